@@ -0,0 +1,476 @@
+#!/usr/bin/env python
+"""
+Measures how quickly cdl_convert evaluates corrections on pixels
+
+Run from the root of the repository:
+
+    $ python benchmarks/bench_apply.py
+
+REQUIREMENTS:
+
+numpy
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert.cdl_convert as cdl_convert
+
+np = cdl_convert.np
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+# (name, height, width)
+RESOLUTIONS = [
+    ('HD', 1080, 1920),
+    ('4K', 2160, 4096),
+]
+
+REPEATS = 5
+
+#==============================================================================
+# FUNCTIONS
+#==============================================================================
+
+
+def build_cdl():
+    """Returns a correction that exercises every operation"""
+    cdl = cdl_convert.ColorCorrection('bench', 'bench.cc')
+    cdl.slope = [1.1, 0.95, 1.05]
+    cdl.offset = [0.01, -0.02, 0.0]
+    cdl.power = [0.9, 1.1, 1.0]
+    cdl.sat = 1.2
+    return cdl
+
+#==============================================================================
+
+
+def megapixels_per_second(func, pixel_count):
+    """Returns the best throughput of several runs of func"""
+    seconds = min(timeit.repeat(func, number=1, repeat=REPEATS))
+    return pixel_count / seconds / 1000000.0
+
+#==============================================================================
+
+
+def bench_apply(cdl):
+    """Prints apply throughput for each resolution and float dtype"""
+    print('apply_cdl')
+    print('{0:<6} {1:<8} {2:>10}'.format('res', 'dtype', 'MP/s'))
+    for name, height, width in RESOLUTIONS:
+        for dtype in [np.float32, np.float64]:
+            pixels = np.random.uniform(0.0, 1.0, (height, width, 3))
+            pixels = pixels.astype(dtype)
+            out = np.empty_like(pixels)
+            rate = megapixels_per_second(
+                lambda: cdl.apply(pixels, out=out), height * width
+            )
+            print(
+                '{0:<6} {1:<8} {2:>10.1f}'.format(
+                    name, np.dtype(dtype).name, rate
+                )
+            )
+
+#==============================================================================
+
+
+def bench_precision(cdl):
+    """Prints throughput and error against float64 for each dtype"""
+    height, width = RESOLUTIONS[0][1:]
+    source = np.random.uniform(0.0, 1.0, (height, width, 3))
+    reference = cdl_convert.apply_cdl(source, cdl)
+
+    print('apply_cdl {0}x{1} precision'.format(width, height))
+    print('{0:<8} {1:<8} {2:>10} {3:>12}'.format(
+        'pixels', 'math', 'MP/s', 'max error'
+    ))
+    for dtype, math in [
+            ('float16', None),
+            ('float16', 'float16'),
+            ('float32', None),
+            ('float32', 'float64'),
+            ('float64', 'float32'),
+            ('float64', None),
+    ]:
+        pixels = source.astype(dtype)
+        out = np.empty_like(pixels)
+        rate = megapixels_per_second(
+            lambda: cdl_convert.apply_cdl(pixels, cdl, out=out, dtype=math),
+            height * width
+        )
+        error = np.abs(out.astype(np.float64) - reference).max()
+        print('{0:<8} {1:<8} {2:>10.1f} {3:>12.2e}'.format(
+            dtype,
+            cdl_convert._compute_dtype(pixels, math).name,  # pylint: disable=W0212
+            rate,
+            error
+        ))
+
+#==============================================================================
+
+
+def bench_codes(cdl):
+    """Prints integer code value throughput with and without saturation"""
+    height, width = RESOLUTIONS[0][1:]
+    sat = cdl.sat
+
+    print('apply_cdl {0}x{1} integer codes'.format(width, height))
+    print('{0:<8} {1:<6} {2:<6} {3:>10}'.format('pixels', 'bits', 'sat', 'MP/s'))
+    try:
+        for dtype, bit_depth in [('uint8', 8), ('uint16', 10), ('uint16', 16)]:
+            pixels = np.random.randint(
+                0, 2 ** bit_depth, (height, width, 3)
+            ).astype(dtype)
+            out = np.empty_like(pixels)
+            for cdl.sat in [1.0, sat]:
+                rate = megapixels_per_second(
+                    lambda: cdl_convert.apply_cdl(
+                        pixels, cdl, out=out, bit_depth=bit_depth
+                    ),
+                    height * width
+                )
+                print('{0:<8} {1:<6} {2:<6} {3:>10.1f}'.format(
+                    dtype, bit_depth, cdl.sat, rate
+                ))
+    finally:
+        cdl.sat = sat
+
+#==============================================================================
+
+
+def bench_tiled(cdl):
+    """Prints tiled apply throughput for several memory budgets"""
+    height, width = RESOLUTIONS[-1][1:]
+    pixels = np.random.uniform(0.0, 1.0, (height, width, 3))
+    pixels = pixels.astype(np.float32)
+    out = np.empty_like(pixels)
+
+    print('apply_cdl_tiled {0}x{1} float32'.format(width, height))
+    print('{0:<10} {1:>10}'.format('memory', 'MP/s'))
+    for memory in [1, 4, 16, 64]:
+        rate = megapixels_per_second(
+            lambda: cdl_convert.apply_cdl_tiled(
+                pixels, cdl, out=out, memory=memory * 1024 * 1024
+            ),
+            height * width
+        )
+        print('{0:<10} {1:>10.1f}'.format('{0}MB'.format(memory), rate))
+
+#==============================================================================
+
+
+def bench_chain(cdl):
+    """Prints chain throughput against applying each correction in turn"""
+    height, width = RESOLUTIONS[-1][1:]
+    pixels = np.random.uniform(0.0, 1.0, (height, width, 3))
+    pixels = pixels.astype(np.float32)
+    out = np.empty_like(pixels)
+
+    sequence = cdl_convert.ColorCorrection('bench_seq', 'bench.cc')
+    sequence.power = [1.1, 1.1, 1.1]
+    sequence.sat = 0.9
+    chain = [cdl, sequence]
+
+    def sequential():
+        """Applies each correction to the whole frame in turn"""
+        cdl_convert.apply_cdl(pixels, cdl, out=out)
+        cdl_convert.apply_cdl(out, sequence, out=out)
+
+    print('apply_cdl_chain {0}x{1} float32, 2 corrections'.format(
+        width, height
+    ))
+    print('{0:<12} {1:>10}'.format('method', 'MP/s'))
+    for name, func in [
+            ('sequential', sequential),
+            ('chain', lambda: cdl_convert.apply_cdl_chain(
+                pixels, chain, out=out
+            )),
+    ]:
+        rate = megapixels_per_second(func, height * width)
+        print('{0:<12} {1:>10.1f}'.format(name, rate))
+
+#==============================================================================
+
+
+def bench_bake():
+    """Prints 33 cube LUT baking throughput in and across processes"""
+    directory = tempfile.mkdtemp()
+    cdls = []
+    for i in range(48):
+        cdl = cdl_convert.ColorCorrection('bake{0}'.format(i), 'bench.cc')
+        # Every grade is used twice, as happens with dailies.
+        cdl.slope = [1.0 + (i // 2) * 0.01, 0.95, 1.05]
+        cdl.sat = 1.2
+        cdl._files['file_out'] = os.path.join(
+            directory, '{0}.cube'.format(cdl.id)
+        )
+        cdls.append(cdl)
+
+    print('bake_luts {0} cubes of 33, {1} distinct grades'.format(
+        len(cdls), len(cdls) // 2
+    ))
+    print('{0:<10} {1:>10}'.format('processes', 'LUTs/s'))
+    try:
+        for processes in sorted(set([1, cdl_convert.cpu_count()])):
+            start = time.time()
+            cdl_convert.bake_luts(cdls, 'cube', size=33, processes=processes)
+            rate = len(cdls) / (time.time() - start)
+            print('{0:<10} {1:>10.1f}'.format(processes, rate))
+    finally:
+        shutil.rmtree(directory)
+
+#==============================================================================
+
+
+def bench_cluster():
+    """Prints how long clustering a million grades into looks takes"""
+    looks = np.random.uniform(0.5, 1.5, (12, 10))
+    batches = []
+    for _ in range(10):
+        values = looks[np.random.randint(0, 12, 100000)]
+        values += np.random.normal(0.0, 0.02, values.shape)
+        batches.append(np.abs(values))
+    print('cluster_cdls 10 batches of 100000 grades')
+    print('{0:<10} {1:>10}'.format('looks', 'seconds'))
+    for clusters in [12, 48]:
+        seconds = min(timeit.repeat(
+            lambda: cdl_convert.cluster_cdls(batches, clusters),
+            number=1,
+            repeat=REPEATS
+        ))
+        cdl_convert.ColorCorrection.members = {}
+        print('{0:<10} {1:>10.3f}'.format(clusters, seconds))
+
+#==============================================================================
+
+
+def bench_fit(cdl):
+    """Prints how long fitting a correction to noisy samples takes"""
+    print('fit_cdl noisy samples')
+    print('{0:<10} {1:>10}'.format('samples', 'seconds'))
+    for count in [1000, 100000, 1000000]:
+        source = np.random.uniform(0.0, 1.0, (count, 3))
+        target = cdl.apply(source)
+        target += np.random.normal(0.0, 0.005, target.shape)
+        seconds = min(timeit.repeat(
+            lambda: cdl_convert.fit_cdl(source, target),
+            number=1,
+            repeat=REPEATS
+        ))
+        print('{0:<10} {1:>10.3f}'.format(count, seconds))
+
+#==============================================================================
+
+
+def bench_index():
+    """Prints how long indexing and searching a million grades takes"""
+    count = 1000000
+    looks = np.random.uniform(0.5, 1.5, (500, 10))
+    values = looks[np.random.randint(0, 500, count)]
+    values += np.random.normal(0.0, 0.02, values.shape)
+    batch = cdl_convert.CorrectionBatch(
+        [str(i) for i in range(count)], np.abs(values)
+    )
+    grades = np.abs(looks + np.random.normal(0.0, 0.02, looks.shape))
+    seconds = min(timeit.repeat(
+        lambda: cdl_convert.GradeIndex(batch), number=1, repeat=REPEATS
+    ))
+    index = cdl_convert.GradeIndex(batch)
+    print('GradeIndex {0} grades, built in {1:.2f}s'.format(count, seconds))
+    print('{0:<12} {1:>10}'.format('query', 'ms'))
+    for name, func in [
+            ('nearest 1', lambda grade: index.nearest(grade)),
+            ('nearest 10', lambda grade: index.nearest(grade, k=10)),
+            ('within 0.1', lambda grade: index.within(grade, 0.1)),
+    ]:
+        seconds = min(timeit.repeat(
+            lambda: [func(grade) for grade in grades],
+            number=1,
+            repeat=REPEATS
+        ))
+        print('{0:<12} {1:>10.2f}'.format(name, seconds * 1000 / len(grades)))
+
+#==============================================================================
+
+
+def bench_lgg():
+    """Prints how long converting logs of lift, gamma and gain takes"""
+    print('lgg_to_cdl and cdl_to_lgg')
+    print('{0:<10} {1:>10} {2:>10}'.format('rows', 'to cdl ms', 'to lgg ms'))
+    for count in [1000, 100000, 1000000]:
+        lift = np.random.uniform(-0.1, 0.1, (count, 3))
+        gamma = np.random.uniform(0.5, 2.0, (count, 3))
+        gain = np.random.uniform(0.8, 1.5, (count, 3))
+        values = cdl_convert.lgg_to_cdl(lift, gamma, gain)
+        to_cdl, to_lgg = [
+            min(timeit.repeat(func, number=1, repeat=REPEATS)) * 1000
+            for func in [
+                lambda: cdl_convert.lgg_to_cdl(lift, gamma, gain),
+                lambda: cdl_convert.cdl_to_lgg(values),
+            ]
+        ]
+        print('{0:<10} {1:>10.2f} {2:>10.2f}'.format(count, to_cdl, to_lgg))
+
+#==============================================================================
+
+
+def bench_render(cdl):
+    """Prints HD PFM sequence rendering throughput in and across processes"""
+    height, width = RESOLUTIONS[0][1:]
+    source = tempfile.mkdtemp()
+    dest = tempfile.mkdtemp()
+    frame_count = 24
+    pixels = np.random.uniform(0.0, 1.0, (height, width, 3))
+    pixels = pixels.astype(np.float32)
+    for frame in range(frame_count):
+        cdl_convert.write_image(
+            os.path.join(source, 'plate.{0:04d}.pfm'.format(frame)), pixels
+        )
+    media_ref = cdl_convert.MediaRef(os.path.join(source, 'plate.0000.pfm'))
+
+    print('render_sequences {0} {1}x{2} pfm frames'.format(
+        frame_count, width, height
+    ))
+    print('{0:<10} {1:>10}'.format('processes', 'frames/s'))
+    try:
+        for processes in sorted(set([1, cdl_convert.cpu_count()])):
+            start = time.time()
+            cdl_convert.render_sequences(
+                [(cdl, media_ref)], dest, processes=processes
+            )
+            rate = frame_count / (time.time() - start)
+            print('{0:<10} {1:>10.1f}'.format(processes, rate))
+    finally:
+        shutil.rmtree(source)
+        shutil.rmtree(dest)
+
+#==============================================================================
+
+
+def bench_verify(cdl):
+    """Prints LUT lookup and verification throughput for a 33 cube"""
+    samples = cdl_convert.VERIFY_SAMPLES
+    lut = cdl_convert.bake_lut(cdl, size=33, dimensions=3)
+    points = np.random.uniform(0.0, 1.0, (samples, 3))
+
+    print('sample_lut and verify_lut 33 cube, {0} samples'.format(samples))
+    print('{0:<12} {1:>12}'.format('method', 'Msamples/s'))
+    for interpolation in ['trilinear', 'tetrahedral']:
+        rate = megapixels_per_second(
+            lambda: cdl_convert.sample_lut(
+                lut, points, interpolation=interpolation
+            ),
+            samples
+        )
+        print('{0:<12} {1:>12.1f}'.format(interpolation, rate))
+    rate = megapixels_per_second(
+        lambda: cdl_convert.verify_lut(cdl, lut), samples
+    )
+    print('{0:<12} {1:>12.1f}'.format('verify', rate))
+
+#==============================================================================
+
+
+def bench_stats():
+    """Prints how long summarising a million grades by group takes"""
+    count = 1000000
+    batch = cdl_convert.CorrectionBatch(
+        [
+            '{0:03d}_{1}_A{2:03d}'.format(i % 97, i, i % 13)
+            for i in range(count)
+        ],
+        np.abs(np.random.normal(1.0, 0.2, (count, 10)))
+    )
+    print('grade_stats {0} grades'.format(count))
+    print('{0:<10} {1:>10}'.format('group', 'seconds'))
+    for group in [None, 'scene', 'reel', 'prefix']:
+        seconds = min(timeit.repeat(
+            lambda: cdl_convert.grade_stats(batch, group=group),
+            number=1,
+            repeat=REPEATS
+        ))
+        print('{0:<10} {1:>10.3f}'.format(group or 'all', seconds))
+
+#==============================================================================
+
+
+def bench_threaded(cdl):
+    """Prints threaded apply throughput from 1 thread up to one per CPU"""
+    height, width = RESOLUTIONS[-1][1:]
+    pixels = np.random.uniform(0.0, 1.0, (height, width, 3))
+    pixels = pixels.astype(np.float32)
+    out = np.empty_like(pixels)
+
+    counts = [1]
+    while counts[-1] * 2 <= cdl_convert.cpu_count():
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cdl_convert.cpu_count():
+        counts.append(cdl_convert.cpu_count())
+
+    print('apply_cdl_threaded {0}x{1} float32'.format(width, height))
+    print('{0:<8} {1:>10} {2:>8}'.format('threads', 'MP/s', 'scaling'))
+    base = None
+    for threads in counts:
+        rate = megapixels_per_second(
+            lambda: cdl_convert.apply_cdl_threaded(
+                pixels, cdl, out=out, threads=threads
+            ),
+            height * width
+        )
+        base = base or rate
+        print(
+            '{0:<8} {1:>10.1f} {2:>7.2f}x'.format(threads, rate, rate / base)
+        )
+
+#==============================================================================
+# MAIN
+#==============================================================================
+
+
+def main():
+    """Runs every benchmark"""
+    cdl = build_cdl()
+    bench_apply(cdl)
+    print()
+    bench_precision(cdl)
+    print()
+    bench_codes(cdl)
+    print()
+    bench_tiled(cdl)
+    print()
+    bench_chain(cdl)
+    print()
+    bench_threaded(cdl)
+    print()
+    bench_bake()
+    print()
+    bench_render(cdl)
+    print()
+    bench_verify(cdl)
+    print()
+    bench_fit(cdl)
+    print()
+    bench_cluster()
+    print()
+    bench_lgg()
+    print()
+    bench_index()
+    print()
+    bench_stats()
+
+if __name__ == '__main__':
+    main()
@@ -65,10 +65,20 @@ from __future__ import print_function
 
 from argparse import ArgumentParser
 from ast import literal_eval
+import atexit
+import hashlib
+import heapq
+import itertools
+import math
+from multiprocessing import Pool, RawArray, cpu_count
+from multiprocessing.pool import ThreadPool
 from xml.dom import minidom
+from xml.sax.saxutils import escape, quoteattr
 import os
 import re
+import shutil
 import sys
+import threading
 from xml.etree import ElementTree
 
 # Python 3 compatibility
@@ -80,6 +90,21 @@ try:
     raw_input
 except NameError:  # pragma: no cover
     raw_input = input  # pylint: disable=W0622, C0103
+try:
+    basestring
+except NameError:  # pragma: no cover
+    basestring = str  # pylint: disable=W0622, C0103
+try:
+    from queue import Queue
+except ImportError:  # pragma: no cover
+    from Queue import Queue  # pylint: disable=F0401
+
+# NumPy is only needed to evaluate corrections on pixels. Everything else
+# works without it, so it stays an optional dependency.
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # pylint: disable=C0103
 
 # ==============================================================================
 # GLOBALS
@@ -112,27 +137,266 @@ else:  # pragma: no cover
 #       contains an image sequence, will just return False.
 HALT_ON_ERROR = False
 
+# INTERN_GRADES turns on hash-consing of grade values. When True, identical
+# slope, offset, power and saturation values are stored as one shared
+# immutable object no matter how many nodes hold them, and the text written
+# out for a given set of values is only formatted once. Useful when parsing
+# dailies ALEs where thousands of takes share a handful of grades.
+INTERN_GRADES = False
+
+# Storage for INTERN_GRADES. _INTERNED maps a value to its shared instance,
+# _SERIALIZED maps a value to the text that was formatted for it. Both are
+# keyed by _intern_key, and each is cleared whenever it grows past
+# _INTERNED_LIMIT. Use reset_interned_grades() to empty both.
+_INTERNED = {}
+_SERIALIZED = {}
+_INTERNED_LIMIT = 65536
+
+# FINGERPRINT_PRECISION is the default number of decimal places grade values
+# are rounded to before a ColorCorrection fingerprint is taken. Values that
+# only differ past this many places are considered identical by the
+# fingerprint, and therefore by ColorCorrection equality and hashing.
+FINGERPRINT_PRECISION = 6
+
+# Characters that are not allowed in an id are matched by _ILLEGAL_ID_CHARS.
+# _ILLEGAL_ID_CHARS_LINES is the same, but leaves newlines alone so that a
+# whole column of ids can be sanitized in a single pass.
+_ILLEGAL_ID_CHARS = re.compile(r'[^a-zA-Z0-9\._]+')
+_ILLEGAL_ID_CHARS_LINES = re.compile(r'[^a-zA-Z0-9\._\n]+')
+_LEADING_ID_CHARS_LINES = re.compile(r'^[_.]', re.MULTILINE)
+
+# Previously sanitized ids, mapping the raw id to the sanitized id. Emptied
+# whenever it grows past _SANITIZED_LIMIT entries.
+_SANITIZED = {}
+_SANITIZED_LIMIT = 65536
+
+# Rec 709 luma coefficients, used by the ASC CDL saturation operation.
+REC709_LUMA = (0.2126, 0.7152, 0.0722)
+
+# CLAMP is the default clamping policy used when evaluating and baking
+# corrections, one of CLAMP_MODES:
+#   asc: Clamp to 0.0 - 1.0 after Slope and Offset and after Saturation, as
+#        the ASC CDL v1.2 specifies.
+#   none: Never clamp. Power leaves negative values as they are.
+#   mirror: Never clamp. Power is mirrored around 0.0, so negative values
+#           are raised as their absolute value and stay negative.
+CLAMP = 'asc'
+CLAMP_MODES = ('asc', 'none', 'mirror')
+
+# INVERSE_TOLERANCE is how far outside of 0.0 - 1.0 a value can land while
+# undoing saturation before ColorCorrectionInverse considers it undefined,
+# rather than rounding error.
+INVERSE_TOLERANCE = 1e-6
+
+# Pixel dtypes that NumPy has no fast math for, mapped to the dtype they're
+# evaluated in by default. Bands of pixels are converted to the wider dtype,
+# evaluated and converted back, so whole frames stay in the narrow dtype.
+_WIDENED_DTYPES = {'float16': 'float32'}
+
+# Integer pixels are graded through a table with an entry per code value,
+# so they can have at most this many bits.
+_MAX_CODE_BITS = 16
+
+# TILE_MEMORY is the default number of bytes of pixel data apply_cdl_tiled
+# evaluates at once.
+TILE_MEMORY = 16 * 1024 * 1024
+
+# THREADS is the default number of threads apply_cdl_threaded spreads bands
+# across. None means one thread per CPU.
+THREADS = None
+
+# PROCESSES is the default number of worker processes bake_luts spreads
+# corrections across. None means one process per CPU.
+PROCESSES = None
+
+# Default sizes and input range for baked LUTs. 1D LUTs are baked when a
+# correction has no saturation and the format allows it, 3D LUTs otherwise.
+LUT_1D_SIZE = 4096
+LUT_3D_SIZE = 33
+LUT_RANGE = (0.0, 1.0)
+
+# INDEX_LEAF_SIZE is the default number of grades GradeIndex compares at once
+# in each leaf of its tree.
+INDEX_LEAF_SIZE = 128
+
+# Columns parse_ale reads lift, gamma and gain from, in that order, when an
+# ALE has no ASC_SOP column. Each holds a red, green and blue value, which
+# can be wrapped in parentheses and separated by commas.
+ALE_LGG_COLUMNS = ('Lift', 'Gamma', 'Gain')
+_LGG_PUNCTUATION = re.compile(r'[(),]')
+
+# Curves blend_cdls eases between corrections with, and the domains it can
+# blend slope in. 'sop' blends slope linearly like every other value, 'log'
+# blends slope in log2, so that changes of exposure happen at an even rate.
+BLEND_CURVES = ('linear', 'ease_in', 'ease_out', 'ease_in_out')
+BLEND_DOMAINS = ('sop', 'log')
+
+# Defaults for cluster_cdls, which reads grades CLUSTER_BATCH at a time and
+# passes over them CLUSTER_PASSES times, or until no look moves by more than
+# _CLUSTER_TOLERANCE in a pass.
+CLUSTER_BATCH = 4096
+CLUSTER_PASSES = 5
+_CLUSTER_TOLERANCE = 1e-9
+
+# Ways grade_stats can group corrections by their ids. 'scene' and 'reel' are
+# the first and last fields of ids separated by underscores, which is how
+# FLEx ids are laid out, and 'prefix' is an id without its last field.
+STATS_GROUPS = ('scene', 'reel', 'prefix')
+
+# Default percentiles grade_stats reports, and how many interquartile ranges
+# past the quartiles of its group a value has to be to be flagged an outlier.
+STATS_PERCENTILES = (5, 25, 50, 75, 95)
+OUTLIER_FENCE = 1.5
+
+# Names of the 10 values of a grade, in the order of CorrectionBatch.values.
+_GRADE_VALUES = (
+    'slope_r', 'slope_g', 'slope_b',
+    'offset_r', 'offset_g', 'offset_b',
+    'power_r', 'power_g', 'power_b',
+    'sat',
+)
+
+# CONTRAST_PIVOT is the value wedge_cdl pivots contrast around, which stays
+# where it is as contrast changes.
+CONTRAST_PIVOT = 0.18
+
+# FIT_ITERATIONS is the most steps fit_cdl takes towards the best grade.
+# Fitting stops sooner once a step moves no grade value by more than
+# _FIT_TOLERANCE, or improves the squared error by less than that fraction.
+FIT_ITERATIONS = 100
+_FIT_TOLERANCE = 1e-10
+
+# Number of samples fit_cdl works through at once. Small enough that a
+# chunk's temporaries stay in cache.
+_FIT_CHUNK = 8192
+
+# How sample_lut interpolates between LUT entries. 1D LUTs are interpolated
+# linearly, 3D LUTs trilinearly or tetrahedrally, tetrahedral by default.
+LUT_INTERPOLATIONS = ('linear', 'trilinear', 'tetrahedral')
+
+# VERIFY_SAMPLES is the default number of random inputs verify_lut compares a
+# baked LUT against the correction's math at.
+VERIFY_SAMPLES = 1000000
+
+# Number of points sample_lut and verify_lut work through at once, which
+# bounds the memory their temporaries take.
+_SAMPLE_CHUNK = 65536
+
+# RENDER_QUEUE is the default number of frames render_sequences holds between
+# reading and grading, and again between grading and writing, in each
+# process.
+RENDER_QUEUE = 4
+
+# Number of LUT entries, or batch corrections, formatted into text at once
+# when writing.
+_LUT_WRITE_ROWS = 4096
+
+# The grade of a ColorCorrection written by CorrectionBatch.write_ccc,
+# indented as a child of the collection.
+_CCC_ENTRY = (
+    '        <SOPNode>\n'
+    '            <Slope>{slope}</Slope>\n'
+    '            <Offset>{offset}</Offset>\n'
+    '            <Power>{power}</Power>\n'
+    '        </SOPNode>\n'
+    '        <SATNode>\n'
+    '            <Saturation>{sat}</Saturation>\n'
+    '        </SATNode>\n'
+    '    </ColorCorrection>\n'
+)
+
+# Thread pools shared by calls to apply_cdl_threaded, keyed by the id of the
+# process that built them and their thread count. A forked child builds its
+# own, since the threads of the parent's pools aren't copied into it. Each
+# process closes the pools it built when it exits.
+_THREAD_POOLS = {}
+_THREAD_POOLS_LOCK = threading.Lock()
+
+# State of a bake_luts worker process, filled in by _init_lut_worker. Holds
+# the shared identity lattices and the output buffers reused between jobs,
+# both keyed by LUT dimensions.
+_LUT_WORKER = {}
+
+# Plans compiled by compile_chain, keyed by dtype, clamping policy and the
+# values of each correction in the chain. Cleared whenever it grows past
+# _CHAIN_PLANS_LIMIT.
+_CHAIN_PLANS = {}
+_CHAIN_PLANS_LIMIT = 4096
+
 # ==============================================================================
 # EXPORTS
 # ==============================================================================
 
 __all__ = [
+    'ALE_LGG_COLUMNS',
+    'BLEND_CURVES',
+    'BLEND_DOMAINS',
+    'CLAMP',
+    'CLAMP_MODES',
+    'CLUSTER_BATCH',
+    'CLUSTER_PASSES',
+    'CONTRAST_PIVOT',
+    'FIT_ITERATIONS',
+    'INDEX_LEAF_SIZE',
+    'INVERSE_TOLERANCE',
+    'LUT_1D_SIZE',
+    'LUT_3D_SIZE',
+    'LUT_INTERPOLATIONS',
+    'LUT_RANGE',
+    'OUTLIER_FENCE',
+    'PROCESSES',
+    'REC709_LUMA',
+    'RENDER_QUEUE',
+    'STATS_GROUPS',
+    'STATS_PERCENTILES',
+    'THREADS',
+    'TILE_MEMORY',
+    'VERIFY_SAMPLES',
     'AscColorSpaceBase',
     'AscDescBase',
     'AscXMLBase',
     'ColorCollectionBase',
     'ColorCorrection',
+    'ColorCorrectionInverse',
+    'ColorCorrectionPlan',
     'ColorDecision',
     'ColorNodeBase',
+    'CorrectionBatch',
+    'GradeIndex',
     'MediaRef',
     'SatNode',
     'SopNode',
+    'apply_cdl',
+    'apply_cdl_chain',
+    'apply_cdl_threaded',
+    'apply_cdl_tiled',
+    'bake_lut',
+    'bake_luts',
+    'blend_cdls',
+    'cdl_to_lgg',
+    'cluster_cdls',
+    'compile_chain',
+    'filter_frames',
+    'fit_cdl',
+    'grade_stats',
+    'lgg_to_cdl',
     'parse_ale',
     'parse_cc',
     'parse_cdl',
     'parse_flex',
+    'read_image',
+    'render_sequences',
+    'reset_interned_grades',
+    'sample_lut',
+    'sanitize_ids',
+    'verify_lut',
+    'wedge_cdl',
     'write_cc',
     'write_cdl',
+    'write_cube',
+    'write_image',
+    'write_spi1d',
+    'write_spi3d',
 ]
 
 # ==============================================================================
@@ -480,6 +744,12 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     Order of operations is Slope, Offset, Power, then Saturation.
 
+    Two :class:`ColorCorrection` compare equal, and hash identically, when
+    their ten grade values match to ``FINGERPRINT_PRECISION`` decimal places.
+    The id, files and descriptions are not considered. Note that changing a
+    grade value changes the hash, so don't change the grade of a
+    :class:`ColorCorrection` while it's stored in a set or used as a key.
+
     **Class Attributes:**
 
         members : {str: :class`ColorCorrection`}
@@ -487,6 +757,12 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
             dictionary, with their unique id being the key and the
             :class:`ColorCorrection` being the value.
 
+    **Class Methods:**
+
+        allocate_id()
+            Returns an id made of a prefix and a zero padded number that is
+            not yet registered in ``members``.
+
     **Attributes:**
 
         desc : [str]
@@ -518,6 +794,11 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
             to ensure the new id is open. If it is, the key is changed to the
             new id and the id is changed.
 
+            If sanitizing the id given at creation makes it collide with a
+            registered id, it's suffixed with a number from
+            ``allocate_id()`` instead, like ``A001_001``. Ids that were
+            already clean still raise on a collision.
+
             Note that this shadows the builtin id.
 
         input_desc : (str)
@@ -548,6 +829,10 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     **Public Methods:**
 
+        apply()
+            Evaluates this correction on a NumPy array of RGB pixels. See
+            :func:`apply_cdl` .
+
         build_element()
             Builds an ElementTree XML Element for this node and all nodes it
             contains. ``element``, ``xml``, and ``xml_root`` attributes use
@@ -555,10 +840,22 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
             ``element`` attribute. Overrides inherited placeholder method
             from :class:`AscXMLBase` .
 
+        compile()
+            Returns a cached :class:`ColorCorrectionPlan` that evaluates this
+            correction with as few array operations as its values allow.
+
         determine_dest()
             When provided an output extension, determines the destination
             filename to be written to based on ``file_in`` & ``id``.
 
+        fingerprint()
+            Returns a canonical hex digest of the ten grade values, and
+            optionally the descriptions, suitable for use as a cache key.
+
+        inverse()
+            Returns a :class:`ColorCorrectionInverse` which undoes this
+            correction.
+
         parse_xml_descs()
             Parses an ElementTree Element for any Description tags and appends
             any text they contain to the ``desc``. Inherited from
@@ -578,6 +875,15 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     members = {}
 
+    # The next number allocate_id() will try for each prefix, and the members
+    # dictionary those numbers were counted against.
+    _id_counters = {}
+    _id_counters_members = None
+
+    # Held while checking and changing members or the id counters. Reading
+    # members doesn't need it. Reentrant, since init allocates ids.
+    _members_lock = threading.RLock()
+
     def __init__(self, id, cdl_file):  # pylint: disable=W0622
         """Inits an instance of a ColorCorrection"""
         super(ColorCorrection, self).__init__()
@@ -588,31 +894,69 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
             'file_out': None
         }
 
+        # ASC_SAT attribute
+        self.sat_node = None
+
+        # ASC_SOP attributes
+        self.sop_node = None
+
+        # Cached fingerprints, keyed by the fingerprint arguments. Each entry
+        # stores the state the digest was taken from along with the digest.
+        self._fingerprints = {}
+
+        # Compiled evaluation plans, keyed by dtype. Each entry stores the
+        # values the plan was compiled from along with the plan.
+        self._plans = {}
+
         # The id is really the only required part of a ColorCorrection node
         # Each ID should be unique
+        given_id = id
         id = _sanitize(id)
-        if id in ColorCorrection.members.keys():
-            raise ValueError(
-                'Error initiating id to "{id}". This id is already a '
-                'registered id.'.format(
-                    id=id
+        # Checking and registering happen under the members lock so that two
+        # threads can't claim the same id. We register last, so that other
+        # threads reading members never find a half built instance.
+        with ColorCorrection._members_lock:
+            if id and id != given_id and id in ColorCorrection.members:
+                # Sanitizing made this id collide, so it's suffixed rather
+                # than refused, the same way every time.
+                id = ColorCorrection.allocate_id(id + '_')
+            elif id in ColorCorrection.members:
+                raise ValueError(
+                    'Error initiating id to "{id}". This id is already a '
+                    'registered id.'.format(
+                        id=id
+                    )
                 )
-            )
-        elif not id:
-            if HALT_ON_ERROR:
-                raise ValueError('Blank id given to ColorCorrection.')
-            else:
-                id = str(len(ColorCorrection.members) + 1).rjust(3, '0')
-        self._id = id
+            elif not id:
+                if HALT_ON_ERROR:
+                    raise ValueError('Blank id given to ColorCorrection.')
+                else:
+                    id = ColorCorrection.allocate_id(
+                        start=len(ColorCorrection.members) + 1
+                    )
+            self._id = id
 
-        # Register with member dictionary
-        ColorCorrection.members[self._id] = self
+            # Register with member dictionary
+            ColorCorrection.members[self._id] = self
 
-        # ASC_SAT attribute
-        self.sat_node = None
+    # Special Methods =========================================================
 
-        # ASC_SOP attributes
-        self.sop_node = None
+    def __eq__(self, other):
+        """Corrections are equal if their grade values are equal"""
+        if not isinstance(other, ColorCorrection):
+            return NotImplemented
+        return self.fingerprint() == other.fingerprint()
+
+    def __ne__(self, other):
+        """Corrections are unequal if their grade values differ"""
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __hash__(self):
+        """Hashes the fingerprint of the grade values"""
+        return hash(self.fingerprint())
 
     # Properties ==============================================================
 
@@ -694,26 +1038,153 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     # Private Methods =========================================================
 
+    def _fingerprint_state(self, descs):
+        """Returns everything a fingerprint is derived from as a tuple"""
+        state = self._values()
+
+        if descs:
+            state += (
+                self.input_desc,
+                self.viewing_desc,
+                tuple(self.desc),
+                tuple(self.sop_node.desc) if self.sop_node else (),
+                tuple(self.sat_node.desc) if self.sat_node else (),
+            )
+
+        return state
+
+    # =========================================================================
+
+    def _values(self):
+        """Returns the slope, offset, power and sat values as a tuple"""
+        # We read the node attributes directly, so that reading values never
+        # creates nodes as a side effect. Missing nodes read identically to
+        # nodes left at their defaults.
+        if self.sop_node:
+            sop = (
+                self.sop_node._slope,  # pylint: disable=W0212
+                self.sop_node._offset,  # pylint: disable=W0212
+                self.sop_node._power,  # pylint: disable=W0212
+            )
+        else:
+            sop = ((1.0, 1.0, 1.0), (0.0, 0.0, 0.0), (1.0, 1.0, 1.0))
+        if self.sat_node:
+            sat = self.sat_node._sat  # pylint: disable=W0212
+        else:
+            sat = 1.0
+
+        return (tuple(sop[0]), tuple(sop[1]), tuple(sop[2]), sat)
+
+    # =========================================================================
+
     def _set_id(self, new_id):
         """Changes the id field if the new id is unique"""
         cc_id = _sanitize(new_id)
-        # Check if this id is already registered
-        if cc_id in ColorCorrection.members.keys():
-            raise ValueError(
-                'Error setting the id to "{cc_id}". This id is already a '
-                'registered id.'.format(
-                    cc_id=cc_id
+        with ColorCorrection._members_lock:
+            # Check if this id is already registered
+            if cc_id in ColorCorrection.members:
+                raise ValueError(
+                    'Error setting the id to "{cc_id}". This id is already a '
+                    'registered id.'.format(
+                        cc_id=cc_id
+                    )
                 )
-            )
-        else:
-            # Clear the current id from the dictionary
-            ColorCorrection.members.pop(self._id)
-            self._id = cc_id
-            # Register the new id with the dictionary
-            ColorCorrection.members[self._id] = self
+            else:
+                # Register the new id before clearing the current one, so
+                # that lookups from other threads always find us under one
+                # of them.
+                ColorCorrection.members[cc_id] = self
+                ColorCorrection.members.pop(self._id)
+                self._id = cc_id
 
     # Public Methods ==========================================================
 
+    @classmethod
+    def allocate_id(cls, prefix='', start=1):
+        """Returns an unregistered id of prefix followed by a padded number
+
+        **Args:**
+            prefix='' : (str)
+                The start of the id. It will be sanitized.
+
+            start=1 : (int)
+                The lowest number to try. Numbers are padded to 3 digits.
+
+        **Returns:**
+            (str)
+                The first id of the form ``prefix###`` that's not a key of
+                ``members``, counting up from the larger of ``start`` and the
+                number following the last id allocated for this prefix.
+
+        **Raises:**
+            N/A
+
+        The id is not registered until a :class:`ColorCorrection` is created
+        with it, but it won't be handed out again, even to another thread.
+        Each prefix keeps its own counter, so allocation doesn't have to
+        rescan numbers it has already handed out. If ``members`` is replaced
+        with a new dictionary, all counters start over.
+
+        """
+        # Sanitizing can expose another leading underscore or period, so we
+        # sanitize until the prefix stops changing. That way sanitizing the
+        # returned id again during init won't change it.
+        clean = _sanitize(prefix)
+        while clean != prefix:
+            prefix, clean = clean, _sanitize(clean)
+
+        with cls._members_lock:
+            if cls._id_counters_members is not cls.members:
+                cls._id_counters = {}
+                cls._id_counters_members = cls.members
+
+            number = max(cls._id_counters.get(prefix, 1), start)
+            cc_id = prefix + str(number).rjust(3, '0')
+            while cc_id in cls.members:
+                number += 1
+                cc_id = prefix + str(number).rjust(3, '0')
+            cls._id_counters[prefix] = number + 1
+
+        return cc_id
+
+    # =========================================================================
+
+    def apply(self, pixels, out=None, dtype=None, bit_depth=None,
+              clamp=None):
+        """Evaluates this correction on an array of RGB pixels
+
+        **Args:**
+            pixels : (numpy.ndarray)
+                A floating point or unsigned integer array whose last axis
+                holds R, G and B.
+
+            out=None : (numpy.ndarray)
+                Array to write results to, which may be ``pixels`` itself.
+
+            dtype=None : (numpy.dtype)
+                The floating point dtype to do the math in.
+
+            bit_depth=None : (int)
+                The bit depth of integer pixels.
+
+            clamp=None : (str)
+                One of ``CLAMP_MODES``. Defaults to ``CLAMP``.
+
+        **Returns:**
+            (numpy.ndarray)
+                The graded pixels.
+
+        **Raises:**
+            See :func:`apply_cdl`
+
+        """
+        return apply_cdl(
+            pixels, self, out=out, dtype=dtype, bit_depth=bit_depth,
+            clamp=clamp
+        )
+
+    # =========================================================================
+
     def build_element(self):
         """Builds an ElementTree XML element representing this CC"""
         cc_xml = ElementTree.Element('ColorCorrection')
@@ -736,6 +1207,54 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
     # =========================================================================
 
+    def compile(self, dtype=None, clamp=None):
+        """Returns an evaluation plan specialized to the current values
+
+        **Args:**
+            dtype=None : (numpy.dtype)
+                The floating point dtype the plan does its math in. Defaults
+                to float64.
+
+            clamp=None : (str)
+                The clamping policy of the plan, one of ``CLAMP_MODES``.
+                Defaults to ``CLAMP``.
+
+        **Returns:**
+            ( :class:`ColorCorrectionPlan` )
+                The plan for the current slope, offset, power and sat.
+
+        **Raises:**
+            ImportError:
+                If NumPy is not installed.
+
+            TypeError:
+                If ``dtype`` is not floating point.
+
+            ValueError:
+                If ``clamp`` is not one of ``CLAMP_MODES``.
+
+        Plans are cached for each dtype and clamping policy, and only
+        compiled again once the values change, so evaluating the same grade
+        on many frames compiles it once.
+
+        """
+        _require_numpy('compile')
+
+        dtype = np.dtype(np.float64 if dtype is None else dtype)
+        clamp = _clamp_mode(clamp)
+        values = self._values()
+
+        cached = self._plans.get((dtype, clamp))
+        if cached and cached[0] == values:
+            return cached[1]
+
+        plan = ColorCorrectionPlan(values, dtype, clamp)
+        self._plans[(dtype, clamp)] = (values, plan)
+
+        return plan
+
+    # =========================================================================
+
     def determine_dest(self, output):
         """Determines the destination file and sets it on the cdl"""
 
@@ -745,280 +1264,487 @@ class ColorCorrection(AscDescBase, AscColorSpaceBase, AscXMLBase):  # pylint: di
 
         self._files['file_out'] = os.path.join(directory, filename)
 
-# ==============================================================================
+    # =========================================================================
 
+    def fingerprint(self, precision=None, descs=False):
+        """Returns a canonical hex digest identifying this grade
 
-class ColorDecision(AscXMLBase):  # pylint: disable=R0903
-    """Contains a media ref and a ColorCorrection or reference to CC.
+        **Args:**
+            precision=None : (int)
+                The number of decimal places grade values are rounded to
+                before hashing. Defaults to ``FINGERPRINT_PRECISION``.
 
-    Description
-    ~~~~~~~~~~~
+            descs=False : (bool)
+                If True, the input, viewing and all description fields of
+                this correction and its nodes are included in the digest.
 
-    This class is a stub for now, with no functionality.
+        **Returns:**
+            (str)
+                A 40 character hex digest. Two corrections whose slope,
+                offset, power and saturation round to the same values share
+                a fingerprint, regardless of their ids.
 
-    **Attributes:**
+        **Raises:**
+            N/A
 
-        element : (<xml.etree.ElementTree.Element>)
-            etree style Element representing the node. Inherited from
-            :class:`AscXMLBase` .
+        The digest is cached, and only recomputed once the values it was
+        taken from change.
 
-        xml : (str)
-            A nicely formatted XML string representing the node. Inherited from
-            :class:`AscXMLBase`.
+        """
+        if precision is None:
+            precision = FINGERPRINT_PRECISION
+
+        state = self._fingerprint_state(descs)
+        key = (precision, descs)
+
+        cached = self._fingerprints.get(key)
+        if cached and cached[0] == state:
+            return cached[1]
+
+        scale = 10 ** precision
+        # Rounding to integers both quantizes the values and folds -0.0
+        # into 0.0.
+        values = [
+            str(int(round(value * scale)))
+            for value in state[0] + state[1] + state[2] + (state[3], )
+        ]
+        canonical = '{precision}:{values}'.format(
+            precision=precision,
+            values=' '.join(values)
+        )
+        if descs:
+            # Multiple descriptions are joined with the ASCII record
+            # separator, which can't be typed into a description.
+            for field in state[4:]:
+                if type(field) is tuple:
+                    field = '\x1e'.join(field)
+                canonical += '\n' + (field if field else '')
 
-        xml_root : (str)
-            A nicely formatted XML, ready to write to file string representing
-            the node. Formatted as an XML root, it includes the xml version and
-            encoding tags on the first line. Inherited from
-            :class:`AscXMLBase`.
+        digest = hashlib.sha1(canonical.encode('UTF-8')).hexdigest()
+        self._fingerprints[key] = (state, digest)
 
-    **Public Methods:**
+        return digest
 
-        build_element()
-            Builds an ElementTree XML Element for this node and all nodes it
-            contains. ``element``, ``xml``, and ``xml_root`` attributes use
-            this to build the XML. This function is identical to calling the
-            ``element`` attribute. Overrides inherited placeholder method
-            from :class:`AscXMLBase` .
+    # =========================================================================
 
-    """
-    def __init__(self):
-        """Inits an instance of ColorDecision"""
-        super(ColorDecision, self).__init__()
+    def inverse(self, clamp=None):
+        """Returns the inverse transform of this correction
+
+        **Args:**
+            clamp=None : (str)
+                The clamping policy the correction was applied with, one of
+                ``CLAMP_MODES``. Defaults to ``CLAMP``. See
+                :func:`apply_cdl` .
+
+        **Returns:**
+            ( :class:`ColorCorrectionInverse` )
+                A snapshot of the current grade values, which undoes them
+                when applied. Later changes to this correction don't affect
+                it.
+
+        **Raises:**
+            ValueError:
+                If any slope or power value, or the saturation, is 0.0, or
+                ``clamp`` isn't one of ``CLAMP_MODES``.
+
+        """
+        return ColorCorrectionInverse(self, clamp)
 
 # ==============================================================================
 
 
-class ColorNodeBase(AscDescBase, AscXMLBase):  # pylint: disable=R0903
-    """Base class for SOP and SAT nodes.
+class ColorCorrectionInverse(object):
+    """The inverse transform of a ColorCorrection
 
     Description
     ~~~~~~~~~~~
 
-    This class is meant only to be inherited by :class:`SopNode` and
-    :class:`SatNode` and should not be used outside of those classes.
+    Undoes a :class:`ColorCorrection` by reversing each operation in reverse
+    order: Saturation, then Power, Offset and Slope. Get one from
+    :class:`ColorCorrection` ``inverse()``.
 
-    It inherits from both :class:`AscDescBase` and :class:`AscXMLBase` giving
-    the child classes both ``desc`` and ``xml`` related functionality.
+    Saturation is undone around the same Rec 709 luma it was applied around,
+    which it doesn't change. Power is undone with the reciprocal power, and
+    Offset and Slope by subtracting and dividing.
 
-    This class is also home to a private function which helps :class:`SopNode`
-    and :class:`SatNode` perform type and value checks on incoming values.
+    The inverse follows the clamping policy the correction was applied with.
+    The clamps of the 'asc' policy throw information away, so not every
+    value can be inverted. Values that no input could have produced, which
+    land outside of 0.0 - 1.0 once saturation is undone, come out as NaN.
+    Values that the forward transform clamped to 0.0 or 1.0 come back as the
+    input that lands exactly on the clamp. The 'none' and 'mirror' policies
+    never clamp, so every value is undone, negative values included, with
+    Power left off or mirrored around 0.0 as it was applied.
 
     **Attributes:**
 
-        desc : [str]
-            Since all Asc nodes which can contain a single description, can
-            actually contain an infinite number of descriptions, the desc
-            attribute is a list, allowing us to store every single description
-            found during parsing.
+        clamp : (str)
+            The clamping policy being undone, one of ``CLAMP_MODES``.
 
-            Setting desc directly will cause the value given to append to the
-            end of the list, but desc can also be replaced by passing it a list
-            or tuple. Desc can be emptied by passing it None, [] or ().
+        id : (str)
+            The id of the :class:`ColorCorrection` this inverts.
 
-            Inherited from :class:`AscDescBase` .
+        offset : (float, float, float)
+            The offset of the :class:`ColorCorrection` this inverts.
 
-        element : (<xml.etree.ElementTree.Element>)
-            etree style Element representing the node. Inherited from
-            :class:`AscXMLBase` .
+        power : (float, float, float)
+            The power of the :class:`ColorCorrection` this inverts.
 
-        xml : (str)
-            A nicely formatted XML string representing the node. Inherited from
-            :class:`AscXMLBase`.
+        sat : (float)
+            The saturation of the :class:`ColorCorrection` this inverts.
 
-        xml_root : (str)
-            A nicely formatted XML, ready to write to file string representing
-            the node. Formatted as an XML root, it includes the xml version and
-            encoding tags on the first line. Inherited from
-            :class:`AscXMLBase`.
+        slope : (float, float, float)
+            The slope of the :class:`ColorCorrection` this inverts.
 
     **Public Methods:**
 
-        build_element()
-            Builds an ElementTree XML Element for this node and all nodes it
-            contains. ``element``, ``xml``, and ``xml_root`` attributes use
-            this to build the XML. This function is identical to calling the
-            ``element`` attribute. Overrides inherited placeholder method
-            from :class:`AscXMLBase` .
-
-        parse_xml_descs()
-            Parses an ElementTree Element for any Description tags and appends
-            any text they contain to the ``desc``. Inherited from
-            :class:`AscDescBase`
+        apply()
+            Evaluates the inverse on a NumPy array of RGB pixels.
 
     """
-    def __init__(self):
-        super(ColorNodeBase, self).__init__()
-
-    # Private Methods =========================================================
-
-    @staticmethod
-    def _check_single_value(value, name, negative_allow=False):
-        """Checks given value for legitimacy.
+    def __init__(self, cdl, clamp=None):
+        """Inits an instance of ColorCorrectionInverse
 
         **Args:**
-            value : (str, float, int)
-                Any numeric value to be checked.
-
-            name : (str)
-                The type of value being checked: slope, offset, etc.
-
-            negative_allow=False : (bool)
-                If false, do not allow negative values.
+            cdl : ( :class:`ColorCorrection` )
+                The correction to invert.
 
-        **Returns:**
-            (float)
-                If value passes all tests, returns value as float.
+            clamp=None : (str)
+                The clamping policy ``cdl`` was applied with, one of
+                ``CLAMP_MODES``. Defaults to ``CLAMP``.
 
         **Raises:**
-            TypeError:
-                If value given is not a number.
-
             ValueError:
-                If negative is False, raised if value given is negative.
+                If any slope or power value, or the saturation, is 0.0, or
+                ``clamp`` isn't one of ``CLAMP_MODES``.
 
         """
-        # If given as a string, the string must be convertible to a float
-        if type(value) == str:
-            try:
-                value = float(value)
-            except ValueError:
-                raise TypeError(
-                    'Error setting {name} with value: "{value}". '
-                    'Value is not a number.'.format(
+        slope, offset, power, sat = cdl._values()  # pylint: disable=W0212
+        for name, values in [('slope', slope), ('power', power)]:
+            if 0.0 in values:
+                raise ValueError(
+                    'Correction {id} has a {name} of {values}. A {name} of '
+                    '0.0 cannot be inverted.'.format(
+                        id=cdl.id,
                         name=name,
-                        value=value
+                        values=values
                     )
                 )
-        # If given as a single number, that number must be positive
-        if type(value) in [float, int] and not negative_allow:
-            if value < 0:
-                if HALT_ON_ERROR:
-                    raise ValueError(
-                        'Error setting {name} with value: "{value}". '
-                        'Values must not be negative'.format(
-                            name=name,
-                            value=value
-                        )
-                    )
-                else:
-                    value = 0
+        if sat == 0.0:
+            raise ValueError(
+                'Correction {id} has a saturation of 0.0, which leaves only '
+                'luma and cannot be inverted.'.format(id=cdl.id)
+            )
 
-        return float(value)
+        self.id = cdl.id  # pylint: disable=C0103
+        self.clamp = _clamp_mode(clamp)
+        self.slope = slope
+        self.offset = offset
+        self.power = power
+        self.sat = sat
+
+        # Reciprocals of slope, power and sat, in _values() order.
+        self._inverse_values = (
+            tuple(1.0 / value for value in slope),
+            offset,
+            tuple(1.0 / value for value in power),
+            1.0 / sat,
+        )
 
-# ==============================================================================
+    # Public Methods ==========================================================
 
+    def apply(self, pixels, out=None, dtype=None):
+        """Evaluates the inverse on an array of RGB pixels
+
+        **Args:**
+            pixels : (numpy.ndarray)
+                A floating point array whose last axis holds R, G and B.
+
+            out=None : (numpy.ndarray)
+                Array to write results to, which may be ``pixels`` itself.
+
+            dtype=None : (numpy.dtype)
+                The floating point dtype to do the math in. See
+                :func:`apply_cdl` .
+
+        **Returns:**
+            (numpy.ndarray)
+                The ungraded pixels. With the 'asc' clamping policy, every
+                channel that has no inverse is NaN.
+
+        **Raises:**
+            See :func:`apply_cdl`
+
+        """
+        _require_numpy('ColorCorrectionInverse.apply')
+
+        pixels, out = _check_pixels(pixels, out)
+        dtype = _compute_dtype(pixels, dtype)
+        slope, offset, power, sat = [
+            param[0]
+            for param in _value_arrays([self._inverse_values], dtype)
+        ]
+
+        if dtype == pixels.dtype:
+            return _evaluate_inverse(
+                pixels, slope, offset, power, sat, out, self.clamp
+            )
+
+        work = pixels.astype(dtype)
+        out[...] = _evaluate_inverse(
+            work, slope, offset, power, sat, work, self.clamp
+        )
+        return out
+
+# ==============================================================================
 
-class MediaRef(AscXMLBase):
-    """A directory of files or a single file used for grade reference
+
+class ColorCorrectionPlan(object):
+    """A ColorCorrection compiled into the array operations it needs
 
     Description
     ~~~~~~~~~~~
 
-    :class:`MediaRef` is a container for an image path that should be
-    referenced in regards to the color correction being performed. What that
-    reference means must be further clarified, either through communication or
-    Description fields.
+    Evaluating the ASC CDL takes up to ten array operations, but many
+    corrections leave parts of it at identity. A plan is built for one set
+    of values in one dtype, and only runs the operations those values need:
+
+    * Slope of 1.0 and Offset of 0.0 are skipped.
+    * Power of 1.0 is skipped, a Power of 2.0 is a square and 0.5 a square
+      root.
+    * Saturation of 1.0 is skipped, along with the clamp after it, since
+      values are already inside of 0.0 - 1.0.
+    * Slope and Offset that are equal across R, G and B are folded into a
+      single scalar.
+    * Power that is equal across R, G and B is raised as a scalar.
+      Otherwise each channel is raised to its own scalar power in place,
+      which is cheaper than broadcasting a power per channel, and lets
+      channels left at 1.0 be skipped.
+
+    The clamp after Slope and Offset is always needed for the first
+    correction. Get a plan from :class:`ColorCorrection` ``compile()`` .
+
+    Plans are built for one of the clamping policies in ``CLAMP_MODES``.
+    Plans that don't clamp leave out both clamps, and raise negative values
+    to their power in place with the help of a mask of the negative values,
+    either leaving them as they are or mirroring the power around 0.0.
+
+    Plans for a chain of corrections, which are evaluated one after another,
+    come from :func:`compile_chain` and share the stages of each
+    correction's own plan. Every correction after the first gets input
+    that's already inside of 0.0 - 1.0, so corrections after the first skip
+    their first clamp when they have no Slope or Offset, and are left out
+    entirely if they're identity.
 
-    Requires a ``ref_uri`` and an optional ``parent`` to instantiate.
+    **Attributes:**
 
-    An XML URI is usually a filepath to a directory or file, sometimes
-    proceeded by a protocol (such as ``http://``). **Note that many of the**
-    **functions and methods described below do not function properly when**
-    **given a URI with a protocol in front.**
+        clamp : (str)
+            The clamping policy of the plan, one of ``CLAMP_MODES``.
 
-    The parent of a :class:`MediaRef` should typically be a
-    :class:`ColorDecision` , and in fact the CDL specification states that
-    no other container is allowed to contain a :class:`MediaRef`. That
-    restriction is not enforced here, but writers for ``.ccc`` and ``.cc`` will
-    only pass through :class:`MediaRef` as Description entries.
+        dtype : (numpy.dtype)
+            The dtype the plan does its math in.
 
-    **Class Attributes:**
+        steps : (str, )
+            The names of the operations the plan runs, in order. One of
+            'slope', 'offset', 'clamp', 'power', 'square', 'sqrt' or
+            'saturation'. Power operations on a single channel are followed
+            by the channel index, such as 'power[1]'.
 
-        members : {str: [:class:`MediaRef`]}
-            All instances of :class:`MediaRef` are added to this class level
-            members dictionary, with the key being the full reference URI.
-            Since it's possible that multiple :class:`MediaRef` point to the
-            same reference URI, the value returned is a list of
-            :class:`MediaRef` that all have a value of that same URI.
+    **Public Methods:**
 
-            When you change a single :class:`MediaRef` ref attribute, it
-            removes itself from the old key's list, and adds itself to the
-            new key's list. The old key is removed from the dictionary if this
-            :class:`MediaRef` was the last member.
+        apply()
+            Evaluates the plan on a NumPy array of RGB pixels.
 
-    **Attributes:**
+    """
+    def __init__(self, values, dtype, clamp='asc'):
+        """Inits an instance of ColorCorrectionPlan
 
-        directory : (str)
-            The directory portion of the URI, without the protocol or filename.
+        **Args:**
+            values : (tuple)
+                Grade values, as returned by :class:`ColorCorrection`
+                ``_values()``.
 
-        element : (<xml.etree.ElementTree.Element>)
-            etree style Element representing the node. Inherited from
-            :class:`AscXMLBase` .
+            dtype : (numpy.dtype)
+                A floating point dtype to do the math in.
 
-        exists : (bool)
-            True if the path is present in the file system.
+            clamp='asc' : (str)
+                The clamping policy, one of ``CLAMP_MODES``.
 
-        filename : (str)
-            The filename portion of the URI, without any protocol or directory.
+        **Raises:**
+            TypeError:
+                If ``dtype`` is not floating point.
 
-        is_abs : (bool)
-            True if ``directory`` is an absolute reference.
+            ValueError:
+                If ``clamp`` is not one of ``CLAMP_MODES``.
 
-        is_dir : (bool)
-            True if ``path`` points to a directory with no filename portion.
+        """
+        slope, offset, power, sat = values
+        self.dtype = _compute_dtype(None, dtype)
+        self.clamp = _clamp_mode(clamp)
+        clamped = self.clamp == 'asc'
+
+        # Each entry is a ufunc, the operands that follow the pixels, and
+        # the channel it works on, or None for all of them.
+        ops = []
+        steps = []
+        if slope != (1.0, 1.0, 1.0):
+            ops.append((np.multiply, (_fold(slope, self.dtype), ), None))
+            steps.append('slope')
+        if offset != (0.0, 0.0, 0.0):
+            ops.append((np.add, (_fold(offset, self.dtype), ), None))
+            steps.append('offset')
+        if clamped:
+            ops.append((np.clip, (0.0, 1.0), None))
+            steps.append('clamp')
+
+        if power[0] == power[1] == power[2]:
+            channels = [(power[0], None, '')]
+        else:
+            channels = [
+                (value, channel, '[{0}]'.format(channel))
+                for channel, value in enumerate(power)
+            ]
+        for value, channel, suffix in channels:
+            if value == 1.0:
+                continue
+            elif value == 2.0:
+                func, operands, step = np.square, (), 'square'
+            elif value == 0.5:
+                func, operands, step = np.sqrt, (), 'sqrt'
+            else:
+                func, operands, step = (
+                    np.power, (self.dtype.type(value), ), 'power'
+                )
+            if not clamped:
+                func, operands = (
+                    _signed_power, (func, operands, self.clamp == 'mirror')
+                )
+            ops.append((func, operands, channel))
+            steps.append(step + suffix)
+
+        sat = None if sat == 1.0 else self.dtype.type(sat)
+        if sat is not None:
+            steps.append('saturation')
+            if clamped:
+                steps.append('clamp')
+
+        # Each stage is the ops of one correction, followed by its
+        # saturation or None, and its steps. The head stages run when this
+        # plan comes first, the tail stages when it follows another plan.
+        self._head = [(ops, sat, steps)]
+        if clamped and slope == (1.0, 1.0, 1.0) and \
+                offset == (0.0, 0.0, 0.0):
+            # Input is already clamped, so only power and sat are left.
+            self._tail = [(ops[1:], sat, steps[1:])]
+        else:
+            self._tail = list(self._head)
+        if not self._tail[0][0] and sat is None:
+            self._tail = []
 
-        is_seq : (bool)
-            True if ``path`` points to an image sequence or a directory of
-            image sequences. Image sequences are determined by files ending
-            in a dot or underscore, followed by an integer, followed by the
-            file extension. If the filename reference given already has pound
-            padding or %d indication padding, this will also return true.
+        self.steps = tuple(steps)
 
-            Valid image sequences:
-                - TCM100X_20140215.0001.exr
-                - Bobs Big_Score_2.jpg
-                - 2383-279873.67267_32t7634.63278623781638218763.exr
-                - 104fl.x034.######.dpx
-                - 104fl.x034_%06d.dpx
+    # Private Methods =========================================================
 
-        parent : (:class:`ColorDecision`)
-            The parent that contains this :class:`MediaRef` object. This should
-            normally be a :class:`ColorDecision` , but that is not enforced.
+    def _run(self, pixels, out, scratch=None):
+        """Runs the plan on pixels in the plan dtype, writing into out
 
-        path : (str)
-            The directory joined with the filename via os.path.join(), if
-            there is no filename, path is identical to ``directory``. If there
-            is no protocol, ``path`` is identicial to ``ref``.
+        **Args:**
+            pixels : (numpy.ndarray)
+                Array with RGB on the last axis, in the plan dtype.
 
-        protocol : (str)
-            The URI protocol section of the URI, if any. This is the section
-            that proceeds the '://' of any URI. If there is no '://' in the
-            given URI, this is empty.
+            out : (numpy.ndarray)
+                Array of the same shape and dtype as ``pixels`` to write
+                to. It may be ``pixels``.
 
-        ref : (str)
-            The full URI reference which includes the protocol, directory and
-            filename. If there is no protocol and no filename, ``ref`` is
-            identical to ``directory``.
+            scratch=None : (numpy.ndarray)
+                Scratch array for :func:`_luma` , only used if the plan
+                saturates.
 
-        seq : (str)
-            If ``is_seq`` finds that the filename or directory refers to one or
-            more image sequences, ``seq`` will return the first found sequence
-            in  the form of filename.####.ext (or filename_####.ext if the
-            sequence has an ``_`` in front of the frame numbers).
-            *Note that there may be more than one image sequence if* ``ref``
-            *points to a directory*. To get a list of all image sequences
-            found, use ``seqs``.
+        **Returns:**
+            (numpy.ndarray)
+                ``out``
 
-            Only if a reference was given to us already in the form of ``%d``
-            padding will ``seq`` and ``seqs`` return a sequence filename with
-            ``%d`` padding.
+        **Raises:**
+            N/A
 
-        seqs : [str]
-            Returns all found sequences in a list. If ``ref`` points to a
-            filename, this list will only contain one sequence. If ``ref``
-            points to a directory, all sequences found in that directory will
-            be in this list.
+        The first operation reads ``pixels`` and every one after it works
+        in place in ``out``, so no temporaries are made beyond ``scratch``
+        and the masks of plans that don't clamp. Single channel operations
+        and saturation only ever read ``out``, so ``pixels`` is copied over
+        first if the plan starts with one, or if it has nothing to do at
+        all. Every pixel goes through exactly the same operations no matter
+        how the array is split up, which keeps tiled and threaded results
+        bit identical.
+
+        """
+        clamped = self.clamp == 'asc'
+        source = pixels
+        for ops, sat, _ in self._head:
+            for func, operands, channel in ops:
+                if channel is None:
+                    func(source, *operands, out=out)
+                else:
+                    if source is not out:
+                        out[...] = source
+                    func(out[..., channel], *operands, out=out[..., channel])
+                source = out
+            if sat is not None:
+                if source is not out:
+                    out[...] = source
+                    source = out
+                _saturate(out, sat, scratch, clamped)
+        if source is not out:
+            out[...] = source
+
+        return out
+
+    # Public Methods ==========================================================
+
+    def apply(self, pixels, out=None):
+        """Evaluates the plan on an array of RGB pixels
+
+        **Args:**
+            pixels : (numpy.ndarray)
+                A floating point array whose last axis holds R, G and B. If
+                it isn't in the plan dtype, it's converted a band at a time
+                as in :func:`apply_cdl` .
+
+            out=None : (numpy.ndarray)
+                Array to write results to, which may be ``pixels`` itself.
+
+        **Returns:**
+            (numpy.ndarray)
+                The graded pixels.
+
+        **Raises:**
+            See :func:`apply_cdl`
+
+        """
+        pixels, out = _check_pixels(pixels, out)
+        if pixels.dtype == self.dtype:
+            return self._run(pixels, out)
+
+        buffers = {}
+        for band, band_out in _row_bands(pixels, out, TILE_MEMORY):
+            _evaluate_band((band, band_out, self), buffers)
+        return out
+
+# ==============================================================================
+
+
+class ColorDecision(AscXMLBase):  # pylint: disable=R0903
+    """Contains a media ref and a ColorCorrection or reference to CC.
+
+    Description
+    ~~~~~~~~~~~
+
+    This class is a stub for now, with no functionality.
+
+    **Attributes:**
+
+        element : (<xml.etree.ElementTree.Element>)
+            etree style Element representing the node. Inherited from
+            :class:`AscXMLBase` .
 
         xml : (str)
             A nicely formatted XML string representing the node. Inherited from
@@ -1040,1185 +1766,6498 @@ class MediaRef(AscXMLBase):
             from :class:`AscXMLBase` .
 
     """
+    def __init__(self):
+        """Inits an instance of ColorDecision"""
+        super(ColorDecision, self).__init__()
 
-    members = {}
-
-    def __init__(self, ref_uri, parent=None):
-        super(MediaRef, self).__init__()
-        self._protocol, self._dir, self._filename = self._split_uri(ref_uri)
-        self.parent = parent
+# ==============================================================================
 
-        # If we're a directory, we can contain one or more sequences, but we
-        # won't do the work to figure that out until is_seq, seq, and seqs are
-        # called for.
-        self._is_seq = None
-        self._sequences = None
 
-        # Add this instance to the member dictionary.
-        self._change_membership()
+class ColorNodeBase(AscDescBase, AscXMLBase):  # pylint: disable=R0903
+    """Base class for SOP and SAT nodes.
 
-    # Properties ==============================================================
+    Description
+    ~~~~~~~~~~~
 
-    @property
-    def directory(self):
-        """Returns the directory the uri points to"""
-        return self._dir
+    This class is meant only to be inherited by :class:`SopNode` and
+    :class:`SatNode` and should not be used outside of those classes.
 
-    @directory.setter
-    def directory(self, value):
-        """Checks directory for type and resets cached properties"""
-        if type(value) is str:
-            old_ref = self.ref
-            self._dir = value
-            self._change_membership(old_ref=old_ref)
-            self._reset_cached_properties()
-        else:
-            raise TypeError(
-                'Directory must be set with a string, not {type}'.format(
-                    type=type(value)
-                )
-            )
+    It inherits from both :class:`AscDescBase` and :class:`AscXMLBase` giving
+    the child classes both ``desc`` and ``xml`` related functionality.
 
-    @property
-    def exists(self):
-        """Convenience property for os.path.exists"""
-        return os.path.exists(self.path)
+    This class is also home to a private function which helps :class:`SopNode`
+    and :class:`SatNode` perform type and value checks on incoming values.
 
-    @property
-    def filename(self):
-        """Returns the filename the uri points to, if any"""
-        return self._filename
+    **Attributes:**
 
-    @filename.setter
-    def filename(self, value):
-        """Checks filename for type and resets cached properties"""
-        if type(value) is str:
-            old_ref = self.ref
-            self._filename = value
-            self._change_membership(old_ref=old_ref)
-            self._reset_cached_properties()
-        else:
-            raise TypeError(
-                'Filename must be set with a string, not {type}'.format(
-                    type=type(value)
-                )
-            )
+        desc : [str]
+            Since all Asc nodes which can contain a single description, can
+            actually contain an infinite number of descriptions, the desc
+            attribute is a list, allowing us to store every single description
+            found during parsing.
 
-    @property
-    def is_abs(self):
-        """Returns True if path is an absolute path"""
-        return os.path.abspath(self.path)
+            Setting desc directly will cause the value given to append to the
+            end of the list, but desc can also be replaced by passing it a list
+            or tuple. Desc can be emptied by passing it None, [] or ().
 
-    @property
-    def is_dir(self):
-        """Returns True if path points to a directory"""
-        return os.path.isdir(self.path)
+            Inherited from :class:`AscDescBase` .
 
-    @property
-    def is_seq(self):
-        """Returns True if path is to an image sequence"""
-        if self._is_seq is None:
-            self._get_sequences()
-        return self._is_seq
+        element : (<xml.etree.ElementTree.Element>)
+            etree style Element representing the node. Inherited from
+            :class:`AscXMLBase` .
 
-    @property
-    def path(self):
-        """Returns the path without any uri protocol"""
-        return os.path.join(self._dir, self._filename)
+        xml : (str)
+            A nicely formatted XML string representing the node. Inherited from
+            :class:`AscXMLBase`.
 
-    @property
-    def protocol(self):
-        """Returns the protocol of the uri, if any"""
-        return self._protocol
-
-    @protocol.setter
-    def protocol(self, value):
-        """Checks protocol for type and resets cached properties"""
-        if type(value) is str:
-            # If :// was appended we'll remove it.
-            if value.endswith('://'):
-                value = value[:-3]
-            old_ref = self.ref
-            self._protocol = value
-            self._change_membership(old_ref=old_ref)
-            # We probably don't need to reset the cached properties, but we
-            # will just to be safe.
-            self._reset_cached_properties()
-        else:
-            raise TypeError(
-                'Protocol must be set with a string, not {type}'.format(
-                    type=type(value)
-                )
-            )
-
-    @property
-    def ref(self):
-        """Returns the reference uri"""
-        if self._protocol:
-            prefix = "{proto}://".format(proto=self._protocol)
-        else:
-            prefix = ''
-        return prefix + self.path
-
-    @ref.setter
-    def ref(self, uri):
-        """Sets the reference uri and resets all cached properties"""
-        if type(uri) is str:
-            old_ref = self.ref
-            self._protocol, self._dir, self._filename = self._split_uri(uri)
-            self._change_membership(old_ref=old_ref)
-            self._reset_cached_properties()
-        else:
-            raise TypeError(
-                'URI must be set with a string, not {type}'.format(
-                    type=type(uri)
-                )
-            )
+        xml_root : (str)
+            A nicely formatted XML, ready to write to file string representing
+            the node. Formatted as an XML root, it includes the xml version and
+            encoding tags on the first line. Inherited from
+            :class:`AscXMLBase`.
 
-    @property
-    def seq(self):
-        """Returns first found sequence with frames as # padding"""
-        if self._is_seq is None:
-            self._get_sequences()
-        elif not self._is_seq:
-            return None
+    **Public Methods:**
 
-        return self._sequences[0]
+        build_element()
+            Builds an ElementTree XML Element for this node and all nodes it
+            contains. ``element``, ``xml``, and ``xml_root`` attributes use
+            this to build the XML. This function is identical to calling the
+            ``element`` attribute. Overrides inherited placeholder method
+            from :class:`AscXMLBase` .
 
-    @property
-    def seqs(self):
-        """Returns all found sequences with frames as # padding"""
-        if self._is_seq is None:
-            self._get_sequences()
-        elif not self._is_seq:
-            return []
+        parse_xml_descs()
+            Parses an ElementTree Element for any Description tags and appends
+            any text they contain to the ``desc``. Inherited from
+            :class:`AscDescBase`
 
-        return self._sequences
+    """
+    def __init__(self):
+        super(ColorNodeBase, self).__init__()
 
     # Private Methods =========================================================
 
-    def _change_membership(self, old_ref=None):
-        """Change which ref uri this instance is under in the class dict.
-
-        We remove ourselves from the list returned by the key of old_ref
-        in the member dictionary, then append ourselves to the list of the
-        new ref key. If the ref isn't already in the dictionary, we'll be
-        creating a new list with ourselves as the only member.
+    @staticmethod
+    def _check_single_value(value, name, negative_allow=False):
+        """Checks given value for legitimacy.
 
         **Args:**
+            value : (str, float, int)
+                Any numeric value to be checked.
 
-            old_ref=None : (str)
-                The previous uri reference of the instance. We'll look in the
-                class level member dictionary for this uri as a key, then
-                remove ourselves. If old_ref isn't a key, or we're not in the
-                list it returns, we'll just move on.
-
-        Returns:
-            None
+            name : (str)
+                The type of value being checked: slope, offset, etc.
 
-        Raises:
-            N/A
+            negative_allow=False : (bool)
+                If false, do not allow negative values.
 
-        """
-        if old_ref:
-            try:
-                MediaRef.members[old_ref].remove(self)
-            except (KeyError, ValueError):
-                # Either the key doesn't exist or we're not in the list.
-                # Either way, it doesn't matter to us.
-                pass
-            else:
-                # Now that we're removed, we need to see if the list is empty,
-                # and if so, delete the key ref.
-                if not MediaRef.members[old_ref]:
-                    del MediaRef.members[old_ref]
-        try:
-            MediaRef.members[self.ref].append(self)
-        except KeyError:
-            MediaRef.members[self.ref] = [self]
+        **Returns:**
+            (float)
+                If value passes all tests, returns value as float.
 
-    # =========================================================================
+        **Raises:**
+            TypeError:
+                If value given is not a number.
 
-    def _get_sequences(self):
-        """Determines if the media ref is pointing to an image sequence"""
-        re_exp = r'(^[ \w_.-]+[_.])([0-9]+)(\.[a-zA-Z0-9]{3}$)'
-        re_exp_percent = r'(^[ \w_.-]+[_.])(%[0-9]+d)(\.[a-zA-Z0-9]{3}$)'
-        match = re.compile(re_exp)
+            ValueError:
+                If negative is False, raised if value given is negative.
 
-        if self.is_dir and not self.exists:
-            # It doesn't exist, so we can't tell if it's a sequence
-            if HALT_ON_ERROR:
-                raise ValueError(
-                    'Cannot determine if non-existent directory {dir} '
-                    'contains an image sequence.'.format(
-                        dir=self.path,
+        """
+        # If given as a string, the string must be convertible to a float
+        if type(value) == str:
+            try:
+                value = float(value)
+            except ValueError:
+                raise TypeError(
+                    'Error setting {name} with value: "{value}". '
+                    'Value is not a number.'.format(
+                        name=name,
+                        value=value
                     )
                 )
-            else:
-                self._is_seq = False
-                self._sequences = []
-        elif self.is_dir and self.exists:
-            file_list = os.listdir(self.path)
-            files = [f for f in file_list if match.search(f)]
-            if not files:
-                self._is_seq = False
-                self._sequences = []
-            else:
-                seqs = []
-                for image in files:
-                    found = match.search(image)
-                    padding = '#' * len(found.group(2))
-                    filename = found.group(1) + padding + found.group(3)
-                    if filename not in seqs:
-                        seqs.append(filename)
-                self._is_seq = True
-                self._sequences = seqs
-        else:
-            found = match.search(self.filename)
-            if found:
-                padding = '#' * len(found.group(2))
-                self._is_seq = True
-                self._sequences = [found.group(1) + padding + found.group(3)]
-            else:
-                # We'll finally check for %d style padding
-                match = re.compile(re_exp_percent)
-                found = match.search(self.filename)
-                if found:
-                    self._is_seq = True
-                    self._sequences = [self.filename]
+        # If given as a single number, that number must be positive
+        if type(value) in [float, int] and not negative_allow:
+            if value < 0:
+                if HALT_ON_ERROR:
+                    raise ValueError(
+                        'Error setting {name} with value: "{value}". '
+                        'Values must not be negative'.format(
+                            name=name,
+                            value=value
+                        )
+                    )
                 else:
-                    self._is_seq = False
-                    self._sequences = []
+                    value = 0
 
-    # =========================================================================
+        return float(value)
 
-    def _reset_cached_properties(self):
-        """Resets cached attributes back to init values"""
-        self._is_seq = None
-        self._sequences = None
+# ==============================================================================
 
-    # =========================================================================
 
-    @staticmethod
-    def _split_uri(uri):
-        """Splits uri into protocol, base and filename"""
-        if ':' in uri:
-            protocol = uri.split('://')[0]
-            uri = uri.split('://')[1]
-        else:
-            protocol = ''
+class CorrectionBatch(object):
+    """The grade values of many corrections held as columns
 
-        directory = os.path.split(uri)[0]
-        ref_file = os.path.split(uri)[1]
+    Description
+    ~~~~~~~~~~~
 
-        return protocol, directory, ref_file
+    Holds the slope, offset, power and saturation of many corrections as a
+    single NumPy array with a row per correction, alongside their ids and
+    optional descriptions, without creating a :class:`ColorCorrection` for
+    each. Batches are meant for generated grades, such as wedges from
+    :func:`wedge_cdl` , which can number in the hundreds per shot. Whole
+    batches are written straight to a CCC with ``write_ccc()``, and
+    turned into registered corrections only when they're needed.
 
-# ==============================================================================
+    Values are checked the way :class:`ColorCorrection` checks them, a
+    column at a time. Negative slope, power and saturation are set to 0.0,
+    or raise if ``HALT_ON_ERROR`` is set.
 
+    A batch with a row per frame can be given to the evaluation functions
+    in place of a list of corrections, such as the per frame grades of a
+    dissolve from :func:`blend_cdls` , and each frame is graded with its
+    own row.
 
-class SatNode(ColorNodeBase):
-    """Color node that contains saturation data.
+    **Attributes:**
 
-    **Class Attributes:**
+        descs : [str|None]
+            A description for each correction, or None.
 
-        element_names : [str]
-            Contains a list of XML Elements that refer to this class for use
-            in parsing XML files.
+        ids : [str]
+            The sanitized id of each correction.
 
-    **Attributes:**
+        offset : (numpy.ndarray)
+            A view of the (n, 3) offset columns of ``values``.
 
-        desc : [str]
-            Since all Asc nodes which can contain a single description, can
-            actually contain an infinite number of descriptions, the desc
-            attribute is a list, allowing us to store every single description
-            found during parsing.
+        power : (numpy.ndarray)
+            A view of the (n, 3) power columns of ``values``.
 
-            Setting desc directly will cause the value given to append to the
-            end of the list, but desc can also be replaced by passing it a list
-            or tuple. Desc can be emptied by passing it None, [] or ().
+        sat : (numpy.ndarray)
+            A view of the (n, ) saturation column of ``values``.
 
-            Inherited from :class:`AscDescBase` .
+        slope : (numpy.ndarray)
+            A view of the (n, 3) slope columns of ``values``.
 
-        element : (<xml.etree.ElementTree.Element>)
-            etree style Element representing the node. Inherited from
-            :class:`AscXMLBase` .
+        values : (numpy.ndarray)
+            A float64 array of shape (n, 10), holding the red, green and
+            blue slope, offset and power, then saturation, of each
+            correction.
 
-        parent : ( :class:`ColorCorrection` )
-            The parent :class:`ColorCorrection` instance that created this
-            instance.
+    **Public Methods:**
 
-        sat : (float)
-            The saturation value (to be applied with Rec 709 coefficients) is
-            stored here. Saturation is the last operation to be applied when
-            applying a CDL.
+        compile()
+            Returns the cached :class:`ColorCorrectionPlan` of a row.
 
-            sat can be set with a float, int or numeric string.
+        corrections()
+            Creates a :class:`ColorCorrection` for each row.
 
-        xml : (str)
-            A nicely formatted XML string representing the node. Inherited from
-            :class:`AscXMLBase`.
+        from_corrections()
+            Class method that builds a batch from existing corrections.
 
-        xml_root : (str)
-            A nicely formatted XML, ready to write to file string representing
-            the node. Formatted as an XML root, it includes the xml version and
-            encoding tags on the first line. Inherited from
-            :class:`AscXMLBase`.
+        from_lgg()
+            Class method that builds a batch from lift, gamma and gain.
 
-    **Public Methods:**
+        lgg()
+            Returns the lift, gamma and gain of every row.
 
-        build_element()
-            Builds an ElementTree XML Element for this node and all nodes it
-            contains. ``element``, ``xml``, and ``xml_root`` attributes use
-            this to build the XML. This function is identical to calling the
-            ``element`` attribute. Overrides inherited placeholder method
-            from :class:`AscXMLBase` .
-
-        parse_xml_descs()
-            Parses an ElementTree Element for any Description tags and appends
-            any text they contain to the ``desc``. Inherited from
-            :class:`AscDescBase`
+        write_ccc()
+            Streams the batch to a ColorCorrectionCollection file.
 
     """
+    def __init__(self, ids, values, descs=None):
+        """Inits an instance of CorrectionBatch
 
-    # XML Fields for SopNodes can be one of these names:
-    element_names = ['ASC_SAT', 'SATNode', 'SatNode']
+        **Args:**
+            ids : [str]
+                An id for each correction. They're sanitized like the ids
+                of :class:`ColorCorrection` .
 
-    def __init__(self, parent):
-        super(SatNode, self).__init__()
+            values : (numpy.ndarray)
+                Anything NumPy can turn into an array of shape (n, 10), in
+                the order of the ``values`` attribute.
 
-        self._parent = parent
-        self._sat = 1.0
+            descs=None : [str|None]
+                A description for each correction.
 
-    # Properties ==============================================================
+        **Raises:**
+            ImportError:
+                If NumPy is not installed.
 
-    @property
-    def parent(self):
-        """Returns which :class:`ColorCorrection` created this SatNode"""
-        return self._parent
+            ValueError:
+                If ``values`` has the wrong shape, if ``ids`` or ``descs``
+                don't have an entry per row, if any id is repeated, or if
+                a slope, power or saturation is negative and
+                ``HALT_ON_ERROR`` is set.
 
-    @property
-    def sat(self):
-        """Returns the protected sat attribute"""
-        return self._sat
+        """
+        _require_numpy('CorrectionBatch')
 
-    @sat.setter
-    def sat(self, value):
-        """Runs checks and converts saturation value before setting"""
-        # If given as a string, the string must be convertible to a float
-        if type(value) in [float, int, str]:
-            try:
-                value = self._check_single_value(value, 'saturation')
-            except (TypeError, ValueError):
-                raise
-            else:
-                self._sat = value
-        else:
-            raise TypeError(
-                'Saturation cannot be set directly with objects of type: '
-                '"{type}". Value given: "{value}".'.format(
-                    type=type(value),
-                    value=value,
+        values = np.array(values, dtype=np.float64, ndmin=2)
+        if values.ndim != 2 or values.shape[1] != 10:
+            raise ValueError(
+                'Batch values must have a shape of (n, 10), not '
+                '{shape}.'.format(shape=values.shape)
+            )
+        ids = sanitize_ids(list(ids))
+        if descs is None:
+            descs = [None] * len(ids)
+        descs = list(descs)
+        if not len(ids) == len(descs) == len(values):
+            raise ValueError(
+                'A batch of {count} corrections needs as many ids and '
+                'descriptions, but got {ids} ids and {descs} '
+                'descriptions.'.format(
+                    count=len(values),
+                    ids=len(ids),
+                    descs=len(descs)
+                )
+            )
+        if len(set(ids)) != len(ids):
+            raise ValueError(
+                'Batch ids must be unique, but these repeat: {ids}'.format(
+                    ids=', '.join(
+                        sorted(set(i for i in ids if ids.count(i) > 1))
+                    )
                 )
             )
 
-    # Public Methods ==========================================================
-
-    def build_element(self):
-        """Builds an ElementTree XML Element representing this SatNode"""
-        sat = ElementTree.Element('SATNode')
-        for description in self.desc:
-            desc = ElementTree.SubElement(sat, 'Description')
-            desc.text = description
-        op_node = ElementTree.SubElement(sat, 'Saturation')
-        op_node.text = _de_exponent(self.sat)
-        return sat
+        # Slope, power and sat, as the setters of ColorCorrection see them.
+        positive = np.r_[0:3, 6:10]
+        if (values[:, positive] < 0.0).any():
+            if HALT_ON_ERROR:
+                raise ValueError(
+                    'Batch slope, power and saturation values must not be '
+                    'negative.'
+                )
+            values[:, positive] = np.maximum(values[:, positive], 0.0)
 
-# ==============================================================================
+        self.ids = ids
+        self.descs = descs
+        self.values = values
 
+        # Plans compiled by compile, keyed by row, dtype and clamping
+        # policy, along with the values they were compiled from.
+        self._plans = {}
 
-class SopNode(ColorNodeBase):
-    """Color node that contains slope, offset and power data.
+    # Special Methods =========================================================
 
-    Description
-    ~~~~~~~~~~~
+    def __len__(self):
+        """Returns the number of grades in the batch"""
+        return len(self.values)
 
-    Slope, offset and saturation are stored internally as lists, but always
-    returned as tuples to prevent index assignment from being successful. This
-    protects the user from inadvertently setting a single value in the list
-    to be a non-valid value, which might result in values not being floats or
-    even numbers at all.
+    # Private Methods =========================================================
 
-    **Class Attributes:**
+    def _values(self, index):
+        """Returns the values of a row as ColorCorrection._values does"""
+        row = tuple(self.values[index].tolist())
+        return (row[0:3], row[3:6], row[6:9], row[9])
 
-        element_names : [str]
-            Contains a list of XML Elements that refer to this class for use
-            in parsing XML files.
+    # Properties ==============================================================
 
-    **Attributes:**
+    @property
+    def offset(self):
+        """A view of the offset columns of values"""
+        return self.values[:, 3:6]
 
-        desc : [str]
-            Since all Asc nodes which can contain a single description, can
-            actually contain an infinite number of descriptions, the desc
-            attribute is a list, allowing us to store every single description
-            found during parsing.
+    @property
+    def power(self):
+        """A view of the power columns of values"""
+        return self.values[:, 6:9]
 
-            Setting desc directly will cause the value given to append to the
-            end of the list, but desc can also be replaced by passing it a list
-            or tuple. Desc can be emptied by passing it None, [] or ().
+    @property
+    def sat(self):
+        """A view of the saturation column of values"""
+        return self.values[:, 9]
 
-            Inherited from :class:`AscDescBase` .
+    @property
+    def slope(self):
+        """A view of the slope columns of values"""
+        return self.values[:, 0:3]
 
-        element : (<xml.etree.ElementTree.Element>)
-            etree style Element representing the node. Inherited from
-            :class:`AscXMLBase` .
+    # Public Methods ==========================================================
 
-        parent : ( :class:`ColorCorrection` )
-            The parent :class:`ColorCorrection` instance that created this
-            instance.
+    @classmethod
+    def from_corrections(cls, cdls):
+        """Builds a batch holding the values of existing corrections
 
-        slope : (float, float, float)
-            An rgb tuple representing the slope, which changes the slope of the
-            input without shifting the black level established by the offset.
-            These values must be positive. If you set this attribute with a
-            single value, it will be copied over all 3 colors. Any single value
-            given can be a float, int or numeric string.
+        **Args:**
+            cdls : [ :class:`ColorCorrection` ]
+                The corrections, which keep their ids and first
+                descriptions.
 
-            default: (1.0, 1.0, 1.0)
+        **Returns:**
+            ( :class:`CorrectionBatch` )
+                A new batch with a row per correction.
 
-        offset : (float, float, float)
-            An rgb tuple representing the offset, which raises or lowers the
-            input brightness while holding the slope constant. If you set this
-            attribute with a single value, it will be copied over all 3 colors.
-            Any single value given can be a float, int or numeric string.
+        **Raises:**
+            ImportError:
+                If NumPy is not installed.
 
-            default: (0.0, 0.0, 0.0)
+        """
+        cdls = list(cdls)
+        values = []
+        for cdl in cdls:
+            slope, offset, power, sat = cdl._values()  # pylint: disable=W0212
+            values.append(slope + offset + power + (sat, ))
+        return cls(
+            [cdl.id for cdl in cdls],
+            np.array(values, dtype=np.float64).reshape(-1, 10),
+            [cdl.desc[0] if cdl.desc else None for cdl in cdls]
+        )
 
-        power : (float, float, float)
-            An rgb tuple representing the power, which is the only function
-            that changes the response curve of the function. Note that this has
-            the opposite response to adjustments than a traditional gamma
-            operator. These values must be positive. If you set this attribute
-            with a single value, it will be copied over all 3 colors. Any
-            single value given can be a float, int or numeric string.
+    # =========================================================================
 
-            default: (1.0, 1.0, 1.0)
+    @classmethod
+    def from_lgg(cls, ids, lift, gamma, gain, sat=None, descs=None):
+        """Builds a batch from the lift, gamma and gain of each correction
 
-        xml : (str)
-            A nicely formatted XML string representing the node. Inherited from
-            :class:`AscXMLBase`.
+        **Args:**
+            ids : [str]
+                An id for each correction.
 
-        xml_root : (str)
-            A nicely formatted XML, ready to write to file string representing
-            the node. Formatted as an XML root, it includes the xml version and
-            encoding tags on the first line. Inherited from
-            :class:`AscXMLBase`.
+            lift : (numpy.ndarray)
+            gamma : (numpy.ndarray)
+            gain : (numpy.ndarray)
+            sat=None : (numpy.ndarray)
+                The grades to convert, see :func:`lgg_to_cdl` .
 
-    **Public Methods:**
+            descs=None : [str|None]
+                A description for each correction.
 
-        build_element()
-            Builds an ElementTree XML Element for this node and all nodes it
-            contains. ``element``, ``xml``, and ``xml_root`` attributes use
-            this to build the XML. This function is identical to calling the
-            ``element`` attribute. Overrides inherited placeholder method
-            from :class:`AscXMLBase` .
+        **Returns:**
+            ( :class:`CorrectionBatch` )
+                A new batch with a row per grade.
 
-        parse_xml_descs()
-            Parses an ElementTree Element for any Description tags and appends
-            any text they contain to the ``desc``. Inherited from
-            :class:`AscDescBase`
+        **Raises:**
+            ImportError:
+                If NumPy is not installed.
 
-    """
+            ValueError:
+                If the grades can't be converted, see :func:`lgg_to_cdl` ,
+                or the batch can't be built from them.
 
-    # XML Fields for SopNodes can be one of these names:
-    element_names = ['ASC_SOP', 'SOPNode', 'SopNode']
+        """
+        return cls(ids, lgg_to_cdl(lift, gamma, gain, sat), descs)
 
-    def __init__(self, parent):
-        super(SopNode, self).__init__()
+    # =========================================================================
 
-        self._parent = parent
+    def compile(self, index, dtype=None, clamp=None):
+        """Returns the cached evaluation plan of a row
 
-        self._slope = [1.0, 1.0, 1.0]
-        self._offset = [0.0, 0.0, 0.0]
-        self._power = [1.0, 1.0, 1.0]
+        **Args:**
+            index : (int)
+                The row to compile.
 
-    # Properties ==============================================================
+            dtype=None : (numpy.dtype)
+                The dtype the plan does its math in. Defaults to float64.
 
-    @property
-    def parent(self):
-        """Returns which :class:`ColorCorrection` created this SopNode"""
-        return self._parent
+            clamp=None : (str)
+                The clamping policy of the plan, one of ``CLAMP_MODES``.
+                Defaults to ``CLAMP``.
 
-    @property
-    def slope(self):
-        """Returns the slope as an tuple"""
-        return tuple(self._slope)
+        **Returns:**
+            ( :class:`ColorCorrectionPlan` )
+                The plan for the row's current values, see
+                :class:`ColorCorrection` ``compile()``.
 
-    @slope.setter
-    def slope(self, value):
-        """Runs tests and converts slope rgb values before setting"""
-        value = self._check_setter_value(value, 'slope')
-        self._slope = value
+        **Raises:**
+            ImportError:
+                If NumPy is not installed.
 
-    @property
-    def offset(self):
-        """Returns the offset as a tuple"""
-        return tuple(self._offset)
+            ValueError:
+                If ``clamp`` is not one of ``CLAMP_MODES``.
 
-    @offset.setter
-    def offset(self, value):
-        """Runs tests and converts offset rgb values before setting"""
-        value = self._check_setter_value(value, 'offset', True)
-        self._offset = value
+        Rows are compiled again whenever their values have changed since
+        they were last compiled.
 
-    @property
-    def power(self):
-        """Returns the power as a tuple"""
-        return tuple(self._power)
+        """
+        dtype = np.dtype(np.float64 if dtype is None else dtype)
+        clamp = _clamp_mode(clamp)
+        values = self._values(index)
 
-    @power.setter
-    def power(self, value):
-        """Runs tests and converts power rgb values before setting"""
-        value = self._check_setter_value(value, 'power')
-        self._power = value
+        cached = self._plans.get((index, dtype, clamp))
+        if cached and cached[0] == values:
+            return cached[1]
 
-    # Private Methods =========================================================
+        plan = ColorCorrectionPlan(values, dtype, clamp)
+        self._plans[(index, dtype, clamp)] = (values, plan)
 
-    def _check_rgb_values(self, values, name, negative_allow=False):
-        """Checks a list or tuple containing 3 values for legitimacy
+        return plan
 
-        **Args:**
-            value : [(str, float, int)]
-                A list of three numeric values to be checked.
+    # =========================================================================
 
-            name : (str)
-                The type of values being checked: slope, offset, etc.
+    def corrections(self, cdl_file=None):
+        """Creates and registers a ColorCorrection for each row
 
-            negative_allow=False : (bool)
-                If false, do not allow negative values.
+        **Args:**
+            cdl_file=None : (str)
+                File the corrections are said to come from. Defaults to a
+                cc file named after each id.
 
         **Returns:**
-            [float, float, float]
-                If all values pass all tests, returns values as a list of
-                floats.
+            [ :class:`ColorCorrection` ]
+                A correction per row, in order.
 
         **Raises:**
-            TypeError:
-                If a value given is not a number.
-
             ValueError:
-                If length of list or tuple is not 3 or if negative is False,
-                raised if value given is negative.
+                If an id is already taken by a registered correction.
 
         """
-        try:
-            assert len(values) == 3
-        except AssertionError:
-            raise ValueError(
-                'Error setting {name} with value: "{values}". '
-                '{name_upper} values given as a list or tuple must have 3 '
-                'elements, one for each color.'.format(
-                    name=name,
-                    name_upper=name.title(),
-                    values=values
-                )
+        cdls = []
+        rows = zip(self.ids, self.values.tolist(), self.descs)
+        for cc_id, row, desc in rows:
+            cdl = ColorCorrection(
+                cc_id,
+                cdl_file if cdl_file else '{id}.cc'.format(id=cc_id)
             )
+            cdl.slope = row[0:3]
+            cdl.offset = row[3:6]
+            cdl.power = row[6:9]
+            cdl.sat = row[9]
+            if desc:
+                cdl.desc = desc
+            cdls.append(cdl)
 
-        values = list(values)
+        return cdls
 
-        for i in xrange(len(values)):
-            try:
-                values[i] = self._check_single_value(
-                    values[i],
-                    name,
-                    negative_allow
-                )
-            except (TypeError, ValueError):
-                raise
+    # =========================================================================
 
-        return values
+    def lgg(self):
+        """Returns the lift, gamma and gain of every row
 
-    # =========================================================================
+        **Returns:**
+            (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+                The (n, 3) lift, gamma and gain, and (n, ) saturation, see
+                :func:`cdl_to_lgg` .
 
-    def _check_setter_value(self, value, name, negative_allow=False):
-        """Exception handling wrapper handling setting values
+        **Raises:**
+            N/A
 
-        Ties together _check_single_value and _check_rgb_values
+        """
+        return cdl_to_lgg(self.values)
 
-                    **Args:**
-            value : [(str, float, int)] or (str, float, int)
-                A list of three (or one) numeric values to be checked.
+    # =========================================================================
 
-            name : (str)
-                The type of values being checked: slope, offset, etc.
+    def write_ccc(self, path):
+        """Streams the batch to a ColorCorrectionCollection file
 
-            negative_allow=False : (bool)
-                If false, do not allow negative values.
+        **Args:**
+            path : (str)
+                The file to write.
 
         **Returns:**
-            [float, float, float]
-                If all values pass all tests, returns values as a list of
-                floats.
+            None
 
         **Raises:**
-            TypeError:
-                If a value given is not a number.
+            N/A
+
+        Corrections are formatted as text straight from ``values`` a block
+        of rows at a time, and laid out as :class:`ColorCorrection` lays out
+        its own XML, so no correction objects or XML trees are built.
+
+        """
+        with open(path, 'wb') as ccc_file:
+            ccc_file.write(enc(
+                '<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<ColorCorrectionCollection xmlns="urn:ASC:CDL:v1.01">\n'
+            ))
+            for start in range(0, len(self), _LUT_WRITE_ROWS):
+                stop = start + _LUT_WRITE_ROWS
+                text = []
+                for cc_id, row, desc in zip(
+                        self.ids[start:stop],
+                        self.values[start:stop].tolist(),
+                        self.descs[start:stop]
+                ):
+                    text.append(
+                        '    <ColorCorrection id={id}>\n'.format(
+                            id=quoteattr(cc_id)
+                        )
+                    )
+                    if desc:
+                        text.append(
+                            '        <Description>{desc}</Description>'
+                            '\n'.format(desc=escape(desc))
+                        )
+                    text.append(_CCC_ENTRY.format(
+                        slope=_serialize(tuple(row[0:3])),
+                        offset=_serialize(tuple(row[3:6])),
+                        power=_serialize(tuple(row[6:9])),
+                        sat=_serialize(row[9])
+                    ))
+                ccc_file.write(enc(''.join(text)))
+            ccc_file.write(enc('</ColorCorrectionCollection>\n'))
+
+# ==============================================================================
+
+
+class GradeIndex(object):
+    """A spatial index for finding the grades nearest to another
+
+    Description
+    ~~~~~~~~~~~
+
+    Indexes the slope, offset, power and saturation of many corrections as
+    points in 10 dimensions, laid out like :class:`CorrectionBatch`
+    ``values``, so the grades closest to a given one can be found without
+    comparing against every grade. Useful for finding existing looks to
+    reuse, or grades that sit far from all others.
+
+    The index is a KD-tree held in flat arrays. Each node is split at the
+    median of its widest dimension until it holds no more than
+    ``leaf_size`` grades, and keeps the bounds of the grades under it, so
+    whole branches are skipped when they can't hold a closer grade. Grades
+    within a leaf are compared a leaf at a time.
+
+    Distances are Euclidean, with every dimension scaled by its weight
+    first. Weights can favour the values that matter most to a look, such
+    as slope and offset over power, or leave saturation out with a weight
+    of 0.0.
+
+    **Attributes:**
+
+        ids : [str]
+            The id of each indexed grade.
+
+        values : (numpy.ndarray)
+            A float64 array of shape (n, 10) holding the indexed grades,
+            in the order of ``ids``.
+
+        weights : (numpy.ndarray)
+            The (10, ) scale of each dimension.
+
+    **Public Methods:**
+
+        nearest()
+            Returns the k grades nearest to a grade.
+
+        within()
+            Returns every grade within a distance of a grade.
+
+    """
+    def __init__(self, grades, weights=None, leaf_size=None):
+        """Inits an instance of GradeIndex
+
+        **Args:**
+            grades : ( :class:`CorrectionBatch` |[ :class:`ColorCorrection` ])
+                The grades to index, as a batch or any collection of
+                corrections.
+
+            weights=None : [float]
+                A scale for each of the 10 dimensions, or one for all of
+                them. Defaults to 1.0.
+
+            leaf_size=None : (int)
+                The most grades a leaf of the tree holds. Defaults to
+                ``INDEX_LEAF_SIZE``.
+
+        **Raises:**
+            ImportError:
+                If NumPy is not installed.
 
             ValueError:
-                If length of list or tuple is not 3 or if negative is False,
-                raised if value given is negative.
+                If there are no grades, a weight is negative or there
+                aren't 10 of them, or ``leaf_size`` is less than 1.
 
         """
-        if type(value) in [float, int, str]:
-            try:
-                value = self._check_single_value(value, name, negative_allow)
-            except (TypeError, ValueError):
-                raise
-            else:
-                set_value = [value] * 3
-        elif type(value) in [list, tuple]:
-            try:
-                value = self._check_rgb_values(value, name, negative_allow)
-            except (TypeError, ValueError):
-                raise
-            else:
-                set_value = value
-        else:
-            raise TypeError(
-                '{name} cannot be set directly with objects of type: "{type}".'
-                ' Value given: "{value}".'.format(
-                    name=name.title(),
-                    type=type(value),
-                    value=value,
-                )
+        _require_numpy('GradeIndex')
+
+        if not isinstance(grades, CorrectionBatch):
+            grades = CorrectionBatch.from_corrections(grades)
+        if not len(grades):
+            raise ValueError('GradeIndex needs at least one grade to index.')
+        weights = np.broadcast_to(
+            np.array(1.0 if weights is None else weights, dtype=np.float64),
+            (10, )
+        ).copy()
+        if (weights < 0.0).any():
+            raise ValueError('GradeIndex weights must not be negative.')
+        leaf_size = INDEX_LEAF_SIZE if leaf_size is None else int(leaf_size)
+        if leaf_size < 1:
+            raise ValueError(
+                'GradeIndex leaves must hold at least 1 grade, not '
+                '{size}.'.format(size=leaf_size)
             )
 
-        return set_value
+        self.ids = list(grades.ids)
+        self.values = grades.values.copy()
+        self.weights = weights
+
+        # Nodes are numbered breadth first, so each is built after its
+        # parent, and the two children of a node are numbered together.
+        # Grades are held a dimension per row while building, and reordered
+        # as nodes split, so every node is a contiguous slice.
+        points = (self.values * weights).T.copy()
+        order = np.arange(len(self.values))
+        ranges = [(0, len(order))]
+        children = []
+        lows = []
+        highs = []
+        node = 0
+        while node < len(ranges):
+            start, end = ranges[node]
+            node += 1
+            block = points[:, start:end]
+            low = block.min(axis=1)
+            high = block.max(axis=1)
+            lows.append(low)
+            highs.append(high)
+            if end - start <= leaf_size or (low == high).all():
+                children.append(-1)
+                continue
+            middle = (end - start) // 2
+            split = np.argpartition(block[np.argmax(high - low)], middle)
+            block[:] = np.take(block, split, axis=1)
+            order[start:end] = order[start:end][split]
+            children.append(len(ranges))
+            ranges.append((start, start + middle))
+            ranges.append((start + middle, end))
+
+        self._order = order
+        self._points = points.T.copy()
+        self._ranges = ranges
+        self._children = children
+        self._lows = np.array(lows)
+        self._highs = np.array(highs)
+
+    # Special Methods =========================================================
+
+    def __len__(self):
+        """Returns the number of grades in the index"""
+        return len(self.values)
+
+    # Private Methods =========================================================
+
+    def _bounds(self, node, point):
+        """Returns the least squared distances to the children of a node"""
+        child = self._children[node]
+        below = self._lows[child:child + 2] - point
+        above = point - self._highs[child:child + 2]
+        gaps = np.maximum(np.maximum(below, above), 0.0)
+        return child, np.einsum('ij,ij->i', gaps, gaps).tolist()
+
+    # =========================================================================
+
+    def _leaf(self, node, point):
+        """Returns the squared distances to the grades of a leaf"""
+        start, end = self._ranges[node]
+        offsets = self._points[start:end] - point
+        return start, np.einsum('ij,ij->i', offsets, offsets)
+
+    # =========================================================================
+
+    def _point(self, grade):
+        """Returns a grade as a weighted point"""
+        if isinstance(grade, ColorCorrection):
+            values = grade._values()  # pylint: disable=W0212
+            grade = values[0] + values[1] + values[2] + (values[3], )
+        point = np.array(grade, dtype=np.float64)
+        if point.shape != (10, ):
+            raise ValueError(
+                'Grades must be a ColorCorrection or 10 values, not '
+                'values of shape {shape}.'.format(shape=point.shape)
+            )
+        return point * self.weights
+
+    # =========================================================================
+
+    def _results(self, distances, positions):
+        """Sorts squared distances and tree positions into results"""
+        ranked = np.argsort(distances, kind='mergesort')
+        return (
+            np.sqrt(distances[ranked]),
+            self._order[positions[ranked]]
+        )
 
     # Public Methods ==========================================================
 
-    def build_element(self):
-        """Builds an ElementTree XML Element representing this SopNode"""
-        sop = ElementTree.Element('SOPNode')
-        fields = ['Slope', 'Offset', 'Power']
-        for description in self.desc:
-            desc = ElementTree.SubElement(sop, 'Description')
-            desc.text = description
-        for i, grade in enumerate([self.slope, self.offset, self.power]):
-            op_node = ElementTree.SubElement(sop, fields[i])
-            op_node.text = '{valueR} {valueG} {valueB}'.format(
-                valueR=_de_exponent(grade[0]),
-                valueG=_de_exponent(grade[1]),
-                valueB=_de_exponent(grade[2])
+    def nearest(self, grade, k=1):
+        """Returns the k grades nearest to a grade
+
+        **Args:**
+            grade : ( :class:`ColorCorrection` |[float])
+                The grade to search around, as a correction or 10 values
+                laid out like :class:`CorrectionBatch` ``values``.
+
+            k=1 : (int)
+                The number of grades to return.
+
+        **Returns:**
+            (numpy.ndarray, numpy.ndarray)
+                The weighted distances to the nearest grades, nearest
+                first, and the index of each in ``ids`` and ``values``.
+                Fewer than k grades come back if fewer are indexed.
+
+        **Raises:**
+            ValueError:
+                If ``grade`` isn't a correction or 10 values, or ``k`` is
+                less than 1.
+
+        Branches are visited nearest first, and searching stops once no
+        branch left can hold a grade closer than the kth found so far.
+
+        """
+        point = self._point(grade)
+        if k < 1:
+            raise ValueError(
+                'At least 1 nearest grade must be asked for, not '
+                '{k}.'.format(k=k)
             )
-        return sop
+        k = min(int(k), len(self))
+
+        found = np.empty(0)
+        positions = np.empty(0, dtype=np.intp)
+        furthest = np.inf
+        heap = [(0.0, 0)]
+        while heap:
+            bound, node = heapq.heappop(heap)
+            if bound > furthest:
+                break
+            if self._children[node] >= 0:
+                child, bounds = self._bounds(node, point)
+                for offset, child_bound in enumerate(bounds):
+                    if child_bound <= furthest:
+                        heapq.heappush(heap, (child_bound, child + offset))
+                continue
 
-# ==============================================================================
-# PRIVATE FUNCTIONS
-# ==============================================================================
+            start, distances = self._leaf(node, point)
+            found = np.concatenate([found, distances])
+            positions = np.concatenate([
+                positions, np.arange(start, start + len(distances))
+            ])
+            if len(found) > k:
+                keep = np.argpartition(found, k - 1)[:k]
+                found = found[keep]
+                positions = positions[keep]
+            if len(found) == k:
+                furthest = found.max()
 
+        return self._results(found, positions)
 
-def _de_exponent(notation):
-    """Translates scientific notation into float strings"""
-    notation = str(notation)
-    if 'e' not in notation:
-        return notation
+    # =========================================================================
 
-    notation = notation.split('e')
-    # Grab the exponent value
-    digits = int(notation[-1])
-    # Grab the value we'll be adding 0s to
-    value = notation[0]
+    def within(self, grade, radius):
+        """Returns every grade within a distance of a grade
 
-    if value.startswith('-'):
-        negative = '-'
-        value = value[1:]
-    else:
-        negative = ''
+        **Args:**
+            grade : ( :class:`ColorCorrection` |[float])
+                The grade to search around, as a correction or 10 values
+                laid out like :class:`CorrectionBatch` ``values``.
 
-    value = value.replace('.', '')
+            radius : (float)
+                The largest weighted distance to return grades at.
 
-    if digits < 0:
-        new_value = negative + '0.0' + '0' * (abs(digits) - 2) + value
-    else:
-        zeros = len(value)
-        new_value = negative + value + '0' * (abs(digits) - zeros) + '0.0'
-    return new_value
+        **Returns:**
+            (numpy.ndarray, numpy.ndarray)
+                The weighted distances to the grades within ``radius``,
+                nearest first, and the index of each in ``ids`` and
+                ``values``.
+
+        **Raises:**
+            ValueError:
+                If ``grade`` isn't a correction or 10 values.
+
+        """
+        point = self._point(grade)
+        limit = float(radius) ** 2
+
+        found = []
+        positions = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self._children[node] >= 0:
+                child, bounds = self._bounds(node, point)
+                for offset, child_bound in enumerate(bounds):
+                    if child_bound <= limit:
+                        stack.append(child + offset)
+                continue
+
+            start, distances = self._leaf(node, point)
+            close = np.flatnonzero(distances <= limit)
+            found.append(distances[close])
+            positions.append(close + start)
+
+        if not found:
+            return np.empty(0), np.empty(0, dtype=np.intp)
+        return self._results(np.concatenate(found), np.concatenate(positions))
 
 # ==============================================================================
 
 
-def _sanitize(name):
-    """Removes any characters in string name that aren't alnum or in '_.'"""
-    if not name:
-        # If not name, it's probably an empty string, but let's throw back
-        # exactly what we got.
-        return name
-    # Replace any spaces with underscores
-    name = name.replace(' ', '_')
-    # If we start our string with an underscore or period, remove it
-    if name[0] in '_.':
-        name = name[1:]
-    # a-z is all lowercase
-    # A-Z is all uppercase
-    # 0-9 is all digits
-    # \. is an escaped period
-    # _ is an underscore
-    # Put them together, negate them by leading with an ^
-    # and our compiler will mark every non alnum, non ., _ character
-    pattern = re.compile(r'[^a-zA-Z0-9\._]+')
-    # Then we sub them with nothing
-    fixed = pattern.sub('', name)
+class MediaRef(AscXMLBase):
+    """A directory of files or a single file used for grade reference
+
+    Description
+    ~~~~~~~~~~~
+
+    :class:`MediaRef` is a container for an image path that should be
+    referenced in regards to the color correction being performed. What that
+    reference means must be further clarified, either through communication or
+    Description fields.
+
+    Requires a ``ref_uri`` and an optional ``parent`` to instantiate.
+
+    An XML URI is usually a filepath to a directory or file, sometimes
+    proceeded by a protocol (such as ``http://``). **Note that many of the**
+    **functions and methods described below do not function properly when**
+    **given a URI with a protocol in front.**
+
+    The parent of a :class:`MediaRef` should typically be a
+    :class:`ColorDecision` , and in fact the CDL specification states that
+    no other container is allowed to contain a :class:`MediaRef`. That
+    restriction is not enforced here, but writers for ``.ccc`` and ``.cc`` will
+    only pass through :class:`MediaRef` as Description entries.
+
+    **Class Attributes:**
+
+        members : {str: [:class:`MediaRef`]}
+            All instances of :class:`MediaRef` are added to this class level
+            members dictionary, with the key being the full reference URI.
+            Since it's possible that multiple :class:`MediaRef` point to the
+            same reference URI, the value returned is a list of
+            :class:`MediaRef` that all have a value of that same URI.
+
+            When you change a single :class:`MediaRef` ref attribute, it
+            removes itself from the old key's list, and adds itself to the
+            new key's list. The old key is removed from the dictionary if this
+            :class:`MediaRef` was the last member.
+
+            Membership changes are serialized by a class level lock, so
+            :class:`MediaRef` can be created and changed from many threads.
+
+    **Attributes:**
+
+        directory : (str)
+            The directory portion of the URI, without the protocol or filename.
+
+        element : (<xml.etree.ElementTree.Element>)
+            etree style Element representing the node. Inherited from
+            :class:`AscXMLBase` .
+
+        exists : (bool)
+            True if the path is present in the file system.
+
+        filename : (str)
+            The filename portion of the URI, without any protocol or directory.
+
+        frames : [str]
+            The paths of every frame of every sequence in ``seqs`` that is
+            on disk, sorted by sequence and then by frame number. Frames are
+            looked for every time, so this stays current as frames are
+            added.
+
+        is_abs : (bool)
+            True if ``directory`` is an absolute reference.
+
+        is_dir : (bool)
+            True if ``path`` points to a directory with no filename portion.
+
+        is_seq : (bool)
+            True if ``path`` points to an image sequence or a directory of
+            image sequences. Image sequences are determined by files ending
+            in a dot or underscore, followed by an integer, followed by the
+            file extension. If the filename reference given already has pound
+            padding or %d indication padding, this will also return true.
+
+            Valid image sequences:
+                - TCM100X_20140215.0001.exr
+                - Bobs Big_Score_2.jpg
+                - 2383-279873.67267_32t7634.63278623781638218763.exr
+                - 104fl.x034.######.dpx
+                - 104fl.x034_%06d.dpx
+
+        parent : (:class:`ColorDecision`)
+            The parent that contains this :class:`MediaRef` object. This should
+            normally be a :class:`ColorDecision` , but that is not enforced.
+
+        path : (str)
+            The directory joined with the filename via os.path.join(), if
+            there is no filename, path is identical to ``directory``. If there
+            is no protocol, ``path`` is identicial to ``ref``.
+
+        protocol : (str)
+            The URI protocol section of the URI, if any. This is the section
+            that proceeds the '://' of any URI. If there is no '://' in the
+            given URI, this is empty.
+
+        ref : (str)
+            The full URI reference which includes the protocol, directory and
+            filename. If there is no protocol and no filename, ``ref`` is
+            identical to ``directory``.
+
+        seq : (str)
+            If ``is_seq`` finds that the filename or directory refers to one or
+            more image sequences, ``seq`` will return the first found sequence
+            in  the form of filename.####.ext (or filename_####.ext if the
+            sequence has an ``_`` in front of the frame numbers).
+            *Note that there may be more than one image sequence if* ``ref``
+            *points to a directory*. To get a list of all image sequences
+            found, use ``seqs``.
+
+            Only if a reference was given to us already in the form of ``%d``
+            padding will ``seq`` and ``seqs`` return a sequence filename with
+            ``%d`` padding.
+
+        seqs : [str]
+            Returns all found sequences in a list. If ``ref`` points to a
+            filename, this list will only contain one sequence. If ``ref``
+            points to a directory, all sequences found in that directory will
+            be in this list.
+
+        xml : (str)
+            A nicely formatted XML string representing the node. Inherited from
+            :class:`AscXMLBase`.
+
+        xml_root : (str)
+            A nicely formatted XML, ready to write to file string representing
+            the node. Formatted as an XML root, it includes the xml version and
+            encoding tags on the first line. Inherited from
+            :class:`AscXMLBase`.
+
+    **Public Methods:**
+
+        build_element()
+            Builds an ElementTree XML Element for this node and all nodes it
+            contains. ``element``, ``xml``, and ``xml_root`` attributes use
+            this to build the XML. This function is identical to calling the
+            ``element`` attribute. Overrides inherited placeholder method
+            from :class:`AscXMLBase` .
+
+    """
+
+    members = {}
+
+    # Held while members is being changed.
+    _members_lock = threading.Lock()
+
+    def __init__(self, ref_uri, parent=None):
+        super(MediaRef, self).__init__()
+        self._protocol, self._dir, self._filename = self._split_uri(ref_uri)
+        self.parent = parent
+
+        # If we're a directory, we can contain one or more sequences, but we
+        # won't do the work to figure that out until is_seq, seq, and seqs are
+        # called for.
+        self._is_seq = None
+        self._sequences = None
+
+        # Add this instance to the member dictionary.
+        self._change_membership()
+
+    # Properties ==============================================================
+
+    @property
+    def directory(self):
+        """Returns the directory the uri points to"""
+        return self._dir
+
+    @directory.setter
+    def directory(self, value):
+        """Checks directory for type and resets cached properties"""
+        if type(value) is str:
+            old_ref = self.ref
+            self._dir = value
+            self._change_membership(old_ref=old_ref)
+            self._reset_cached_properties()
+        else:
+            raise TypeError(
+                'Directory must be set with a string, not {type}'.format(
+                    type=type(value)
+                )
+            )
+
+    @property
+    def exists(self):
+        """Convenience property for os.path.exists"""
+        return os.path.exists(self.path)
+
+    @property
+    def filename(self):
+        """Returns the filename the uri points to, if any"""
+        return self._filename
+
+    @filename.setter
+    def filename(self, value):
+        """Checks filename for type and resets cached properties"""
+        if type(value) is str:
+            old_ref = self.ref
+            self._filename = value
+            self._change_membership(old_ref=old_ref)
+            self._reset_cached_properties()
+        else:
+            raise TypeError(
+                'Filename must be set with a string, not {type}'.format(
+                    type=type(value)
+                )
+            )
+
+    @property
+    def frames(self):
+        """Returns the paths of every frame of the found sequences"""
+        directory = self.path if self.is_dir else self.directory
+        try:
+            names = os.listdir(directory or os.curdir)
+        except OSError:
+            return []
+
+        frames = []
+        for seq in self.seqs:
+            prefix, _, suffix = re.split(r'(#+|%[0-9]*d)', seq, 1)
+            match = re.compile(
+                '^' + re.escape(prefix) + '([0-9]+)' + re.escape(suffix) + '$'
+            )
+            numbered = []
+            for name in names:
+                found = match.search(name)
+                if found:
+                    numbered.append((int(found.group(1)), name))
+            frames.extend(
+                os.path.join(directory, name) for _, name in sorted(numbered)
+            )
+
+        return frames
+
+    @property
+    def is_abs(self):
+        """Returns True if path is an absolute path"""
+        return os.path.abspath(self.path)
+
+    @property
+    def is_dir(self):
+        """Returns True if path points to a directory"""
+        return os.path.isdir(self.path)
+
+    @property
+    def is_seq(self):
+        """Returns True if path is to an image sequence"""
+        if self._is_seq is None:
+            self._get_sequences()
+        return self._is_seq
+
+    @property
+    def path(self):
+        """Returns the path without any uri protocol"""
+        return os.path.join(self._dir, self._filename)
+
+    @property
+    def protocol(self):
+        """Returns the protocol of the uri, if any"""
+        return self._protocol
+
+    @protocol.setter
+    def protocol(self, value):
+        """Checks protocol for type and resets cached properties"""
+        if type(value) is str:
+            # If :// was appended we'll remove it.
+            if value.endswith('://'):
+                value = value[:-3]
+            old_ref = self.ref
+            self._protocol = value
+            self._change_membership(old_ref=old_ref)
+            # We probably don't need to reset the cached properties, but we
+            # will just to be safe.
+            self._reset_cached_properties()
+        else:
+            raise TypeError(
+                'Protocol must be set with a string, not {type}'.format(
+                    type=type(value)
+                )
+            )
+
+    @property
+    def ref(self):
+        """Returns the reference uri"""
+        if self._protocol:
+            prefix = "{proto}://".format(proto=self._protocol)
+        else:
+            prefix = ''
+        return prefix + self.path
+
+    @ref.setter
+    def ref(self, uri):
+        """Sets the reference uri and resets all cached properties"""
+        if type(uri) is str:
+            old_ref = self.ref
+            self._protocol, self._dir, self._filename = self._split_uri(uri)
+            self._change_membership(old_ref=old_ref)
+            self._reset_cached_properties()
+        else:
+            raise TypeError(
+                'URI must be set with a string, not {type}'.format(
+                    type=type(uri)
+                )
+            )
+
+    @property
+    def seq(self):
+        """Returns first found sequence with frames as # padding"""
+        if self._is_seq is None:
+            self._get_sequences()
+        elif not self._is_seq:
+            return None
+
+        return self._sequences[0]
+
+    @property
+    def seqs(self):
+        """Returns all found sequences with frames as # padding"""
+        if self._is_seq is None:
+            self._get_sequences()
+        elif not self._is_seq:
+            return []
+
+        return self._sequences
+
+    # Private Methods =========================================================
+
+    def _change_membership(self, old_ref=None):
+        """Change which ref uri this instance is under in the class dict.
+
+        We remove ourselves from the list returned by the key of old_ref
+        in the member dictionary, then append ourselves to the list of the
+        new ref key. If the ref isn't already in the dictionary, we'll be
+        creating a new list with ourselves as the only member.
+
+        **Args:**
+
+            old_ref=None : (str)
+                The previous uri reference of the instance. We'll look in the
+                class level member dictionary for this uri as a key, then
+                remove ourselves. If old_ref isn't a key, or we're not in the
+                list it returns, we'll just move on.
+
+        Returns:
+            None
+
+        Raises:
+            N/A
+
+        """
+        with MediaRef._members_lock:
+            if old_ref:
+                try:
+                    MediaRef.members[old_ref].remove(self)
+                except (KeyError, ValueError):
+                    # Either the key doesn't exist or we're not in the list.
+                    # Either way, it doesn't matter to us.
+                    pass
+                else:
+                    # Now that we're removed, we need to see if the list is
+                    # empty, and if so, delete the key ref.
+                    if not MediaRef.members[old_ref]:
+                        del MediaRef.members[old_ref]
+            try:
+                MediaRef.members[self.ref].append(self)
+            except KeyError:
+                MediaRef.members[self.ref] = [self]
+
+    # =========================================================================
+
+    def _get_sequences(self):
+        """Determines if the media ref is pointing to an image sequence"""
+        re_exp = r'(^[ \w_.-]+[_.])([0-9]+)(\.[a-zA-Z0-9]{3}$)'
+        re_exp_percent = r'(^[ \w_.-]+[_.])(%[0-9]+d)(\.[a-zA-Z0-9]{3}$)'
+        match = re.compile(re_exp)
+
+        if self.is_dir and not self.exists:
+            # It doesn't exist, so we can't tell if it's a sequence
+            if HALT_ON_ERROR:
+                raise ValueError(
+                    'Cannot determine if non-existent directory {dir} '
+                    'contains an image sequence.'.format(
+                        dir=self.path,
+                    )
+                )
+            else:
+                self._is_seq = False
+                self._sequences = []
+        elif self.is_dir and self.exists:
+            file_list = os.listdir(self.path)
+            files = [f for f in file_list if match.search(f)]
+            if not files:
+                self._is_seq = False
+                self._sequences = []
+            else:
+                seqs = []
+                for image in files:
+                    found = match.search(image)
+                    padding = '#' * len(found.group(2))
+                    filename = found.group(1) + padding + found.group(3)
+                    if filename not in seqs:
+                        seqs.append(filename)
+                self._is_seq = True
+                self._sequences = seqs
+        else:
+            found = match.search(self.filename)
+            if found:
+                padding = '#' * len(found.group(2))
+                self._is_seq = True
+                self._sequences = [found.group(1) + padding + found.group(3)]
+            else:
+                # We'll finally check for %d style padding
+                match = re.compile(re_exp_percent)
+                found = match.search(self.filename)
+                if found:
+                    self._is_seq = True
+                    self._sequences = [self.filename]
+                else:
+                    self._is_seq = False
+                    self._sequences = []
+
+    # =========================================================================
+
+    def _reset_cached_properties(self):
+        """Resets cached attributes back to init values"""
+        self._is_seq = None
+        self._sequences = None
+
+    # =========================================================================
+
+    @staticmethod
+    def _split_uri(uri):
+        """Splits uri into protocol, base and filename"""
+        if ':' in uri:
+            protocol = uri.split('://')[0]
+            uri = uri.split('://')[1]
+        else:
+            protocol = ''
+
+        directory = os.path.split(uri)[0]
+        ref_file = os.path.split(uri)[1]
+
+        return protocol, directory, ref_file
+
+# ==============================================================================
+
+
+class SatNode(ColorNodeBase):
+    """Color node that contains saturation data.
+
+    **Class Attributes:**
+
+        element_names : [str]
+            Contains a list of XML Elements that refer to this class for use
+            in parsing XML files.
+
+    **Attributes:**
+
+        desc : [str]
+            Since all Asc nodes which can contain a single description, can
+            actually contain an infinite number of descriptions, the desc
+            attribute is a list, allowing us to store every single description
+            found during parsing.
+
+            Setting desc directly will cause the value given to append to the
+            end of the list, but desc can also be replaced by passing it a list
+            or tuple. Desc can be emptied by passing it None, [] or ().
+
+            Inherited from :class:`AscDescBase` .
+
+        element : (<xml.etree.ElementTree.Element>)
+            etree style Element representing the node. Inherited from
+            :class:`AscXMLBase` .
+
+        parent : ( :class:`ColorCorrection` )
+            The parent :class:`ColorCorrection` instance that created this
+            instance.
+
+        sat : (float)
+            The saturation value (to be applied with Rec 709 coefficients) is
+            stored here. Saturation is the last operation to be applied when
+            applying a CDL.
+
+            sat can be set with a float, int or numeric string.
+
+        xml : (str)
+            A nicely formatted XML string representing the node. Inherited from
+            :class:`AscXMLBase`.
+
+        xml_root : (str)
+            A nicely formatted XML, ready to write to file string representing
+            the node. Formatted as an XML root, it includes the xml version and
+            encoding tags on the first line. Inherited from
+            :class:`AscXMLBase`.
+
+    **Public Methods:**
+
+        build_element()
+            Builds an ElementTree XML Element for this node and all nodes it
+            contains. ``element``, ``xml``, and ``xml_root`` attributes use
+            this to build the XML. This function is identical to calling the
+            ``element`` attribute. Overrides inherited placeholder method
+            from :class:`AscXMLBase` .
+
+        parse_xml_descs()
+            Parses an ElementTree Element for any Description tags and appends
+            any text they contain to the ``desc``. Inherited from
+            :class:`AscDescBase`
+
+    """
+
+    # XML Fields for SopNodes can be one of these names:
+    element_names = ['ASC_SAT', 'SATNode', 'SatNode']
+
+    def __init__(self, parent):
+        super(SatNode, self).__init__()
+
+        self._parent = parent
+        self._sat = 1.0
+
+    # Properties ==============================================================
+
+    @property
+    def parent(self):
+        """Returns which :class:`ColorCorrection` created this SatNode"""
+        return self._parent
+
+    @property
+    def sat(self):
+        """Returns the protected sat attribute"""
+        return self._sat
+
+    @sat.setter
+    def sat(self, value):
+        """Runs checks and converts saturation value before setting"""
+        # If given as a string, the string must be convertible to a float
+        if type(value) in [float, int, str]:
+            try:
+                value = self._check_single_value(value, 'saturation')
+            except (TypeError, ValueError):
+                raise
+            else:
+                self._sat = _intern(value)
+        else:
+            raise TypeError(
+                'Saturation cannot be set directly with objects of type: '
+                '"{type}". Value given: "{value}".'.format(
+                    type=type(value),
+                    value=value,
+                )
+            )
+
+    # Public Methods ==========================================================
+
+    def build_element(self):
+        """Builds an ElementTree XML Element representing this SatNode"""
+        sat = ElementTree.Element('SATNode')
+        for description in self.desc:
+            desc = ElementTree.SubElement(sat, 'Description')
+            desc.text = description
+        op_node = ElementTree.SubElement(sat, 'Saturation')
+        op_node.text = _serialize(self.sat)
+        return sat
+
+# ==============================================================================
+
+
+class SopNode(ColorNodeBase):
+    """Color node that contains slope, offset and power data.
+
+    Description
+    ~~~~~~~~~~~
+
+    Slope, offset and saturation are stored internally as tuples, and always
+    returned as tuples to prevent index assignment from being successful. This
+    protects the user from inadvertently setting a single value in the list
+    to be a non-valid value, which might result in values not being floats or
+    even numbers at all.
+
+    If ``INTERN_GRADES`` is set, every :class:`SopNode` with identical slope,
+    offset or power values shares a single tuple for those values.
+
+    **Class Attributes:**
+
+        element_names : [str]
+            Contains a list of XML Elements that refer to this class for use
+            in parsing XML files.
+
+    **Attributes:**
+
+        desc : [str]
+            Since all Asc nodes which can contain a single description, can
+            actually contain an infinite number of descriptions, the desc
+            attribute is a list, allowing us to store every single description
+            found during parsing.
+
+            Setting desc directly will cause the value given to append to the
+            end of the list, but desc can also be replaced by passing it a list
+            or tuple. Desc can be emptied by passing it None, [] or ().
+
+            Inherited from :class:`AscDescBase` .
+
+        element : (<xml.etree.ElementTree.Element>)
+            etree style Element representing the node. Inherited from
+            :class:`AscXMLBase` .
+
+        parent : ( :class:`ColorCorrection` )
+            The parent :class:`ColorCorrection` instance that created this
+            instance.
+
+        slope : (float, float, float)
+            An rgb tuple representing the slope, which changes the slope of the
+            input without shifting the black level established by the offset.
+            These values must be positive. If you set this attribute with a
+            single value, it will be copied over all 3 colors. Any single value
+            given can be a float, int or numeric string.
+
+            default: (1.0, 1.0, 1.0)
+
+        offset : (float, float, float)
+            An rgb tuple representing the offset, which raises or lowers the
+            input brightness while holding the slope constant. If you set this
+            attribute with a single value, it will be copied over all 3 colors.
+            Any single value given can be a float, int or numeric string.
+
+            default: (0.0, 0.0, 0.0)
+
+        power : (float, float, float)
+            An rgb tuple representing the power, which is the only function
+            that changes the response curve of the function. Note that this has
+            the opposite response to adjustments than a traditional gamma
+            operator. These values must be positive. If you set this attribute
+            with a single value, it will be copied over all 3 colors. Any
+            single value given can be a float, int or numeric string.
+
+            default: (1.0, 1.0, 1.0)
+
+        xml : (str)
+            A nicely formatted XML string representing the node. Inherited from
+            :class:`AscXMLBase`.
+
+        xml_root : (str)
+            A nicely formatted XML, ready to write to file string representing
+            the node. Formatted as an XML root, it includes the xml version and
+            encoding tags on the first line. Inherited from
+            :class:`AscXMLBase`.
+
+    **Public Methods:**
+
+        build_element()
+            Builds an ElementTree XML Element for this node and all nodes it
+            contains. ``element``, ``xml``, and ``xml_root`` attributes use
+            this to build the XML. This function is identical to calling the
+            ``element`` attribute. Overrides inherited placeholder method
+            from :class:`AscXMLBase` .
+
+        parse_xml_descs()
+            Parses an ElementTree Element for any Description tags and appends
+            any text they contain to the ``desc``. Inherited from
+            :class:`AscDescBase`
+
+    """
+
+    # XML Fields for SopNodes can be one of these names:
+    element_names = ['ASC_SOP', 'SOPNode', 'SopNode']
+
+    def __init__(self, parent):
+        super(SopNode, self).__init__()
+
+        self._parent = parent
+
+        self._slope = (1.0, 1.0, 1.0)
+        self._offset = (0.0, 0.0, 0.0)
+        self._power = (1.0, 1.0, 1.0)
+
+    # Properties ==============================================================
+
+    @property
+    def parent(self):
+        """Returns which :class:`ColorCorrection` created this SopNode"""
+        return self._parent
+
+    @property
+    def slope(self):
+        """Returns the slope as an tuple"""
+        return tuple(self._slope)
+
+    @slope.setter
+    def slope(self, value):
+        """Runs tests and converts slope rgb values before setting"""
+        value = self._check_setter_value(value, 'slope')
+        self._slope = _intern(tuple(value))
+
+    @property
+    def offset(self):
+        """Returns the offset as a tuple"""
+        return tuple(self._offset)
+
+    @offset.setter
+    def offset(self, value):
+        """Runs tests and converts offset rgb values before setting"""
+        value = self._check_setter_value(value, 'offset', True)
+        self._offset = _intern(tuple(value))
+
+    @property
+    def power(self):
+        """Returns the power as a tuple"""
+        return tuple(self._power)
+
+    @power.setter
+    def power(self, value):
+        """Runs tests and converts power rgb values before setting"""
+        value = self._check_setter_value(value, 'power')
+        self._power = _intern(tuple(value))
+
+    # Private Methods =========================================================
+
+    def _check_rgb_values(self, values, name, negative_allow=False):
+        """Checks a list or tuple containing 3 values for legitimacy
+
+        **Args:**
+            value : [(str, float, int)]
+                A list of three numeric values to be checked.
+
+            name : (str)
+                The type of values being checked: slope, offset, etc.
+
+            negative_allow=False : (bool)
+                If false, do not allow negative values.
+
+        **Returns:**
+            [float, float, float]
+                If all values pass all tests, returns values as a list of
+                floats.
+
+        **Raises:**
+            TypeError:
+                If a value given is not a number.
+
+            ValueError:
+                If length of list or tuple is not 3 or if negative is False,
+                raised if value given is negative.
+
+        """
+        try:
+            assert len(values) == 3
+        except AssertionError:
+            raise ValueError(
+                'Error setting {name} with value: "{values}". '
+                '{name_upper} values given as a list or tuple must have 3 '
+                'elements, one for each color.'.format(
+                    name=name,
+                    name_upper=name.title(),
+                    values=values
+                )
+            )
+
+        values = list(values)
+
+        for i in xrange(len(values)):
+            try:
+                values[i] = self._check_single_value(
+                    values[i],
+                    name,
+                    negative_allow
+                )
+            except (TypeError, ValueError):
+                raise
+
+        return values
+
+    # =========================================================================
+
+    def _check_setter_value(self, value, name, negative_allow=False):
+        """Exception handling wrapper handling setting values
+
+        Ties together _check_single_value and _check_rgb_values
+
+                    **Args:**
+            value : [(str, float, int)] or (str, float, int)
+                A list of three (or one) numeric values to be checked.
+
+            name : (str)
+                The type of values being checked: slope, offset, etc.
+
+            negative_allow=False : (bool)
+                If false, do not allow negative values.
+
+        **Returns:**
+            [float, float, float]
+                If all values pass all tests, returns values as a list of
+                floats.
+
+        **Raises:**
+            TypeError:
+                If a value given is not a number.
+
+            ValueError:
+                If length of list or tuple is not 3 or if negative is False,
+                raised if value given is negative.
+
+        """
+        if type(value) in [float, int, str]:
+            try:
+                value = self._check_single_value(value, name, negative_allow)
+            except (TypeError, ValueError):
+                raise
+            else:
+                set_value = [value] * 3
+        elif type(value) in [list, tuple]:
+            try:
+                value = self._check_rgb_values(value, name, negative_allow)
+            except (TypeError, ValueError):
+                raise
+            else:
+                set_value = value
+        else:
+            raise TypeError(
+                '{name} cannot be set directly with objects of type: "{type}".'
+                ' Value given: "{value}".'.format(
+                    name=name.title(),
+                    type=type(value),
+                    value=value,
+                )
+            )
+
+        return set_value
+
+    # Public Methods ==========================================================
+
+    def build_element(self):
+        """Builds an ElementTree XML Element representing this SopNode"""
+        sop = ElementTree.Element('SOPNode')
+        fields = ['Slope', 'Offset', 'Power']
+        for description in self.desc:
+            desc = ElementTree.SubElement(sop, 'Description')
+            desc.text = description
+        for i, grade in enumerate([self.slope, self.offset, self.power]):
+            op_node = ElementTree.SubElement(sop, fields[i])
+            op_node.text = _serialize(grade)
+        return sop
+
+# ==============================================================================
+# PRIVATE FUNCTIONS
+# ==============================================================================
+
+
+def _bake_lut_group(job, lattices, outputs, buffers):
+    """Bakes one grade and writes it to every file that shares it
+
+    **Args:**
+        job : (str, tuple, int, (float, float), str, [(str, str)])
+            The LUT format, the ``_values()`` of the grade, the LUT
+            dimensions, the input range, the clamping policy, and a list of
+            the file paths and titles to write.
+
+        lattices : {int: numpy.ndarray}
+            Identity lattices keyed by dimensions, as returned by
+            :func:`_identity_lattice`.
+
+        outputs : {int: numpy.ndarray}
+            Output arrays keyed by dimensions, reused between jobs. Missing
+            entries are created.
+
+        buffers : {numpy.dtype: numpy.ndarray}
+            Scratch arrays reused between jobs, see :func:`_evaluate_band` .
+
+    **Returns:**
+        (int)
+            The number of files written.
+
+    **Raises:**
+        N/A
+
+    The grade is only evaluated and formatted once. Every other file gets
+    its own header, followed by the body copied from the first file.
+
+    """
+    ext, values, dimensions, in_range, clamp, targets = job
+
+    lattice = lattices[dimensions]
+    lut = outputs.get(dimensions)
+    if lut is None:
+        lut = outputs[dimensions] = np.empty_like(lattice)
+
+    plan = ColorCorrectionPlan(values, _compute_dtype(lattice, None), clamp)
+    _evaluate_band((lattice, lut, plan), buffers)
+
+    first_path, first_title = targets[0]
+    header, rows, row_format, footer = _lut_layout(
+        ext, lut, first_title, in_range
+    )
+    _write_lut_file(first_path, header, rows, row_format, footer)
+
+    body_start = len(enc(header))
+    for path, title in targets[1:]:
+        with open(first_path, 'rb') as src_f:
+            src_f.seek(body_start)
+            with open(path, 'wb') as lut_f:
+                lut_f.write(enc(_lut_layout(ext, lut, title, in_range)[0]))
+                shutil.copyfileobj(src_f, lut_f)
+
+    return len(targets)
+
+# ==============================================================================
+
+
+def _bake_lut_job(job):
+    """Bakes a job in a bake_luts worker process. See _bake_lut_group"""
+    return _bake_lut_group(
+        job,
+        _LUT_WORKER['lattices'],
+        _LUT_WORKER['outputs'],
+        _LUT_WORKER['buffers']
+    )
+
+# ==============================================================================
+
+
+def _chain_plans(plans):
+    """Returns a ColorCorrectionPlan that runs each of plans in turn
+
+    **Args:**
+        plans : [ :class:`ColorCorrectionPlan` ]
+            Plans sharing a dtype, in the order they're to be applied.
+
+    **Returns:**
+        ( :class:`ColorCorrectionPlan` )
+            A plan whose results match running each plan on the results of
+            the one before it.
+
+    **Raises:**
+        ValueError:
+            If no plans are given, or if they don't share a dtype and
+            clamping policy.
+
+    The stages of each plan are shared, not copied, so chaining is cheap and
+    a plan used in many chains is only compiled once.
+
+    """
+    # pylint: disable=W0212
+    if not plans:
+        raise ValueError('A chain needs at least one correction.')
+    dtypes = set(plan.dtype for plan in plans)
+    if len(dtypes) > 1:
+        raise ValueError(
+            'Chained plans must share a dtype, not {dtypes}.'.format(
+                dtypes=', '.join(sorted(dtype.name for dtype in dtypes))
+            )
+        )
+    clamps = set(plan.clamp for plan in plans)
+    if len(clamps) > 1:
+        raise ValueError(
+            'Chained plans must share a clamping policy, not {clamps}.'.format(
+                clamps=', '.join(sorted(clamps))
+            )
+        )
+
+    chained = ColorCorrectionPlan.__new__(ColorCorrectionPlan)
+    chained.dtype = plans[0].dtype
+    chained.clamp = plans[0].clamp
+    chained._head = list(plans[0]._head)
+    chained._tail = list(plans[0]._tail)
+    for plan in plans[1:]:
+        chained._head.extend(plan._tail)
+        chained._tail.extend(plan._tail)
+    chained.steps = tuple(
+        step for stage in chained._head for step in stage[2]
+    )
+
+    return chained
+
+# ==============================================================================
+
+
+def _check_pixels(pixels, out, integers=False):
+    """Checks pixels and out for evaluation and returns them as arrays
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            Pixels to be evaluated. Anything NumPy can turn into an array is
+            accepted.
+
+        out : (numpy.ndarray|None)
+            The array results will be written to, if any.
+
+        integers=False : (bool)
+            If True, unsigned integer pixels are accepted as well.
+
+    **Returns:**
+        (numpy.ndarray, numpy.ndarray)
+            ``pixels`` as an array, and ``out`` or a new empty array matching
+            ``pixels`` if ``out`` was None.
+
+    **Raises:**
+        TypeError:
+            If ``pixels`` is not a floating point array, or an unsigned
+            integer one when ``integers`` is True.
+
+        ValueError:
+            If ``pixels`` doesn't have RGB on its last axis, or if ``out``
+            doesn't match ``pixels``.
+
+    """
+    pixels = np.asarray(pixels)
+    kinds = 'fu' if integers else 'f'
+    if pixels.dtype.kind not in kinds:
+        raise TypeError(
+            'Pixels must be a {kinds} array, not {dtype}.'.format(
+                kinds=(
+                    'floating point or unsigned integer' if integers
+                    else 'floating point'
+                ),
+                dtype=pixels.dtype
+            )
+        )
+    if not pixels.ndim or pixels.shape[-1] != 3:
+        raise ValueError(
+            'Pixels must have R, G and B on the last axis. Shape given: '
+            '{shape}'.format(
+                shape=pixels.shape
+            )
+        )
+
+    if out is None:
+        out = np.empty_like(pixels)
+    elif out.shape != pixels.shape or out.dtype != pixels.dtype:
+        raise ValueError(
+            'Out array of shape {out_shape} and dtype {out_dtype} does not '
+            'match pixels of shape {shape} and dtype {dtype}.'.format(
+                out_shape=out.shape,
+                out_dtype=out.dtype,
+                shape=pixels.shape,
+                dtype=pixels.dtype
+            )
+        )
+
+    return pixels, out
+
+# ==============================================================================
+
+
+def _clamp_mode(clamp):
+    """Returns the clamping policy for clamp, checking it's one we know
+
+    **Args:**
+        clamp : (str|None)
+            One of ``CLAMP_MODES``, or None for ``CLAMP``.
+
+    **Returns:**
+        (str)
+            The clamping policy.
+
+    **Raises:**
+        ValueError:
+            If ``clamp`` isn't one of ``CLAMP_MODES``.
+
+    """
+    if clamp is None:
+        clamp = CLAMP
+    if clamp not in CLAMP_MODES:
+        raise ValueError(
+            'The clamping policy: {clamp} is not one of: {modes}'.format(
+                clamp=clamp,
+                modes=', '.join(CLAMP_MODES)
+            )
+        )
+    return clamp
+
+# ==============================================================================
+
+
+@atexit.register
+def _close_thread_pools():
+    """Closes and joins the thread pools of this process as it exits"""
+    pid = os.getpid()
+    with _THREAD_POOLS_LOCK:
+        keys = [key for key in _THREAD_POOLS if key[0] == pid]
+        pools = [_THREAD_POOLS.pop(key) for key in keys]
+    for pool in pools:
+        pool.close()
+        pool.join()
+
+# ==============================================================================
+
+
+def _code_bands(pixels, out, cdl, memory, dtype, bit_depth, clamp='asc'):
+    """Yields bands of integer pixels along with per channel code tables
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            Checked unsigned integer pixel array.
+
+        out : (numpy.ndarray)
+            Array matching ``pixels`` that results will be written to.
+
+        cdl : ( :class:`ColorCorrection` ) or [ :class:`ColorCorrection` ]
+            The correction for every pixel, or one per frame.
+
+        memory : (int)
+            The most bytes of pixel data in a band.
+
+        dtype : (numpy.dtype)
+            The floating point dtype saturation is evaluated in.
+
+        bit_depth : (int|None)
+            The bit depth of the code values, or None for every bit of the
+            pixel dtype.
+
+        clamp='asc' : (str)
+            The clamping policy, one of ``CLAMP_MODES``.
+
+    **Yields:**
+        (tuple)
+            Views of a band of ``pixels`` and ``out``, the code tables as
+            returned by :func:`_code_tables` , the saturation in ``dtype``
+            or None if the tables already give output codes, the highest
+            code value, and whether saturation is clamped.
+
+    **Raises:**
+        ValueError:
+            If the bit depth is invalid, or if the number of corrections
+            doesn't match the first axis.
+
+    """
+    bits = pixels.dtype.itemsize * 8
+    if bit_depth is None:
+        bit_depth = bits
+    if not 1 <= bit_depth <= min(bits, _MAX_CODE_BITS):
+        raise ValueError(
+            'A bit depth of {bit_depth} is not supported for {dtype} pixels. '
+            'Integer pixels can have up to {max_bits} bits.'.format(
+                bit_depth=bit_depth,
+                dtype=pixels.dtype,
+                max_bits=min(bits, _MAX_CODE_BITS)
+            )
+        )
+    top = 2 ** bit_depth - 1
+
+    # pylint: disable=W0212
+    if isinstance(cdl, ColorCorrection):
+        frames = [(pixels, out, cdl._values())]
+    else:
+        cdls = _frame_cdls(cdl, pixels)
+        if isinstance(cdls, CorrectionBatch):
+            grades = [cdls._values(i) for i in range(len(cdls))]
+        else:
+            grades = [frame_cdl._values() for frame_cdl in cdls]
+        frames = zip(pixels, out, grades)
+
+    # Frames that share a grade share its tables.
+    tables = {}
+    for frame, frame_out, values in frames:
+        if values not in tables:
+            if values[3] == 1.0:
+                tables[values] = (
+                    _code_tables(values, top, pixels.dtype, clamp), None
+                )
+            else:
+                tables[values] = (
+                    _code_tables(values, top, dtype, clamp),
+                    dtype.type(values[3])
+                )
+        frame_tables, sat = tables[values]
+        for band, band_out in _row_bands(frame, frame_out, memory):
+            yield band, band_out, frame_tables, sat, top, clamp == 'asc'
+
+# ==============================================================================
+
+
+def _code_tables(values, top, dtype, clamp='asc'):
+    """Returns the slope, offset and power of each code value per channel
+
+    **Args:**
+        values : (tuple)
+            Grade values, as returned by :class:`ColorCorrection`
+            ``_values()``.
+
+        top : (int)
+            The highest code value, which stands for 1.0.
+
+        dtype : (numpy.dtype)
+            A floating point dtype for tables of graded values, or an
+            unsigned integer dtype for tables of graded code values.
+
+        clamp='asc' : (str)
+            The clamping policy, one of ``CLAMP_MODES``.
+
+    **Returns:**
+        (numpy.ndarray)
+            An array of shape (3, top + 1), where entry [c, i] is code value
+            i of channel c after slope, offset and power, clamped according
+            to ``clamp``. Integer tables are scaled back up to code values,
+            rounded and limited to the codes that exist.
+
+    **Raises:**
+        N/A
+
+    Tables are tiny next to a frame, so they're always computed in float64,
+    by a :class:`ColorCorrectionPlan` with saturation left out.
+
+    """
+    ramp = np.arange(top + 1, dtype=np.float64) / top
+    tables = np.repeat(ramp[:, np.newaxis], 3, axis=1)
+    plan = ColorCorrectionPlan(values[:3] + (1.0, ), np.float64, clamp)
+    plan._run(tables, tables)  # pylint: disable=W0212
+
+    if np.dtype(dtype).kind == 'u':
+        np.multiply(tables, top, out=tables)
+        np.rint(tables, out=tables)
+        np.clip(tables, 0, top, out=tables)
+    return np.ascontiguousarray(tables.T, dtype=dtype)
+
+# ==============================================================================
+
+
+def _compute_dtype(pixels, dtype):
+    """Returns the dtype pixels should be evaluated in
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            Checked pixel array.
+
+        dtype : (numpy.dtype|None)
+            The dtype asked for, or None to pick one for ``pixels``.
+
+    **Returns:**
+        (numpy.dtype)
+            ``dtype`` if given. Otherwise the dtype of ``pixels``, the
+            wider dtype from ``_WIDENED_DTYPES`` for dtypes that NumPy
+            computes slowly, such as float16, or float32 for integers.
+
+    **Raises:**
+        TypeError:
+            If ``dtype`` is not a floating point dtype.
+
+    """
+    if dtype is None:
+        if pixels.dtype.kind == 'u':
+            return np.dtype(np.float32)
+        return np.dtype(_WIDENED_DTYPES.get(pixels.dtype.name, pixels.dtype))
+
+    dtype = np.dtype(dtype)
+    if dtype.kind != 'f':
+        raise TypeError(
+            'Pixels can only be evaluated in a floating point dtype, not '
+            '{dtype}.'.format(
+                dtype=dtype
+            )
+        )
+    return dtype
+
+# ==============================================================================
+
+
+def _de_exponent(notation):
+    """Translates scientific notation into float strings"""
+    notation = str(notation)
+    if 'e' not in notation:
+        return notation
+
+    notation = notation.split('e')
+    # Grab the exponent value
+    digits = int(notation[-1])
+    # Grab the value we'll be adding 0s to
+    value = notation[0]
+
+    if value.startswith('-'):
+        negative = '-'
+        value = value[1:]
+    else:
+        negative = ''
+
+    value = value.replace('.', '')
+
+    if digits < 0:
+        new_value = negative + '0.0' + '0' * (abs(digits) - 2) + value
+    else:
+        zeros = len(value)
+        new_value = negative + value + '0' * (abs(digits) - zeros) + '0.0'
+    return new_value
+
+# ==============================================================================
+
+
+def _evaluate_band(band, buffers):
+    """Evaluates a band from _graded_bands using reusable scratch memory
+
+    **Args:**
+        band : (tuple)
+            A tuple of pixels, out and a :class:`ColorCorrectionPlan` as
+            yielded by :func:`_graded_bands` .
+
+        buffers : {numpy.dtype: numpy.ndarray}
+            Flat scratch arrays by dtype. If the one for this band's dtype is
+            missing or too small, it's replaced with a larger one.
+
+    **Returns:**
+        None
+
+    **Raises:**
+        N/A
+
+    The band is evaluated in the dtype of the plan. If that differs from
+    the dtype of the pixels, the band is first copied into scratch memory
+    of that dtype, and the results are copied back into ``out``. Bands of
+    integer pixels are handed to :func:`_evaluate_codes` .
+
+    """
+    if band[0].dtype.kind == 'u':
+        _evaluate_codes(band, buffers)
+        return
+
+    pixels, out, plan = band
+    count = pixels.size // 3
+    widen = plan.dtype != pixels.dtype
+    luma_size = 2 * count if 'saturation' in plan.steps else 0
+
+    scratch = None
+    buffer = None
+    if luma_size or widen:
+        buffer = _scratch(
+            buffers, plan.dtype, luma_size + (3 * count if widen else 0)
+        )
+    if luma_size:
+        scratch = buffer[:luma_size].reshape((2, ) + pixels.shape[:-1])
+
+    if not widen:
+        plan._run(pixels, out, scratch)  # pylint: disable=W0212
+        return
+
+    work = buffer[luma_size:luma_size + 3 * count].reshape(pixels.shape)
+    work[...] = pixels
+    plan._run(work, work, scratch)  # pylint: disable=W0212
+    out[...] = work
+
+# ==============================================================================
+
+
+def _evaluate_codes(band, buffers):
+    """Evaluates a band of integer pixels from _code_bands
+
+    **Args:**
+        band : (tuple)
+            A tuple of pixels, out, tables, sat, the top code value and
+            whether to clamp as yielded by :func:`_code_bands` .
+
+        buffers : {numpy.dtype: numpy.ndarray}
+            Flat scratch arrays by dtype, as for :func:`_evaluate_band` .
+
+    **Returns:**
+        None
+
+    **Raises:**
+        N/A
+
+    Each channel is looked up in its table, so slope, offset and power cost
+    a single gather. Without saturation the tables hold output codes and
+    that's all there is to do. Otherwise saturation is evaluated on the
+    looked up values, which are then scaled back to rounded code values.
+    Code values above the top code are treated as the top code, and results
+    are always limited to the codes that exist.
+
+    """
+    pixels, out, tables, sat, top, clamped = band
+
+    if sat is None:
+        for channel in xrange(3):
+            out[..., channel] = tables[channel].take(
+                pixels[..., channel], mode='clip'
+            )
+        return
+
+    count = pixels.size // 3
+    buffer = _scratch(buffers, tables.dtype, 5 * count)
+    scratch = buffer[:2 * count].reshape((2, ) + pixels.shape[:-1])
+    work = buffer[2 * count:5 * count].reshape(pixels.shape)
+
+    for channel in xrange(3):
+        np.take(
+            tables[channel],
+            pixels[..., channel],
+            out=work[..., channel],
+            mode='clip'
+        )
+    _saturate(work, sat, scratch, clamped)
+    np.multiply(work, top, out=work)
+    np.rint(work, out=work)
+    if not clamped:
+        np.clip(work, 0, top, out=work)
+    out[...] = work
+
+# ==============================================================================
+
+
+def _evaluate_inverse(pixels, slope, offset, power, sat, out, clamp='asc',
+                      scratch=None):
+    """Undoes slope, offset, power and sat on pixels, writing into out
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            Checked array of graded RGB pixels.
+
+        slope : (numpy.ndarray)
+            The reciprocal of the slope, broadcastable to ``pixels``.
+
+        offset : (numpy.ndarray)
+            The offset, broadcastable to ``pixels``.
+
+        power : (numpy.ndarray)
+            The reciprocal of the power, broadcastable to ``pixels``.
+
+        sat : (numpy.ndarray)
+            The reciprocal of the saturation, broadcastable to ``pixels``
+            without its last axis.
+
+        out : (numpy.ndarray)
+            Array of the same shape and dtype as ``pixels`` to write to. It
+            may be ``pixels``.
+
+        clamp='asc' : (str)
+            The clamping policy being undone, one of ``CLAMP_MODES``.
+
+        scratch=None : (numpy.ndarray)
+            Scratch array for :func:`_luma` .
+
+    **Returns:**
+        (numpy.ndarray)
+            ``out``
+
+    **Raises:**
+        N/A
+
+    With the 'asc' policy, channels that land further than
+    ``INVERSE_TOLERANCE`` outside of 0.0 - 1.0 once saturation is undone
+    have no inverse, and are set to NaN. The other policies never clamp,
+    so every channel is undone.
+
+    """
+    luma = _luma(pixels, scratch)
+    np.subtract(pixels, luma, out=out)
+    np.multiply(out, sat, out=out)
+    np.add(out, luma, out=out)
+
+    if clamp == 'asc':
+        undefined = np.less(out, -INVERSE_TOLERANCE)
+        undefined |= np.greater(out, 1.0 + INVERSE_TOLERANCE)
+        np.clip(out, 0.0, 1.0, out=out)
+        np.power(out, power, out=out)
+    else:
+        undefined = None
+        _signed_power(out, np.power, (power, ), clamp == 'mirror', out)
+    np.subtract(out, offset, out=out)
+    np.multiply(out, slope, out=out)
+    if undefined is not None:
+        out[undefined] = np.nan
+
+    return out
+
+# ==============================================================================
+
+
+def _fit_normal_equations(source, target, params, clamp):
+    """Returns the squared error of params and its Gauss-Newton terms
+
+    **Args:**
+        source : (numpy.ndarray)
+            A float64 array of shape (3, n) of ungraded samples, one row per
+            channel.
+
+        target : (numpy.ndarray)
+            A float64 array of shape (3, n) the graded samples should match.
+
+        params : (numpy.ndarray)
+            The 10 grade values, slope, offset and power for red, green and
+            blue, then saturation.
+
+        clamp : (str)
+            One of ``CLAMP_MODES``.
+
+    **Returns:**
+        (float, numpy.ndarray, numpy.ndarray)
+            Half the sum of squared errors, the (10, 10) product of the
+            Jacobian with itself, and the product of the Jacobian with the
+            errors.
+
+    **Raises:**
+        N/A
+
+    The Jacobian is never built. Slope, offset and power only reach an
+    output channel through saturation's fixed mix of the powered channels,
+    so the products are summed from the (9, n) derivatives of the powered
+    channels once per output channel, and weighted by the mix afterwards.
+    Samples are worked through ``_FIT_CHUNK`` at a time.
+
+    """
+    # How much each output channel moves with each powered channel.
+    sat = params[9]
+    mix = (1.0 - sat) * np.array([REC709_LUMA] * 3) + sat * np.eye(3)
+
+    cost = 0.0
+    normal = np.zeros((10, 10))
+    gradient = np.zeros(10)
+    for start in range(0, source.shape[1], _FIT_CHUNK):
+        chunk = slice(start, start + _FIT_CHUNK)
+        graded, derivatives, d_sat, held = _fit_terms(
+            source[:, chunk], params, clamp
+        )
+        graded -= target[:, chunk]
+        cost += 0.5 * float(np.vdot(graded, graded))
+        if held is not None:
+            graded[held] = 0.0
+            d_sat[held] = 0.0
+
+        for channel in range(3):
+            weights = np.tile(mix[channel], 3)
+            if held is None:
+                live = derivatives
+            else:
+                live = derivatives * ~held[channel]
+            normal[:9, :9] += np.outer(weights, weights) * np.dot(
+                live, derivatives.T
+            )
+            normal[:9, 9] += weights * np.dot(live, d_sat[channel])
+            normal[9, 9] += np.dot(d_sat[channel], d_sat[channel])
+            gradient[:9] += weights * np.dot(live, graded[channel])
+            gradient[9] += np.dot(d_sat[channel], graded[channel])
+    normal[9, :9] = normal[:9, 9]
+
+    return cost, normal, gradient
+
+# ==============================================================================
+
+
+def _fit_terms(source, params, clamp):
+    """Grades source with params and returns the result and its derivatives
+
+    **Args:**
+        source : (numpy.ndarray)
+            A float64 array of shape (3, n), one row per channel.
+
+        params : (numpy.ndarray)
+            The 10 grade values, slope, offset and power for red, green and
+            blue, then saturation.
+
+        clamp : (str)
+            One of ``CLAMP_MODES``.
+
+    **Returns:**
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray|None)
+            The graded samples, of shape (3, n). The derivative of each
+            powered channel by its slope, offset and power, of shape (9, n)
+            and in the order of ``params``. The derivative of each graded
+            channel by saturation, of shape (3, n). A boolean (3, n) array
+            of the graded channels held by the final clamp, which don't
+            move with any value, or None if nothing clamps.
+
+    **Raises:**
+        N/A
+
+    Derivatives are taken as zero wherever a clamp holds a value at its
+    limit, and at a value of exactly zero before power. Channels are kept
+    in rows so that every step works on long contiguous runs.
+
+    """
+    power = params[6:9, np.newaxis]
+    linear = source * params[0:3, np.newaxis]
+    linear += params[3:6, np.newaxis]
+
+    if clamp == 'asc':
+        base = np.clip(linear, 0.0, 1.0)
+    else:
+        base = np.abs(linear)
+    positive = base > 0.0
+    safe = np.where(positive, base, 1.0)
+    powered = np.power(safe, power)
+    powered *= positive
+
+    d_linear = powered / safe
+    d_linear *= power
+    d_power = np.log(safe)
+    if clamp == 'asc':
+        d_linear *= linear < 1.0
+    elif clamp == 'mirror':
+        np.copysign(powered, linear, out=powered)
+    else:
+        negative = linear < 0.0
+        d_linear = np.where(negative, 1.0, d_linear)
+        d_power *= ~negative
+        powered = np.where(negative, linear, powered)
+    d_power *= powered
+    derivatives = np.concatenate([d_linear * source, d_linear, d_power])
+
+    luma = np.dot(REC709_LUMA, powered)
+    d_sat = powered - luma
+    graded = d_sat * params[9]
+    graded += luma
+
+    held = None
+    if clamp == 'asc':
+        held = (graded <= 0.0) | (graded >= 1.0)
+        np.clip(graded, 0.0, 1.0, out=graded)
+
+    return graded, derivatives, d_sat, held
+
+# ==============================================================================
+
+
+def _float_pixels(pixels):
+    """Returns pixels as float32, scaling integer codes to 0.0 - 1.0"""
+    if pixels.dtype.kind == 'u':
+        return np.divide(
+            pixels, float(np.iinfo(pixels.dtype).max), dtype=np.float32
+        )
+    return pixels.astype(np.float32)
+
+# ==============================================================================
+
+
+def _fold(values, dtype):
+    """Returns RGB values as a scalar of dtype if they're all equal
+
+    Otherwise returns them as an array of dtype. Scalars broadcast against
+    pixels more cheaply than a length 3 array.
+
+    """
+    if values[0] == values[1] == values[2]:
+        return dtype.type(values[0])
+    return np.array(values, dtype=dtype)
+
+# ==============================================================================
+
+
+def _frame_cdls(cdls, pixels):
+    """Returns cdls as a list, checking there's one for every frame
+
+    **Args:**
+        cdls : [ :class:`ColorCorrection` ] or ( :class:`CorrectionBatch` )
+            One correction for each entry along the first axis of
+            ``pixels``, or a batch with a row for each.
+
+        pixels : (numpy.ndarray)
+            The checked pixel array the corrections will be applied to.
+
+    **Returns:**
+        [ :class:`ColorCorrection` ] or ( :class:`CorrectionBatch` )
+            ``cdls`` as a list, or the batch as it is.
+
+    **Raises:**
+        ValueError:
+            If the number of corrections doesn't match the first axis.
+
+    """
+    if not isinstance(cdls, CorrectionBatch):
+        cdls = list(cdls)
+    if pixels.ndim < 2 or len(cdls) != pixels.shape[0]:
+        raise ValueError(
+            'Given {count} corrections for pixels of shape {shape}. '
+            'One correction is needed for each entry of the first '
+            'axis.'.format(
+                count=len(cdls),
+                shape=pixels.shape
+            )
+        )
+    return cdls
+
+# ==============================================================================
+
+
+def _grade_chunks(batches, size, random):
+    """Yields the grades of a stream of batches a shuffled chunk at a time
+
+    **Args:**
+        batches : (callable)
+            Returns a new iterator of :class:`CorrectionBatch` or (n, 10)
+            arrays each time it's called.
+
+        size : (int)
+            The most grades in a chunk.
+
+        random : (numpy.random.RandomState)
+            Shuffles the rows of each batch, so that grades logged in order
+            don't arrive a scene at a time.
+
+    **Yields:**
+        (numpy.ndarray)
+            An (m, 10) float64 array of grades.
+
+    """
+    for batch in batches():
+        values = _grade_values(batch)
+        values = values[random.permutation(len(values))]
+        for start in range(0, len(values), size):
+            yield values[start:start + size]
+
+# ==============================================================================
+
+
+def _grade_values(batch):
+    """Returns the (n, 10) values of a batch or array of grades"""
+    if isinstance(batch, CorrectionBatch):
+        return batch.values
+    values = np.array(batch, dtype=np.float64, ndmin=2)
+    if values.ndim != 2 or values.shape[1] != 10:
+        raise ValueError(
+            'Grade values must have a shape of (n, 10), not '
+            '{shape}.'.format(shape=values.shape)
+        )
+    return values
+
+# ==============================================================================
+
+
+def _graded_bands(pixels, out, cdl, memory, dtype, bit_depth=None,
+                  clamp='asc'):
+    """Yields bands of pixels along with the grade values they need
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            Checked pixel array.
+
+        out : (numpy.ndarray)
+            Array matching ``pixels`` that results will be written to.
+
+        cdl : ( :class:`ColorCorrection` ) or [ :class:`ColorCorrection` ]
+            The correction for every pixel, or one per frame.
+
+        memory : (int)
+            The most bytes of pixel data in a band.
+
+        dtype : (numpy.dtype)
+            The dtype to evaluate in, as returned by :func:`_compute_dtype` .
+
+        bit_depth=None : (int)
+            The bit depth of integer pixels. See :func:`_code_bands` .
+
+        clamp='asc' : (str)
+            The clamping policy, one of ``CLAMP_MODES``.
+
+    **Yields:**
+        (tuple)
+            Views of a band of ``pixels`` and ``out``, followed by the
+            :class:`ColorCorrectionPlan` for that band. Bands of integer
+            pixels are yielded by :func:`_code_bands` instead.
+
+    **Raises:**
+        ValueError:
+            If the number of corrections doesn't match the first axis.
+
+    """
+    if pixels.dtype.kind == 'u':
+        for band in _code_bands(
+                pixels, out, cdl, memory, dtype, bit_depth, clamp):
+            yield band
+        return
+
+    if isinstance(cdl, ColorCorrection):
+        frames = [(pixels, out, cdl.compile(dtype, clamp))]
+    elif isinstance(cdl, CorrectionBatch):
+        frames = [
+            (pixels[i], out[i], cdl.compile(i, dtype, clamp))
+            for i in range(len(_frame_cdls(cdl, pixels)))
+        ]
+    else:
+        # Plans are cached on each correction, so frames that share a
+        # correction share a plan.
+        frames = [
+            (pixels[i], out[i], frame_cdl.compile(dtype, clamp))
+            for i, frame_cdl in enumerate(_frame_cdls(cdl, pixels))
+        ]
+
+    for frame, frame_out, plan in frames:
+        for band, band_out in _row_bands(frame, frame_out, memory):
+            yield band, band_out, plan
+
+# ==============================================================================
+
+
+def _group_percentiles(ranked, starts, counts, percentiles):
+    """Returns percentiles of each group of grades sorted within groups
+
+    **Args:**
+        ranked : (numpy.ndarray)
+            An (n, 10) array of grades, held a group at a time, with each
+            column sorted within each group.
+
+        starts : (numpy.ndarray)
+            The first row of each group.
+
+        counts : (numpy.ndarray)
+            The number of rows in each group.
+
+        percentiles : [float]
+            The percentiles to find, from 0 to 100.
+
+    **Returns:**
+        (numpy.ndarray)
+            A (groups, percentiles, 10) array. Percentiles between two
+            grades are linearly interpolated, as ``numpy.percentile`` does
+            by default.
+
+    """
+    positions = starts[:, np.newaxis] + np.outer(
+        counts - 1, np.asarray(percentiles, dtype=np.float64) / 100.0
+    )
+    low = np.floor(positions).astype(np.intp)
+    high = np.minimum(low + 1, (starts + counts - 1)[:, np.newaxis])
+    fraction = (positions - low)[..., np.newaxis]
+    return ranked[low] * (1.0 - fraction) + ranked[high] * fraction
+
+# ==============================================================================
+
+
+def _identity_lattice(size, dimensions, in_range, dtype):
+    """Returns the input values a LUT of the given size samples
+
+    **Args:**
+        size : (int)
+            Number of entries along each axis.
+
+        dimensions : (int)
+            1 or 3.
+
+        in_range : (float, float)
+            The input values of the first and last entries.
+
+        dtype : (numpy.dtype)
+            The dtype of the returned array.
+
+    **Returns:**
+        (numpy.ndarray)
+            For 1 dimension, an array of shape (size, 3) where every channel
+            ramps from the low to the high end of ``in_range``. For 3, an
+            array of shape (size, size, size, 3) where entry [r, g, b] holds
+            the input sampled at red index r, green g and blue b.
+
+    **Raises:**
+        N/A
+
+    """
+    ramp = np.linspace(in_range[0], in_range[1], size).astype(dtype)
+    if dimensions == 1:
+        return np.repeat(ramp[:, np.newaxis], 3, axis=1)
+
+    lattice = np.empty((size, size, size, 3), dtype=dtype)
+    lattice[..., 0] = ramp[:, np.newaxis, np.newaxis]
+    lattice[..., 1] = ramp[np.newaxis, :, np.newaxis]
+    lattice[..., 2] = ramp[np.newaxis, np.newaxis, :]
+    return lattice
+
+# ==============================================================================
+
+
+def _image_format(path):
+    """Returns the reader and writer for path, checking its extension"""
+    ext = os.path.splitext(path)[1][1:].lower()
+    if ext not in IMAGE_FORMATS:
+        raise ValueError(
+            'The image: {path} is not in a supported format: '
+            '{formats}'.format(
+                path=path,
+                formats=', '.join(sorted(IMAGE_FORMATS))
+            )
+        )
+    return IMAGE_FORMATS[ext]
+
+# ==============================================================================
+
+
+def _init_lut_worker(shared):
+    """Attaches a bake_luts worker process to the shared identity lattices
+
+    **Args:**
+        shared : {int: (multiprocessing.RawArray, tuple, str)}
+            Shared memory holding each identity lattice, along with the
+            shape and dtype of the lattice, keyed by dimensions.
+
+    **Returns:**
+        None
+
+    **Raises:**
+        N/A
+
+    The lattices are wrapped as NumPy arrays without copying, so every
+    worker reads the same memory.
+
+    """
+    _LUT_WORKER['lattices'] = dict(
+        (dimensions, np.frombuffer(raw, dtype=dtype).reshape(shape))
+        for dimensions, (raw, shape, dtype) in shared.items()
+    )
+    _LUT_WORKER['outputs'] = {}
+    _LUT_WORKER['buffers'] = {}
+
+# ==============================================================================
+
+
+def _intern(value):
+    """Returns the shared instance of value if INTERN_GRADES is on
+
+    **Args:**
+        value : (float|tuple)
+            An immutable grade value, either a single float or a tuple of
+            floats.
+
+    **Returns:**
+        (float|tuple)
+            The first registered object equal to value, or value itself if
+            INTERN_GRADES is off or no equal value has been seen yet.
+
+    **Raises:**
+        N/A
+
+    """
+    if not INTERN_GRADES:
+        return value
+    key = _intern_key(value)
+    try:
+        return _INTERNED[key]
+    except KeyError:
+        if len(_INTERNED) >= _INTERNED_LIMIT:
+            _INTERNED.clear()
+        return _INTERNED.setdefault(key, value)
+
+# ==============================================================================
+
+
+def _intern_key(value):
+    """Returns the key value is cached by for INTERN_GRADES
+
+    -0.0 and 0.0 are equal and hash the same, so the sign of every float is
+    part of the key, keeping a negative zero from being swapped for a
+    positive one.
+
+    """
+    if type(value) is tuple:
+        return value, tuple([math.copysign(1.0, i) for i in value])
+    return value, math.copysign(1.0, value)
+
+# ==============================================================================
+
+
+def _interpolate_linear(lut, points, in_range, out):
+    """Linearly interpolates each channel of a 1D LUT at points
+
+    **Args:**
+        lut : (numpy.ndarray)
+            A LUT of shape (size, 3).
+
+        points : (numpy.ndarray)
+            A float64 array of shape (n, 3).
+
+        in_range : (float, float)
+            The input values of the first and last entries.
+
+        out : (numpy.ndarray)
+            An array of shape (n, 3) the results are written to.
+
+    **Returns:**
+        None
+
+    **Raises:**
+        N/A
+
+    """
+    ramp = np.linspace(in_range[0], in_range[1], lut.shape[0])
+    for channel in range(3):
+        out[:, channel] = np.interp(points[:, channel], ramp, lut[:, channel])
+
+# ==============================================================================
+
+
+def _interpolate_tetrahedral(lut, points, in_range, out):
+    """Tetrahedrally interpolates a 3D LUT at points
+
+    **Args:**
+        lut : (numpy.ndarray)
+            A LUT of shape (size, size, size, 3).
+
+        points : (numpy.ndarray)
+            A float64 array of shape (n, 3).
+
+        in_range : (float, float)
+            The input values of the first and last entries.
+
+        out : (numpy.ndarray)
+            An array of shape (n, 3) the results are written to.
+
+    **Returns:**
+        None
+
+    **Raises:**
+        N/A
+
+    Each lattice cell is split into 6 tetrahedra along its black to white
+    diagonal. The tetrahedron holding a point is the one walking from the
+    black corner to the white corner along the axes in order of the point's
+    largest to smallest position within the cell, so ranking those
+    positions picks every point's 4 corners and weights without branching.
+
+    """
+    flat = lut.reshape(-1, 3)
+    base, fractions, strides = _lattice_cells(lut, points, in_range)
+
+    order = np.argsort(-fractions, axis=1)
+    ranked = fractions[np.arange(len(fractions))[:, np.newaxis], order]
+    first = base + strides[order[:, 0]]
+    second = first + strides[order[:, 1]]
+
+    np.multiply(
+        np.take(flat, base, axis=0), 1.0 - ranked[:, 0:1], out=out
+    )
+    out += np.take(flat, first, axis=0) * (ranked[:, 0:1] - ranked[:, 1:2])
+    out += np.take(flat, second, axis=0) * (ranked[:, 1:2] - ranked[:, 2:3])
+    out += np.take(flat, base + strides.sum(), axis=0) * ranked[:, 2:3]
+
+# ==============================================================================
+
+
+def _interpolate_trilinear(lut, points, in_range, out):
+    """Trilinearly interpolates a 3D LUT at points
+
+    **Args:**
+        lut : (numpy.ndarray)
+            A LUT of shape (size, size, size, 3).
+
+        points : (numpy.ndarray)
+            A float64 array of shape (n, 3).
+
+        in_range : (float, float)
+            The input values of the first and last entries.
+
+        out : (numpy.ndarray)
+            An array of shape (n, 3) the results are written to.
+
+    **Returns:**
+        None
+
+    **Raises:**
+        N/A
+
+    """
+    flat = lut.reshape(-1, 3)
+    base, fractions, strides = _lattice_cells(lut, points, in_range)
+
+    # Blend along blue for each of the 4 red and green corner pairs, then
+    # along green, then red.
+    edges = []
+    for offset in (0, strides[1], strides[0], strides[0] + strides[1]):
+        near = np.take(flat, base + offset, axis=0)
+        far = np.take(flat, base + offset + strides[2], axis=0)
+        far -= near
+        far *= fractions[:, 2:3]
+        near += far
+        edges.append(near)
+    for low, high in ((edges[0], edges[1]), (edges[2], edges[3])):
+        high -= low
+        high *= fractions[:, 1:2]
+        low += high
+    edges[2] -= edges[0]
+    edges[2] *= fractions[:, 0:1]
+    np.add(edges[0], edges[2], out=out)
+
+# ==============================================================================
+
+
+def _lattice_cells(lut, points, in_range):
+    """Finds the 3D LUT cell holding each point and the point's place in it
+
+    **Args:**
+        lut : (numpy.ndarray)
+            A LUT of shape (size, size, size, 3).
+
+        points : (numpy.ndarray)
+            A float64 array of shape (n, 3).
+
+        in_range : (float, float)
+            The input values of the first and last entries.
+
+    **Returns:**
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            The flat index of the black corner of each point's cell, an
+            (n, 3) array of how far along each axis of its cell each point
+            lies from 0 to 1, and the flat index strides of the red, green
+            and blue axes.
+
+    **Raises:**
+        N/A
+
+    Points outside of ``in_range`` are clamped to the edge of the LUT.
+
+    """
+    size = lut.shape[0]
+    scaled = (points - in_range[0]) * (
+        (size - 1) / (in_range[1] - in_range[0])
+    )
+    np.clip(scaled, 0, size - 1, out=scaled)
+    index = scaled.astype(np.intp)
+    np.minimum(index, size - 2, out=index)
+    scaled -= index
+
+    strides = np.array([size * size, size, 1], dtype=np.intp)
+    return index.dot(strides), scaled, strides
+
+# ==============================================================================
+
+
+def _luma(pixels, scratch=None):
+    """Returns the Rec 709 luma of pixels, summed into scratch
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            Array with RGB on the last axis.
+
+        scratch=None : (numpy.ndarray)
+            Scratch array in the pixel dtype with a shape of 2 followed by
+            the shape of ``pixels`` without its last axis. If not given, one
+            is created.
+
+    **Returns:**
+        (numpy.ndarray)
+            A view of ``scratch`` holding the luma of each pixel, with a
+            length 1 last axis so that it broadcasts against ``pixels``.
+
+    **Raises:**
+        N/A
+
+    Luma is summed channel by channel rather than with a dot product, so
+    every pixel goes through exactly the same operations no matter how the
+    array is split up.
+
+    """
+    if scratch is None:
+        scratch = np.empty((2, ) + pixels.shape[:-1], dtype=pixels.dtype)
+    luma, term = scratch[0, ...], scratch[1, ...]
+    np.multiply(pixels[..., 0], REC709_LUMA[0], out=luma)
+    np.multiply(pixels[..., 1], REC709_LUMA[1], out=term)
+    np.add(luma, term, out=luma)
+    np.multiply(pixels[..., 2], REC709_LUMA[2], out=term)
+    np.add(luma, term, out=luma)
+    return luma[..., np.newaxis]
+
+# ==============================================================================
+
+
+def _lut_dimensions(name, sat, dimensions):
+    """Picks and checks the dimensions of a LUT baked from a correction
+
+    **Args:**
+        name : (str)
+            The id of the correction to bake, used in errors.
+
+        sat : (float)
+            The saturation of the correction, or 1.0 if none of the
+            corrections in a chain change saturation.
+
+        dimensions : (int|None)
+            1, 3 or None to choose 1 if there's no saturation change and 3
+            otherwise.
+
+    **Returns:**
+        (int)
+            1 or 3.
+
+    **Raises:**
+        ValueError:
+            If dimensions isn't 1 or 3, or if 1 is asked for a correction
+            with saturation.
+
+    """
+    if dimensions is None:
+        dimensions = 1 if sat == 1.0 else 3
+    if dimensions not in (1, 3):
+        raise ValueError(
+            'LUTs can only have 1 or 3 dimensions, not {dims}.'.format(
+                dims=dimensions
+            )
+        )
+    if dimensions == 1 and sat != 1.0:
+        raise ValueError(
+            'Correction {id} has a saturation of {sat}, which mixes '
+            'channels and cannot be baked into a 1D LUT.'.format(
+                id=name,
+                sat=sat
+            )
+        )
+    return dimensions
+
+# ==============================================================================
+
+
+def _lut_format_range(ext, in_range):
+    """Returns the input range to bake for ext, or raises if it can't be
+
+    spi3d LUTs have no way to describe an input range, so they always cover
+    0.0 - 1.0. Other formats get ``in_range`` back unchanged.
+
+    """
+    if ext != 'spi3d':
+        return in_range
+    if in_range is not None and tuple(in_range) != (0.0, 1.0):
+        raise ValueError(
+            'spi3d LUTs always cover an input range of 0.0 - 1.0, and cannot '
+            'be written with an input range of {in_range}.'.format(
+                in_range=tuple(in_range)
+            )
+        )
+    return (0.0, 1.0)
+
+# ==============================================================================
+
+
+def _lut_layout(ext, lut, title, in_range):
+    """Lays out a baked LUT as the text of a LUT file
+
+    **Args:**
+        ext : (str)
+            One of ``LUT_FORMATS``.
+
+        lut : (numpy.ndarray)
+            A baked LUT, as returned by :func:`bake_lut`.
+
+        title : (str)
+            The title of the LUT, for formats that have one.
+
+        in_range : (float, float)
+            The input values of the first and last entries.
+
+    **Returns:**
+        (str, numpy.ndarray, str, str)
+            The header, a two dimensional array with one file row per row,
+            the %-style format of a single row, and the footer.
+
+    **Raises:**
+        N/A
+
+    """
+    size = lut.shape[0]
+    low = _de_exponent(in_range[0])
+    high = _de_exponent(in_range[1])
+
+    if ext == 'spi1d':
+        header = (
+            'Version 1\n'
+            'From {low} {high}\n'
+            'Length {size}\n'
+            'Components 3\n'
+            '{{\n'
+        ).format(low=low, high=high, size=size)
+        return header, lut, '    %.6f %.6f %.6f\n', '}\n'
+
+    if ext == 'spi3d':
+        # Each row leads with the red, green and blue lattice indexes, with
+        # blue changing fastest.
+        rows = np.empty((size ** 3, 6))
+        rows[:, :3] = np.indices((size, size, size)).reshape(3, -1).T
+        rows[:, 3:] = lut.reshape(-1, 3)
+        header = 'SPILUT 1.0\n3 3\n{size} {size} {size}\n'.format(size=size)
+        return header, rows, '%d %d %d %.6f %.6f %.6f\n', ''
+
+    if lut.ndim == 2:
+        header = 'LUT_1D_SIZE {size}\n'
+        rows = lut
+    else:
+        header = 'LUT_3D_SIZE {size}\n'
+        # Cube files list red fastest, then green, then blue.
+        rows = lut.transpose(2, 1, 0, 3).reshape(-1, 3)
+    header = (
+        'TITLE "{title}"\n' + header +
+        'DOMAIN_MIN {low} {low} {low}\n'
+        'DOMAIN_MAX {high} {high} {high}\n'
+    ).format(title=title, size=size, low=low, high=high)
+    return header, rows, '%.6f %.6f %.6f\n', ''
+
+# ==============================================================================
+
+
+def _lut_options(size, in_range, dimensions):
+    """Fills in and checks LUT baking options
+
+    **Args:**
+        size : (int|None)
+            Requested number of entries along each axis, or None for the
+            default of the dimension.
+
+        in_range : ((float, float)|None)
+            Requested input range, or None for ``LUT_RANGE``.
+
+        dimensions : (int)
+            1 or 3.
+
+    **Returns:**
+        (int, (float, float))
+            The size and input range to use.
+
+    **Raises:**
+        ValueError:
+            If size is less than 2 or the range is empty.
+
+    """
+    if size is None:
+        size = LUT_1D_SIZE if dimensions == 1 else LUT_3D_SIZE
+    size = int(size)
+    if size < 2:
+        raise ValueError(
+            'LUT size must be at least 2, not {size}.'.format(size=size)
+        )
+
+    if in_range is None:
+        in_range = LUT_RANGE
+    in_range = (float(in_range[0]), float(in_range[1]))
+    if not in_range[0] < in_range[1]:
+        raise ValueError(
+            'LUT input range {in_range} must go from low to high.'.format(
+                in_range=in_range
+            )
+        )
+
+    return size, in_range
+
+# ==============================================================================
+
+
+def _nearest_centers(values, centers, weights):
+    """Returns the index of the weighted nearest center to each grade"""
+    points = values * weights
+    scaled = centers * weights
+    # The squared distance less the squared length of each point, which
+    # is the same for every center.
+    distances = np.einsum('ij,ij->i', scaled, scaled) - 2.0 * points.dot(
+        scaled.T
+    )
+    return distances.argmin(axis=1)
+
+# ==============================================================================
+
+
+def _read_frame(stream, frame):
+    """Fills the bytes of frame from stream, returning False at the end
+
+    **Args:**
+        stream : (file)
+            A binary stream with a ``readinto()`` method.
+
+        frame : (memoryview)
+            Byte view of the frame buffer to fill.
+
+    **Returns:**
+        (bool)
+            True if a whole frame was read, False if the stream had already
+            ended.
+
+    **Raises:**
+        ValueError:
+            If the stream ends partway through a frame.
+
+    Pipes hand over data in pieces, so reads are repeated until the frame
+    is full, each one going straight into the rest of the buffer.
+
+    """
+    filled = 0
+    while filled < len(frame):
+        count = stream.readinto(frame[filled:])
+        if not count:
+            break
+        filled += count
+
+    if filled and filled < len(frame):
+        raise ValueError(
+            'The stream ended {missing} bytes short of a whole frame.'.format(
+                missing=len(frame) - filled
+            )
+        )
+    return filled > 0
+
+# ==============================================================================
+
+
+def _read_header(image_file, count):
+    """Reads count whitespace separated header fields of a PFM or PPM
+
+    Comments starting with # are skipped, and the single whitespace
+    character that ends the header is consumed, leaving ``image_file`` at
+    the start of the pixel data.
+
+    """
+    fields = []
+    field = b''
+    while len(fields) < count:
+        char = image_file.read(1)
+        if not char:
+            raise ValueError(
+                'The image file: {path} ended inside of its header'.format(
+                    path=image_file.name
+                )
+            )
+        if char == b'#' and not field:
+            image_file.readline()
+        elif char.isspace():
+            if field:
+                fields.append(field.decode('ascii'))
+                field = b''
+        else:
+            field += char
+    return fields
+
+# ==============================================================================
+
+
+def _read_lut(path):
+    """Reads a LUT file written by _write_lut_file back into a baked LUT
+
+    **Args:**
+        path : (str)
+            Path to a .cube, .spi1d or .spi3d file laid out by
+            :func:`_lut_layout` .
+
+    **Returns:**
+        (numpy.ndarray, (float, float))
+            The LUT, shaped as :func:`bake_lut` returns it, and the input
+            values of its first and last entries.
+
+    **Raises:**
+        ValueError:
+            If the file doesn't hold as many entries as its header says.
+
+    Only the layouts this module writes are understood, which is enough to
+    check that what reached the disk is what was baked.
+
+    """
+    with open(path, 'rb') as lut_file:
+        lines = lut_file.read().decode('ascii').splitlines()
+
+    ext = os.path.splitext(path)[1].lower()
+    in_range = (0.0, 1.0)
+    dimensions = 1
+    size = None
+    values = []
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0] in ('{', '}', 'TITLE', 'Version'):
+            continue
+        elif fields[0] in ('LUT_1D_SIZE', 'LUT_3D_SIZE', 'Length'):
+            size = int(fields[1])
+            dimensions = 3 if fields[0] == 'LUT_3D_SIZE' else 1
+        elif fields[0] == 'From':
+            in_range = (float(fields[1]), float(fields[2]))
+        elif fields[0] == 'DOMAIN_MIN':
+            in_range = (float(fields[1]), in_range[1])
+        elif fields[0] == 'DOMAIN_MAX':
+            in_range = (in_range[0], float(fields[1]))
+        elif fields[0] in ('SPILUT', 'Components'):
+            continue
+        elif ext == '.spi3d' and size is None:
+            # The dimension line, then the size of each axis.
+            if fields != ['3', '3']:
+                size = int(fields[0])
+                dimensions = 3
+        else:
+            values.extend(fields)
+
+    columns = 6 if ext == '.spi3d' else 3
+    entries = size ** dimensions if size else 0
+    if not entries or len(values) != entries * columns:
+        raise ValueError(
+            'The LUT file: {path} does not hold the {entries} entries its '
+            'header describes'.format(path=path, entries=entries)
+        )
+    rows = np.array(values, dtype=np.float64).reshape(entries, columns)
+
+    if dimensions == 1:
+        return rows, in_range
+    lut = np.empty((size, size, size, 3))
+    if ext == '.spi3d':
+        indexes = rows[:, :3].astype(np.intp)
+        lut[indexes[:, 0], indexes[:, 1], indexes[:, 2]] = rows[:, 3:]
+    else:
+        # Cube files list red fastest, then green, then blue.
+        lut[:] = rows.reshape(size, size, size, 3).transpose(2, 1, 0, 3)
+    return lut, in_range
+
+# ==============================================================================
+
+
+def _read_pfm(path, shape=None):  # pylint: disable=W0613
+    """Reads a Portable Float Map into a float32 RGB array"""
+    with open(path, 'rb') as image_file:
+        magic, width, height, scale = _read_header(image_file, 4)
+        if magic not in ('PF', 'Pf'):
+            raise ValueError(
+                'The image file: {path} is not a PFM'.format(path=path)
+            )
+        channels = 3 if magic == 'PF' else 1
+        width, height = int(width), int(height)
+        pixels = np.fromfile(
+            image_file,
+            dtype='<f4' if float(scale) < 0 else '>f4',
+            count=width * height * channels
+        )
+
+    if pixels.size != width * height * channels:
+        raise ValueError(
+            'The image file: {path} is missing pixel data'.format(path=path)
+        )
+    # Rows are stored from the bottom of the image up.
+    pixels = np.ascontiguousarray(
+        pixels.reshape(height, width, channels)[::-1], dtype=np.float32
+    )
+    if channels == 1:
+        pixels = np.repeat(pixels, 3, axis=2)
+
+    return pixels
+
+# ==============================================================================
+
+
+def _read_ppm(path, shape=None):  # pylint: disable=W0613
+    """Reads an 8 or 16 bit binary PPM into a uint8 or uint16 RGB array"""
+    with open(path, 'rb') as image_file:
+        magic, width, height, maxval = _read_header(image_file, 4)
+        if magic != 'P6':
+            raise ValueError(
+                'The image file: {path} is not a binary PPM'.format(path=path)
+            )
+        if maxval not in ('255', '65535'):
+            raise ValueError(
+                'The PPM: {path} has a maximum value of {maxval}. Only 8 and '
+                '16 bit PPMs are supported.'.format(path=path, maxval=maxval)
+            )
+        width, height = int(width), int(height)
+        native = np.uint8 if maxval == '255' else np.uint16
+        pixels = np.fromfile(
+            image_file,
+            dtype=np.dtype(native).newbyteorder('>'),
+            count=width * height * 3
+        )
+
+    if pixels.size != width * height * 3:
+        raise ValueError(
+            'The image file: {path} is missing pixel data'.format(path=path)
+        )
+
+    return pixels.reshape(height, width, 3).astype(native)
+
+# ==============================================================================
+
+
+def _read_raw(path, shape=None):
+    """Reads headerless little endian float32 RGB of the given shape"""
+    if shape is None:
+        raise ValueError(
+            'Raw images have no header, so a height and width must be given '
+            'to read: {path}'.format(path=path)
+        )
+    height, width = shape
+    pixels = np.fromfile(path, dtype='<f4')
+    if pixels.size != height * width * 3:
+        raise ValueError(
+            'The raw image: {path} holds {count} values, not the {height} x '
+            '{width} x 3 expected.'.format(
+                path=path, count=pixels.size, height=height, width=width
+            )
+        )
+
+    return pixels.reshape(height, width, 3).astype(np.float32)
+
+# ==============================================================================
+
+
+def _remember_sanitized(results):
+    """Adds raw to sanitized id results to the _SANITIZED cache"""
+    if len(_SANITIZED) + len(results) > _SANITIZED_LIMIT:
+        _SANITIZED.clear()
+    _SANITIZED.update(results)
+
+# ==============================================================================
+
+
+def _render_frames(job):
+    """Reads, grades and writes frames, overlapping all three
+
+    **Args:**
+        job : ( :class:`ColorCorrection` , [(str, str)], str, int, tuple)
+            The correction, a list of source and destination frame paths,
+            the clamping policy, the number of frames each queue holds and
+            the shape of raw frames.
+
+    **Returns:**
+        (int)
+            The number of frames written.
+
+    **Raises:**
+        Whatever reading, grading or writing a frame raised first.
+
+    A thread reads frames into one bounded queue, this thread grades them in
+    place and hands them to a second bounded queue, and another thread
+    writes them out. File reads and writes release the GIL, so they overlap
+    with grading, and at most two queues worth of frames are ever held.
+    After an error every stage stops as soon as it can.
+
+    """
+    cdl, frames, clamp, queue_size, raw_shape = job
+    graded = Queue(queue_size)
+    read = Queue(queue_size)
+    errors = []
+
+    def read_frames():
+        """Reads every frame into the read queue"""
+        try:
+            for src, dst in frames:
+                if errors:
+                    break
+                read.put((read_image(src, raw_shape), dst))
+        except Exception as err:  # pylint: disable=W0703
+            errors.append(err)
+        finally:
+            read.put(None)
+
+    def write_frames():
+        """Writes every frame from the graded queue"""
+        while True:
+            frame = graded.get()
+            if frame is None:
+                return
+            if errors:
+                # Keep emptying the queue so nothing blocks on it.
+                continue
+            try:
+                write_image(frame[1], frame[0])
+            except Exception as err:  # pylint: disable=W0703
+                errors.append(err)
+
+    threads = [
+        threading.Thread(target=read_frames),
+        threading.Thread(target=write_frames),
+    ]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    try:
+        frame = read.get()
+        while frame is not None:
+            if not errors:
+                pixels, dst = frame
+                apply_cdl(pixels, cdl, out=pixels, clamp=clamp)
+                graded.put((pixels, dst))
+            frame = read.get()
+    except Exception as err:  # pylint: disable=W0703
+        errors.append(err)
+        while read.get() is not None:
+            pass
+    finally:
+        graded.put(None)
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+
+    return len(frames)
+
+# ==============================================================================
+
+
+def _require_numpy(feature):
+    """Raises an ImportError naming feature if NumPy isn't installed"""
+    if np is None:
+        raise ImportError(
+            'NumPy is required for {feature}, but it could not be '
+            'imported.'.format(
+                feature=feature
+            )
+        )
+
+# ==============================================================================
+
+
+def _row_bands(pixels, out, memory):
+    """Yields matching slices of pixels and out holding memory bytes or less
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            Array with RGB on the last axis.
+
+        out : (numpy.ndarray)
+            Array of the same shape as ``pixels``.
+
+        memory : (int)
+            The most bytes of ``pixels`` a band should hold. At least one
+            row is always yielded.
+
+    **Yields:**
+        (numpy.ndarray, numpy.ndarray)
+            Views of consecutive rows of ``pixels`` and ``out``.
+
+    **Raises:**
+        N/A
+
+    Arrays with more than 3 dimensions are first split along their leading
+    axes, so a band never spans more than one frame.
+
+    """
+    if pixels.ndim > 3:
+        for i in xrange(pixels.shape[0]):
+            for bands in _row_bands(pixels[i], out[i], memory):
+                yield bands
+        return
+
+    # Empty arrays have no first row to measure, and are yielded whole.
+    if pixels.ndim == 1 or not pixels.shape[0]:
+        yield pixels, out
+        return
+
+    row_bytes = max(pixels[0].size * pixels.itemsize, 1)
+    rows = max(int(memory // row_bytes), 1)
+    for start in xrange(0, pixels.shape[0], rows):
+        yield pixels[start:start + rows], out[start:start + rows]
+
+# ==============================================================================
+
+
+def _sanitize(name):
+    """Removes any characters in string name that aren't alnum or in '_.'"""
+    if not name:
+        # If not name, it's probably an empty string, but let's throw back
+        # exactly what we got.
+        return name
+    try:
+        return _SANITIZED[name]
+    except KeyError:
+        pass
+    raw = name
+    # Replace any spaces with underscores
+    name = name.replace(' ', '_')
+    # If we start our string with an underscore or period, remove it
+    if name[0] in '_.':
+        name = name[1:]
+    # a-z is all lowercase
+    # A-Z is all uppercase
+    # 0-9 is all digits
+    # \. is an escaped period
+    # _ is an underscore
+    # Put them together, negate them by leading with an ^
+    # and _ILLEGAL_ID_CHARS will mark every non alnum, non ., _ character
+    # Then we sub them with nothing
+    fixed = _ILLEGAL_ID_CHARS.sub('', name)
+
+    _remember_sanitized({raw: fixed})
+
+    return fixed
+
+# ==============================================================================
+
+
+def _saturate(pixels, sat, scratch=None, clamp=True):
+    """Applies saturation around Rec 709 luma and clamps, in place
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            Floating point array with RGB on the last axis.
+
+        sat : (numpy.ndarray)
+            Array that broadcasts against ``pixels`` with the last axis
+            removed.
+
+        scratch=None : (numpy.ndarray)
+            Scratch array for :func:`_luma` .
+
+        clamp=True : (bool)
+            Whether to clamp the results to 0.0 - 1.0.
+
+    **Returns:**
+        (numpy.ndarray)
+            ``pixels``
+
+    **Raises:**
+        N/A
+
+    """
+    luma = _luma(pixels, scratch)
+    np.subtract(pixels, luma, out=pixels)
+    np.multiply(pixels, sat, out=pixels)
+    np.add(pixels, luma, out=pixels)
+    if clamp:
+        np.clip(pixels, 0.0, 1.0, out=pixels)
+
+    return pixels
+
+# ==============================================================================
+
+
+def _scratch(buffers, dtype, size):
+    """Returns a flat scratch array of at least size from buffers
+
+    **Args:**
+        buffers : {numpy.dtype: numpy.ndarray}
+            Flat scratch arrays by dtype. If the one for ``dtype`` is
+            missing or too small, it's replaced with a larger one.
+
+        dtype : (numpy.dtype)
+            The dtype of the scratch array.
+
+        size : (int)
+            The number of elements needed.
+
+    **Returns:**
+        (numpy.ndarray)
+            The scratch array, which may be larger than ``size``.
+
+    **Raises:**
+        N/A
+
+    """
+    buffer = buffers.get(dtype)
+    if buffer is None or buffer.size < size:
+        buffer = buffers[dtype] = np.empty(size, dtype=dtype)
+    return buffer
+
+# ==============================================================================
+
+
+def _seed_centers(values, count, weights, random):
+    """Picks grades spread across values to start clustering from
+
+    **Args:**
+        values : (numpy.ndarray)
+            An (n, 10) array of grades to pick from.
+
+        count : (int)
+            The number of grades to pick.
+
+        weights : (numpy.ndarray)
+            The (10, ) scale of each dimension of the distance.
+
+        random : (numpy.random.RandomState)
+            Picks the grades.
+
+    **Returns:**
+        (numpy.ndarray)
+            A (count, 10) array of picked grades.
+
+    Grades are picked as k-means++ picks them, each with a chance in
+    proportion to its squared distance from the nearest grade already
+    picked.
+
+    """
+    points = values * weights
+    chosen = [random.randint(len(points))]
+    offsets = points - points[chosen[0]]
+    distances = np.einsum('ij,ij->i', offsets, offsets)
+    for _ in range(1, count):
+        total = np.cumsum(distances)
+        if total[-1] > 0.0:
+            index = min(
+                int(np.searchsorted(total, random.uniform(0.0, total[-1]))),
+                len(points) - 1
+            )
+        else:
+            index = random.randint(len(points))
+        chosen.append(index)
+        offsets = points - points[index]
+        np.minimum(
+            distances, np.einsum('ij,ij->i', offsets, offsets), out=distances
+        )
+    return values[chosen].copy()
+
+# ==============================================================================
+
+
+def _serialize(value):
+    """Formats a float or tuple of floats as space separated plain text
+
+    If INTERN_GRADES is on, the text is cached against the value so that
+    identical grades are only formatted once.
+
+    """
+    if INTERN_GRADES:
+        key = _intern_key(value)
+        try:
+            return _SERIALIZED[key]
+        except KeyError:
+            pass
+
+    if type(value) is tuple:
+        text = ' '.join([_de_exponent(i) for i in value])
+    else:
+        text = _de_exponent(value)
+
+    if INTERN_GRADES:
+        if len(_SERIALIZED) >= _INTERNED_LIMIT:
+            _SERIALIZED.clear()
+        _SERIALIZED[key] = text
+
+    return text
+
+# ==============================================================================
+
+
+def _signed_power(pixels, func, operands, mirror, out):
+    """Raises pixels to a power without clamping negative values first
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            Floating point array to raise.
+
+        func : (numpy.ufunc)
+            ``np.power``, ``np.square`` or ``np.sqrt``.
+
+        operands : (tuple)
+            The operands of ``func`` that follow the pixels.
+
+        mirror : (bool)
+            If True, negative values are raised as their absolute value and
+            negated back. Otherwise they're left as they are.
+
+        out : (numpy.ndarray)
+            Array matching ``pixels`` to write to. It may be ``pixels``.
+
+    **Returns:**
+        (numpy.ndarray)
+            ``out``
+
+    **Raises:**
+        N/A
+
+    Works in place in ``out``. The only temporary is a boolean mask of the
+    negative values, a quarter of the size of float32 pixels.
+
+    """
+    if pixels is not out:
+        out[...] = pixels
+    negative = np.less(out, 0.0)
+    if mirror:
+        np.negative(out, out=out, where=negative)
+        func(out, *operands, out=out)
+        np.negative(out, out=out, where=negative)
+    else:
+        np.logical_not(negative, out=negative)
+        func(out, *operands, out=out, where=negative)
+
+    return out
+
+# ==============================================================================
+
+
+def _stats_report(stats, ids, percentiles):
+    """Returns the lines of a plain text report of grade_stats results"""
+    lines = []
+    header = ['value', 'mean', 'min', 'max'] + [
+        'p{0:g}'.format(percentile) for percentile in percentiles
+    ]
+    flagged = stats['outliers'].any(axis=1)
+    for number, group in enumerate(stats['groups']):
+        members = np.flatnonzero(stats['group_index'] == number)
+        outliers = members[flagged[members]]
+        lines.append(
+            'Group {group}: {count} grades, {outliers} outliers'.format(
+                group=group,
+                count=stats['count'][number],
+                outliers=len(outliers)
+            )
+        )
+        lines.append(''.join('{0:>12}'.format(i) for i in header))
+        columns = np.vstack([
+            stats['mean'][number],
+            stats['min'][number],
+            stats['max'][number],
+            stats['percentiles'][number],
+        ]).T.tolist()
+        for name, column in zip(_GRADE_VALUES, columns):
+            lines.append('{0:>12}'.format(name) + ''.join(
+                '{0:>12.6g}'.format(value) for value in column
+            ))
+        for index in outliers.tolist():
+            lines.append(
+                'Outlier {id}: {values}'.format(
+                    id=ids[index],
+                    values=', '.join(
+                        name for name, outlier in zip(
+                            _GRADE_VALUES, stats['outliers'][index]
+                        ) if outlier
+                    )
+                )
+            )
+        lines.append('')
+    return lines
+
+# ==============================================================================
+
+
+def _thread_pool(threads):
+    """Returns this process's shared ThreadPool with the number of threads"""
+    # Pools inherited through a fork are keyed by the parent's id, so
+    # they're never used here, and they're left alone since their threads
+    # don't exist in this process to be closed.
+    key = (os.getpid(), threads)
+    with _THREAD_POOLS_LOCK:
+        try:
+            pool = _THREAD_POOLS[key]
+        except KeyError:
+            pool = _THREAD_POOLS[key] = ThreadPool(threads)
+    return pool
+
+# ==============================================================================
+
+
+def _value_arrays(values, dtype):
+    """Returns slope, offset, power and sat arrays for a list of _values()
+
+    **Args:**
+        values : [tuple]
+            Grade values, as returned by :class:`ColorCorrection`
+            ``_values()``.
+
+        dtype : (numpy.dtype)
+            The dtype of the returned arrays.
+
+    **Returns:**
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            Slope, offset and power with a shape of (len(values), 3), and
+            sat with a shape of (len(values), ).
+
+    **Raises:**
+        N/A
+
+    """
+    values = np.array(
+        [
+            grade[0] + grade[1] + grade[2] + (grade[3], )
+            for grade in values
+        ],
+        dtype=dtype
+    ).reshape(len(values), 10)
+    return values[:, 0:3], values[:, 3:6], values[:, 6:9], values[:, 9]
+
+# ==============================================================================
+
+
+def _write_lut_file(path, header, rows, row_format, footer):
+    """Writes a LUT file laid out by _lut_layout to path"""
+    with open(path, 'wb') as lut_f:
+        lut_f.write(enc(header))
+        _write_lut_rows(lut_f, rows, row_format)
+        lut_f.write(enc(footer))
+
+# ==============================================================================
+
+
+def _write_lut_rows(lut_file, rows, row_format):
+    """Streams rows of LUT values to an open binary file
+
+    **Args:**
+        lut_file : (file)
+            File opened for binary writing.
+
+        rows : (numpy.ndarray)
+            Two dimensional array, with one LUT entry per row.
+
+        row_format : (str)
+            %-style format for a single row, including the newline.
+
+    **Returns:**
+        None
+
+    **Raises:**
+        N/A
+
+    Rows are formatted a block at a time, so that neither the whole file
+    nor a string per entry is ever built.
+
+    """
+    for start in xrange(0, rows.shape[0], _LUT_WRITE_ROWS):
+        block = rows[start:start + _LUT_WRITE_ROWS]
+        text = (row_format * block.shape[0]) % tuple(block.ravel().tolist())
+        lut_file.write(enc(text))
+
+# ==============================================================================
+
+
+def _write_pfm(path, pixels):
+    """Writes RGB pixels as a little endian Portable Float Map"""
+    height, width = pixels.shape[:2]
+    with open(path, 'wb') as image_file:
+        image_file.write(
+            enc('PF\n{width} {height}\n-1.0\n'.format(
+                width=width, height=height
+            ))
+        )
+        # Rows are stored from the bottom of the image up.
+        _float_pixels(pixels[::-1]).astype('<f4').tofile(image_file)
+
+# ==============================================================================
+
+
+def _write_ppm(path, pixels):
+    """Writes RGB pixels as an 8 or 16 bit binary PPM
+
+    uint8 pixels are written as 8 bit and uint16 as 16 bit. Anything else is
+    treated as floating point, clamped to 0.0 - 1.0 and written as 16 bit.
+
+    """
+    if pixels.dtype not in (np.uint8, np.uint16):
+        pixels = np.rint(np.clip(pixels, 0.0, 1.0) * 65535).astype(np.uint16)
+    height, width = pixels.shape[:2]
+    with open(path, 'wb') as image_file:
+        image_file.write(
+            enc('P6\n{width} {height}\n{maxval}\n'.format(
+                width=width,
+                height=height,
+                maxval=np.iinfo(pixels.dtype).max
+            ))
+        )
+        pixels.astype(pixels.dtype.newbyteorder('>')).tofile(image_file)
+
+# ==============================================================================
+
+
+def _write_raw(path, pixels):
+    """Writes RGB pixels as headerless little endian float32"""
+    _float_pixels(pixels).astype('<f4').tofile(path)
+
+# ==============================================================================
+# FUNCTIONS
+# ==============================================================================
+
+
+def apply_cdl(pixels, cdl, out=None, dtype=None, bit_depth=None, clamp=None):
+    """Evaluates one or more ColorCorrections on an array of RGB pixels
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            A float16, float32, float64 or unsigned integer array whose last
+            axis holds R, G and B, such as an H x W x 3 frame or an
+            N x H x W x 3 stack of frames.
+
+        cdl : ( :class:`ColorCorrection` ) or [ :class:`ColorCorrection` ]
+            The correction to apply to every pixel. If a list is given
+            instead, it must hold one correction for each entry along the
+            first axis of ``pixels``, and each frame is graded with its own
+            correction. A :class:`CorrectionBatch` with a row for each entry
+            can be given in place of a list.
+
+        out=None : (numpy.ndarray)
+            Array to write the results to. It must match the shape and dtype
+            of ``pixels``, and may be ``pixels`` itself to grade in place.
+
+        dtype=None : (numpy.dtype)
+            The floating point dtype to do the math in. Defaults to the
+            dtype of ``pixels``, except for float16 and integers which are
+            evaluated in float32.
+
+        bit_depth=None : (int)
+            For integer pixels, the number of bits of the code values, such
+            as 10 for 10 bit codes stored in uint16. Code values run from 0
+            to 2 ** bit_depth - 1, and higher codes are treated as the top
+            code. Defaults to every bit of the dtype, up to 16. Ignored for
+            floating point pixels.
+
+        clamp=None : (str)
+            How values are clamped, one of ``CLAMP_MODES``. Defaults to
+            ``CLAMP``. See below.
+
+    **Returns:**
+        (numpy.ndarray)
+            ``out`` if given, otherwise a new array matching ``pixels``.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        TypeError:
+            If ``pixels`` is not floating point or unsigned integer, or if
+            ``dtype`` is not floating point.
+
+        ValueError:
+            If ``pixels`` doesn't have RGB on its last axis, if ``out``
+            doesn't match ``pixels``, if the number of corrections given
+            doesn't match the number of frames, if the bit depth is more
+            than the dtype holds or more than 16, or if ``clamp`` isn't one
+            of ``CLAMP_MODES``.
+
+    Operations are performed in the order Slope, Offset, Power, then
+    Saturation, as the ASC specifies. Saturation uses the Rec 709 luma
+    coefficients found in ``REC709_LUMA``.
+
+    With the 'asc' clamping policy, values are clamped to 0.0 - 1.0 after
+    the Slope and Offset, and again after Saturation, as in the ASC CDL
+    v1.2. With 'none' and 'mirror' values are never clamped, and negative
+    values reaching Power are either left as they are, or raised as their
+    absolute value and kept negative. Integer results are always limited
+    to the codes that exist.
+
+    Each correction is evaluated with its :class:`ColorCorrectionPlan` , see
+    :class:`ColorCorrection` ``compile()``, which leaves out the operations
+    that its values make unnecessary.
+
+    When the math happens in the dtype of ``pixels``, each frame is
+    evaluated in one go. Otherwise it's converted to ``dtype`` a band of
+    rows at a time, as in :func:`apply_cdl_tiled` , so that only
+    ``TILE_MEMORY`` worth of pixels is ever held in ``dtype``. Results
+    are the same either way.
+
+    Integer pixels are also evaluated a band at a time. Slope, offset and
+    power are a function of the code value of each channel, so they're
+    evaluated once per code into a table for each channel, and pixels are
+    graded by looking their codes up. Without saturation the tables give
+    output codes directly. Otherwise saturation is evaluated on the looked
+    up values in ``dtype``, and the results are rounded back to codes.
+
+    """
+    _require_numpy('apply_cdl')
+
+    pixels, out = _check_pixels(pixels, out, integers=True)
+    dtype = _compute_dtype(pixels, dtype)
+    clamp = _clamp_mode(clamp)
+
+    # Frames are evaluated whole unless they need converting.
+    memory = max(pixels.nbytes, 1) if dtype == pixels.dtype else TILE_MEMORY
+
+    buffers = {}
+    for band in _graded_bands(
+            pixels, out, cdl, memory, dtype, bit_depth, clamp):
+        _evaluate_band(band, buffers)
+
+    return out
+
+# ==============================================================================
+
+
+def apply_cdl_chain(pixels, cdls, out=None, dtype=None, memory=None,
+                    clamp=None):
+    """Evaluates a chain of ColorCorrections on pixels in one pass
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            A float16, float32 or float64 array whose last axis holds R, G
+            and B.
+
+        cdls : [ :class:`ColorCorrection` ]
+            The corrections to apply, in order. Each is applied to the
+            results of the one before it, such as a shot grade followed by
+            a sequence grade.
+
+        out=None : (numpy.ndarray)
+            Array to write the results to. It must match the shape and dtype
+            of ``pixels``, and may be ``pixels`` itself to grade in place.
+
+        dtype=None : (numpy.dtype)
+            The floating point dtype to do the math in. Defaults to the
+            dtype of ``pixels``, except for float16 which is evaluated in
+            float32.
+
+        memory=None : (int)
+            Roughly how many bytes of pixels to evaluate at once. Defaults
+            to ``TILE_MEMORY``.
+
+        clamp=None : (str)
+            How values are clamped by every correction in the chain, one of
+            ``CLAMP_MODES``. See :func:`apply_cdl` .
+
+    **Returns:**
+        (numpy.ndarray)
+            ``out`` if given, otherwise a new array matching ``pixels``.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        TypeError:
+            If ``pixels`` or ``dtype`` is not floating point.
+
+        ValueError:
+            If ``pixels`` doesn't have RGB on its last axis, if ``out``
+            doesn't match ``pixels``, if no corrections are given, or if
+            ``clamp`` isn't one of ``CLAMP_MODES``.
+
+    Results are the same as calling :func:`apply_cdl` with each correction
+    in turn, but every correction is evaluated on a band of rows while it's
+    still in cache before moving on to the next band, so pixels only travel
+    to and from memory once however long the chain is. The plan for the
+    chain comes from :func:`compile_chain` , so it's only built once for
+    each distinct chain.
+
+    """
+    _require_numpy('apply_cdl_chain')
+
+    pixels, out = _check_pixels(pixels, out)
+    plan = compile_chain(cdls, _compute_dtype(pixels, dtype), clamp)
+
+    buffers = {}
+    for band, band_out in _row_bands(
+            pixels, out, TILE_MEMORY if memory is None else memory):
+        _evaluate_band((band, band_out, plan), buffers)
+
+    return out
+
+# ==============================================================================
+
+
+def apply_cdl_threaded(pixels, cdl, out=None, threads=None, memory=None,
+                       dtype=None, bit_depth=None, clamp=None):
+    """Evaluates ColorCorrections on pixels with a pool of threads
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            A float16, float32, float64 or unsigned integer array whose last
+            axis holds R, G and B, such as a single frame or a stack of
+            frames.
+
+        cdl : ( :class:`ColorCorrection` ) or [ :class:`ColorCorrection` ]
+            The correction to apply, or one correction per frame. See
+            :func:`apply_cdl` .
+
+        out=None : (numpy.ndarray)
+            Array to write the results to, which may be ``pixels`` itself.
+
+        threads=None : (int)
+            How many threads to evaluate with. Defaults to ``THREADS``, or
+            one per CPU if that's None.
+
+        memory=None : (int)
+            The most bytes of pixel data in a single band. Defaults to
+            ``TILE_MEMORY``, but bands are made smaller when needed so that
+            every thread gets several of them.
+
+        dtype=None : (numpy.dtype)
+            The floating point dtype to do the math in. See
+            :func:`apply_cdl` .
+
+        bit_depth=None : (int)
+            The bit depth of integer pixels. See :func:`apply_cdl` .
+
+        clamp=None : (str)
+            How values are clamped, one of ``CLAMP_MODES``. See
+            :func:`apply_cdl` .
+
+    **Returns:**
+        (numpy.ndarray)
+            ``out`` if given, otherwise a new array matching ``pixels``.
+
+    **Raises:**
+        See :func:`apply_cdl`
+
+    The pixels are split into bands of rows as in :func:`apply_cdl_tiled`,
+    and the bands are handed out to the threads. NumPy releases the GIL
+    while it works, so the threads run on separate cores. Each thread keeps
+    its own scratch buffer. Since bands never overlap and every pixel goes
+    through the same operations, results are bit identical to
+    :func:`apply_cdl` for any number of threads.
+
+    """
+    _require_numpy('apply_cdl_threaded')
+
+    pixels, out = _check_pixels(pixels, out, integers=True)
+
+    if threads is None:
+        threads = THREADS if THREADS else cpu_count()
+    threads = max(int(threads), 1)
+    if memory is None:
+        memory = TILE_MEMORY
+    # Four bands per thread evens out threads finishing at different times.
+    memory = min(memory, max(pixels.nbytes // (threads * 4), 1))
+
+    bands = list(
+        _graded_bands(
+            pixels, out, cdl, memory, _compute_dtype(pixels, dtype), bit_depth,
+            _clamp_mode(clamp)
+        )
+    )
+
+    if threads == 1 or len(bands) == 1:
+        buffers = {}
+        for band in bands:
+            _evaluate_band(band, buffers)
+        return out
+
+    # Scratch buffers for each thread of the pool, only kept for this call.
+    local = threading.local()
+
+    def evaluate(band):
+        """Evaluates a band with this thread's scratch buffers"""
+        try:
+            buffers = local.buffers
+        except AttributeError:
+            buffers = local.buffers = {}
+        _evaluate_band(band, buffers)
+
+    _thread_pool(threads).map(evaluate, bands, chunksize=1)
+
+    return out
+
+# ==============================================================================
+
+
+def apply_cdl_tiled(pixels, cdl, out=None, memory=None, dtype=None,
+                    bit_depth=None, clamp=None):
+    """Evaluates ColorCorrections on pixels one band of rows at a time
+
+    **Args:**
+        pixels : (numpy.ndarray)
+            A float16, float32, float64 or unsigned integer array whose last
+            axis holds R, G and B.
+
+        cdl : ( :class:`ColorCorrection` ) or [ :class:`ColorCorrection` ]
+            The correction to apply, or one correction per frame. See
+            :func:`apply_cdl` .
+
+        out=None : (numpy.ndarray)
+            Array to write the results to, which may be ``pixels`` itself.
+
+        memory=None : (int)
+            The most bytes of pixel data to process in one band. Defaults to
+            ``TILE_MEMORY``. At least one row is always processed at a time.
+
+        dtype=None : (numpy.dtype)
+            The floating point dtype to do the math in. See
+            :func:`apply_cdl` .
+
+        bit_depth=None : (int)
+            The bit depth of integer pixels. See :func:`apply_cdl` .
+
+        clamp=None : (str)
+            How values are clamped, one of ``CLAMP_MODES``. See
+            :func:`apply_cdl` .
+
+    **Returns:**
+        (numpy.ndarray)
+            ``out`` if given, otherwise a new array matching ``pixels``.
+
+    **Raises:**
+        See :func:`apply_cdl`
+
+    Results are identical to :func:`apply_cdl` , but instead of creating
+    frame sized temporaries, every band is evaluated into its slice of
+    ``out`` using a single scratch buffer that is reused for every band.
+    Beyond ``out`` itself, peak memory is around two thirds of ``memory``, no
+    matter how large the frame is. When the math happens in a different
+    dtype than ``pixels``, each band is also copied into a buffer of that
+    dtype.
+
+    """
+    _require_numpy('apply_cdl_tiled')
+
+    pixels, out = _check_pixels(pixels, out, integers=True)
+
+    if memory is None:
+        memory = TILE_MEMORY
+
+    buffers = {}
+    for band in _graded_bands(
+            pixels, out, cdl, memory, _compute_dtype(pixels, dtype), bit_depth,
+            _clamp_mode(clamp)
+    ):
+        _evaluate_band(band, buffers)
+
+    return out
+
+# ==============================================================================
+
+
+def bake_lut(cdl, size=None, in_range=None, dimensions=None, dtype=None,
+             clamp=None):
+    """Evaluates a ColorCorrection over a 1D or 3D lattice of inputs
+
+    **Args:**
+        cdl : ( :class:`ColorCorrection` ) or [ :class:`ColorCorrection` ]
+            The correction to bake, or a chain of corrections to bake into
+            a single LUT, in the order they're applied. See
+            :func:`apply_cdl_chain` .
+
+        size=None : (int)
+            Number of entries along each axis of the LUT, such as 17, 33 or
+            65 for a 3D LUT. Defaults to ``LUT_1D_SIZE`` or ``LUT_3D_SIZE``.
+
+        in_range=None : (float, float)
+            The input values of the first and last entries. Defaults to
+            ``LUT_RANGE``.
+
+        dimensions=None : (int)
+            1 or 3. If None, a 1D LUT is baked if no correction has a
+            saturation change, since a 1D LUT reproduces it exactly, and a
+            3D LUT otherwise.
+
+        dtype=None : (numpy.dtype)
+            The floating point dtype of the LUT. Defaults to float64. The
+            math happens in this dtype, except for float16 which is
+            evaluated in float32, as in :func:`apply_cdl` .
+
+        clamp=None : (str)
+            How values are clamped, one of ``CLAMP_MODES``. See
+            :func:`apply_cdl` . LUTs baked with 'none' or 'mirror' only
+            match the unclamped math inside of ``in_range``, so a wider
+            range is usually wanted with them.
+
+    **Returns:**
+        (numpy.ndarray)
+            A ``dtype`` array of shape (size, 3) for a 1D LUT, or
+            (size, size, size, 3) for a 3D LUT, where entry [r, g, b] is the
+            output for red index r, green g and blue b.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        ValueError:
+            If a 1D LUT is asked for a correction with saturation, if an
+            empty chain is given, if the size or input range is invalid, or
+            if ``clamp`` isn't one of ``CLAMP_MODES``.
+
+    The whole lattice is evaluated in a single vectorized pass, with every
+    correction in a chain applied to a band of the lattice before moving on
+    to the next.
+
+    """
+    _require_numpy('bake_lut')
+
+    cdls = [cdl] if isinstance(cdl, ColorCorrection) else list(cdl)
+    if not cdls:
+        raise ValueError('A chain needs at least one correction.')
+    sat = 1.0
+    name = cdls[0].id
+    for link in cdls:
+        if link._values()[3] != 1.0:  # pylint: disable=W0212
+            sat = link._values()[3]  # pylint: disable=W0212
+            name = link.id
+            break
+
+    dimensions = _lut_dimensions(name, sat, dimensions)
+    size, in_range = _lut_options(size, in_range, dimensions)
+    lattice = _identity_lattice(
+        size, dimensions, in_range, np.float64 if dtype is None else dtype
+    )
+
+    return apply_cdl_chain(lattice, cdls, out=lattice, clamp=clamp)
+
+# ==============================================================================
+
+
+def bake_luts(cdls, ext, size=None, in_range=None, processes=None,
+              dtype=None, clamp=None):
+    """Bakes many ColorCorrections to LUT files with a pool of processes
+
+    **Args:**
+        cdls : [ :class:`ColorCorrection` ]
+            The corrections to bake. Each is written to its ``file_out``,
+            see :class:`ColorCorrection` ``determine_dest()``.
+
+        ext : (str)
+            The LUT format to write, one of ``LUT_FORMATS``.
+
+        size=None : (int)
+            Number of entries along each axis of the LUTs. Defaults to
+            ``LUT_1D_SIZE`` or ``LUT_3D_SIZE``.
+
+        in_range=None : (float, float)
+            The input values of the first and last entries. Defaults to
+            ``LUT_RANGE``.
+
+        processes=None : (int)
+            Number of worker processes. Defaults to ``PROCESSES``, or the
+            number of CPUs if that's None. With 1, or when there's only one
+            grade to bake, everything happens in this process.
+
+        dtype=None : (numpy.dtype)
+            The floating point dtype LUTs are baked in. Defaults to float64.
+            See :func:`bake_lut` .
+
+        clamp=None : (str)
+            How values are clamped, one of ``CLAMP_MODES``. Defaults to
+            ``CLAMP``. See :func:`apply_cdl` .
+
+    **Returns:**
+        (int)
+            The number of distinct grades that were baked.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        ValueError:
+            If ``ext`` isn't a LUT format, if the size, input range or
+            clamping policy is invalid, or if a correction can't be written
+            to the format. All corrections are checked before any file is
+            written.
+
+    Writes the same files as calling the format's write function on each
+    correction, but corrections with the same fingerprint, see
+    :class:`ColorCorrection` ``fingerprint()``, are only evaluated and
+    formatted once. The identity lattice for each LUT size is
+    built once in this process and handed to every worker through shared
+    memory, so workers only allocate their own output.
+
+    """
+    _require_numpy('bake_luts')
+
+    if ext not in LUT_FORMATS:
+        raise ValueError(
+            'The output format: {ext} is not a LUT format'.format(ext=ext)
+        )
+    in_range = _lut_format_range(ext, in_range)
+    clamp = _clamp_mode(clamp)
+    forced = {'spi1d': 1, 'spi3d': 3}.get(ext)
+
+    jobs = {}
+    lattice_options = {}
+    for cdl in cdls:
+        values = cdl._values()  # pylint: disable=W0212
+        dimensions = _lut_dimensions(cdl.id, values[3], forced)
+        if dimensions not in lattice_options:
+            lattice_options[dimensions] = _lut_options(
+                size, in_range, dimensions
+            )
+        job = jobs.setdefault(
+            (cdl.fingerprint(), dimensions),
+            (
+                ext, values, dimensions, lattice_options[dimensions][1],
+                clamp, []
+            )
+        )
+        job[5].append((cdl.file_out, cdl.id))
+    jobs = list(jobs.values())
+
+    if dtype is None:
+        dtype = np.float64
+    lattices = dict(
+        (
+            dimensions,
+            _identity_lattice(lut_size, dimensions, lut_range, dtype)
+        )
+        for dimensions, (lut_size, lut_range) in lattice_options.items()
+    )
+
+    if processes is None:
+        processes = PROCESSES if PROCESSES else cpu_count()
+    processes = min(processes, len(jobs))
+
+    if processes <= 1:
+        outputs = {}
+        buffers = {}
+        for job in jobs:
+            _bake_lut_group(job, lattices, outputs, buffers)
+        return len(jobs)
+
+    shared = {}
+    for dimensions, lattice in lattices.items():
+        raw = RawArray('b', lattice.nbytes)
+        np.frombuffer(raw, dtype=lattice.dtype)[:] = lattice.ravel()
+        shared[dimensions] = (raw, lattice.shape, lattice.dtype.str)
+    del lattices
+
+    pool = Pool(processes, _init_lut_worker, (shared, ))
+    try:
+        for _ in pool.imap_unordered(
+                _bake_lut_job,
+                jobs,
+                max(len(jobs) // (processes * 4), 1)
+        ):
+            pass
+        pool.close()
+    finally:
+        # Every job has finished once the results are read, so this only
+        # stops workers early if a job raised.
+        pool.terminate()
+        pool.join()
+
+    return len(jobs)
+
+# ==============================================================================
+
+
+def blend_cdls(cdls, frames, keys=None, curve=None, domain=None,
+               prefix=None):
+    """Blends between corrections across frames, such as for a dissolve
+
+    **Args:**
+        cdls : [ :class:`ColorCorrection` ]
+            Two or more corrections to blend between, in order.
+
+        frames : (int)
+            Number of frames to make a grade for.
+
+        keys=None : [float]
+            The frame each correction is reached at, increasing. Frames
+            before the first key hold the first correction, and frames past
+            the last key hold the last. Defaults to spreading the
+            corrections evenly from the first frame to the last.
+
+        curve=None : (str)
+            How each blend eases from one correction to the next, one of
+            ``BLEND_CURVES``. Defaults to 'linear'.
+
+        domain=None : (str)
+            How slope is blended, one of ``BLEND_DOMAINS``. Defaults to
+            'sop'.
+
+        prefix=None : (str)
+            Start of the generated ids, which are followed by a padded frame
+            number counting from 1. Defaults to the first id, then 'blend'.
+
+    **Returns:**
+        ( :class:`CorrectionBatch` )
+            A row for every frame. Each row is described with the two
+            corrections it blends and how far from one to the other it is.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        ValueError:
+            If fewer than two corrections or frames are given, if the keys
+            don't increase or don't match the corrections, if ``curve`` or
+            ``domain`` isn't supported, or if slope is blended in 'log' and
+            a correction has a slope of 0.0.
+
+    Every frame is blended at once. The batch can be handed to the
+    evaluation functions with a stack of frames to grade each frame with
+    its own row, compiled a row at a time with its ``compile()`` method,
+    or turned into corrections with ``corrections()`` to bake LUTs.
+
+    """
+    _require_numpy('blend_cdls')
+
+    cdls = list(cdls)
+    frames = int(frames)
+    if len(cdls) < 2 or frames < 2:
+        raise ValueError(
+            'Blending needs at least 2 corrections and 2 frames, not '
+            '{count} corrections and {frames} frames.'.format(
+                count=len(cdls),
+                frames=frames
+            )
+        )
+    if keys is None:
+        keys = np.linspace(0.0, frames - 1.0, len(cdls))
+    keys = np.array(keys, dtype=np.float64)
+    if keys.shape != (len(cdls), ) or not (np.diff(keys) > 0.0).all():
+        raise ValueError(
+            'Blend keys must give an increasing frame for each of the '
+            '{count} corrections, not {keys}.'.format(
+                count=len(cdls),
+                keys=keys.tolist()
+            )
+        )
+    curve = 'linear' if curve is None else curve
+    domain = 'sop' if domain is None else domain
+    for name, value, supported in [
+            ('curve', curve, BLEND_CURVES),
+            ('domain', domain, BLEND_DOMAINS)
+    ]:
+        if value not in supported:
+            raise ValueError(
+                'The blend {name} {value} is not one of: {supported}'.format(
+                    name=name,
+                    value=value,
+                    supported=', '.join(supported)
+                )
+            )
+
+    grades = []
+    for cdl in cdls:
+        slope, offset, power, sat = cdl._values()  # pylint: disable=W0212
+        grades.append(slope + offset + power + (sat, ))
+    grades = np.array(grades)
+    if domain == 'log':
+        if (grades[:, 0:3] == 0.0).any():
+            raise ValueError(
+                'Slope cannot be blended in log when a slope is 0.0.'
+            )
+        grades[:, 0:3] = np.log2(grades[:, 0:3])
+
+    # Which pair of corrections each frame falls between, and how far.
+    positions = np.arange(frames, dtype=np.float64)
+    starts = np.clip(
+        np.searchsorted(keys, positions, side='right') - 1, 0, len(keys) - 2
+    )
+    amounts = (positions - keys[starts]) / (keys[starts + 1] - keys[starts])
+    np.clip(amounts, 0.0, 1.0, out=amounts)
+    if curve == 'ease_in':
+        weights = amounts ** 2
+    elif curve == 'ease_out':
+        weights = 1.0 - (1.0 - amounts) ** 2
+    elif curve == 'ease_in_out':
+        weights = amounts * amounts * (3.0 - 2.0 * amounts)
+    else:
+        weights = amounts
+
+    values = grades[starts] * (1.0 - weights)[:, np.newaxis]
+    values += grades[starts + 1] * weights[:, np.newaxis]
+    if domain == 'log':
+        values[:, 0:3] = np.exp2(values[:, 0:3])
+
+    if prefix is None:
+        prefix = '{id}_blend'.format(id=cdls[0].id)
+    width = max(3, len(str(frames)))
+    ids = [
+        prefix + str(number).rjust(width, '0')
+        for number in range(1, frames + 1)
+    ]
+    descs = [
+        'Blend of {start} and {end} at {amount:g}'.format(
+            start=cdls[start].id,
+            end=cdls[start + 1].id,
+            amount=amount
+        )
+        for start, amount in zip(starts.tolist(), weights.tolist())
+    ]
+
+    return CorrectionBatch(ids, values, descs)
+
+# ==============================================================================
+
+
+def cdl_to_lgg(values):
+    """Converts the slope, offset and power of many grades to lift, gamma, gain
+
+    **Args:**
+        values : (numpy.ndarray|:class:`CorrectionBatch`)
+            A batch, or anything NumPy can turn into an array of shape
+            (n, 10) laid out like :class:`CorrectionBatch` ``values``.
+
+    **Returns:**
+        (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray)
+            The (n, 3) lift, gamma and gain, and the (n, ) saturation, of
+            each grade. A power of 0.0 comes back as a gamma of infinity.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        ValueError:
+            If ``values`` has the wrong shape.
+
+    The inverse of :func:`lgg_to_cdl` . Lift is the offset, and gain is the
+    value an input of 1.0 lands on before power, the slope plus the offset.
+    Every row is converted at once.
+
+    """
+    _require_numpy('cdl_to_lgg')
+
+    values = _grade_values(values)
+
+    lift = values[:, 3:6].copy()
+    gain = values[:, 0:3] + lift
+    with np.errstate(divide='ignore'):
+        gamma = 1.0 / values[:, 6:9]
+
+    return lift, gamma, gain, values[:, 9].copy()
+
+# ==============================================================================
+
+
+def cluster_cdls(batches, clusters, weights=None, passes=None,
+                 batch_size=None, seed=0, prefix=None):
+    """Clusters a stream of grades into the looks they share
+
+    **Args:**
+        batches : ( :class:`CorrectionBatch` |[ :class:`CorrectionBatch` ])
+            The grades to cluster, as a batch, a list of batches, or a
+            function that returns a new iterator of batches each time it's
+            called. A function lets batches be read from files as they're
+            needed, so that every grade is never held at once. (n, 10)
+            arrays laid out like :class:`CorrectionBatch` ``values`` can be
+            given in place of batches.
+
+        clusters : (int)
+            The number of looks to find.
+
+        weights=None : [float]
+            A scale for each of the 10 dimensions of the distance between
+            grades, or one for all of them. Defaults to 1.0.
+
+        passes=None : (int)
+            The most passes over the grades to take. Defaults to
+            ``CLUSTER_PASSES``.
+
+        batch_size=None : (int)
+            The most grades to update the looks from at once. Defaults to
+            ``CLUSTER_BATCH``.
+
+        seed=0 : (int)
+            Seeds the random choices, so the same grades always cluster
+            into the same looks.
+
+        prefix=None : (str)
+            Start of the ids allocated to the looks. Defaults to 'look'.
+
+    **Returns:**
+        ([ :class:`ColorCorrection` ], [numpy.ndarray])
+            A registered correction for each look, holding the mean of the
+            grades in it, most used look first. Then, for each batch, an
+            array holding the index of the look each of its grades belongs
+            to.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        ValueError:
+            If there are fewer grades than ``clusters``, a weight is
+            negative or there aren't 10 of them, or a batch isn't grades.
+
+    Clustering is mini-batch k-means. Looks start from grades spread
+    across the first batch as k-means++ spreads them. Each chunk of
+    grades is then assigned to its nearest looks, and each look moves to
+    the running mean of every grade it has been assigned, so the
+    distances of a whole chunk to every look are found with a single
+    matrix product. A final pass assigns every grade to the look it ends
+    up nearest. Generators can only be read once, so a stream of files
+    should be given as a function that returns one.
+
+    """
+    _require_numpy('cluster_cdls')
+
+    if isinstance(batches, (CorrectionBatch, np.ndarray)):
+        batches = [batches]
+    if not callable(batches):
+        stream = batches
+        batches = lambda: iter(stream)
+    clusters = int(clusters)
+    weights = np.broadcast_to(
+        np.array(1.0 if weights is None else weights, dtype=np.float64),
+        (10, )
+    ).copy()
+    if (weights < 0.0).any():
+        raise ValueError('Clustering weights must not be negative.')
+    if passes is None:
+        passes = CLUSTER_PASSES
+    if batch_size is None:
+        batch_size = CLUSTER_BATCH
+    random = np.random.RandomState(seed)
+
+    # The first chunks seed the looks, and are then the start of the
+    # first pass.
+    chunks = _grade_chunks(batches, batch_size, random)
+    sample = []
+    for chunk in chunks:
+        sample.append(chunk)
+        if sum(len(i) for i in sample) >= max(batch_size, clusters):
+            break
+    sample = np.concatenate(sample) if sample else np.empty((0, 10))
+    if clusters < 1 or len(sample) < clusters:
+        raise ValueError(
+            'At least {clusters} grades are needed to find {clusters} '
+            'looks.'.format(clusters=max(clusters, 1))
+        )
+    centers = _seed_centers(sample, clusters, weights, random)
+    counts = np.zeros(clusters)
+
+    for pass_number in range(passes):
+        if pass_number:
+            chunks = _grade_chunks(batches, batch_size, random)
+        else:
+            chunks = itertools.chain([sample], chunks)
+        start = centers.copy()
+        for chunk in chunks:
+            labels = _nearest_centers(chunk, centers, weights)
+            sizes = np.bincount(labels, minlength=clusters)
+            sums = np.array([
+                np.bincount(labels, chunk[:, i], minlength=clusters)
+                for i in range(10)
+            ]).T
+            counts += sizes
+            hit = sizes > 0
+            centers[hit] += (
+                sums[hit] - sizes[hit, np.newaxis] * centers[hit]
+            ) / counts[hit, np.newaxis]
+        if np.abs((centers - start) * weights).max() <= _CLUSTER_TOLERANCE:
+            break
+
+    memberships = []
+    sizes = np.zeros(clusters, dtype=np.intp)
+    for batch in batches():
+        values = _grade_values(batch)
+        labels = np.empty(len(values), dtype=np.intp)
+        for start in range(0, len(values), batch_size):
+            labels[start:start + batch_size] = _nearest_centers(
+                values[start:start + batch_size], centers, weights
+            )
+        sizes += np.bincount(labels, minlength=clusters)
+        memberships.append(labels)
+
+    # Looks are numbered from the most used.
+    order = np.argsort(-sizes, kind='mergesort')
+    ranks = np.empty(clusters, dtype=np.intp)
+    ranks[order] = np.arange(clusters)
+    memberships = [ranks[labels] for labels in memberships]
+
+    looks = []
+    for center, size in zip(centers[order].tolist(), sizes[order].tolist()):
+        cc_id = ColorCorrection.allocate_id(
+            'look' if prefix is None else prefix
+        )
+        cdl = ColorCorrection(cc_id, '{id}.cc'.format(id=cc_id))
+        cdl.slope = center[0:3]
+        cdl.offset = center[3:6]
+        cdl.power = center[6:9]
+        cdl.sat = center[9]
+        cdl.desc = 'Look of {size} grades'.format(size=size)
+        looks.append(cdl)
+
+    return looks, memberships
+
+# ==============================================================================
+
+
+def compile_chain(cdls, dtype=None, clamp=None):
+    """Returns a ColorCorrectionPlan evaluating a chain of corrections
+
+    **Args:**
+        cdls : [ :class:`ColorCorrection` ]
+            The corrections to apply, in order.
+
+        dtype=None : (numpy.dtype)
+            The floating point dtype the plan evaluates in. Defaults to
+            float64.
+
+        clamp=None : (str)
+            The clamping policy of the plan, one of ``CLAMP_MODES``.
+            Defaults to ``CLAMP``.
+
+    **Returns:**
+        ( :class:`ColorCorrectionPlan` )
+            A plan whose results match applying each correction in turn.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        ValueError:
+            If no corrections are given, or if ``clamp`` isn't one of
+            ``CLAMP_MODES``.
+
+    Chain plans are cached by dtype, clamping policy and the values of each
+    correction, so shots that share a chain of grades share one plan. Chains
+    are built from the cached plan of each correction, see
+    :class:`ColorCorrection` ``compile()``, so a sequence grade that ends
+    the chains of hundreds of shots is only compiled once.
+
+    """
+    _require_numpy('compile_chain')
+
+    cdls = list(cdls)
+    dtype = np.dtype(np.float64 if dtype is None else dtype)
+    clamp = _clamp_mode(clamp)
+    values = tuple(cdl._values() for cdl in cdls)  # pylint: disable=W0212
+    key = (dtype, clamp, values)
+
+    plan = _CHAIN_PLANS.get(key)
+    if plan is None:
+        plan = _chain_plans([cdl.compile(dtype, clamp) for cdl in cdls])
+        if len(_CHAIN_PLANS) >= _CHAIN_PLANS_LIMIT:
+            _CHAIN_PLANS.clear()
+        _CHAIN_PLANS[key] = plan
+
+    return plan
+
+# ==============================================================================
+
+
+def filter_frames(cdl, width, height, dtype=None, stream_in=None,
+                  stream_out=None, bit_depth=None, clamp=None):
+    """Grades a stream of raw RGB frames into another stream
+
+    **Args:**
+        cdl : ( :class:`ColorCorrection` )
+            The correction to apply to every frame.
+
+        width : (int)
+            Width of every frame in pixels.
+
+        height : (int)
+            Height of every frame in pixels.
+
+        dtype=None : (numpy.dtype)
+            The dtype of the interleaved RGB values of the frames, such as
+            uint8, uint16, float16 or float32. Big endian dtypes such as
+            '>u2' are accepted. Defaults to float32.
+
+        stream_in=None : (file)
+            Binary stream to read frames from. Defaults to stdin.
+
+        stream_out=None : (file)
+            Binary stream to write graded frames to. Defaults to stdout.
+
+        bit_depth=None : (int)
+            The bit depth of integer frames. See :func:`apply_cdl` .
+
+        clamp=None : (str)
+            How values are clamped, one of ``CLAMP_MODES``. See
+            :func:`apply_cdl` .
+
+    **Returns:**
+        (int)
+            The number of frames graded.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        TypeError:
+            If ``dtype`` is not floating point or unsigned integer.
+
+        ValueError:
+            If the size, bit depth or clamping policy is invalid, or if the
+            stream ends partway through a frame.
+
+    Frames are read by a second thread into one of two frame buffers while
+    the other is graded in place and written out, so reading overlaps with
+    grading. Both buffers, the bands they're split into and any scratch
+    memory are set up before the first frame, and every frame reuses them,
+    so the only memory traffic per frame is the frame itself. Big endian
+    frames are swapped in place on the way in and out.
+
+    """
+    _require_numpy('filter_frames')
+
+    dtype = np.dtype(np.float32 if dtype is None else dtype)
+    clamp = _clamp_mode(clamp)
+    if width < 1 or height < 1:
+        raise ValueError(
+            'Frames must be at least 1 x 1, not {width} x {height}.'.format(
+                width=width, height=height
+            )
+        )
+    if stream_in is None:
+        stream_in = getattr(sys.stdin, 'buffer', sys.stdin)
+    if stream_out is None:
+        stream_out = getattr(sys.stdout, 'buffer', sys.stdout)
+
+    frames = [
+        np.zeros((height, width, 3), dtype=dtype.newbyteorder('='))
+        for _ in xrange(2)
+    ]
+    _check_pixels(frames[0], None, integers=True)
+    compute = _compute_dtype(frames[0], None)
+    memory = max(frames[0].nbytes, 1) if compute == dtype else TILE_MEMORY
+    bands = [
+        list(
+            _graded_bands(
+                frame, frame, cdl, memory, compute, bit_depth, clamp
+            )
+        )
+        for frame in frames
+    ]
+    views = [memoryview(frame.reshape(-1).view(np.uint8)) for frame in frames]
+    swap = not dtype.isnative
+    buffers = {}
+
+    free = Queue()
+    full = Queue()
+    free.put(0)
+    free.put(1)
+    errors = []
+
+    def read_frames():
+        """Fills free frame buffers until the stream ends"""
+        try:
+            index = free.get()
+            while index is not None and _read_frame(stream_in, views[index]):
+                if swap:
+                    frames[index].byteswap(True)
+                full.put(index)
+                index = free.get()
+        except Exception as err:  # pylint: disable=W0703
+            errors.append(err)
+        full.put(None)
+
+    reader = threading.Thread(target=read_frames)
+    reader.daemon = True
+    reader.start()
+
+    count = 0
+    try:
+        index = full.get()
+        while index is not None:
+            for band in bands[index]:
+                _evaluate_band(band, buffers)
+            if swap:
+                frames[index].byteswap(True)
+            stream_out.write(views[index])
+            count += 1
+            free.put(index)
+            index = full.get()
+    except Exception:
+        # The reader might be waiting on a buffer, but not if it's waiting
+        # on the stream, so it's left to stop with the process.
+        free.put(None)
+        raise
+    reader.join()
+    stream_out.flush()
+
+    if errors:
+        raise errors[0]
+
+    return count
+
+# ==============================================================================
+
+
+def fit_cdl(source, target, cc_id=None, cdl_file=None, in_range=None,
+            clamp=None, iterations=None):
+    """Finds the ColorCorrection that best grades source samples to target
+
+    **Args:**
+        source : (numpy.ndarray|None)
+            Floating point RGB samples of any shape with R, G and B on the
+            last axis, such as the patches of a chart before grading. If
+            None, ``target`` is a 1D or 3D LUT laid out as :func:`bake_lut`
+            returns, and the samples are the inputs of its entries.
+
+        target : (numpy.ndarray)
+            The graded samples, matching ``source``, or a LUT.
+
+        cc_id=None : (str)
+            Id of the returned correction. Defaults to a new id starting
+            with 'fit'. See :class:`ColorCorrection` ``allocate_id()``.
+
+        cdl_file=None : (str)
+            File the returned correction is said to come from. Defaults to
+            ``cc_id`` with a cc extension.
+
+        in_range=None : (float, float)
+            The input values of the first and last entries of a LUT given
+            as ``target``. Defaults to ``LUT_RANGE``.
+
+        clamp=None : (str)
+            The clamping policy the correction will be applied with, one of
+            ``CLAMP_MODES``. See :func:`apply_cdl` .
+
+        iterations=None : (int)
+            The most steps to take. Defaults to ``FIT_ITERATIONS``.
+
+    **Returns:**
+        ( :class:`ColorCorrection` )
+            A new correction whose slope, offset, power and saturation
+            minimize the squared error between the graded ``source`` and
+            ``target``.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        TypeError:
+            If the samples aren't floating point arrays.
+
+        ValueError:
+            If the samples don't have RGB on the last axis or don't match,
+            if ``target`` isn't a LUT when ``source`` is None, if the input
+            range is invalid, if ``clamp`` isn't one of ``CLAMP_MODES`` or
+            if ``cc_id`` is already taken.
+
+    All ten values are fitted at once with Levenberg-Marquardt, starting
+    from a straight line fit of each channel. Every step evaluates the
+    graded samples and the exact derivatives of each grade value on all the
+    samples as whole array operations, so a hundred thousand samples fit in
+    a fraction of a second. Slope, power and saturation are kept from going
+    negative. Like any local fit, the result is the closest grade to that
+    starting point, which is the best one for targets a CDL can reproduce.
+
+    """
+    _require_numpy('fit_cdl')
+
+    clamp = _clamp_mode(clamp)
+    if source is None:
+        target = np.asarray(target)
+        if target.ndim == 2 and target.shape[1] == 3:
+            dimensions = 1
+        elif target.ndim == 4 and \
+                target.shape[1:] == (target.shape[0], target.shape[0], 3):
+            dimensions = 3
+        else:
+            raise ValueError(
+                'A LUT must have a shape of (size, 3) or (size, size, size, '
+                '3), not {shape}.'.format(shape=target.shape)
+            )
+        size, in_range = _lut_options(target.shape[0], in_range, dimensions)
+        source = _identity_lattice(size, dimensions, in_range, np.float64)
+    source, target = _check_pixels(
+        source, np.asarray(target, np.asarray(source).dtype)
+    )
+    # One row per channel, see _fit_terms.
+    source = np.array(source.reshape(-1, 3).T, np.float64, order='C')
+    target = np.array(target.reshape(-1, 3).T, np.float64, order='C')
+    if iterations is None:
+        iterations = FIT_ITERATIONS
+
+    params = np.ones(10)
+    params[3:6] = 0.0
+    for channel in range(3):
+        variance = np.var(source[channel])
+        if variance > 0.0:
+            params[channel] = max(
+                np.mean(
+                    (source[channel] - source[channel].mean()) *
+                    (target[channel] - target[channel].mean())
+                ) / variance,
+                0.0
+            )
+        params[3 + channel] = (
+            target[channel].mean() - params[channel] * source[channel].mean()
+        )
+
+    cost, normal, gradient = _fit_normal_equations(
+        source, target, params, clamp
+    )
+    damping = 1e-3
+    for _ in range(iterations):
+        scale = np.maximum(np.diag(normal), 1e-12)
+        try:
+            step = np.linalg.solve(
+                normal + damping * np.diag(scale), -gradient
+            )
+        except np.linalg.LinAlgError:
+            break
+        trial = params + step
+        np.maximum(trial[0:3], 0.0, out=trial[0:3])
+        np.maximum(trial[6:10], 0.0, out=trial[6:10])
+        trial_cost, trial_normal, trial_gradient = _fit_normal_equations(
+            source, target, trial, clamp
+        )
+        converged = np.abs(step).max() <= _FIT_TOLERANCE
+        if trial_cost < cost:
+            converged |= cost - trial_cost <= _FIT_TOLERANCE * cost
+            params, cost = trial, trial_cost
+            normal, gradient = trial_normal, trial_gradient
+            damping = max(damping / 3.0, 1e-12)
+        else:
+            damping *= 4.0
+        if converged or damping > 1e12:
+            break
+
+    if cc_id is None:
+        cc_id = ColorCorrection.allocate_id('fit')
+    if cdl_file is None:
+        cdl_file = '{id}.cc'.format(id=cc_id)
+    cdl = ColorCorrection(cc_id, cdl_file)
+    cdl.slope = [float(i) for i in params[0:3]]
+    cdl.offset = [float(i) for i in params[3:6]]
+    cdl.power = [float(i) for i in params[6:9]]
+    cdl.sat = float(params[9])
+
+    return cdl
+
+# ==============================================================================
+
+
+def grade_stats(grades, group=None, percentiles=None, fence=None):
+    """Summarises the values of many grades, a group of grades at a time
+
+    **Args:**
+        grades : ( :class:`CorrectionBatch` |[ :class:`ColorCorrection` ])
+            The grades to summarise, as a batch or any collection of
+            corrections.
+
+        group=None : (str|callable|[str]|numpy.ndarray)
+            How to group grades, one of ``STATS_GROUPS``, a function that
+            returns a group name for an id, or a group name or number for
+            each grade. Defaults to a single group named 'all'.
+
+        percentiles=None : [float]
+            The percentiles to find, from 0 to 100. Defaults to
+            ``STATS_PERCENTILES``.
+
+        fence=None : (float)
+            How many interquartile ranges beyond the quartiles of its group
+            a value has to be to be flagged an outlier. Defaults to
+            ``OUTLIER_FENCE``.
+
+    **Returns:**
+        {str: }
+            The results, keyed by:
+
+            - 'groups': The name of each group, sorted.
+            - 'count': An array holding the number of grades in each group.
+            - 'mean', 'min' and 'max': (groups, 10) arrays holding each
+              value of the grades in each group, laid out like
+              :class:`CorrectionBatch` ``values``.
+            - 'percentiles': A (groups, percentiles, 10) array.
+            - 'group_index': The index of the group of each grade.
+            - 'outliers': An (n, 10) boolean array flagging the values of
+              each grade that are outliers in its group.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        ValueError:
+            If there are no grades, ``group`` isn't one of
+            ``STATS_GROUPS`` or doesn't name a group for every grade, or a
+            percentile is outside 0 to 100.
+
+    Grades are sorted by group once, and every statistic is then found for
+    every group at once with reductions over the columns of the batch, so
+    no correction is read a value at a time. Outliers are found with Tukey
+    fences, so a handful of wild grades don't move the fences they're
+    measured against.
+
+    """
+    _require_numpy('grade_stats')
+
+    if not isinstance(grades, CorrectionBatch):
+        grades = CorrectionBatch.from_corrections(grades)
+    if not len(grades):
+        raise ValueError('Statistics need at least one grade.')
+    percentiles = np.array(
+        STATS_PERCENTILES if percentiles is None else percentiles,
+        dtype=np.float64,
+        ndmin=1
+    )
+    if ((percentiles < 0.0) | (percentiles > 100.0)).any():
+        raise ValueError('Percentiles must be from 0 to 100.')
+    if fence is None:
+        fence = OUTLIER_FENCE
+
+    # Names are checked before anything is compared against them, so that
+    # an array of groups is never compared as a whole.
+    if group is None:
+        keys = ['all'] * len(grades)
+    elif isinstance(group, basestring):
+        if group not in STATS_GROUPS:
+            raise ValueError(
+                'Grades can be grouped by {groups}, not {group}.'.format(
+                    groups=', '.join(STATS_GROUPS),
+                    group=group
+                )
+            )
+        elif group == 'scene':
+            keys = [cc_id.split('_')[0] for cc_id in grades.ids]
+        elif group == 'reel':
+            keys = [cc_id.split('_')[-1] for cc_id in grades.ids]
+        else:
+            keys = [cc_id.rsplit('_', 1)[0] for cc_id in grades.ids]
+    elif callable(group):
+        keys = [str(group(cc_id)) for cc_id in grades.ids]
+    else:
+        keys = [str(key) for key in np.asarray(group).reshape(-1).tolist()]
+        if len(keys) != len(grades):
+            raise ValueError(
+                'A group is needed for each of the {count} grades, but '
+                'got {keys}.'.format(count=len(grades), keys=len(keys))
+            )
+    names, index = np.unique(keys, return_inverse=True)
+    index = index.reshape(-1)
+
+    # Rows are held a group at a time, then every column of a group is
+    # sorted at once for the percentiles. Groups of one are already sorted.
+    values = grades.values[np.argsort(index, kind='mergesort')]
+    counts = np.bincount(index, minlength=len(names))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    ranked = values.copy()
+    several = counts > 1
+    for start, end in zip(
+            starts[several].tolist(), (starts + counts)[several].tolist()
+    ):
+        ranked[start:end].sort(axis=0)
+
+    quartiles = _group_percentiles(ranked, starts, counts, [25, 75])
+    spread = fence * (quartiles[:, 1] - quartiles[:, 0])
+    low = (quartiles[:, 0] - spread)[index]
+    high = (quartiles[:, 1] + spread)[index]
+
+    return {
+        'groups': names.tolist(),
+        'count': counts,
+        'mean': np.add.reduceat(values, starts) / counts[:, np.newaxis],
+        'min': np.minimum.reduceat(values, starts),
+        'max': np.maximum.reduceat(values, starts),
+        'percentiles': _group_percentiles(
+            ranked, starts, counts, percentiles
+        ),
+        'group_index': index,
+        'outliers': (grades.values < low) | (grades.values > high),
+    }
+
+# ==============================================================================
+
+
+def lgg_to_cdl(lift, gamma, gain, sat=None):
+    """Converts the lift, gamma and gain of many grades to slope, offset, power
+
+    **Args:**
+        lift : (numpy.ndarray)
+            Anything NumPy can turn into an array of shape (n, 3), holding
+            the value an input of 0.0 lands on before gamma. A single red,
+            green and blue, or a single value, is shared by every row.
+
+        gamma : (numpy.ndarray)
+            Like ``lift``, holding the gamma each channel is raised to the
+            inverse of.
+
+        gain : (numpy.ndarray)
+            Like ``lift``, holding the value an input of 1.0 lands on
+            before gamma.
+
+        sat=None : (numpy.ndarray)
+            An (n, ) saturation for each grade, or one shared by every
+            row. Defaults to 1.0.
+
+    **Returns:**
+        (numpy.ndarray)
+            A float64 array of shape (n, 10) laid out like
+            :class:`CorrectionBatch` ``values``, which can be given
+            straight to a batch.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
+        ValueError:
+            If the arrays can't be broadcast to a common (n, 3) shape, or
+            if a gamma is 0.0 or less, which has no power.
+
+    Lift, gamma and gain are taken as ``(lift + in * (gain - lift)) **
+    (1 / gamma)``, which is a Slope of ``gain - lift`` , an Offset of
+    ``lift`` and a Power of ``1 / gamma`` , so grades convert exactly both
+    ways. Every row is converted at once, so a log of many thousands of
+    grades takes a handful of array operations. Negative slopes, from a
+    lift above gain, are left for :class:`CorrectionBatch` or
+    :class:`ColorCorrection` to clip or raise on.
+
+    """
+    _require_numpy('lgg_to_cdl')
+
+    lift, gamma, gain = np.broadcast_arrays(*[
+        np.array(values, dtype=np.float64, ndmin=2)
+        for values in (lift, gamma, gain)
+    ])
+    if lift.ndim != 2 or lift.shape[1] != 3:
+        raise ValueError(
+            'Lift, gamma and gain must have a shape of (n, 3), not '
+            '{shape}.'.format(shape=lift.shape)
+        )
+    if (gamma <= 0.0).any():
+        raise ValueError(
+            'Gamma must be greater than 0.0 to convert to a power.'
+        )
+
+    values = np.empty((len(lift), 10))
+    np.subtract(gain, lift, out=values[:, 0:3])
+    values[:, 3:6] = lift
+    np.divide(1.0, gamma, out=values[:, 6:9])
+    values[:, 9] = 1.0 if sat is None else sat
+
+    return values
+
+# ==============================================================================
+
+
+def parse_ale(edl_file):
+    """Parses an Avid Log Exchange (ALE) file for CDLs
+
+    **Args:**
+        file : (str)
+            The filepath to the ALE EDL
+
+    **Returns:**
+        [:class:`ColorCorrection`]
+            A list of CDL objects retrieved from the ALE
+
+    **Raises:**
+        ImportError:
+            If the ALE holds lift, gamma and gain and NumPy is not
+            installed.
+
+        ValueError:
+            If a lift, gamma or gain cell doesn't hold 3 numbers, or can't
+            be converted, see :func:`lgg_to_cdl` .
+
+    An ALE file is traditionally gathered during a telecine transfer using
+    standard ASCII characters. Each line theoretically represents a single
+    clip/take/shot.
+
+    Each field of data is tab delineated. We'll be searching for the ASC_SOP,
+    ASC_SAT fields, alone with the standard Scan Filename fields.
+
+    ALEs logged on set often hold lift, gamma and gain instead of ASC_SOP,
+    in the columns named by ``ALE_LGG_COLUMNS`` . The whole log is then
+    converted with :func:`lgg_to_cdl` in one pass.
+
+    The Data line indicates that all the following lines are comprised of
+    shot information.
+
+    """
+    # When we enter a section, we're store the section name
+    section = {
+        'column': False,
+        'data': False
+    }
+
+    # We'll store the correlation between index and field name
+    ale_indexes = {}
+
+    # Split data lines, which we'll turn into cdls once we've seen them all
+    rows = []
+
+    cdls = []
+
+    with open(edl_file, 'r') as edl:
+        lines = edl.readlines()
+        for line in lines:
+            if line.startswith('Column'):
+                section['column'] = True
+                continue
+            elif line.startswith('Data'):
+                section['data'] = True
+                continue
+            elif section['column']:
+                for i, field in enumerate(line.split('\t')):
+                    ale_indexes[field.strip()] = i
+                section['column'] = False
+            elif section['data']:
+                rows.append(line.split('\t'))
+
+    # Sanitizing the entire id column up front means each ColorCorrection
+    # we create below finds its sanitized id already waiting.
+    sanitize_ids([row[ale_indexes['Scan Filename']] for row in rows])
+
+    if 'ASC_SOP' not in ale_indexes and all(
+            column in ale_indexes for column in ALE_LGG_COLUMNS
+    ):
+        _require_numpy('lift, gamma and gain ALE columns')
+        given_ids = [row[ale_indexes['Scan Filename']] for row in rows]
+        ids = sanitize_ids(given_ids)
+        # Blank ids, and ids that sanitizing made collide, are numbered and
+        # suffixed as ColorCorrection does when the rows are created one at
+        # a time, counting the rows before them.
+        taken = set()
+        for i, cc_id in enumerate(ids):
+            if not cc_id:
+                if HALT_ON_ERROR:
+                    raise ValueError('Blank id given to ColorCorrection.')
+                ids[i] = ColorCorrection.allocate_id(
+                    start=len(ColorCorrection.members) + i + 1
+                )
+            elif cc_id != given_ids[i] and (
+                    cc_id in taken or cc_id in ColorCorrection.members
+            ):
+                ids[i] = ColorCorrection.allocate_id(cc_id + '_')
+            taken.add(ids[i])
+        # Each cell is checked on its own, so that a short or blank cell
+        # can't shift the values of later rows onto the wrong clip.
+        grades = []
+        for column in ALE_LGG_COLUMNS:
+            values = []
+            for number, row in enumerate(rows, 1):
+                cell = _LGG_PUNCTUATION.sub(
+                    ' ', row[ale_indexes[column]]
+                ).split()
+                try:
+                    if len(cell) != 3:
+                        raise ValueError
+                    values.append([float(i) for i in cell])
+                except ValueError:
+                    raise ValueError(
+                        'ALE data row {number} ({id}) must hold 3 {column} '
+                        'values, not "{cell}".'.format(
+                            number=number,
+                            id=ids[number - 1],
+                            column=column,
+                            cell=row[ale_indexes[column]].strip()
+                        )
+                    )
+            grades.append(np.array(values, dtype=np.float64).reshape(-1, 3))
+        lift, gamma, gain = grades
+        sat = None
+        if 'ASC_SAT' in ale_indexes:
+            sat = [float(row[ale_indexes['ASC_SAT']]) for row in rows]
+        batch = CorrectionBatch.from_lgg(ids, lift, gamma, gain, sat)
+        return batch.corrections(edl_file)
+
+    for cdl_data in rows:
+        sat = cdl_data[ale_indexes['ASC_SAT']]
+        sop = cdl_data[ale_indexes['ASC_SOP']]
+        cc_id = cdl_data[ale_indexes['Scan Filename']]
+
+        # Determine slope, offset and power from sop
+        # sop should look like:
+        # (1.4 1.9 1.7)(-0.1 -0.26 -0.20)(0.87 1.0 1.32)
+        sop = sop.replace(' ', ', ')
+        sop = sop.replace(')(', ')|(')
+        sop = sop.split('|')
+        sop_values = {
+            'slope': literal_eval(sop[0]),
+            'offset': literal_eval(sop[1]),
+            'power': literal_eval(sop[2])
+        }
+
+        cdl = ColorCorrection(cc_id, edl_file)
+
+        cdl.sat = sat
+        cdl.slope = sop_values['slope']
+        cdl.offset = sop_values['offset']
+        cdl.power = sop_values['power']
+
+        cdls.append(cdl)
+
+    return cdls
+
+# ==============================================================================
+
+
+def parse_cc(cdl_file):
+    """Parses a .cc file for ASC CDL information
+
+    **Args:**
+        file : (str)
+            The filepath to the CC
+
+    **Returns:**
+        [:class:`ColorCorrection`]
+            A list of CDL objects retrieved from the CC
+
+    **Raises:**
+        ValueError:
+            Bad XML formatting can raise ValueError is missing required
+            elements.
+
+    A CC file is really only a single element of a larger CDL or CCC XML file,
+    but this element has become a popular way of passing around single shot
+    CDLs, rather than the much bulkier CDL file.
+
+    A sample CC XML file has text like:
+    ::
+        <ColorCorrection id="cc03340">
+            <SOPNode>
+                <Description>change +1 red, contrast boost</Description>
+                <Slope>1.2 1.3 1.4</Slope>
+                <Offset>0.3 0.0 0.0</Offset>
+                <Power>1.0 1.0 1.0</Power>
+            </SOPNode>
+            <SatNode>
+                <Saturation>1.2</Saturation>
+            </SatNode>
+        </ColorCorrection>
+
+    Additional elements can include multiple descriptions at every level,
+    a description of the input colorspace, and a description of the viewing
+    colorspace and equipment.
+
+    """
+    root = ElementTree.parse(cdl_file).getroot()
+
+    cdls = []
+
+    if not root.tag == 'ColorCorrection':
+        # This is not a CC file...
+        raise ValueError('CC parsed but no ColorCorrection found')
+
+    try:
+        cc_id = root.attrib['id']
+    except KeyError:
+        raise ValueError('No id found on ColorCorrection')
+
+    cdl = ColorCorrection(cc_id, cdl_file)
+
+    # Grab our descriptions and add them to the cdl
+    cdl.parse_xml_descs(root)
+    # See if we have a viewing description.
+    cdl.parse_xml_viewing_desc(root)
+    # See if we have an input description
+    cdl.parse_xml_input_desc(root)
+
+    def find_required(elem, names):
+        """Finds the required element and returns the found value.
+
+        Args:
+            root : <ElementTree.Element>
+                The element to search in.
+
+            names : [str]
+                A list of names the element might be under.
+
+        Raises:
+            ValueError:
+                If element does not contain the required name.
+
+        Returns:
+            <ElementTree.Element>
+
+        """
+        found_element = None
+
+        for possibility in names:
+            found_element = elem.find(possibility)
+            if found_element is not None:
+                break
+
+        # element might never have been triggered.
+        if found_element is None:
+            raise ValueError(
+                'The ColorCorrection element could not be parsed because the '
+                'XML is missing required elements: {elems}'.format(
+                    elems=str(names)
+                )
+            )
+        else:
+            return found_element
+
+    try:
+        sop_xml = find_required(root, SopNode.element_names)
+    except ValueError:
+        sop_xml = None
+    try:
+        sat_xml = find_required(root, SatNode.element_names)
+    except ValueError:
+        sat_xml = None
+
+    if sop_xml is None and sat_xml is None:
+        raise ValueError(
+            'The ColorCorrection element requires either a Sop node or a Sat '
+            'node, and it is missing both.'
+        )
+
+    if sop_xml is not None:
+        cdl.slope = find_required(sop_xml, ['Slope']).text.split()
+        cdl.offset = find_required(sop_xml, ['Offset']).text.split()
+        cdl.power = find_required(sop_xml, ['Power']).text.split()
+
+        # Calling the slope, offset and power attributes on the cdl will have
+        # created an instance of SopNode on cdl.sop_node, so we can populate
+        # those descriptions.
+        cdl.sop_node.parse_xml_descs(sop_xml)
+
+    if sat_xml is not None:
+        cdl.sat = find_required(sat_xml, ['Saturation']).text
+
+        # In the same manor of sop, we can call the sat node now to set the
+        # desc descriptions.
+        cdl.sat_node.parse_xml_descs(sat_xml)
+
+    cdls.append(cdl)
+
+    return cdls
+
+# ==============================================================================
+
+
+def parse_cdl(cdl_file):
+    """Parses a space separated .cdl file for ASC CDL information.
+
+    **Args:**
+        file : (str)
+            The filepath to the CDL
+
+    **Returns:**
+        [:class:`ColorCorrection`]
+            A list with only the single CDL object retrieved from the SS CDL
+
+    **Raises:**
+        N/A
+
+    A space separated cdl file is an internal Rhythm & Hues format used by
+    the Rhythm & Hues for displaying shot level and sequence level within
+    their internally developed playback software.
+
+    The file is a simple file consisting of one line. That line has 10, space
+    separated elements that correspond to the ten ASC CDL elements in order of
+    operations.
+
+    ``SlopeR SlopeG SlopeB OffsetR OffsetG OffsetB PowerR PowerG PowerB Sat``
+
+    """
+    # Although we only parse one cdl file, we still want to return a list
+    cdls = []
+
+    with open(cdl_file, 'r') as cdl_f:
+        # We only need to read the first line
+        line = cdl_f.readline()
+        line = line.split()
+
+        # The filename without extension will become the id
+        filename = os.path.basename(cdl_file).split('.')[0]
+
+        slope = [line[0], line[1], line[2]]
+        offset = [line[3], line[4], line[5]]
+        power = [line[6], line[7], line[8]]
+
+        sat = line[9]
+
+        cdl = ColorCorrection(filename, cdl_file)
+
+        cdl.slope = slope
+        cdl.offset = offset
+        cdl.power = power
+        cdl.sat = sat
+
+        cdls.append(cdl)
+
+    return cdls
+
+# ==============================================================================
+
+
+def parse_flex(edl_file):
+    """Parses a DaVinci FLEx telecine EDL for ASC CDL information.
+
+    **Args:**
+        file : (str)
+            The filepath to the FLEx EDL
+
+    **Returns:**
+        [:class:`ColorCorrection`]
+            A list of CDL objects retrieved from the FLEx
+
+    **Raises:**
+        N/A
+
+    The DaVinci FLEx EDL is an odd duck, it's information conveyed via an
+    extremely strict line & character addressing system.
+
+    Each line must begin with a line number header that indicated what type
+    of information the line contains, with line number 100 indicating the
+    start of a new shot/take. Lines 000-099 contain session information.
+
+    Within each line, important information is constricted to a certain
+    range of characters, rather than space or comma separated like in an
+    ALE EDL.
+
+    Some line numbers we care about, and the character indexes:
+
+    +--------+---------------+------------+---------------------------------+
+    | Line # | Line Name     | Char Index | Data Type                       |
+    +========+===============+============+=================================+
+    | 010    | Project Title | 10-79      | Title                           |
+    +--------+---------------+------------+---------------------------------+
+    | 100    | Slate Info    | 10-17      | Scene                           |
+    +--------+---------------+------------+---------------------------------+
+    |        |               | 24-31      | Take ID                         |
+    +--------+---------------+------------+---------------------------------+
+    |        |               | 42-49      | Camera Reel ID                  |
+    +--------+---------------+------------+---------------------------------+
+    | 701    | ASC SOP       | (This entry can be safely space separated)   |
+    +--------+---------------+------------+---------------------------------+
+    | 702    | ASC SAT       | (This entry can be safely space separated)   |
+    +--------+---------------+------------+---------------------------------+
+
+    We'll try and default to using the Slate information to derive the
+    resultant filename, however that information is optional. If no
+    slate information is found, we'll iterate up at the end of the title.
+    If no title information is found, we'll have to iterate up on the
+    actual input filename, which is far from ideal.
+
+    """
+
+    cdls = []
+
+    with open(edl_file, 'r') as edl:
+        lines = edl.readlines()
+
+        filename = os.path.basename(edl_file).split('.')[0]
+
+        title = None
+        # Metadata will store, in order, the various scene, take, reel fields
+        # it finds.
+        metadata = []
+
+        sop = {}
+        sat = None
+
+        def build_cc(line_id, edl_path, sop_dict, sat_value, title_line):
+            """Builds and returns a cc if sop/sat values found"""
+            if line_id is None:
+                # No slate information, so we number up from the title or
+                # filename, skipping any ids that are already taken.
+                field = title_line if title_line else filename
+                line_id = ColorCorrection.allocate_id(field, len(cdls) + 1)
+            col_cor = ColorCorrection(line_id, edl_path)
+            if title_line:
+                col_cor.desc = title_line
+            if sop_dict:
+                # If it finds the 701 line, it will have all three
+                col_cor.slope = sop_dict['slope']
+                col_cor.offset = sop_dict['offset']
+                col_cor.power = sop_dict['power']
+            if sat_value:
+                col_cor.sat = sat_value
+
+            return col_cor
+
+        for line in lines:
+            if line.startswith('100'):
+                # This is the start of a take/shot
+                # We need to dump the previous records to a CDL
+                # Then clear the records.
+                # Note that the first data line will also hit this.
+                metadata = [i for i in metadata if i != '']
+                cc_id = '_'.join(metadata) if metadata else None
+
+                # If we already have values:
+                if sop or sat:
+                    cdl = build_cc(cc_id, edl_file, sop, sat, title)
+                    cdls.append(cdl)
+
+                metadata = []
+                sop = {}
+                sat = None
+
+            elif line.startswith('010'):
+                # Title Line
+                # 10-79 Title
+                title = line[10:80].strip()
+            elif line.startswith('110'):
+                # Slate Information
+                # 10-17 Scene
+                # 24-31 Take ID
+                # 42-49 Camera Reel ID
+                metadata = [
+                    line[10:18].strip(),  # Scene
+                    line[24:32].strip(),  # Take
+                    line[42:50].strip(),  # Reel
+                ]
+            elif line.startswith('701'):
+                # ASC SOP
+                # 701 ASC_SOP(# # #)(-# -# -#)(# # #)
+                sop = {
+                    'slope': line[12:32].split(),
+                    'offset': line[34:57].split(),
+                    'power': line[59:79].split()
+                }
+            elif line.startswith('702'):
+                # ASC SAT
+                # 702 ASC_SAT ######
+                sat = float(line.split()[-1])
 
-    return fixed
+    # We need to dump the last record to the cdl list
+    metadata = [i for i in metadata if i != '']
+    cc_id = '_'.join(metadata) if metadata else None
+
+    # If we found values at all:
+    if sop or sat:
+        cdl = build_cc(cc_id, edl_file, sop, sat, title)
+        cdls.append(cdl)
+
+    return cdls
 
-# ==============================================================================
-# FUNCTIONS
 # ==============================================================================
 
 
-def parse_ale(edl_file):
-    """Parses an Avid Log Exchange (ALE) file for CDLs
+def read_image(path, shape=None):
+    """Reads an uncompressed image file into an array of RGB pixels
 
     **Args:**
-        file : (str)
-            The filepath to the ALE EDL
+        path : (str)
+            Path to a file with one of the extensions in ``IMAGE_FORMATS``.
+
+        shape=None : (int, int)
+            The height and width of raw images, which have no header to say.
+            Ignored for other formats.
 
     **Returns:**
-        [:class:`ColorCorrection`]
-            A list of CDL objects retrieved from the ALE
+        (numpy.ndarray)
+            An H x W x 3 array. PFM and raw images are read as float32, and
+            8 and 16 bit PPM images as uint8 and uint16 code values.
 
     **Raises:**
-        N/A
+        ImportError:
+            If NumPy is not installed.
 
-    An ALE file is traditionally gathered during a telecine transfer using
-    standard ASCII characters. Each line theoretically represents a single
-    clip/take/shot.
-
-    Each field of data is tab delineated. We'll be searching for the ASC_SOP,
-    ASC_SAT fields, alone with the standard Scan Filename fields.
+        ValueError:
+            If the extension isn't a supported image format, if the file
+            isn't valid for its format, or if a raw image doesn't match
+            ``shape``.
 
-    The Data line indicates that all the following lines are comprised of
-    shot information.
+    Single channel PFMs are read as grey RGB.
 
     """
-    # When we enter a section, we're store the section name
-    section = {
-        'column': False,
-        'data': False
-    }
+    _require_numpy('read_image')
 
-    # We'll store the correlation between index and field name
-    ale_indexes = {}
+    return _image_format(path)[0](path, shape)
 
-    cdls = []
+# ==============================================================================
 
-    with open(edl_file, 'r') as edl:
-        lines = edl.readlines()
-        for line in lines:
-            if line.startswith('Column'):
-                section['column'] = True
-                continue
-            elif line.startswith('Data'):
-                section['data'] = True
-                continue
-            elif section['column']:
-                for i, field in enumerate(line.split('\t')):
-                    ale_indexes[field] = i
-                section['column'] = False
-            elif section['data']:
-                cdl_data = line.split('\t')
-
-                sat = cdl_data[ale_indexes['ASC_SAT']]
-                sop = cdl_data[ale_indexes['ASC_SOP']]
-                cc_id = cdl_data[ale_indexes['Scan Filename']]
-
-                # Determine slope, offset and power from sop
-                # sop should look like:
-                # (1.4 1.9 1.7)(-0.1 -0.26 -0.20)(0.87 1.0 1.32)
-                sop = sop.replace(' ', ', ')
-                sop = sop.replace(')(', ')|(')
-                sop = sop.split('|')
-                sop_values = {
-                    'slope': literal_eval(sop[0]),
-                    'offset': literal_eval(sop[1]),
-                    'power': literal_eval(sop[2])
-                }
 
-                cdl = ColorCorrection(cc_id, edl_file)
+def render_sequences(decisions, dest, ext=None, processes=None,
+                     queue_size=None, clamp=None, raw_shape=None):
+    """Grades every frame of image sequences across a pool of processes
 
-                cdl.sat = sat
-                cdl.slope = sop_values['slope']
-                cdl.offset = sop_values['offset']
-                cdl.power = sop_values['power']
+    **Args:**
+        decisions : [( :class:`ColorCorrection` , :class:`MediaRef` )]
+            Pairs of a correction and the media it grades. Every frame of
+            every sequence found by the :class:`MediaRef` , see its
+            ``frames`` attribute, is graded with the correction.
 
-                cdls.append(cdl)
+        dest : (str)
+            Directory the graded frames are written to, with the same file
+            names as their sources. It's created if missing.
 
-    return cdls
+        ext=None : (str)
+            An extension from ``IMAGE_FORMATS`` to write the graded frames
+            as. Defaults to the format of each source frame.
 
-# ==============================================================================
+        processes=None : (int)
+            Number of worker processes. Defaults to ``PROCESSES``, or the
+            number of CPUs if that's None. With 1, everything happens in
+            this process.
 
+        queue_size=None : (int)
+            Frames held between each stage of each process. Defaults to
+            ``RENDER_QUEUE``.
 
-def parse_cc(cdl_file):
-    """Parses a .cc file for ASC CDL information
+        clamp=None : (str)
+            How values are clamped, one of ``CLAMP_MODES``. See
+            :func:`apply_cdl` .
 
-    **Args:**
-        file : (str)
-            The filepath to the CC
+        raw_shape=None : (int, int)
+            The height and width of raw source frames.
 
     **Returns:**
-        [:class:`ColorCorrection`]
-            A list of CDL objects retrieved from the CC
+        (int)
+            The number of frames rendered.
 
     **Raises:**
+        ImportError:
+            If NumPy is not installed.
+
         ValueError:
-            Bad XML formatting can raise ValueError is missing required
-            elements.
+            If a :class:`MediaRef` has no frames on disk, if a frame isn't a
+            supported image format, if a graded frame would overwrite its
+            source, or if ``ext`` or ``clamp`` is invalid. Everything is
+            checked before any frame is read. Errors reading, grading or
+            writing a frame are raised once the other frames in flight have
+            finished.
+
+    Frames are split into runs of consecutive frames that are handed out to
+    the processes. Each process reads, grades and writes its frames at the
+    same time through a pair of bounded queues, so disk access overlaps with
+    grading without ever holding more than a few frames in memory. Frames
+    are graded in place in their own dtype, so PPM code values are graded
+    through the tables described in :func:`apply_cdl` .
 
-    A CC file is really only a single element of a larger CDL or CCC XML file,
-    but this element has become a popular way of passing around single shot
-    CDLs, rather than the much bulkier CDL file.
+    """
+    _require_numpy('render_sequences')
 
-    A sample CC XML file has text like:
-    ::
-        <ColorCorrection id="cc03340">
-            <SOPNode>
-                <Description>change +1 red, contrast boost</Description>
-                <Slope>1.2 1.3 1.4</Slope>
-                <Offset>0.3 0.0 0.0</Offset>
-                <Power>1.0 1.0 1.0</Power>
-            </SOPNode>
-            <SatNode>
-                <Saturation>1.2</Saturation>
-            </SatNode>
-        </ColorCorrection>
+    clamp = _clamp_mode(clamp)
+    if ext is not None:
+        ext = ext.lower()
+        if ext not in IMAGE_FORMATS:
+            raise ValueError(
+                'The render format: {ext} is not supported'.format(ext=ext)
+            )
+    if queue_size is None:
+        queue_size = RENDER_QUEUE
 
-    Additional elements can include multiple descriptions at every level,
-    a description of the input colorspace, and a description of the viewing
-    colorspace and equipment.
+    sequences = []
+    for cdl, media_ref in decisions:
+        frames = media_ref.frames
+        if not frames:
+            raise ValueError(
+                'No frames were found for the media: {ref}'.format(
+                    ref=media_ref.ref
+                )
+            )
+        targets = []
+        for src in frames:
+            _image_format(src)
+            name = os.path.basename(src)
+            if ext:
+                name = os.path.splitext(name)[0] + '.' + ext
+            dst = os.path.join(dest, name)
+            if os.path.abspath(dst) == os.path.abspath(src):
+                raise ValueError(
+                    'Rendering {src} would overwrite it.'.format(src=src)
+                )
+            targets.append((src, dst))
+        sequences.append((cdl, targets))
+
+    total = sum(len(targets) for _, targets in sequences)
+    if processes is None:
+        processes = PROCESSES if PROCESSES else cpu_count()
+    processes = max(min(processes, total), 1)
+
+    # Two runs per process evens out processes finishing at different times.
+    run = max(total // (processes * 2), 1)
+    jobs = [
+        (cdl, targets[i:i + run], clamp, queue_size, raw_shape)
+        for cdl, targets in sequences
+        for i in xrange(0, len(targets), run)
+    ]
+
+    if not os.path.isdir(dest):
+        os.makedirs(dest)
+
+    if processes == 1:
+        for job in jobs:
+            _render_frames(job)
+        return total
+
+    pool = Pool(processes)
+    try:
+        for _ in pool.imap_unordered(_render_frames, jobs):
+            pass
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+    return total
+
+# ==============================================================================
+
+
+def reset_interned_grades():
+    """Empties the value and text caches used by INTERN_GRADES
+
+    Nodes that already hold an interned value keep it, but new values will
+    no longer be matched against anything set before the reset.
 
     """
-    root = ElementTree.parse(cdl_file).getroot()
+    _INTERNED.clear()
+    _SERIALIZED.clear()
 
-    cdls = []
+# ==============================================================================
 
-    if not root.tag == 'ColorCorrection':
-        # This is not a CC file...
-        raise ValueError('CC parsed but no ColorCorrection found')
 
-    try:
-        cc_id = root.attrib['id']
-    except KeyError:
-        raise ValueError('No id found on ColorCorrection')
+def sample_lut(lut, points, in_range=None, interpolation=None, out=None):
+    """Looks up points in a baked LUT, interpolating between its entries
 
-    cdl = ColorCorrection(cc_id, cdl_file)
+    **Args:**
+        lut : (numpy.ndarray)
+            A 1D LUT of shape (size, 3) or a 3D LUT of shape
+            (size, size, size, 3), laid out as :func:`bake_lut` returns.
 
-    # Grab our descriptions and add them to the cdl
-    cdl.parse_xml_descs(root)
-    # See if we have a viewing description.
-    cdl.parse_xml_viewing_desc(root)
-    # See if we have an input description
-    cdl.parse_xml_input_desc(root)
+        points : (numpy.ndarray)
+            Floating point RGB inputs of any shape with R, G and B on the
+            last axis.
 
-    def find_required(elem, names):
-        """Finds the required element and returns the found value.
+        in_range=None : (float, float)
+            The input values of the first and last entries. Defaults to
+            ``LUT_RANGE``.
 
-        Args:
-            root : <ElementTree.Element>
-                The element to search in.
+        interpolation=None : (str)
+            One of ``LUT_INTERPOLATIONS``. 1D LUTs only support 'linear' and
+            3D LUTs 'trilinear' and 'tetrahedral'. Defaults to 'linear' for
+            1D LUTs and 'tetrahedral' for 3D LUTs.
 
-            names : [str]
-                A list of names the element might be under.
+        out=None : (numpy.ndarray)
+            An array matching ``points`` to write results to.
 
-        Raises:
-            ValueError:
-                If element does not contain the required name.
+    **Returns:**
+        (numpy.ndarray)
+            ``out``, or a new array matching ``points``, holding the LUT's
+            output for each point.
 
-        Returns:
-            <ElementTree.Element>
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
 
-        """
-        found_element = None
+        TypeError:
+            If ``points`` isn't a floating point array.
 
-        for possibility in names:
-            found_element = elem.find(possibility)
-            if found_element is not None:
-                break
+        ValueError:
+            If ``lut`` isn't a 1D or 3D LUT, if the input range is invalid,
+            if ``interpolation`` doesn't suit the LUT or if ``points`` or
+            ``out`` have the wrong shape.
 
-        # element might never have been triggered.
-        if found_element is None:
-            raise ValueError(
-                'The ColorCorrection element could not be parsed because the '
-                'XML is missing required elements: {elems}'.format(
-                    elems=str(names)
-                )
-            )
-        else:
-            return found_element
+    Points outside of ``in_range`` are clamped to it, as LUT files are
+    applied. The lookups are vectorized and done in float64 a chunk of
+    points at a time.
 
-    try:
-        sop_xml = find_required(root, SopNode.element_names)
-    except ValueError:
-        sop_xml = None
-    try:
-        sat_xml = find_required(root, SatNode.element_names)
-    except ValueError:
-        sat_xml = None
+    """
+    _require_numpy('sample_lut')
 
-    if sop_xml is None and sat_xml is None:
+    lut = np.asarray(lut)
+    if lut.ndim == 2 and lut.shape[1] == 3:
+        dimensions = 1
+    elif lut.ndim == 4 and lut.shape[1:] == (lut.shape[0], lut.shape[0], 3):
+        dimensions = 3
+    else:
         raise ValueError(
-            'The ColorCorrection element requires either a Sop node or a Sat '
-            'node, and it is missing both.'
+            'A LUT must have a shape of (size, 3) or (size, size, size, 3), '
+            'not {shape}.'.format(shape=lut.shape)
+        )
+    in_range = _lut_options(lut.shape[0], in_range, dimensions)[1]
+
+    interpolators = {
+        1: {'linear': _interpolate_linear},
+        3: {
+            'trilinear': _interpolate_trilinear,
+            'tetrahedral': _interpolate_tetrahedral,
+        },
+    }[dimensions]
+    if interpolation is None:
+        interpolation = 'linear' if dimensions == 1 else 'tetrahedral'
+    if interpolation not in interpolators:
+        raise ValueError(
+            'A {dimensions}D LUT cannot use {interpolation} interpolation. '
+            'Use one of: {supported}'.format(
+                dimensions=dimensions,
+                interpolation=interpolation,
+                supported=', '.join(sorted(interpolators))
+            )
         )
+    interpolator = interpolators[interpolation]
+
+    points, out = _check_pixels(points, out)
+    points = points.reshape(-1, 3)
+    results = out.reshape(-1, 3)
+    for start in range(0, len(points), _SAMPLE_CHUNK):
+        chunk = slice(start, start + _SAMPLE_CHUNK)
+        interpolator(
+            lut, np.asarray(points[chunk], np.float64), in_range,
+            results[chunk]
+        )
+    if not np.may_share_memory(results, out):
+        # out wasn't contiguous, so reshaping it made a copy.
+        out[...] = results.reshape(out.shape)
 
-    if sop_xml is not None:
-        cdl.slope = find_required(sop_xml, ['Slope']).text.split()
-        cdl.offset = find_required(sop_xml, ['Offset']).text.split()
-        cdl.power = find_required(sop_xml, ['Power']).text.split()
+    return out
 
-        # Calling the slope, offset and power attributes on the cdl will have
-        # created an instance of SopNode on cdl.sop_node, so we can populate
-        # those descriptions.
-        cdl.sop_node.parse_xml_descs(sop_xml)
+# ==============================================================================
 
-    if sat_xml is not None:
-        cdl.sat = find_required(sat_xml, ['Saturation']).text
 
-        # In the same manor of sop, we can call the sat node now to set the
-        # desc descriptions.
-        cdl.sat_node.parse_xml_descs(sat_xml)
+def sanitize_ids(names):
+    """Sanitizes a whole column of ids at once
 
-    cdls.append(cdl)
+    **Args:**
+        names : [str]
+            Raw ids, as they were found in a file. Repeats are expected.
 
-    return cdls
+    **Returns:**
+        [str]
+            The ids in the same order, with the same changes ``_sanitize``
+            would have made to each.
+
+    **Raises:**
+        N/A
+
+    Every distinct id that hasn't been seen before is sanitized in one regex
+    pass over the joined column, rather than one pass per id. The results
+    are remembered, so that creating a :class:`ColorCorrection` from any of
+    these ids afterwards won't have to sanitize it again.
+
+    """
+    todo = set()
+    for name in names:
+        if name and name not in _SANITIZED:
+            todo.add(name)
+
+    # Names containing a newline can't be joined on one, so they're rare
+    # enough to go through the single id path.
+    joinable = [name for name in todo if '\n' not in name]
+    for name in todo.difference(joinable):
+        _sanitize(name)
+
+    if joinable:
+        column = '\n'.join(joinable).replace(' ', '_')
+        column = _LEADING_ID_CHARS_LINES.sub('', column)
+        column = _ILLEGAL_ID_CHARS_LINES.sub('', column)
+        _remember_sanitized(dict(zip(joinable, column.split('\n'))))
+
+    return [_sanitize(name) for name in names]
 
 # ==============================================================================
 
 
-def parse_cdl(cdl_file):
-    """Parses a space separated .cdl file for ASC CDL information.
+def verify_lut(cdl, lut=None, size=None, in_range=None, dimensions=None,
+               samples=None, interpolations=None, seed=0, clamp=None):
+    """Measures how closely a baked LUT reproduces a ColorCorrection
 
     **Args:**
-        file : (str)
-            The filepath to the CDL
+        cdl : ( :class:`ColorCorrection` ) or [ :class:`ColorCorrection` ]
+            The correction, or chain of corrections, the LUT was baked from.
+
+        lut=None : (numpy.ndarray)
+            The LUT to check, as returned by :func:`bake_lut` . If None, one
+            is baked from ``cdl`` with ``size``, ``in_range``,
+            ``dimensions`` and ``clamp``.
+
+        size=None : (int)
+            Size of the LUT to bake if ``lut`` isn't given.
+
+        in_range=None : (float, float)
+            The input values of the first and last entries. Defaults to
+            ``LUT_RANGE``. Samples are drawn from within this range.
+
+        dimensions=None : (int)
+            Dimensions of the LUT to bake if ``lut`` isn't given. See
+            :func:`bake_lut` .
+
+        samples=None : (int)
+            Number of random RGB inputs to compare at. Defaults to
+            ``VERIFY_SAMPLES``.
+
+        interpolations=None : [str]
+            The ``LUT_INTERPOLATIONS`` to measure. Defaults to every one the
+            LUT supports.
+
+        seed=0 : (int)
+            Seed for the random inputs, so repeated runs report the same
+            errors. None draws fresh inputs every time.
+
+        clamp=None : (str)
+            How values are clamped, one of ``CLAMP_MODES``. Must match how
+            the LUT was baked. See :func:`apply_cdl` .
 
     **Returns:**
-        [:class:`ColorCorrection`]
-            A list with only the single CDL object retrieved from the SS CDL
+        {str: (float, float)}
+            The maximum and RMS absolute error over every channel of every
+            sample, keyed by interpolation.
 
     **Raises:**
-        N/A
-
-    A space separated cdl file is an internal Rhythm & Hues format used by
-    the Rhythm & Hues for displaying shot level and sequence level within
-    their internally developed playback software.
+        ImportError:
+            If NumPy is not installed.
 
-    The file is a simple file consisting of one line. That line has 10, space
-    separated elements that correspond to the ten ASC CDL elements in order of
-    operations.
+        ValueError:
+            If ``samples`` is less than 1, or for any of the reasons
+            :func:`bake_lut` or :func:`sample_lut` raise.
 
-    ``SlopeR SlopeG SlopeB OffsetR OffsetG OffsetB PowerR PowerG PowerB Sat``
+    Each chunk of samples is evaluated exactly with :func:`apply_cdl_chain`
+    in float64 and looked up in the LUT with :func:`sample_lut` , so the
+    errors are what interpolating the LUT costs over the math. A million
+    samples take a fraction of a second for each interpolation, which is
+    quick enough to check every LUT as it's baked.
 
     """
-    # Although we only parse one cdl file, we still want to return a list
-    cdls = []
+    _require_numpy('verify_lut')
+
+    cdls = [cdl] if isinstance(cdl, ColorCorrection) else list(cdl)
+    if lut is None:
+        lut = bake_lut(cdls, size, in_range, dimensions, clamp=clamp)
+    lut = np.asarray(lut)
+    in_range = LUT_RANGE if in_range is None else in_range
+    if interpolations is None:
+        interpolations = (
+            ['linear'] if lut.ndim == 2 else ['trilinear', 'tetrahedral']
+        )
 
-    with open(cdl_file, 'r') as cdl_f:
-        # We only need to read the first line
-        line = cdl_f.readline()
-        line = line.split()
+    if samples is None:
+        samples = VERIFY_SAMPLES
+    if samples < 1:
+        raise ValueError(
+            'At least one sample is needed to verify a LUT, not '
+            '{samples}.'.format(samples=samples)
+        )
 
-        # The filename without extension will become the id
-        filename = os.path.basename(cdl_file).split('.')[0]
+    random = np.random.RandomState(seed)
+    expected = np.empty((min(samples, _SAMPLE_CHUNK), 3))
+    sampled = np.empty_like(expected)
+    maxima = dict.fromkeys(interpolations, 0.0)
+    squares = dict.fromkeys(interpolations, 0.0)
+    for start in range(0, samples, _SAMPLE_CHUNK):
+        count = min(samples - start, _SAMPLE_CHUNK)
+        points = random.uniform(in_range[0], in_range[1], (count, 3))
+        apply_cdl_chain(points, cdls, out=expected[:count], clamp=clamp)
+        for interpolation in interpolations:
+            errors = sample_lut(
+                lut, points, in_range, interpolation, out=sampled[:count]
+            )
+            errors -= expected[:count]
+            np.abs(errors, out=errors)
+            maxima[interpolation] = max(
+                maxima[interpolation], float(errors.max())
+            )
+            squares[interpolation] += float(np.vdot(errors, errors))
+
+    return dict(
+        (
+            interpolation,
+            (
+                maxima[interpolation],
+                float(np.sqrt(squares[interpolation] / (samples * 3)))
+            )
+        )
+        for interpolation in interpolations
+    )
 
-        slope = [line[0], line[1], line[2]]
-        offset = [line[3], line[4], line[5]]
-        power = [line[6], line[7], line[8]]
+# ==============================================================================
 
-        sat = line[9]
 
-        cdl = ColorCorrection(filename, cdl_file)
+def wedge_cdl(cdl, exposure=None, contrast=None, saturation=None,
+              pivot=None, prefix=None):
+    """Builds every combination of exposure, contrast and saturation changes
 
-        cdl.slope = slope
-        cdl.offset = offset
-        cdl.power = power
-        cdl.sat = sat
+    **Args:**
+        cdl : ( :class:`ColorCorrection` )
+            The base correction the wedge is built around.
+
+        exposure=None : [float]
+            Exposure changes in stops, which scale the output of Slope and
+            Offset by 2 to the power of each.
+
+        contrast=None : [float]
+            Contrast changes, which scale the output of Slope and Offset
+            around ``pivot`` by each.
+
+        saturation=None : [float]
+            Saturation changes, which multiply the base saturation by each.
+
+        pivot=None : (float)
+            The value contrast pivots around. Defaults to
+            ``CONTRAST_PIVOT``.
+
+        prefix=None : (str)
+            Start of the generated ids, which are followed by a padded
+            number counting from 1. Defaults to the base id and an
+            underscore.
+
+    **Returns:**
+        ( :class:`CorrectionBatch` )
+            A row for every combination of the given changes, with
+            exposure changing slowest and saturation fastest. Each row is
+            described with the changes it makes. Sweeps left as None don't
+            change the base correction.
+
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
 
-        cdls.append(cdl)
+        ValueError:
+            If a slope or saturation comes out negative and
+            ``HALT_ON_ERROR`` is set.
 
-    return cdls
+    Every variant is computed at once from a grid of the sweeps. Exposure
+    and contrast change the slope and offset of the base correction, so
+    the variants still evaluate and bake like any other correction.
+
+    """
+    _require_numpy('wedge_cdl')
+
+    sweeps = [
+        (name, [0.0 if name == 'exposure' else 1.0], False)
+        if values is None else (name, list(values), True)
+        for name, values in [
+            ('exposure', exposure),
+            ('contrast', contrast),
+            ('saturation', saturation),
+        ]
+    ]
+    grids = np.meshgrid(
+        *[np.array(values, dtype=np.float64) for _, values, _ in sweeps],
+        indexing='ij'
+    )
+    stops, scale, sat_scale = [grid.ravel() for grid in grids]
+    if pivot is None:
+        pivot = CONTRAST_PIVOT
+
+    slope, offset, power, sat = cdl._values()  # pylint: disable=W0212
+    gain = (np.exp2(stops) * scale)[:, np.newaxis]
+    values = np.empty((len(stops), 10))
+    values[:, 0:3] = gain * slope
+    values[:, 3:6] = gain * offset
+    values[:, 3:6] += (pivot * (1.0 - scale))[:, np.newaxis]
+    values[:, 6:9] = power
+    values[:, 9] = sat * sat_scale
+
+    if prefix is None:
+        prefix = '{id}_'.format(id=cdl.id)
+    width = max(3, len(str(len(values))))
+    ids = [
+        prefix + str(number).rjust(width, '0')
+        for number in range(1, len(values) + 1)
+    ]
+
+    swept = [(name, values) for name, values, given in sweeps if given]
+    descs = []
+    for combination in itertools.product(
+            *[values for _, values in swept]
+    ):
+        descs.append(
+            ', '.join(
+                '{name} {value:g}'.format(name=name, value=value)
+                for (name, _), value in zip(swept, combination)
+            ) or None
+        )
+
+    return CorrectionBatch(ids, values, descs)
 
 # ==============================================================================
 
 
-def parse_flex(edl_file):
-    """Parses a DaVinci FLEx telecine EDL for ASC CDL information.
+def write_cc(cdl):
+    """Writes the ColorCorrection to a .cc file"""
+    with open(cdl.file_out, 'wb') as cdl_f:
+        cdl_f.write(cdl.xml_root)
 
-    **Args:**
-        file : (str)
-            The filepath to the FLEx EDL
+# ==============================================================================
 
-    **Returns:**
-        [:class:`ColorCorrection`]
-            A list of CDL objects retrieved from the FLEx
 
-    **Raises:**
-        N/A
+def write_cdl(cdl):
+    """Writes the ColorCorrection to a space separated .cdl file"""
 
-    The DaVinci FLEx EDL is an odd duck, it's information conveyed via an
-    extremely strict line & character addressing system.
+    values = cdl.slope + cdl.offset + cdl.power + (cdl.sat, )
 
-    Each line must begin with a line number header that indicated what type
-    of information the line contains, with line number 100 indicating the
-    start of a new shot/take. Lines 000-099 contain session information.
+    # The cache key is tagged so that it can't collide with a 10 value
+    # tuple cached by _serialize.
+    key = ('cdl', _intern_key(values)) if INTERN_GRADES else None
+    ss_cdl = _SERIALIZED.get(key) if INTERN_GRADES else None
+    if ss_cdl is None:
+        ss_cdl = enc(' '.join([str(i) for i in values]))
+        if INTERN_GRADES:
+            if len(_SERIALIZED) >= _INTERNED_LIMIT:
+                _SERIALIZED.clear()
+            _SERIALIZED[key] = ss_cdl
 
-    Within each line, important information is constricted to a certain
-    range of characters, rather than space or comma separated like in an
-    ALE EDL.
+    with open(cdl.file_out, 'wb') as cdl_f:
+        cdl_f.write(ss_cdl)
 
-    Some line numbers we care about, and the character indexes:
+# ==============================================================================
 
-    +--------+---------------+------------+---------------------------------+
-    | Line # | Line Name     | Char Index | Data Type                       |
-    +========+===============+============+=================================+
-    | 010    | Project Title | 10-79      | Title                           |
-    +--------+---------------+------------+---------------------------------+
-    | 100    | Slate Info    | 10-17      | Scene                           |
-    +--------+---------------+------------+---------------------------------+
-    |        |               | 24-31      | Take ID                         |
-    +--------+---------------+------------+---------------------------------+
-    |        |               | 42-49      | Camera Reel ID                  |
-    +--------+---------------+------------+---------------------------------+
-    | 701    | ASC SOP       | (This entry can be safely space separated)   |
-    +--------+---------------+------------+---------------------------------+
-    | 702    | ASC SAT       | (This entry can be safely space separated)   |
-    +--------+---------------+------------+---------------------------------+
 
-    We'll try and default to using the Slate information to derive the
-    resultant filename, however that information is optional. If no
-    slate information is found, we'll iterate up at the end of the title.
-    If no title information is found, we'll have to iterate up on the
-    actual input filename, which is far from ideal.
+def write_cube(cdl, size=None, in_range=None, clamp=None):
+    """Bakes the ColorCorrection to a .cube LUT file
+
+    A 1D LUT is written if the correction has no saturation change, and a
+    3D LUT otherwise. See :func:`bake_lut` for the arguments.
 
     """
+    lut = bake_lut(cdl, size, in_range, clamp=clamp)
+    in_range = _lut_options(size, in_range, lut.ndim - 1)[1]
 
-    cdls = []
+    _write_lut_file(cdl.file_out, *_lut_layout('cube', lut, cdl.id, in_range))
 
-    with open(edl_file, 'r') as edl:
-        lines = edl.readlines()
+# ==============================================================================
 
-        filename = os.path.basename(edl_file).split('.')[0]
 
-        title = None
-        # Metadata will store, in order, the various scene, take, reel fields
-        # it finds.
-        metadata = []
+def write_image(path, pixels):
+    """Writes an array of RGB pixels to an uncompressed image file
 
-        sop = {}
-        sat = None
+    **Args:**
+        path : (str)
+            Path to write, with one of the extensions in ``IMAGE_FORMATS``.
 
-        def build_cc(line_id, edl_path, sop_dict, sat_value, title_line):
-            """Builds and returns a cc if sop/sat values found"""
-            col_cor = ColorCorrection(line_id, edl_path)
-            if title_line:
-                col_cor.desc = title_line
-            if sop_dict:
-                # If it finds the 701 line, it will have all three
-                col_cor.slope = sop_dict['slope']
-                col_cor.offset = sop_dict['offset']
-                col_cor.power = sop_dict['power']
-            if sat_value:
-                col_cor.sat = sat_value
+        pixels : (numpy.ndarray)
+            An H x W x 3 array.
 
-            return col_cor
+    **Returns:**
+        None
 
-        for line in lines:
-            if line.startswith('100'):
-                # This is the start of a take/shot
-                # We need to dump the previous records to a CDL
-                # Then clear the records.
-                # Note that the first data line will also hit this.
-                metadata = [i for i in metadata if i != '']
-                if metadata:
-                    cc_id = '_'.join(metadata)
-                else:
-                    field = title if title else filename
-                    cc_id = field + str(len(cdls) + 1).rjust(3, '0')
+    **Raises:**
+        ImportError:
+            If NumPy is not installed.
 
-                # If we already have values:
-                if sop or sat:
-                    cdl = build_cc(cc_id, edl_file, sop, sat, title)
-                    cdls.append(cdl)
+        ValueError:
+            If the extension isn't a supported image format.
 
-                metadata = []
-                sop = {}
-                sat = None
+    PFM and raw images are written as float32, with integer code values
+    scaled to 0.0 - 1.0. PPM images are written as 8 bit for uint8 pixels
+    and 16 bit for anything else, with floating point pixels clamped to
+    0.0 - 1.0 first.
 
-            elif line.startswith('010'):
-                # Title Line
-                # 10-79 Title
-                title = line[10:80].strip()
-            elif line.startswith('110'):
-                # Slate Information
-                # 10-17 Scene
-                # 24-31 Take ID
-                # 42-49 Camera Reel ID
-                metadata = [
-                    line[10:18].strip(),  # Scene
-                    line[24:32].strip(),  # Take
-                    line[42:50].strip(),  # Reel
-                ]
-            elif line.startswith('701'):
-                # ASC SOP
-                # 701 ASC_SOP(# # #)(-# -# -#)(# # #)
-                sop = {
-                    'slope': line[12:32].split(),
-                    'offset': line[34:57].split(),
-                    'power': line[59:79].split()
-                }
-            elif line.startswith('702'):
-                # ASC SAT
-                # 702 ASC_SAT ######
-                sat = float(line.split()[-1])
+    """
+    _require_numpy('write_image')
 
-    # We need to dump the last record to the cdl list
-    metadata = [i for i in metadata if i != '']
-    if metadata:
-        cc_id = '_'.join(metadata)
-    else:
-        field = title if title else filename
-        cc_id = field + str(len(cdls) + 1).rjust(3, '0')
+    _image_format(path)[1](path, pixels)
 
-    # If we found values at all:
-    if sop or sat:
-        cdl = build_cc(cc_id, edl_file, sop, sat, title)
-        cdls.append(cdl)
+# ==============================================================================
 
-    return cdls
 
-# ==============================================================================
+def write_spi1d(cdl, size=None, in_range=None, clamp=None):
+    """Bakes the ColorCorrection to a Sony Imageworks .spi1d LUT file
 
+    Corrections with a saturation change can't be written as a 1D LUT and
+    raise a ValueError. See :func:`bake_lut` for the arguments.
 
-def write_cc(cdl):
-    """Writes the ColorCorrection to a .cc file"""
-    with open(cdl.file_out, 'wb') as cdl_f:
-        cdl_f.write(cdl.xml_root)
+    """
+    lut = bake_lut(cdl, size, in_range, dimensions=1, clamp=clamp)
+    in_range = _lut_options(size, in_range, 1)[1]
+
+    _write_lut_file(cdl.file_out, *_lut_layout('spi1d', lut, cdl.id, in_range))
 
 # ==============================================================================
 
 
-def write_cdl(cdl):
-    """Writes the ColorCorrection to a space separated .cdl file"""
+def write_spi3d(cdl, size=None, in_range=None, clamp=None):
+    """Bakes the ColorCorrection to a Sony Imageworks .spi3d LUT file
 
-    values = list(cdl.slope)
-    values.extend(cdl.offset)
-    values.extend(cdl.power)
-    values.append(cdl.sat)
-    values = [str(i) for i in values]
+    The spi3d format has no way to describe an input range, so only the
+    default 0.0 - 1.0 range can be written. See :func:`bake_lut` for the
+    arguments.
 
-    ss_cdl = ' '.join(values)
+    """
+    in_range = _lut_format_range('spi3d', in_range)
+    lut = bake_lut(cdl, size, in_range, dimensions=3, clamp=clamp)
 
-    with open(cdl.file_out, 'wb') as cdl_f:
-        cdl_f.write(enc(ss_cdl))
+    _write_lut_file(cdl.file_out, *_lut_layout('spi3d', lut, cdl.id, in_range))
 
 # ==============================================================================
 # MAIN
@@ -2237,6 +8276,20 @@ INPUT_FORMATS = {
 OUTPUT_FORMATS = {
     'cc': write_cc,
     'cdl': write_cdl,
+    'cube': write_cube,
+    'spi1d': write_spi1d,
+    'spi3d': write_spi3d,
+}
+
+# Output formats that are baked LUTs, and accept LUT size and range options.
+LUT_FORMATS = ['cube', 'spi1d', 'spi3d']
+
+# Uncompressed image formats that can be read and written for rendering,
+# mapped to their reader and writer.
+IMAGE_FORMATS = {
+    'pfm': (_read_pfm, _write_pfm),
+    'ppm': (_read_ppm, _write_ppm),
+    'raw': (_read_raw, _write_raw),
 }
 
 # ==============================================================================
@@ -2261,9 +8314,93 @@ def parse_args():
         "-o",
         "--output",
         help="specify the filetype to convert to, comma separated lists are "
-             "accepted. Defaults to a .cc XML. Supported output formats are: "  # pylint: disable=C0330
+             "accepted. Defaults to a .cc XML, or to nothing with --render. "  # pylint: disable=C0330
+             "Supported output formats are: "  # pylint: disable=C0330
              "{outputs}".format(outputs=str(OUTPUT_FORMATS.keys()))  # pylint: disable=C0330
     )
+    parser.add_argument(
+        "--lut-size",
+        type=int,
+        help="number of entries along each axis of baked LUTs, such as 17, "
+             "33 or 65 for 3D LUTs. Defaults to {size_3d} for 3D LUTs and "  # pylint: disable=C0330
+             "{size_1d} for 1D LUTs.".format(  # pylint: disable=C0330
+                 size_3d=LUT_3D_SIZE,
+                 size_1d=LUT_1D_SIZE
+             )
+    )
+    parser.add_argument(
+        "--lut-range",
+        help="input range covered by baked LUTs, given as low,high. Use "
+             "--lut-range=low,high if low is negative. Defaults "
+             "to {low},{high}".format(low=LUT_RANGE[0], high=LUT_RANGE[1])  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--clamp",
+        choices=CLAMP_MODES,
+        help="how baked LUTs and renders clamp values. asc clamps to 0-1 "
+             "after slope and offset and after saturation, none never "  # pylint: disable=C0330
+             "clamps, and mirror never clamps and mirrors power around 0. "  # pylint: disable=C0330
+             "Defaults "  # pylint: disable=C0330
+             "to {clamp}".format(clamp=CLAMP)  # pylint: disable=C0330
+    )
+
+    parser.add_argument(
+        "--verify",
+        action='store_true',
+        help="after baking LUTs, read each written file back, compare it "
+             "against the correction at {samples} random inputs and print "  # pylint: disable=C0330
+             "the maximum and RMS errors of interpolating it".format(  # pylint: disable=C0330
+                 samples=VERIFY_SAMPLES  # pylint: disable=C0330
+             )  # pylint: disable=C0330
+    )
+
+    parser.add_argument(
+        "--processes",
+        type=int,
+        help="number of processes to bake LUTs and render frames with. "
+             "Defaults to one per CPU"  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--render",
+        help="grade every frame of the image sequences at this path or "
+             "sequence with the input correction. Supported image formats "  # pylint: disable=C0330
+             "are: {formats}".format(  # pylint: disable=C0330
+                 formats=', '.join(sorted(IMAGE_FORMATS))
+             )
+    )
+    parser.add_argument(
+        "--render-dest",
+        help="directory to write rendered frames to. Required with --render"
+    )
+    parser.add_argument(
+        "--render-format",
+        help="image format to write rendered frames as. Defaults to the "
+             "format of the source frames"  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--raw-size",
+        help="size of raw source frames, and of frames read with --filter, "
+             "given as widthxheight"  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--filter",
+        action="store_true",
+        help="read raw RGB frames of --raw-size from stdin, grade them with "
+             "the input correction and write them to stdout"  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--raw-dtype",
+        default='float32',
+        help="dtype of the frames read with --filter, such as uint8, uint16, "
+             "float16 or float32. Use >u2 style names for big endian. "  # pylint: disable=C0330
+             "Defaults to float32"  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--bit-depth",
+        type=int,
+        help="bit depth of integer frames read with --filter. Defaults to "
+             "every bit of --raw-dtype"  # pylint: disable=C0330
+    )
 
     args = parser.parse_args()
 
@@ -2296,9 +8433,123 @@ def parse_args():
             else:
                 output_types[i] = output_types[i].lower()
         args.output = output_types
+    elif args.render:
+        # Rendering only writes the corrections it's explicitly asked for.
+        args.output = []
     else:
         args.output = ['cc', ]
 
+    if args.lut_range:
+        try:
+            low, high = [float(i) for i in args.lut_range.split(',')]
+        except ValueError:
+            raise ValueError(
+                "The LUT range: {lut_range} must be given as two numbers, "
+                "low,high".format(
+                    lut_range=args.lut_range
+                )
+            )
+        args.lut_range = (low, high)
+
+    if args.render and not args.render_dest:
+        raise ValueError(
+            "A destination directory must be given with --render-dest when "
+            "rendering"
+        )
+    if args.render_format:
+        args.render_format = args.render_format.lower()
+        if args.render_format not in IMAGE_FORMATS:
+            raise ValueError(
+                "The render format: {ext} is not supported".format(
+                    ext=args.render_format
+                )
+            )
+
+    if args.raw_size:
+        try:
+            width, height = [int(i) for i in args.raw_size.lower().split('x')]
+        except ValueError:
+            raise ValueError(
+                "The raw size: {raw_size} must be given as "
+                "widthxheight".format(raw_size=args.raw_size)
+            )
+        # Arrays are indexed by row first.
+        args.raw_size = (height, width)
+
+    if args.filter and not args.raw_size:
+        raise ValueError(
+            "The size of filtered frames must be given with --raw-size"
+        )
+
+    return args
+
+# ==============================================================================
+
+
+def parse_stats_args(argv):
+    """Uses argparse to parse the arguments of the stats subcommand"""
+    parser = ArgumentParser(
+        prog='cdl_convert stats',
+        description="print statistics of the grades in one or more files"
+    )
+    parser.add_argument(
+        "input_files",
+        nargs='+',
+        help="the files to read grades from"
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        help="specify the filetype of every input. Use when CDLConvert "
+             "cannot determine the filetype automatically. Supported input "  # pylint: disable=C0330
+             "formats are: "  # pylint: disable=C0330
+             "{inputs}".format(inputs=str(INPUT_FORMATS.keys()))  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--group",
+        choices=STATS_GROUPS,
+        help="group grades by the scene or reel fields of their ids, or by "
+             "their ids without the last field. Defaults to a single group"  # pylint: disable=C0330
+    )
+    parser.add_argument(
+        "--percentiles",
+        help="comma separated percentiles to report. Defaults to "
+             "{percentiles}".format(  # pylint: disable=C0330
+                 percentiles=','.join(str(i) for i in STATS_PERCENTILES)
+             )
+    )
+    parser.add_argument(
+        "--fence",
+        type=float,
+        help="number of interquartile ranges beyond the quartiles of its "
+             "group a value must be to be reported as an outlier. Defaults "  # pylint: disable=C0330
+             "to {fence}".format(fence=OUTLIER_FENCE)  # pylint: disable=C0330
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.input:
+        if args.input.lower() not in INPUT_FORMATS:
+            raise ValueError(
+                "The input format: {input} is not supported".format(
+                    input=args.input
+                )
+            )
+        args.input = args.input.lower()
+
+    if args.percentiles:
+        try:
+            args.percentiles = [
+                float(i) for i in args.percentiles.split(',')
+            ]
+        except ValueError:
+            raise ValueError(
+                "The percentiles: {percentiles} must be given as comma "
+                "separated numbers".format(percentiles=args.percentiles)
+            )
+    else:
+        args.percentiles = list(STATS_PERCENTILES)
+
     return args
 
 # ==============================================================================
@@ -2306,6 +8557,30 @@ def parse_args():
 
 def main():
     """Will figure out input and destination filetypes, then convert"""
+    # Only the bare word starts the subcommand, so an input file named stats
+    # can still be converted when given with a path, like ./stats.
+    if sys.argv[1:2] == ['stats']:
+        args = parse_stats_args(sys.argv[2:])
+        cdls = []
+        for input_file in args.input_files:
+            filepath = os.path.abspath(input_file)
+            filetype_in = args.input
+            if not filetype_in:
+                filetype_in = os.path.basename(filepath).split('.')[-1]
+            cdls.extend(INPUT_FORMATS[filetype_in.lower()](filepath))
+        # Values are read from each correction once, and every statistic
+        # is then worked out over the columns of the batch.
+        batch = CorrectionBatch.from_corrections(cdls)
+        stats = grade_stats(
+            batch,
+            group=args.group,
+            percentiles=args.percentiles,
+            fence=args.fence
+        )
+        for line in _stats_report(stats, batch.ids, args.percentiles):
+            print(line)
+        return
+
     args = parse_args()
 
     filepath = os.path.abspath(args.input_file)
@@ -2317,9 +8592,45 @@ def main():
 
     cdls = INPUT_FORMATS[filetype_in](filepath)
 
+    if args.filter:
+        # stdout carries the frames, so nothing else is written or printed,
+        # and errors go to stderr with a failing exit status instead.
+        try:
+            if len(cdls) != 1:
+                raise ValueError(
+                    "Filtering needs an input with a single correction, but "
+                    "{path} has {count}".format(path=filepath, count=len(cdls))
+                )
+            filter_frames(
+                cdls[0],
+                args.raw_size[1],
+                args.raw_size[0],
+                dtype=args.raw_dtype,
+                bit_depth=args.bit_depth,
+                clamp=args.clamp
+            )
+        except Exception as err:  # pylint: disable=W0703
+            sys.stderr.write(
+                "Error filtering frames: {err}\n".format(err=err)
+            )
+            sys.exit(1)
+        return
+
+    # Only passed to LUT writers, and only when given, so that the writers
+    # fall back on their own defaults.
+    lut_options = {}
+    if args.lut_size:
+        lut_options['size'] = args.lut_size
+    if args.lut_range:
+        lut_options['in_range'] = args.lut_range
+    if args.clamp:
+        lut_options['clamp'] = args.clamp
+
     if cdls:
         for cdl in cdls:
             for ext in args.output:
+                if ext in LUT_FORMATS:
+                    continue
                 cdl.determine_dest(ext)
                 print(
                     "Writing cdl {id} to {path}".format(
@@ -2329,10 +8640,75 @@ def main():
                 )
                 OUTPUT_FORMATS[ext](cdl)
 
+        # LUTs are baked a whole format at a time, so that they can be
+        # spread across processes.
+        for ext in args.output:
+            if ext not in LUT_FORMATS:
+                continue
+            for cdl in cdls:
+                cdl.determine_dest(ext)
+                print(
+                    "Baking cdl {id} to {path}".format(
+                        id=cdl.id,
+                        path=cdl.file_out
+                    )
+                )
+            bake_luts(cdls, ext, processes=args.processes, **lut_options)
+            if args.verify:
+                # The written files are read back, so that what's checked
+                # is what reached the disk, at the precision it was written.
+                for cdl in cdls:
+                    cdl.determine_dest(ext)
+                    lut, in_range = _read_lut(cdl.file_out)
+                    errors = verify_lut(
+                        cdl, lut, in_range=in_range,
+                        clamp=lut_options.get('clamp')
+                    )
+                    for interpolation in sorted(errors):
+                        print(
+                            "Verified cdl {id} {ext} with {interpolation} "
+                            "interpolation: max error {max:.3g}, rms error "
+                            "{rms:.3g}".format(
+                                id=cdl.id,
+                                ext=ext,
+                                interpolation=interpolation,
+                                max=errors[interpolation][0],
+                                rms=errors[interpolation][1]
+                            )
+                        )
+
+    if args.render:
+        if len(cdls) != 1:
+            raise ValueError(
+                "Rendering needs an input with a single correction, but "
+                "{path} has {count}".format(path=filepath, count=len(cdls))
+            )
+        print(
+            "Rendering cdl {id} to {dest}".format(
+                id=cdls[0].id,
+                dest=args.render_dest
+            )
+        )
+        render_sequences(
+            [(cdls[0], MediaRef(args.render))],
+            args.render_dest,
+            ext=args.render_format,
+            processes=args.processes,
+            clamp=args.clamp,
+            raw_shape=args.raw_size
+        )
+
 if __name__ == '__main__':  # pragma: no cover
     try:
         main()
     except Exception as err:  # pylint: disable=W0703
+        if '--filter' in sys.argv[1:]:
+            # stdin and stdout carry frames, so there's no one to prompt and
+            # nothing else can be written to stdout.
+            sys.stderr.write(
+                'Unexpected error encountered: {err}\n'.format(err=err)
+            )
+            sys.exit(1)
         print('Unexpected error encountered:')
         print(err)
         raw_input('Press enter key to exit')
@@ -151,6 +151,11 @@ setup(
     # project is installed.
     install_requires=['argparse'],
 
+    # NumPy is only needed to evaluate corrections on pixels.
+    extras_require={
+        'numpy': ['numpy'],
+    },
+
     # Testing
     test_suite='nose.collector',
     tests_require=['nose'],
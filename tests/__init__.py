@@ -4,10 +4,18 @@
 from test_cdl_convert import *
 from test_classes import *
 from test_ale import *
+from test_batch import *
 from test_cc import *
 from test_cdl import *
+from test_cluster import *
+from test_evaluate import *
 from test_classes import *
+from test_fit import *
 from test_flex import *
+from test_index import *
+from test_lut import *
+from test_render import *
+from test_stats import *
 
 
 if __name__ == '__main__':
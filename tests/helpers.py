@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Builds the corrections shared by the cdl_convert test modules
+
+REQUIREMENTS:
+
+N/A
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+import os
+import random
+import sys
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert.cdl_convert as cdl_convert
+
+#==============================================================================
+# FUNCTIONS
+#==============================================================================
+
+
+def build_cdl(cc_id, slope=(1.2, 0.9, 1.1), offset=(0.01, -0.02, 0.03),
+              power=(1.1, 0.9, 1.3), sat=0.8):
+    """Builds a ColorCorrection with a slope, offset, power and sat"""
+    cdl = cdl_convert.ColorCorrection(cc_id, 'file')
+    cdl.slope = list(slope)
+    cdl.offset = list(offset)
+    cdl.power = list(power)
+    cdl.sat = sat
+    return cdl
+
+#==============================================================================
+
+
+def random_cdl(cc_id):
+    """Builds a ColorCorrection with random values from the random module"""
+    cdl = cdl_convert.ColorCorrection(cc_id, 'file')
+    cdl.slope = [random.uniform(0.5, 2.0) for i in range(3)]
+    cdl.offset = [random.uniform(-0.2, 0.2) for i in range(3)]
+    cdl.power = [random.uniform(0.5, 2.0) for i in range(3)]
+    cdl.sat = random.uniform(0.0, 2.0)
+    return cdl
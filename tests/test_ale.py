@@ -32,6 +32,8 @@ sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
 import cdl_convert.cdl_convert as cdl_convert
 from tests.test_cdl_convert import TimeCodeSegment
 
+np = cdl_convert.np
+
 #==============================================================================
 # GLOBALS
 #==============================================================================
@@ -62,6 +64,17 @@ Data
 """
 ALE_LINE_SHORT = "{tcIn}\t{tcOut}\t{handleLen}\t{avidClip}\t{sat}\t({slopeR} {slopeG} {slopeB})({offsetR} {offsetG} {offsetB})({powerR} {powerG} {powerB})\t{filename}\t{frames}\n"
 
+ALE_HEADER_LGG = """Heading
+FIELD_DELIM\tTABS
+FPS\t24
+
+Column
+Name\tScan Filename\tLift\tGamma\tGain\tASC_SAT
+
+Data
+"""
+ALE_LINE_LGG = "{name}\t{filename}\t({lift})\t{gamma}\t{gain}\t{sat}\n"
+
 # misc ========================================================================
 
 UPPER = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
@@ -72,6 +85,9 @@ if sys.version_info[0] >= 3:
 else:
     enc = lambda x: x
 
+NO_NUMPY = np is None
+NO_NUMPY_REASON = 'NumPy is not installed'
+
 if sys.version_info[0] >= 3:
     builtins = 'builtins'
 else:
@@ -291,6 +307,154 @@ class TestParseALEShort(TestParseALEBasic):
         self.cdl2 = cdls[1]
         self.cdl3 = cdls[2]
 
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestParseALELgg(unittest.TestCase):
+    """Tests parsing an ALE logged with lift, gamma and gain"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.lift = [(0.01, -0.02, 0.0), (0.1, 0.1, 0.1)]
+        self.gamma = [(1.0, 1.25, 0.8), (2.0, 2.0, 2.0)]
+        self.gain = [(1.2, 0.9, 1.0), (1.1, 1.1, 1.1)]
+        lines = [
+            ALE_LINE_LGG.format(
+                name='A001_C00{number}'.format(number=number),
+                filename='bb94_x10{number}'.format(number=number),
+                lift=' '.join(str(i) for i in lift),
+                gamma=', '.join(str(i) for i in gamma),
+                gain=' '.join(str(i) for i in gain),
+                sat=sat
+            )
+            for number, lift, gamma, gain, sat in zip(
+                [1, 2], self.lift, self.gamma, self.gain, [0.9, 1.1]
+            )
+        ]
+
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False) as f:
+            f.write(enc(ALE_HEADER_LGG + ''.join(lines)))
+            self.filename = f.name
+
+        self.cdls = cdl_convert.parse_ale(self.filename)
+
+    #==========================================================================
+
+    def tearDown(self):
+        os.remove(self.filename)
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testIds(self):
+        """Tests that filenames were parsed correctly"""
+        self.assertEqual(
+            ['bb94_x101', 'bb94_x102'],
+            [cdl.id for cdl in self.cdls]
+        )
+        self.assertEqual(self.filename, self.cdls[0].file_in)
+
+    #==========================================================================
+
+    def testValues(self):
+        """Tests that lift, gamma and gain were converted to SOP"""
+        for cdl, lift, gamma, gain in zip(
+                self.cdls, self.lift, self.gamma, self.gain
+        ):
+            for value, expected in zip(
+                    cdl.slope + cdl.offset + cdl.power,
+                    [b - a for a, b in zip(lift, gain)] + list(lift) +
+                    [1.0 / i for i in gamma]
+            ):
+                self.assertAlmostEqual(expected, value)
+
+    #==========================================================================
+
+    def testSat(self):
+        """Tests that saturation was read from ASC_SAT"""
+        self.assertEqual([0.9, 1.1], [cdl.sat for cdl in self.cdls])
+
+    #==========================================================================
+
+    def parseLines(self, *lines):
+        """Parses an ALE of lift, gamma and gain lines"""
+        with open(self.filename, 'wb') as f:
+            f.write(enc(ALE_HEADER_LGG + ''.join(lines)))
+        cdl_convert.ColorCorrection.members = {}
+        return cdl_convert.parse_ale(self.filename)
+
+    #==========================================================================
+
+    def testBlankIds(self):
+        """Tests that blank ids are numbered like other ALEs number them"""
+        line = ALE_LINE_LGG.format(
+            name='A001', filename='{filename}', lift='0 0 0', gamma='1 1 1',
+            gain='1 1 1', sat=1.0
+        )
+
+        cdls = self.parseLines(
+            line.format(filename=''),
+            line.format(filename='shot'),
+            line.format(filename='')
+        )
+
+        self.assertEqual(['001', 'shot', '003'], [cdl.id for cdl in cdls])
+
+        cdl_convert.ColorCorrection.members = {}
+        halt = cdl_convert.HALT_ON_ERROR
+        cdl_convert.HALT_ON_ERROR = True
+        try:
+            self.assertRaises(
+                ValueError,
+                self.parseLines, line.format(filename='')
+            )
+        finally:
+            cdl_convert.HALT_ON_ERROR = halt
+
+    #==========================================================================
+
+    def testSanitizedIdCollision(self):
+        """Tests that ids made to collide by sanitizing are suffixed"""
+        line = ALE_LINE_LGG.format(
+            name='A001', filename='{filename}', lift='0 0 0', gamma='1 1 1',
+            gain='1 1 1', sat=1.0
+        )
+
+        cdls = self.parseLines(
+            line.format(filename='shot:1'),
+            line.format(filename='shot/1'),
+            line.format(filename='shot2')
+        )
+
+        self.assertEqual(
+            ['shot1', 'shot1_001', 'shot2'], [cdl.id for cdl in cdls]
+        )
+
+    #==========================================================================
+
+    def testShortCells(self):
+        """Tests that cells without 3 values raise naming their row"""
+        good = ALE_LINE_LGG.format(
+            name='A001', filename='first', lift='0 0 0', gamma='1 1 1',
+            gain='1 1 1', sat=1.0
+        )
+        for lift, gamma in [('0.1', '1 1 1'), ('', '1 1 1'),
+                            ('0 0 0', '1 1 1 1'), ('0 0 0', '1 x 1')]:
+            bad = ALE_LINE_LGG.format(
+                name='A002', filename='second', lift=lift, gamma=gamma,
+                gain='1 1 1', sat=1.0
+            )
+            try:
+                self.parseLines(good, bad, good.replace('first', 'third'))
+            except ValueError as err:
+                self.assertTrue('row 2 (second)' in str(err))
+            else:
+                self.fail('A short cell did not raise')
+
 #==============================================================================
 # FUNCTIONS
 #==============================================================================
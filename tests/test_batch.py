@@ -0,0 +1,727 @@
+#!/usr/bin/env python
+"""
+Tests the columnar correction batches of cdl_convert
+
+REQUIREMENTS:
+
+numpy
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from xml.etree import ElementTree
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert.cdl_convert as cdl_convert
+from helpers import build_cdl
+
+np = cdl_convert.np
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+NO_NUMPY = np is None
+NO_NUMPY_REASON = 'NumPy is not installed'
+
+#==============================================================================
+# FUNCTIONS
+#==============================================================================
+
+
+def read_ccc(path):
+    """Reads the ids, values and descriptions from a written CCC"""
+    namespace = '{urn:ASC:CDL:v1.01}'
+    root = ElementTree.parse(path).getroot()
+    ids = []
+    values = []
+    descs = []
+    for correction in root.findall(namespace + 'ColorCorrection'):
+        ids.append(correction.get('id'))
+        desc = correction.find(namespace + 'Description')
+        descs.append(None if desc is None else desc.text)
+        row = []
+        for tag in ['Slope', 'Offset', 'Power', 'Saturation']:
+            text = correction.find('.//' + namespace + tag).text
+            row.extend(float(i) for i in text.split())
+        values.append(row)
+    return ids, np.array(values), descs
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+# CorrectionBatch =============================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestCorrectionBatch(unittest.TestCase):
+    """Tests holding, converting and writing batches of corrections"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.values = np.array([
+            [1.2, 0.9, 1.1, 0.01, -0.02, 0.03, 1.1, 0.9, 1.3, 0.8],
+            [1.0, 1.0, 1.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0],
+            [0.5, 0.6, 0.7, 1e-07, 0.2, 0.3, 2.0, 2.0, 2.0, 1.5],
+        ])
+        self.halt = cdl_convert.HALT_ON_ERROR
+
+    #==========================================================================
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        cdl_convert.HALT_ON_ERROR = self.halt
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testColumns(self):
+        """Tests that the grade columns are views of the values"""
+        batch = cdl_convert.CorrectionBatch(
+            ['a', 'b', 'c'], self.values, ['first', None, 'third']
+        )
+
+        self.assertEqual(3, len(batch))
+        np.testing.assert_array_equal(self.values[:, 0:3], batch.slope)
+        np.testing.assert_array_equal(self.values[:, 3:6], batch.offset)
+        np.testing.assert_array_equal(self.values[:, 6:9], batch.power)
+        np.testing.assert_array_equal(self.values[:, 9], batch.sat)
+        self.assertEqual(['first', None, 'third'], batch.descs)
+
+        batch.sat[1] = 0.5
+        self.assertEqual(0.5, batch.values[1, 9])
+
+    #==========================================================================
+
+    def testIdsSanitized(self):
+        """Tests that ids are sanitized like ColorCorrection ids"""
+        batch = cdl_convert.CorrectionBatch(
+            ['shot 1', '_shot/2', 'shot.3'], self.values
+        )
+
+        self.assertEqual(['shot_1', 'shot2', 'shot.3'], batch.ids)
+        self.assertEqual([None] * 3, batch.descs)
+
+    #==========================================================================
+
+    def testNegativeValues(self):
+        """Tests that negative slope, power and sat clip or raise"""
+        self.values[0, 0] = -1.0
+        self.values[1, 7] = -0.5
+        self.values[2, 9] = -2.0
+        self.values[0, 3] = -0.25
+
+        batch = cdl_convert.CorrectionBatch(['a', 'b', 'c'], self.values)
+
+        self.assertEqual(0.0, batch.slope[0, 0])
+        self.assertEqual(0.0, batch.power[1, 1])
+        self.assertEqual(0.0, batch.sat[2])
+        self.assertEqual(-0.25, batch.offset[0, 0])
+
+        cdl_convert.HALT_ON_ERROR = True
+        self.assertRaises(
+            ValueError,
+            cdl_convert.CorrectionBatch, ['a', 'b', 'c'], self.values * -1
+        )
+
+    #==========================================================================
+
+    def testBadBatches(self):
+        """Tests that mismatched shapes and repeated ids raise"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.CorrectionBatch, ['a', 'b', 'c'], self.values[:, :9]
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.CorrectionBatch, ['a', 'b'], self.values
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.CorrectionBatch, ['a', 'b', 'c'], self.values, ['x']
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.CorrectionBatch, ['a', 'b', 'a'], self.values
+        )
+
+    #==========================================================================
+
+    def testRoundTrip(self):
+        """Tests building a batch from corrections and back again"""
+        cdl = build_cdl('graded')
+        cdl.desc = 'A description'
+        plain = cdl_convert.ColorCorrection('plain', 'file')
+
+        batch = cdl_convert.CorrectionBatch.from_corrections([cdl, plain])
+        cdl_convert.ColorCorrection.members = {}
+        corrections = batch.corrections()
+
+        self.assertEqual(['graded', 'plain'], batch.ids)
+        self.assertEqual(['A description', None], batch.descs)
+        self.assertEqual(cdl, corrections[0])
+        self.assertEqual(plain, corrections[1])
+        self.assertEqual(['A description'], corrections[0].desc)
+        self.assertEqual([], corrections[1].desc)
+        self.assertTrue(corrections[0].file_in.endswith('graded.cc'))
+        self.assertTrue(
+            cdl_convert.ColorCorrection.members['plain'] is corrections[1]
+        )
+
+    #==========================================================================
+
+    def testWriteCcc(self):
+        """Tests that a written CCC holds every correction exactly"""
+        path = os.path.join(self.directory, 'batch.ccc')
+        batch = cdl_convert.CorrectionBatch(
+            ['a', 'b', 'c'], self.values, ['first & <best>', None, 'third']
+        )
+
+        batch.write_ccc(path)
+
+        ids, values, descs = read_ccc(path)
+        self.assertEqual(['a', 'b', 'c'], ids)
+        self.assertEqual(['first & <best>', None, 'third'], descs)
+        np.testing.assert_array_equal(self.values, values)
+        with open(path, 'rb') as ccc_file:
+            self.assertFalse(b'e-' in ccc_file.read())
+
+    #==========================================================================
+
+    def testWriteCccMatchesCc(self):
+        """Tests that each entry is laid out as a written cc is"""
+        path = os.path.join(self.directory, 'batch.ccc')
+        cdl = build_cdl('graded')
+        cdl_convert.CorrectionBatch.from_corrections([cdl]).write_ccc(path)
+
+        with open(path, 'rb') as ccc_file:
+            lines = ccc_file.read().splitlines()
+        cc_lines = cdl.xml_root.splitlines()
+
+        self.assertEqual(
+            [b'    ' + line for line in cc_lines[1:]],
+            lines[2:-1]
+        )
+
+    #==========================================================================
+
+    def testWriteCccStreamed(self):
+        """Tests writing more corrections than fit in one block"""
+        path = os.path.join(self.directory, 'batch.ccc')
+        values = np.tile(self.values, (5, 1))
+        batch = cdl_convert.CorrectionBatch(
+            ['id{0}'.format(i) for i in range(15)], values
+        )
+        write_rows = cdl_convert._LUT_WRITE_ROWS
+        cdl_convert._LUT_WRITE_ROWS = 4
+
+        try:
+            batch.write_ccc(path)
+        finally:
+            cdl_convert._LUT_WRITE_ROWS = write_rows
+
+        ids, written, _ = read_ccc(path)
+        self.assertEqual(batch.ids, ids)
+        np.testing.assert_array_equal(values, written)
+
+    #==========================================================================
+
+    def testCompile(self):
+        """Tests that row plans are cached until the row changes"""
+        batch = cdl_convert.CorrectionBatch(['a', 'b', 'c'], self.values)
+
+        plan = batch.compile(1)
+
+        self.assertEqual(('clamp', ), plan.steps)
+        self.assertTrue(plan is batch.compile(1))
+        self.assertFalse(plan is batch.compile(1, clamp='none'))
+        self.assertEqual(np.float32, batch.compile(1, np.float32).dtype)
+
+        batch.sat[1] = 0.5
+        self.assertTrue('saturation' in batch.compile(1).steps)
+
+    #==========================================================================
+
+    def testApplyPerFrame(self):
+        """Tests that evaluation grades each frame with its own row"""
+        batch = cdl_convert.CorrectionBatch(['a', 'b', 'c'], self.values)
+        corrections = batch.corrections()
+        pixels = np.random.RandomState(3).uniform(0.0, 1.0, (3, 4, 5, 3))
+        codes = (pixels * 1023).astype(np.uint16)
+
+        expected = [
+            cdl_convert.apply_cdl(frame, cdl)
+            for frame, cdl in zip(pixels, corrections)
+        ]
+        expected_codes = [
+            cdl_convert.apply_cdl(frame, cdl, bit_depth=10)
+            for frame, cdl in zip(codes, corrections)
+        ]
+
+        np.testing.assert_array_equal(
+            expected, cdl_convert.apply_cdl(pixels, batch)
+        )
+        np.testing.assert_array_equal(
+            expected, cdl_convert.apply_cdl_threaded(pixels, batch, threads=2)
+        )
+        np.testing.assert_array_equal(
+            expected_codes,
+            cdl_convert.apply_cdl(codes, batch, bit_depth=10)
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.apply_cdl, pixels[:2], batch
+        )
+
+# wedge_cdl() =================================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestWedgeCdl(unittest.TestCase):
+    """Tests building wedges of variants around a correction"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cdl = build_cdl('shot')
+        self.pixels = np.random.RandomState(1).uniform(0.0, 0.7, (50, 3))
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testGrid(self):
+        """Tests that every combination is made, saturation fastest"""
+        batch = cdl_convert.wedge_cdl(
+            self.cdl,
+            exposure=[-1, 0, 1],
+            contrast=[0.9, 1.1],
+            saturation=[0.5, 1.0, 1.5, 2.0]
+        )
+
+        self.assertEqual(24, len(batch))
+        self.assertEqual('shot_001', batch.ids[0])
+        self.assertEqual('shot_024', batch.ids[-1])
+        self.assertEqual(
+            'exposure -1, contrast 0.9, saturation 0.5', batch.descs[0]
+        )
+        self.assertEqual(
+            'exposure -1, contrast 0.9, saturation 1', batch.descs[1]
+        )
+        self.assertEqual(
+            'exposure 1, contrast 1.1, saturation 2', batch.descs[-1]
+        )
+
+    #==========================================================================
+
+    def testVariantsGrade(self):
+        """Tests that each variant grades as its changes describe"""
+        pivot = 0.18
+        batch = cdl_convert.wedge_cdl(
+            self.cdl,
+            exposure=[-0.5, 1.0],
+            contrast=[0.8, 1.2],
+            saturation=[0.5, 1.5]
+        )
+        corrections = batch.corrections()
+
+        index = 0
+        for stops in [-0.5, 1.0]:
+            for contrast in [0.8, 1.2]:
+                for saturation in [0.5, 1.5]:
+                    base = self.pixels * self.cdl.slope + self.cdl.offset
+                    base = (base * 2 ** stops - pivot) * contrast + pivot
+                    base = np.clip(base, 0.0, 1.0) ** self.cdl.power
+                    luma = np.dot(base, cdl_convert.REC709_LUMA)
+                    luma = luma[:, np.newaxis]
+                    expected = luma + self.cdl.sat * saturation * (
+                        base - luma
+                    )
+                    np.testing.assert_allclose(
+                        np.clip(expected, 0.0, 1.0),
+                        corrections[index].apply(self.pixels),
+                        rtol=0,
+                        atol=1e-12
+                    )
+                    index += 1
+
+    #==========================================================================
+
+    def testSingleSweep(self):
+        """Tests that sweeps left out leave the base untouched"""
+        batch = cdl_convert.wedge_cdl(self.cdl, saturation=[0.0, 1.0])
+
+        self.assertEqual(['saturation 0', 'saturation 1'], batch.descs)
+        np.testing.assert_allclose(
+            [self.cdl.slope] * 2, batch.slope, rtol=0, atol=1e-15
+        )
+        np.testing.assert_allclose(
+            [self.cdl.offset] * 2, batch.offset, rtol=0, atol=1e-15
+        )
+        np.testing.assert_array_equal([0.0, 0.8], batch.sat)
+
+    #==========================================================================
+
+    def testNoSweeps(self):
+        """Tests that a wedge of nothing is the base correction"""
+        batch = cdl_convert.wedge_cdl(self.cdl, prefix='base')
+
+        self.assertEqual(['base001'], batch.ids)
+        self.assertEqual([None], batch.descs)
+        cdl_convert.ColorCorrection.members = {}
+        self.assertEqual(self.cdl, batch.corrections()[0])
+
+    #==========================================================================
+
+    def testPivot(self):
+        """Tests that the pivot is left where it is by contrast"""
+        batch = cdl_convert.wedge_cdl(
+            cdl_convert.ColorCorrection('flat', 'file'),
+            contrast=[0.5, 2.0],
+            pivot=0.4
+        )
+
+        np.testing.assert_allclose(
+            [0.4, 0.4], batch.slope[:, 0] * 0.4 + batch.offset[:, 0]
+        )
+
+    #==========================================================================
+
+    def testIdPadding(self):
+        """Tests that ids are padded to the width of the largest number"""
+        batch = cdl_convert.wedge_cdl(
+            self.cdl,
+            exposure=np.linspace(-2, 2, 11),
+            saturation=np.linspace(0, 2, 101)
+        )
+
+        self.assertEqual(1111, len(batch))
+        self.assertEqual('shot_0001', batch.ids[0])
+        self.assertEqual('shot_1111', batch.ids[-1])
+        self.assertEqual('exposure -2, saturation 0.02', batch.descs[1])
+
+# blend_cdls() ================================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestBlendCdls(unittest.TestCase):
+    """Tests blending between corrections across frames"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.start = build_cdl('start')
+        self.end = cdl_convert.ColorCorrection('end', 'file')
+        self.end.slope = [0.6, 1.8, 0.9]
+        self.end.offset = [-0.05, 0.0, 0.1]
+        self.end.power = [1.0, 1.2, 0.8]
+        self.end.sat = 1.2
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def grades(self, *cdls):
+        """Returns the values of corrections as rows"""
+        return np.array([
+            cdl.slope + cdl.offset + cdl.power + (cdl.sat, ) for cdl in cdls
+        ])
+
+    #==========================================================================
+
+    def testLinear(self):
+        """Tests that values blend evenly from the first to the last frame"""
+        batch = cdl_convert.blend_cdls([self.start, self.end], 5)
+        start, end = self.grades(self.start, self.end)
+
+        self.assertEqual(5, len(batch))
+        for frame, amount in enumerate([0.0, 0.25, 0.5, 0.75, 1.0]):
+            np.testing.assert_allclose(
+                start + (end - start) * amount,
+                batch.values[frame],
+                rtol=0,
+                atol=1e-15
+            )
+        self.assertEqual('start_blend001', batch.ids[0])
+        self.assertEqual('start_blend005', batch.ids[-1])
+        self.assertEqual('Blend of start and end at 0.25', batch.descs[1])
+
+    #==========================================================================
+
+    def testCurves(self):
+        """Tests the weights of each easing curve"""
+        amounts = np.linspace(0.0, 1.0, 11)
+        expected = {
+            'linear': amounts,
+            'ease_in': amounts ** 2,
+            'ease_out': 1.0 - (1.0 - amounts) ** 2,
+            'ease_in_out': 3 * amounts ** 2 - 2 * amounts ** 3,
+        }
+        start, end = self.grades(self.start, self.end)
+
+        for curve in cdl_convert.BLEND_CURVES:
+            batch = cdl_convert.blend_cdls(
+                [self.start, self.end], 11, curve=curve
+            )
+            np.testing.assert_allclose(
+                start + np.outer(expected[curve], end - start),
+                batch.values,
+                rtol=0,
+                atol=1e-12
+            )
+
+    #==========================================================================
+
+    def testLogSlope(self):
+        """Tests that slope blends evenly in stops in the log domain"""
+        self.start.slope = [2.0, 1.0, 0.5]
+        self.end.slope = [0.5, 4.0, 0.5]
+
+        batch = cdl_convert.blend_cdls(
+            [self.start, self.end], 3, domain='log'
+        )
+
+        np.testing.assert_allclose(
+            [[2.0, 1.0, 0.5], [1.0, 2.0, 0.5], [0.5, 4.0, 0.5]],
+            batch.slope
+        )
+        np.testing.assert_allclose(
+            self.grades(self.start, self.end)[:, 3:].mean(axis=0),
+            batch.values[1, 3:]
+        )
+
+    #==========================================================================
+
+    def testKeys(self):
+        """Tests blending between more corrections at given frames"""
+        batch = cdl_convert.blend_cdls(
+            [self.start, self.end, self.start], 10, keys=[2, 4, 8]
+        )
+        start, end = self.grades(self.start, self.end)
+
+        for frame in [0, 1, 2, 8, 9]:
+            np.testing.assert_allclose(start, batch.values[frame])
+        np.testing.assert_allclose(end, batch.values[4])
+        np.testing.assert_allclose((start + end) / 2, batch.values[3])
+        np.testing.assert_allclose(
+            end + (start - end) * 0.25, batch.values[5]
+        )
+        self.assertEqual('Blend of end and start at 0.25', batch.descs[5])
+
+    #==========================================================================
+
+    def testEvaluate(self):
+        """Tests grading a dissolve of frames with a blend"""
+        batch = cdl_convert.blend_cdls([self.start, self.end], 4)
+        pixels = np.random.RandomState(9).uniform(0.0, 1.0, (4, 6, 3))
+
+        graded = cdl_convert.apply_cdl(pixels, batch)
+
+        np.testing.assert_array_equal(self.start.apply(pixels[0]), graded[0])
+        np.testing.assert_allclose(
+            self.end.apply(pixels[3]), graded[3], rtol=0, atol=1e-15
+        )
+
+    #==========================================================================
+
+    def testBadBlends(self):
+        """Tests that unsupported blends raise"""
+        cdls = [self.start, self.end]
+        self.assertRaises(
+            ValueError, cdl_convert.blend_cdls, cdls[:1], 4
+        )
+        self.assertRaises(
+            ValueError, cdl_convert.blend_cdls, cdls, 1
+        )
+        self.assertRaises(
+            ValueError, cdl_convert.blend_cdls, cdls, 4, keys=[2, 1]
+        )
+        self.assertRaises(
+            ValueError, cdl_convert.blend_cdls, cdls, 4, keys=[0, 1, 2]
+        )
+        self.assertRaises(
+            ValueError, cdl_convert.blend_cdls, cdls, 4, curve='bounce'
+        )
+        self.assertRaises(
+            ValueError, cdl_convert.blend_cdls, cdls, 4, domain='lin'
+        )
+        self.end.slope = [0.0, 1.0, 1.0]
+        self.assertRaises(
+            ValueError, cdl_convert.blend_cdls, cdls, 4, domain='log'
+        )
+
+# lgg_to_cdl() & cdl_to_lgg() =================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestLgg(unittest.TestCase):
+    """Tests converting lift, gamma and gain to and from SOP"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        random = np.random.RandomState(5)
+        self.lift = random.uniform(-0.1, 0.1, (1000, 3))
+        self.gamma = random.uniform(0.5, 2.0, (1000, 3))
+        self.gain = random.uniform(0.8, 1.5, (1000, 3))
+        self.sat = random.uniform(0.0, 2.0, 1000)
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testToCdl(self):
+        """Tests that converted grades evaluate like lift, gamma and gain"""
+        values = cdl_convert.lgg_to_cdl(
+            self.lift, self.gamma, self.gain, self.sat
+        )
+        ramp = np.linspace(0.0, 1.0, 17)[:, np.newaxis].repeat(3, axis=1)
+
+        self.assertEqual((1000, 10), values.shape)
+        np.testing.assert_array_equal(self.sat, values[:, 9])
+        batch = cdl_convert.CorrectionBatch(
+            [str(i) for i in range(4)], values[:4]
+        )
+        for i, cdl in enumerate(batch.corrections()):
+            cdl.sat = 1.0
+            expected = np.clip(
+                self.lift[i] + ramp * (self.gain[i] - self.lift[i]), 0.0, 1.0
+            ) ** (1.0 / self.gamma[i])
+            np.testing.assert_allclose(
+                expected, cdl.apply(ramp), rtol=0, atol=1e-12
+            )
+
+    #==========================================================================
+
+    def testRoundTrip(self):
+        """Tests that grades convert exactly both ways"""
+        lift, gamma, gain, sat = cdl_convert.cdl_to_lgg(
+            cdl_convert.lgg_to_cdl(self.lift, self.gamma, self.gain, self.sat)
+        )
+
+        np.testing.assert_array_equal(self.lift, lift)
+        np.testing.assert_allclose(self.gamma, gamma, rtol=1e-15)
+        np.testing.assert_allclose(self.gain, gain, rtol=1e-15)
+        np.testing.assert_array_equal(self.sat, sat)
+
+    #==========================================================================
+
+    def testBroadcast(self):
+        """Tests that shared values and a default saturation broadcast"""
+        values = cdl_convert.lgg_to_cdl(self.lift, 2.0, [1.0, 1.1, 1.2])
+
+        np.testing.assert_allclose(
+            [1.0, 1.1, 1.2] - self.lift, values[:, 0:3]
+        )
+        np.testing.assert_array_equal(0.5, values[:, 6:9])
+        np.testing.assert_array_equal(1.0, values[:, 9])
+
+        single = cdl_convert.lgg_to_cdl([0.1, 0.0, 0.0], 1.0, 1.0)
+        self.assertEqual(
+            [[0.9, 1.0, 1.0, 0.1, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0]],
+            single.tolist()
+        )
+
+    #==========================================================================
+
+    def testZeroPower(self):
+        """Tests that a power of 0.0 converts to an infinite gamma"""
+        values = np.ones((1, 10))
+        values[0, 6] = 0.0
+
+        gamma = cdl_convert.cdl_to_lgg(values)[1]
+
+        self.assertEqual([float('inf'), 1.0, 1.0], gamma[0].tolist())
+
+    #==========================================================================
+
+    def testBatch(self):
+        """Tests building a batch from lift, gamma and gain and back"""
+        batch = cdl_convert.CorrectionBatch.from_lgg(
+            ['a', 'b'], self.lift[:2], self.gamma[:2], self.gain[:2],
+            descs=['first', None]
+        )
+
+        self.assertEqual(['a', 'b'], batch.ids)
+        self.assertEqual(['first', None], batch.descs)
+        np.testing.assert_array_equal(self.lift[:2], batch.offset)
+        for converted, expected in zip(
+                batch.lgg(), [self.lift, self.gamma, self.gain]
+        ):
+            np.testing.assert_allclose(expected[:2], converted, rtol=1e-15)
+        np.testing.assert_array_equal(
+            cdl_convert.cdl_to_lgg(batch)[3], [1.0, 1.0]
+        )
+
+    #==========================================================================
+
+    def testBadGrades(self):
+        """Tests that unconvertible grades raise"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.lgg_to_cdl, self.lift, self.gamma[:10], self.gain
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.lgg_to_cdl, self.lift[:, :2], 1.0, 1.0
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.lgg_to_cdl, self.lift, [1.0, 0.0, 1.0], 1.0
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.cdl_to_lgg, np.ones((4, 9))
+        )
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
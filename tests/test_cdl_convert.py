@@ -17,6 +17,7 @@ try:
     from unittest import mock
 except ImportError:
     import mock
+import math
 import os
 from random import randrange
 try:
@@ -119,6 +120,158 @@ class TestDeExponent(unittest.TestCase):
             cdl_convert._de_exponent(value)
         )
 
+# INTERN_GRADES ===============================================================
+
+
+class TestInternGrades(unittest.TestCase):
+    """Tests hash-consing of grade values with INTERN_GRADES"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        cdl_convert.INTERN_GRADES = True
+        cdl_convert.reset_interned_grades()
+        self.cdl1 = cdl_convert.ColorCorrection('shot1', 'file')
+        self.cdl2 = cdl_convert.ColorCorrection('shot2', 'file')
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.INTERN_GRADES = False
+        cdl_convert.reset_interned_grades()
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testSopValuesShared(self):
+        """Tests that identical sop values share the same tuple"""
+        self.cdl1.slope = ['1.2', '1.3', '1.4']
+        self.cdl2.slope = (1.2, 1.3, 1.4)
+        self.cdl1.offset = '-0.1'
+        self.cdl2.offset = -0.1
+        self.cdl1.power = 0.9
+        self.cdl2.power = [0.9, 0.9, 0.9]
+
+        self.assertTrue(self.cdl1.slope is self.cdl2.slope)
+        self.assertTrue(self.cdl1.offset is self.cdl2.offset)
+        self.assertTrue(self.cdl1.power is self.cdl2.power)
+
+    #==========================================================================
+
+    def testSatValueShared(self):
+        """Tests that identical sat values share the same float"""
+        self.cdl1.sat = '1.0625'
+        self.cdl2.sat = '1.0625'
+
+        self.assertTrue(self.cdl1.sat is self.cdl2.sat)
+
+    #==========================================================================
+
+    def testDifferentValuesNotShared(self):
+        """Tests that different values are not merged"""
+        self.cdl1.slope = 1.2
+        self.cdl2.slope = 1.21
+
+        self.assertEqual(
+            (1.2, 1.2, 1.2),
+            self.cdl1.slope
+        )
+        self.assertEqual(
+            (1.21, 1.21, 1.21),
+            self.cdl2.slope
+        )
+
+    #==========================================================================
+
+    def testNotSharedWhenOff(self):
+        """Tests that values are not interned when INTERN_GRADES is False"""
+        cdl_convert.INTERN_GRADES = False
+
+        self.cdl1.slope = ['1.2', '1.3', '1.4']
+        self.cdl2.slope = ['1.2', '1.3', '1.4']
+
+        self.assertFalse(self.cdl1.slope is self.cdl2.slope)
+        self.assertEqual(self.cdl1.slope, self.cdl2.slope)
+
+    #==========================================================================
+
+    def testSerializedOnce(self):
+        """Tests that identical values reuse the formatted text"""
+        self.cdl1.slope = [0.0000000000000000113, 1.0, 2.0]
+        self.cdl2.slope = [0.0000000000000000113, 1.0, 2.0]
+
+        text1 = self.cdl1.sop_node.element.find('Slope').text
+        text2 = self.cdl2.sop_node.element.find('Slope').text
+
+        self.assertEqual(
+            '0.0000000000000000113 1.0 2.0',
+            text1
+        )
+        self.assertTrue(text1 is text2)
+
+    #==========================================================================
+
+    def testNegativeZero(self):
+        """Tests that -0.0 is not swapped for 0.0"""
+        self.cdl1.offset = [0.0, 0.0, 0.0]
+        self.cdl2.offset = [-0.0, 0.0, -0.0]
+        self.cdl1.sat = 0.0
+        self.cdl2.sat = -0.0
+
+        self.assertEqual(
+            [1.0, 1.0, 1.0, -1.0, 1.0, -1.0, 1.0, -1.0],
+            [
+                math.copysign(1.0, i)
+                for i in self.cdl1.offset + self.cdl2.offset +
+                (self.cdl1.sat, self.cdl2.sat)
+            ]
+        )
+        self.assertEqual(
+            '-0.0 0.0 -0.0',
+            self.cdl2.sop_node.element.find('Offset').text
+        )
+        self.assertEqual(
+            '0.0 0.0 0.0',
+            self.cdl1.sop_node.element.find('Offset').text
+        )
+
+    #==========================================================================
+
+    def testLimit(self):
+        """Tests that the caches are cleared when they grow too large"""
+        limit = cdl_convert._INTERNED_LIMIT
+        cdl_convert._INTERNED_LIMIT = 10
+        try:
+            for i in range(25):
+                self.cdl1.slope = 1.0 + i
+                self.cdl1.sop_node.build_element()
+                self.assertTrue(len(cdl_convert._INTERNED) <= 10)
+                self.assertTrue(len(cdl_convert._SERIALIZED) <= 10)
+        finally:
+            cdl_convert._INTERNED_LIMIT = limit
+
+        self.cdl2.slope = 25.0
+        self.assertTrue(self.cdl1.slope is self.cdl2.slope)
+
+    #==========================================================================
+
+    def testReset(self):
+        """Tests that reset_interned_grades empties the caches"""
+        self.cdl1.slope = 1.2
+        self.cdl1.sop_node.build_element()
+
+        self.assertTrue(cdl_convert._INTERNED)
+        self.assertTrue(cdl_convert._SERIALIZED)
+
+        cdl_convert.reset_interned_grades()
+
+        self.assertFalse(cdl_convert._INTERNED)
+        self.assertFalse(cdl_convert._SERIALIZED)
+
 # _sanitize() =================================================================
 
 
@@ -200,6 +353,74 @@ class TestSanitize(unittest.TestCase):
             result
         )
 
+# sanitize_ids() ==============================================================
+
+
+class TestSanitizeIds(unittest.TestCase):
+    """Tests sanitizing a whole column of ids with sanitize_ids()"""
+
+    def setUp(self):
+        cdl_convert._SANITIZED.clear()
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert._SANITIZED.clear()
+
+    #==========================================================================
+
+    def testMatchesSanitize(self):
+        """Tests that every id gets the same result as _sanitize"""
+        names = [
+            'banana apple blueberry',
+            '.abc',
+            '_abc',
+            '__abc',
+            ' abc',
+            'a@$#b!)(*$%&^c`/\\"\';:<>,d',
+            'a.b_c',
+            '',
+            'line\nbreak',
+            '_abc',
+        ]
+
+        results = cdl_convert.sanitize_ids(names)
+
+        cdl_convert._SANITIZED.clear()
+
+        self.assertEqual(
+            [cdl_convert._sanitize(name) for name in names],
+            results
+        )
+
+    #==========================================================================
+
+    def testResultsRemembered(self):
+        """Tests that sanitized ids are cached for later _sanitize calls"""
+        cdl_convert.sanitize_ids(['a b', 'a b', 'c#d'])
+
+        self.assertEqual(
+            {'a b': 'a_b', 'c#d': 'cd'},
+            cdl_convert._SANITIZED
+        )
+
+    #==========================================================================
+
+    def testCacheLimit(self):
+        """Tests that the cache is emptied once it grows past the limit"""
+        limit = cdl_convert._SANITIZED_LIMIT
+        cdl_convert._SANITIZED_LIMIT = 3
+        try:
+            cdl_convert.sanitize_ids(['a', 'b', 'c'])
+            cdl_convert._sanitize('d')
+        finally:
+            cdl_convert._SANITIZED_LIMIT = limit
+
+        self.assertEqual(
+            {'d': 'd'},
+            cdl_convert._SANITIZED
+        )
+
 # parse_args() ================================================================
 
 
@@ -18,6 +18,7 @@ except ImportError:
     import mock
 import os
 import sys
+import threading
 import unittest
 
 # Grab our test's path and append the cdL_convert root directory
@@ -592,6 +593,92 @@ class TestColorCorrection(unittest.TestCase):
 
     #==========================================================================
 
+    def testBlankIdCollision(self):
+        """Tests that a blank id skips over numbered ids already taken"""
+        cdl_convert.ColorCorrection.members = {}
+
+        cdl_convert.ColorCorrection('002', 'file')
+        cdl = cdl_convert.ColorCorrection('', 'file')
+
+        self.assertEqual(
+            '003',
+            cdl.id
+        )
+
+    #==========================================================================
+
+    def testAllocateIdPrefix(self):
+        """Tests that each prefix counts up on its own"""
+        cdl_convert.ColorCorrection('shot001', 'file')
+
+        self.assertEqual(
+            'shot002',
+            cdl_convert.ColorCorrection.allocate_id('shot')
+        )
+        self.assertEqual(
+            'shot003',
+            cdl_convert.ColorCorrection.allocate_id('shot')
+        )
+        self.assertEqual(
+            'other001',
+            cdl_convert.ColorCorrection.allocate_id('other')
+        )
+        self.assertEqual(
+            'shot010',
+            cdl_convert.ColorCorrection.allocate_id('shot', start=10)
+        )
+
+    #==========================================================================
+
+    def testAllocateIdSanitizesPrefix(self):
+        """Tests that allocated ids survive being sanitized again"""
+        cc_id = cdl_convert.ColorCorrection.allocate_id('#_.my shot!')
+
+        self.assertEqual(
+            'my_shot001',
+            cc_id
+        )
+
+        cdl = cdl_convert.ColorCorrection(cc_id, 'file')
+
+        self.assertEqual(
+            cc_id,
+            cdl.id
+        )
+
+    #==========================================================================
+
+    def testSanitizedIdCollision(self):
+        """Tests that ids made to collide by sanitizing are suffixed"""
+        first = cdl_convert.ColorCorrection('shot:1', 'file')
+        second = cdl_convert.ColorCorrection('shot/1', 'file')
+        third = cdl_convert.ColorCorrection('shot|1', 'file')
+
+        self.assertEqual(
+            ['shot1', 'shot1_001', 'shot1_002'],
+            [first.id, second.id, third.id]
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.ColorCorrection, 'shot1', 'file'
+        )
+
+    #==========================================================================
+
+    def testAllocateIdMembersReset(self):
+        """Tests that counters restart when members is replaced"""
+        cdl_convert.ColorCorrection.allocate_id('shot')
+        cdl_convert.ColorCorrection.allocate_id('shot')
+
+        cdl_convert.ColorCorrection.members = {}
+
+        self.assertEqual(
+            'shot001',
+            cdl_convert.ColorCorrection.allocate_id('shot')
+        )
+
+    #==========================================================================
+
     def testIdRenameDictionary(self):
         """Tests that dict entries are removed following a rename"""
 
@@ -924,6 +1011,232 @@ class TestColorCorrection(unittest.TestCase):
             self.cdl.file_out
         )
 
+    # fingerprint() ===========================================================
+
+    def testFingerprintIgnoresId(self):
+        """Tests that corrections with the same grade share a fingerprint"""
+        other = cdl_convert.ColorCorrection('otherId', 'file')
+        for cdl in [self.cdl, other]:
+            cdl.slope = [1.1, 1.2, 1.3]
+            cdl.offset = -0.05
+            cdl.power = [0.9, 1.0, 1.1]
+            cdl.sat = 0.8
+
+        self.assertEqual(
+            self.cdl.fingerprint(),
+            other.fingerprint()
+        )
+        self.assertEqual(40, len(self.cdl.fingerprint()))
+
+    #==========================================================================
+
+    def testFingerprintMissingNodes(self):
+        """Tests that a correction without nodes matches a default grade"""
+        other = cdl_convert.ColorCorrection('otherId', 'file')
+        other.slope = 1.0
+        other.sat = 1.0
+
+        self.assertEqual(
+            self.cdl.fingerprint(),
+            other.fingerprint()
+        )
+        # Fingerprinting should not have created any nodes
+        self.assertEqual(None, self.cdl.sop_node)
+        self.assertEqual(None, self.cdl.sat_node)
+
+    #==========================================================================
+
+    def testFingerprintPrecision(self):
+        """Tests that fingerprints are quantized to the given precision"""
+        other = cdl_convert.ColorCorrection('otherId', 'file')
+        self.cdl.slope = 1.2
+        other.slope = 1.2000001
+        self.cdl.offset = 0.0
+        other.offset = -0.0000001
+
+        self.assertEqual(
+            self.cdl.fingerprint(),
+            other.fingerprint()
+        )
+        self.assertNotEqual(
+            self.cdl.fingerprint(precision=8),
+            other.fingerprint(precision=8)
+        )
+
+    #==========================================================================
+
+    def testFingerprintUpdates(self):
+        """Tests that the cached fingerprint follows value changes"""
+        before = self.cdl.fingerprint()
+        self.cdl.power = 1.5
+        after = self.cdl.fingerprint()
+
+        self.assertNotEqual(before, after)
+
+        self.cdl.power = 1.0
+
+        self.assertEqual(before, self.cdl.fingerprint())
+
+    #==========================================================================
+
+    def testFingerprintDescs(self):
+        """Tests that descriptions are only considered when asked"""
+        other = cdl_convert.ColorCorrection('otherId', 'file')
+        other.desc = 'a look'
+
+        self.assertEqual(
+            self.cdl.fingerprint(),
+            other.fingerprint()
+        )
+        self.assertNotEqual(
+            self.cdl.fingerprint(descs=True),
+            other.fingerprint(descs=True)
+        )
+
+        self.cdl.desc = 'a look'
+
+        self.assertEqual(
+            self.cdl.fingerprint(descs=True),
+            other.fingerprint(descs=True)
+        )
+
+    #==========================================================================
+
+    def testEqualityAndHash(self):
+        """Tests that equality and hashing follow the grade values"""
+        other = cdl_convert.ColorCorrection('otherId', 'file')
+        third = cdl_convert.ColorCorrection('thirdId', 'file')
+        third.sat = 1.2
+
+        self.assertTrue(self.cdl == other)
+        self.assertFalse(self.cdl != other)
+        self.assertTrue(self.cdl != third)
+        self.assertFalse(self.cdl == 'uniqueId')
+
+        self.assertEqual(
+            2,
+            len(set([self.cdl, other, third]))
+        )
+
+# Registries ==================================================================
+
+
+class TestRegistryThreaded(unittest.TestCase):
+    """Hammers the member registries from many threads at once"""
+
+    threads = 16
+    per_thread = 200
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        cdl_convert.ColorCorrection.members = {}
+        cdl_convert.MediaRef.members = {}
+        self.errors = []
+        # Force frequent thread switches so that races actually happen.
+        if hasattr(sys, 'getswitchinterval'):
+            self.interval = sys.getswitchinterval()
+            sys.setswitchinterval(0.000001)
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+        cdl_convert.MediaRef.members = {}
+        if hasattr(sys, 'setswitchinterval'):
+            sys.setswitchinterval(self.interval)
+
+    #==========================================================================
+
+    def runThreads(self, target):
+        """Runs target in many threads, recording any exceptions"""
+        def wrapped(index):
+            try:
+                target(index)
+            except Exception as err:  # pylint: disable=W0703
+                self.errors.append(err)
+
+        threads = [
+            threading.Thread(target=wrapped, args=(i, ))
+            for i in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], self.errors)
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testBlankIdsUnique(self):
+        """Tests that blank ids given from many threads never collide"""
+        created = []
+
+        def create(index):
+            for i in range(self.per_thread):
+                created.append(cdl_convert.ColorCorrection('', 'file'))
+
+        self.runThreads(create)
+
+        total = self.threads * self.per_thread
+        self.assertEqual(total, len(created))
+        self.assertEqual(total, len(set([cdl.id for cdl in created])))
+        self.assertEqual(total, len(cdl_convert.ColorCorrection.members))
+
+    #==========================================================================
+
+    def testCreateAndRename(self):
+        """Tests that racing creations and renames keep the registry sane"""
+        def churn(index):
+            for i in range(self.per_thread):
+                # Every thread fights over the same handful of ids, so most
+                # of these will fail, but no more than one should succeed.
+                try:
+                    cdl = cdl_convert.ColorCorrection(
+                        'shared{0}'.format(i % 5), 'file'
+                    )
+                except ValueError:
+                    cdl = cdl_convert.ColorCorrection('', 'file')
+                try:
+                    cdl.id = 'renamed{0}'.format(i % 7)
+                except ValueError:
+                    cdl.id = 'thread{0}_{1}'.format(index, i)
+
+        self.runThreads(churn)
+
+        members = cdl_convert.ColorCorrection.members
+        self.assertEqual(self.threads * self.per_thread, len(members))
+        for cc_id, cdl in members.items():
+            self.assertEqual(cc_id, cdl.id)
+
+    #==========================================================================
+
+    def testMediaRefMembership(self):
+        """Tests that MediaRef membership survives concurrent changes"""
+        refs = []
+
+        def churn(index):
+            for i in range(self.per_thread):
+                ref = cdl_convert.MediaRef('/some/dir/file{0}.exr'.format(i % 3))
+                refs.append(ref)
+                ref.filename = 'file{0}.exr'.format((i + index) % 4)
+
+        self.runThreads(churn)
+
+        members = cdl_convert.MediaRef.members
+        self.assertEqual(
+            len(refs),
+            sum([len(group) for group in members.values()])
+        )
+        for ref_uri, group in members.items():
+            for ref in group:
+                self.assertEqual(ref_uri, ref.ref)
+
 # ColorNodeBase ===============================================================
 
 
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+"""
+Tests clustering grades into looks with cdl_convert
+
+REQUIREMENTS:
+
+numpy
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+import os
+import sys
+import unittest
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert.cdl_convert as cdl_convert
+
+np = cdl_convert.np
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+NO_NUMPY = np is None
+NO_NUMPY_REASON = 'NumPy is not installed'
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+# cluster_cdls() ==============================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestClusterCdls(unittest.TestCase):
+    """Tests clustering streams of grades into looks"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        random = np.random.RandomState(8)
+        self.looks = np.abs(random.normal(1.0, 0.3, (6, 10)))
+        self.labels = []
+        self.batches = []
+        for number, count in enumerate([3000, 500, 1700]):
+            labels = random.randint(0, 6, count)
+            values = np.abs(
+                self.looks[labels] + random.normal(0.0, 0.01, (count, 10))
+            )
+            self.labels.append(labels)
+            self.batches.append(cdl_convert.CorrectionBatch(
+                ['file{0}_{1}'.format(number, i) for i in range(count)],
+                values
+            ))
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def assertClustered(self, labels, memberships):
+        """Asserts that grades were clustered by the looks they came from"""
+        pairs = set()
+        for expected, found in zip(labels, memberships):
+            self.assertEqual(expected.shape, found.shape)
+            pairs.update(zip(expected.tolist(), found.tolist()))
+        self.assertEqual(6, len(pairs))
+        self.assertEqual(6, len(set(found for _, found in pairs)))
+
+    #==========================================================================
+
+    def testLooks(self):
+        """Tests that the looks grades were made from are found"""
+        looks, memberships = cdl_convert.cluster_cdls(
+            self.batches, 6, batch_size=256
+        )
+
+        self.assertEqual(6, len(looks))
+        self.assertClustered(self.labels, memberships)
+        for look, label in zip(looks, range(6)):
+            members = np.concatenate([
+                batch.values[found == label]
+                for batch, found in zip(self.batches, memberships)
+            ])
+            np.testing.assert_allclose(
+                members.mean(axis=0), look.slope + look.offset +
+                look.power + (look.sat, ), rtol=0, atol=0.005
+            )
+
+    #==========================================================================
+
+    def testMostUsedFirst(self):
+        """Tests that looks are numbered and described by how many use them"""
+        looks, memberships = cdl_convert.cluster_cdls(self.batches, 6)
+
+        sizes = np.bincount(np.concatenate(memberships), minlength=6)
+
+        self.assertEqual(sorted(sizes, reverse=True), sizes.tolist())
+        self.assertEqual(
+            ['look{0:03d}'.format(i) for i in range(1, 7)],
+            [look.id for look in looks]
+        )
+        self.assertEqual(
+            'Look of {0} grades'.format(sizes[0]), looks[0].desc[0]
+        )
+        self.assertTrue(
+            cdl_convert.ColorCorrection.members['look001'] is looks[0]
+        )
+        self.assertTrue(looks[0].file_in.endswith('look001.cc'))
+
+    #==========================================================================
+
+    def testStream(self):
+        """Tests that a function is called for each pass over the grades"""
+        calls = []
+
+        def stream():
+            """Yields each batch, counting the passes over them"""
+            calls.append(None)
+            for batch in self.batches:
+                yield batch
+
+        looks, memberships = cdl_convert.cluster_cdls(
+            stream, 6, passes=3, prefix='season'
+        )
+
+        self.assertTrue(2 <= len(calls) <= 4)
+        self.assertClustered(self.labels, memberships)
+        self.assertEqual('season001', looks[0].id)
+
+    #==========================================================================
+
+    def testArrays(self):
+        """Tests clustering arrays and single batches"""
+        looks, memberships = cdl_convert.cluster_cdls(
+            self.batches[0].values, 6
+        )
+        batch_looks, batch_memberships = cdl_convert.cluster_cdls(
+            self.batches[0], 6
+        )
+
+        self.assertEqual(1, len(memberships))
+        self.assertClustered(self.labels[:1], memberships)
+        np.testing.assert_array_equal(memberships[0], batch_memberships[0])
+        self.assertEqual(
+            [look.slope for look in looks],
+            [look.slope for look in batch_looks]
+        )
+
+    #==========================================================================
+
+    def testSeed(self):
+        """Tests that the same seed always finds the same looks"""
+        first = cdl_convert.cluster_cdls(self.batches, 4, passes=1)
+        second = cdl_convert.cluster_cdls(self.batches, 4, passes=1)
+
+        self.assertEqual(
+            [look.slope for look in first[0]],
+            [look.slope for look in second[0]]
+        )
+
+    #==========================================================================
+
+    def testWeights(self):
+        """Tests that a weight of 0.0 leaves a value out of clustering"""
+        values = np.ones((400, 10))
+        values[:, 9] = np.tile([0.5, 1.5], 200)
+        values[:200, 0] = 2.0
+
+        _, memberships = cdl_convert.cluster_cdls(
+            values, 2, weights=[1.0] * 9 + [0.0]
+        )
+
+        self.assertEqual(1, len(set(memberships[0][:200].tolist())))
+        self.assertEqual(1, len(set(memberships[0][200:].tolist())))
+
+    #==========================================================================
+
+    def testBadClusters(self):
+        """Tests that too few grades and bad arguments raise"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.cluster_cdls, np.ones((3, 10)), 4
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.cluster_cdls, [], 1
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.cluster_cdls, self.batches, 0
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.cluster_cdls, self.batches, 2, weights=[-1.0] * 10
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.cluster_cdls, np.ones((10, 9)), 2
+        )
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
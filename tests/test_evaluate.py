@@ -0,0 +1,1435 @@
+#!/usr/bin/env python
+"""
+Tests the pixel evaluation functions of cdl_convert
+
+REQUIREMENTS:
+
+numpy
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+import os
+import random
+import signal
+import sys
+import time
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+import unittest
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert.cdl_convert as cdl_convert
+from helpers import random_cdl
+
+np = cdl_convert.np
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+NO_NUMPY = np is None
+NO_NUMPY_REASON = 'NumPy is not installed'
+
+#==============================================================================
+# FUNCTIONS
+#==============================================================================
+
+
+def reference_cdl(rgb, slope, offset, power, sat, clamp='asc'):
+    """Evaluates a single rgb triplet the slow, obvious way"""
+    graded = []
+    for i in range(3):
+        value = rgb[i] * slope[i] + offset[i]
+        if clamp == 'asc':
+            value = min(max(value, 0.0), 1.0)
+        if value >= 0.0:
+            graded.append(value ** power[i])
+        elif clamp == 'mirror':
+            graded.append(-((-value) ** power[i]))
+        else:
+            graded.append(value)
+
+    luma = sum([graded[i] * cdl_convert.REC709_LUMA[i] for i in range(3)])
+
+    saturated = [luma + sat * (value - luma) for value in graded]
+    if clamp == 'asc':
+        saturated = [min(max(value, 0.0), 1.0) for value in saturated]
+    return saturated
+
+#==============================================================================
+
+
+def reference_image(cdl, pixels, clamp='asc'):
+    """Runs reference_cdl over every pixel of an array"""
+    flat = pixels.reshape(-1, 3)
+    graded = [
+        reference_cdl(rgb, cdl.slope, cdl.offset, cdl.power, cdl.sat, clamp)
+        for rgb in flat.tolist()
+    ]
+    return np.array(graded).reshape(pixels.shape)
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+# apply_cdl() =================================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestApplyCdl(unittest.TestCase):
+    """Tests evaluating a ColorCorrection on pixel arrays"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        random.seed(1234)
+        self.cdl = random_cdl('shot1')
+        self.pixels = np.random.RandomState(1234).uniform(
+            -0.1, 1.2, (6, 5, 3)
+        )
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testMatchesReference(self):
+        """Tests that float64 results match the scalar formula"""
+        result = cdl_convert.apply_cdl(self.pixels, self.cdl)
+
+        np.testing.assert_allclose(
+            reference_image(self.cdl, self.pixels),
+            result,
+            rtol=0,
+            atol=1e-12
+        )
+
+    #==========================================================================
+
+    def testMethod(self):
+        """Tests that ColorCorrection.apply matches apply_cdl"""
+        np.testing.assert_array_equal(
+            cdl_convert.apply_cdl(self.pixels, self.cdl),
+            self.cdl.apply(self.pixels)
+        )
+
+    #==========================================================================
+
+    def testFloat32(self):
+        """Tests that float32 pixels stay float32"""
+        pixels = self.pixels.astype(np.float32)
+
+        result = self.cdl.apply(pixels)
+
+        self.assertEqual(np.float32, result.dtype)
+        np.testing.assert_allclose(
+            reference_image(self.cdl, pixels),
+            result,
+            rtol=0,
+            atol=1e-5
+        )
+
+    #==========================================================================
+
+    def testOutInPlace(self):
+        """Tests that pixels can be graded in place"""
+        expected = self.cdl.apply(self.pixels)
+
+        result = self.cdl.apply(self.pixels, out=self.pixels)
+
+        self.assertTrue(result is self.pixels)
+        np.testing.assert_array_equal(expected, self.pixels)
+
+    #==========================================================================
+
+    def testOutSeparate(self):
+        """Tests that results are written to a given out array"""
+        out = np.zeros_like(self.pixels)
+        original = self.pixels.copy()
+
+        result = self.cdl.apply(self.pixels, out=out)
+
+        self.assertTrue(result is out)
+        np.testing.assert_array_equal(original, self.pixels)
+        np.testing.assert_array_equal(self.cdl.apply(self.pixels), out)
+
+    #==========================================================================
+
+    def testIdentity(self):
+        """Tests that a default correction only clamps"""
+        cdl = cdl_convert.ColorCorrection('identity', 'file')
+
+        np.testing.assert_allclose(
+            np.clip(self.pixels, 0.0, 1.0),
+            cdl.apply(self.pixels),
+            rtol=0,
+            atol=1e-12
+        )
+        # Evaluating shouldn't have created any nodes
+        self.assertEqual(None, cdl.sop_node)
+
+    #==========================================================================
+
+    def testBatchOfFrames(self):
+        """Tests giving each frame of a stack its own correction"""
+        cdls = [self.cdl, random_cdl('shot2'), random_cdl('shot3')]
+        frames = np.random.RandomState(99).uniform(0.0, 1.0, (3, 4, 2, 3))
+
+        result = cdl_convert.apply_cdl(frames, cdls)
+
+        for i, cdl in enumerate(cdls):
+            np.testing.assert_allclose(
+                cdl.apply(frames[i]),
+                result[i],
+                rtol=0,
+                atol=1e-12
+            )
+
+    #==========================================================================
+
+    def testSingleCdlOnStack(self):
+        """Tests that a single correction applies to every frame"""
+        frames = np.random.RandomState(99).uniform(0.0, 1.0, (3, 4, 2, 3))
+
+        result = cdl_convert.apply_cdl(frames, self.cdl)
+
+        np.testing.assert_array_equal(
+            self.cdl.apply(frames[1]),
+            result[1]
+        )
+
+    #==========================================================================
+
+    def testBadDtype(self):
+        """Tests that non float pixels are rejected"""
+        self.assertRaises(
+            TypeError,
+            cdl_convert.apply_cdl,
+            np.zeros((2, 2, 3), dtype=np.int32),
+            self.cdl
+        )
+
+    #==========================================================================
+
+    def testBadShape(self):
+        """Tests that pixels without RGB on the last axis are rejected"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.apply_cdl,
+            np.zeros((2, 3, 4)),
+            self.cdl
+        )
+
+    #==========================================================================
+
+    def testBadOut(self):
+        """Tests that a mismatched out array is rejected"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.apply_cdl,
+            self.pixels,
+            self.cdl,
+            np.zeros(self.pixels.shape, dtype=np.float32)
+        )
+
+    #==========================================================================
+
+    def testBadCdlCount(self):
+        """Tests that a list of corrections must match the frame count"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.apply_cdl,
+            self.pixels,
+            [self.cdl, self.cdl]
+        )
+
+# apply_cdl_tiled() ===========================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestApplyCdlTiled(unittest.TestCase):
+    """Tests evaluating corrections one band of rows at a time"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        random.seed(4321)
+        self.cdl = random_cdl('shot1')
+        self.pixels = np.random.RandomState(4321).uniform(
+            -0.1, 1.2, (37, 23, 3)
+        ).astype(np.float32)
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testMatchesUntiled(self):
+        """Tests that every band size gives the same result as apply_cdl"""
+        expected = cdl_convert.apply_cdl(self.pixels, self.cdl)
+        row_bytes = 23 * 3 * 4
+
+        for memory in [1, row_bytes, row_bytes * 5, row_bytes * 36, None]:
+            result = cdl_convert.apply_cdl_tiled(
+                self.pixels, self.cdl, memory=memory
+            )
+            np.testing.assert_array_equal(expected, result)
+
+    #==========================================================================
+
+    def testInPlace(self):
+        """Tests that tiled evaluation can grade in place"""
+        expected = cdl_convert.apply_cdl(self.pixels, self.cdl)
+
+        result = cdl_convert.apply_cdl_tiled(
+            self.pixels, self.cdl, out=self.pixels, memory=1000
+        )
+
+        self.assertTrue(result is self.pixels)
+        np.testing.assert_array_equal(expected, self.pixels)
+
+    #==========================================================================
+
+    def testStackWithOneCdl(self):
+        """Tests that stacks of frames are split into bands per frame"""
+        frames = np.random.RandomState(5).uniform(0.0, 1.0, (3, 9, 4, 3))
+
+        np.testing.assert_array_equal(
+            cdl_convert.apply_cdl(frames, self.cdl),
+            cdl_convert.apply_cdl_tiled(frames, self.cdl, memory=100)
+        )
+
+    #==========================================================================
+
+    def testStackWithCdlPerFrame(self):
+        """Tests that each frame of a stack keeps its own correction"""
+        cdls = [self.cdl, random_cdl('shot2')]
+        frames = np.random.RandomState(6).uniform(0.0, 1.0, (2, 9, 4, 3))
+
+        np.testing.assert_array_equal(
+            cdl_convert.apply_cdl(frames, cdls),
+            cdl_convert.apply_cdl_tiled(frames, cdls, memory=100)
+        )
+
+    #==========================================================================
+
+    def testPixelList(self):
+        """Tests banding a flat list of pixels"""
+        pixels = self.pixels.reshape(-1, 3)
+
+        np.testing.assert_array_equal(
+            cdl_convert.apply_cdl(pixels, self.cdl),
+            cdl_convert.apply_cdl_tiled(pixels, self.cdl, memory=64)
+        )
+
+    #==========================================================================
+
+    def testEmpty(self):
+        """Tests that arrays without any pixels come back empty"""
+        for shape in [(0, 3), (0, 5, 3), (4, 0, 3), (2, 0, 4, 3)]:
+            pixels = np.empty(shape, dtype=np.float32)
+            for apply in [
+                    cdl_convert.apply_cdl,
+                    cdl_convert.apply_cdl_tiled,
+                    cdl_convert.apply_cdl_threaded,
+            ]:
+                result = apply(pixels, self.cdl)
+
+                self.assertEqual(shape, result.shape)
+                self.assertEqual(np.float32, result.dtype)
+
+    #==========================================================================
+
+    @unittest.skipIf(tracemalloc is None, 'tracemalloc is not available')
+    def testPeakMemory(self):
+        """Tests that temporaries stay proportional to the band size"""
+        pixels = np.random.RandomState(7).uniform(0.0, 1.0, (512, 512, 3))
+        out = np.empty_like(pixels)
+        memory = 64 * 1024
+
+        tracemalloc.start()
+        try:
+            cdl_convert.apply_cdl_tiled(pixels, self.cdl, out=out, memory=memory)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        # The frame is 6MB, the scratch for a band is two thirds of memory.
+        self.assertTrue(peak < memory * 2, peak)
+
+# apply_cdl_threaded() ========================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestApplyCdlThreaded(unittest.TestCase):
+    """Tests spreading evaluation across a pool of threads"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        random.seed(2468)
+        self.cdl = random_cdl('shot1')
+        self.pixels = np.random.RandomState(2468).uniform(
+            -0.1, 1.2, (61, 47, 3)
+        ).astype(np.float32)
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+        cdl_convert.THREADS = None
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testDeterministic(self):
+        """Tests that results are identical for any number of threads"""
+        expected = cdl_convert.apply_cdl(self.pixels, self.cdl)
+
+        for threads in [1, 2, 3, 8]:
+            result = cdl_convert.apply_cdl_threaded(
+                self.pixels, self.cdl, threads=threads
+            )
+            np.testing.assert_array_equal(expected, result)
+
+    #==========================================================================
+
+    def testDefaultThreads(self):
+        """Tests that THREADS sets the default thread count"""
+        cdl_convert.THREADS = 2
+
+        np.testing.assert_array_equal(
+            cdl_convert.apply_cdl(self.pixels, self.cdl),
+            cdl_convert.apply_cdl_threaded(self.pixels, self.cdl)
+        )
+
+    #==========================================================================
+
+    def testInPlace(self):
+        """Tests that threaded evaluation can grade in place"""
+        expected = cdl_convert.apply_cdl(self.pixels, self.cdl)
+
+        result = cdl_convert.apply_cdl_threaded(
+            self.pixels, self.cdl, out=self.pixels, threads=4, memory=2000
+        )
+
+        self.assertTrue(result is self.pixels)
+        np.testing.assert_array_equal(expected, self.pixels)
+
+    #==========================================================================
+
+    def testBatchOfFrames(self):
+        """Tests that frames of a stack keep their own corrections"""
+        cdls = [self.cdl, random_cdl('shot2'), random_cdl('shot3')]
+        frames = np.random.RandomState(8).uniform(0.0, 1.0, (3, 20, 7, 3))
+
+        np.testing.assert_array_equal(
+            cdl_convert.apply_cdl(frames, cdls),
+            cdl_convert.apply_cdl_threaded(frames, cdls, threads=3)
+        )
+
+    #==========================================================================
+
+    def testSmallerThanThreads(self):
+        """Tests arrays with fewer rows than threads"""
+        pixels = self.pixels[:1, :2]
+
+        np.testing.assert_array_equal(
+            cdl_convert.apply_cdl(pixels, self.cdl),
+            cdl_convert.apply_cdl_threaded(pixels, self.cdl, threads=8)
+        )
+
+    #==========================================================================
+
+    def testSharedPools(self):
+        """Tests that pools are kept for each thread count and closed"""
+        cdl_convert._close_thread_pools()
+
+        two = cdl_convert._thread_pool(2)
+        three = cdl_convert._thread_pool(3)
+        self.assertTrue(two is cdl_convert._thread_pool(2))
+        self.assertTrue(three is cdl_convert._thread_pool(3))
+        self.assertFalse(two is three)
+
+        cdl_convert._close_thread_pools()
+
+        self.assertEqual({}, cdl_convert._THREAD_POOLS)
+        self.assertRaises(ValueError, two.map, abs, [1])
+        self.assertRaises(ValueError, three.map, abs, [1])
+
+        parent = cdl_convert._thread_pool(2)
+        # As a forked child would find them.
+        with mock.patch.object(cdl_convert.os, 'getpid', return_value=-1):
+            child = cdl_convert._thread_pool(2)
+
+        self.assertFalse(child is parent)
+        self.assertTrue(parent is cdl_convert._thread_pool(2))
+        cdl_convert._THREAD_POOLS.clear()
+        for pool in [parent, child]:
+            pool.close()
+            pool.join()
+
+    #==========================================================================
+
+    @unittest.skipIf(not hasattr(os, 'fork'), 'os.fork is not available')
+    def testForked(self):
+        """Tests that a forked child evaluates with a pool of its own"""
+        expected = cdl_convert.apply_cdl(self.pixels, self.cdl)
+        cdl_convert.apply_cdl_threaded(self.pixels, self.cdl, threads=2)
+
+        pid = os.fork()
+        if not pid:  # pragma: no cover
+            try:
+                result = cdl_convert.apply_cdl_threaded(
+                    self.pixels, self.cdl, threads=2
+                )
+                os._exit(0 if (result == expected).all() else 1)
+            finally:
+                os._exit(2)
+
+        # A child using the parent's pool would wait forever.
+        for _ in range(500):
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                break
+            time.sleep(0.01)
+        else:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self.fail('The forked child never finished evaluating')
+        self.assertEqual(0, status)
+
+# dtype ========================================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestApplyCdlPrecision(unittest.TestCase):
+    """Tests evaluating in a dtype other than the pixel dtype"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        random.seed(4321)
+        self.cdl = random_cdl('shot1')
+        self.cdl.sat = 1.2
+        self.pixels = np.random.RandomState(4321).uniform(
+            -0.1, 1.2, (4, 7, 9, 3)
+        )
+        self.tile_memory = cdl_convert.TILE_MEMORY
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+        cdl_convert.TILE_MEMORY = self.tile_memory
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testHalfWidened(self):
+        """Tests that float16 is evaluated in float32 by default"""
+        pixels = self.pixels.astype(np.float16)
+        expected = cdl_convert.apply_cdl(pixels.astype(np.float32), self.cdl)
+
+        result = cdl_convert.apply_cdl(pixels, self.cdl)
+
+        self.assertEqual(np.float16, result.dtype)
+        np.testing.assert_array_equal(expected.astype(np.float16), result)
+
+    #==========================================================================
+
+    def testHalfInHalf(self):
+        """Tests that float16 math can be asked for"""
+        pixels = self.pixels.astype(np.float16)
+
+        result = cdl_convert.apply_cdl(pixels, self.cdl, dtype=np.float16)
+
+        self.assertEqual(np.float16, result.dtype)
+        np.testing.assert_allclose(
+            reference_image(self.cdl, self.pixels.astype(np.float16)),
+            result,
+            rtol=0,
+            atol=1e-2
+        )
+
+    #==========================================================================
+
+    def testWiderDtype(self):
+        """Tests evaluating float32 pixels in float64"""
+        pixels = self.pixels.astype(np.float32)
+        expected = cdl_convert.apply_cdl(pixels.astype(np.float64), self.cdl)
+
+        result = cdl_convert.apply_cdl(pixels, self.cdl, dtype='float64')
+
+        self.assertEqual(np.float32, result.dtype)
+        np.testing.assert_array_equal(expected.astype(np.float32), result)
+
+    #==========================================================================
+
+    def testBandsMatch(self):
+        """Tests that banded conversion matches converting the whole frame"""
+        pixels = self.pixels.astype(np.float16)
+        cdls = [random_cdl('frame{0}'.format(i)) for i in range(4)]
+        expected = cdl_convert.apply_cdl(
+            pixels.astype(np.float32), cdls
+        ).astype(np.float16)
+        # Small enough that every frame is split into several bands.
+        cdl_convert.TILE_MEMORY = 100
+
+        for result in [
+            cdl_convert.apply_cdl(pixels, cdls),
+            cdl_convert.apply_cdl_tiled(pixels, cdls, memory=100),
+            cdl_convert.apply_cdl_threaded(pixels, cdls, threads=3, memory=100),
+            cdl_convert.apply_cdl(pixels.copy(), cdls, out=pixels.copy()),
+        ]:
+            np.testing.assert_array_equal(expected, result)
+
+    #==========================================================================
+
+    def testInPlace(self):
+        """Tests converting bands in place"""
+        pixels = self.pixels.astype(np.float16)
+        expected = cdl_convert.apply_cdl(pixels, self.cdl)
+
+        result = cdl_convert.apply_cdl(pixels, self.cdl, out=pixels)
+
+        self.assertTrue(result is pixels)
+        np.testing.assert_array_equal(expected, pixels)
+
+    #==========================================================================
+
+    def testBadDtype(self):
+        """Tests that only floating point math is accepted"""
+        self.assertRaises(
+            TypeError,
+            cdl_convert.apply_cdl,
+            self.pixels,
+            self.cdl,
+            dtype=np.int32
+        )
+
+    #==========================================================================
+
+    def testBakeLut(self):
+        """Tests baking a LUT in a narrower dtype"""
+        expected = cdl_convert.bake_lut(self.cdl, size=9)
+
+        for dtype, tolerance in [(np.float32, 1e-6), (np.float16, 1e-3)]:
+            lut = cdl_convert.bake_lut(self.cdl, size=9, dtype=dtype)
+            self.assertEqual(dtype, lut.dtype)
+            np.testing.assert_allclose(expected, lut, rtol=0, atol=tolerance)
+
+    #==========================================================================
+
+    def testInverseHalf(self):
+        """Tests inverting float16 pixels"""
+        self.cdl.slope = [1.2, 0.9, 1.1]
+        self.cdl.offset = [0.02, -0.01, 0.05]
+        self.cdl.sat = 0.8
+        pixels = self.pixels.clip(0.1, 0.8).astype(np.float16)
+        graded = self.cdl.apply(pixels)
+
+        result = self.cdl.inverse().apply(graded)
+
+        self.assertEqual(np.float16, result.dtype)
+        np.testing.assert_allclose(pixels, result, rtol=0, atol=1e-2)
+
+# integer pixels ===============================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestApplyCdlCodes(unittest.TestCase):
+    """Tests evaluating integer code values through per channel tables"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        random.seed(2468)
+        self.cdl = random_cdl('shot1')
+        self.cdl.sat = 1.0
+        self.state = np.random.RandomState(2468)
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+
+    def codes(self, top, shape, dtype):
+        """Returns random code values from 0 to top"""
+        return self.state.randint(0, top + 1, shape).astype(dtype)
+
+    #==========================================================================
+
+    def reference(self, cdl, pixels, top):
+        """Grades code values with the scalar formula"""
+        graded = reference_image(cdl, pixels.astype(np.float64) / top)
+        return np.rint(graded * top)
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testNoSat(self):
+        """Tests that 8 bit codes without saturation are looked up exactly"""
+        pixels = self.codes(255, (5, 6, 3), np.uint8)
+
+        result = cdl_convert.apply_cdl(pixels, self.cdl)
+
+        self.assertEqual(np.uint8, result.dtype)
+        ramp = pixels / 255.0
+        expected = np.rint(
+            np.clip(
+                ramp * self.cdl.slope + self.cdl.offset, 0.0, 1.0
+            ) ** np.array(self.cdl.power) * 255
+        )
+        np.testing.assert_array_equal(expected, result)
+
+    #==========================================================================
+
+    def testSat(self):
+        """Tests 16 bit codes with saturation"""
+        self.cdl.sat = 1.4
+        pixels = self.codes(65535, (5, 6, 3), np.uint16)
+
+        result = cdl_convert.apply_cdl(pixels, self.cdl)
+
+        self.assertEqual(np.uint16, result.dtype)
+        np.testing.assert_allclose(
+            self.reference(self.cdl, pixels, 65535), result, rtol=0, atol=1
+        )
+
+    #==========================================================================
+
+    def testBitDepth(self):
+        """Tests 10 bit codes held in uint16"""
+        self.cdl.sat = 0.7
+        pixels = self.codes(1023, (5, 6, 3), np.uint16)
+
+        result = cdl_convert.apply_cdl(pixels, self.cdl, bit_depth=10)
+
+        self.assertTrue(result.max() <= 1023)
+        np.testing.assert_allclose(
+            self.reference(self.cdl, pixels, 1023), result, rtol=0, atol=1
+        )
+
+    #==========================================================================
+
+    def testAboveBitDepth(self):
+        """Tests that codes above the bit depth act as the top code"""
+        for sat in [1.0, 1.3]:
+            self.cdl.sat = sat
+            pixels = np.array([[1023, 4000, 65535]], dtype=np.uint16)
+
+            result = self.cdl.apply(pixels, bit_depth=10)
+
+            np.testing.assert_array_equal(
+                self.cdl.apply(np.array([[1023] * 3], dtype=np.uint16),
+                               bit_depth=10),
+                result
+            )
+
+    #==========================================================================
+
+    def testBandsMatch(self):
+        """Tests that tiled, threaded and per frame results all match"""
+        pixels = self.codes(4095, (4, 7, 9, 3), np.uint16)
+        cdls = [random_cdl('frame{0}'.format(i)) for i in range(4)]
+        cdls[1].sat = 1.0
+        cdls[3] = cdls[2]
+
+        expected = np.array([
+            cdl_convert.apply_cdl(frame, cdl, bit_depth=12)
+            for frame, cdl in zip(pixels, cdls)
+        ])
+
+        for result in [
+            cdl_convert.apply_cdl(pixels, cdls, bit_depth=12),
+            cdl_convert.apply_cdl_tiled(
+                pixels, cdls, memory=100, bit_depth=12
+            ),
+            cdl_convert.apply_cdl_threaded(
+                pixels, cdls, threads=3, memory=100, bit_depth=12
+            ),
+        ]:
+            np.testing.assert_array_equal(expected, result)
+
+    #==========================================================================
+
+    def testInPlace(self):
+        """Tests grading code values in place"""
+        for sat in [1.0, 1.2]:
+            self.cdl.sat = sat
+            pixels = self.codes(255, (5, 6, 3), np.uint8)
+            expected = self.cdl.apply(pixels)
+
+            result = self.cdl.apply(pixels, out=pixels)
+
+            self.assertTrue(result is pixels)
+            np.testing.assert_array_equal(expected, pixels)
+
+    #==========================================================================
+
+    def testFloat64Math(self):
+        """Tests evaluating saturation of codes in float64"""
+        self.cdl.sat = 1.4
+        pixels = self.codes(65535, (5, 6, 3), np.uint16)
+
+        result = cdl_convert.apply_cdl(pixels, self.cdl, dtype=np.float64)
+
+        np.testing.assert_allclose(
+            self.reference(self.cdl, pixels, 65535), result, rtol=0, atol=1
+        )
+
+    #==========================================================================
+
+    def testBadBitDepth(self):
+        """Tests that bit depths must fit the dtype and the tables"""
+        for pixels, bit_depth in [
+                (np.zeros((2, 3), dtype=np.uint8), 10),
+                (np.zeros((2, 3), dtype=np.uint16), 0),
+                (np.zeros((2, 3), dtype=np.uint32), None),
+        ]:
+            self.assertRaises(
+                ValueError,
+                cdl_convert.apply_cdl,
+                pixels,
+                self.cdl,
+                bit_depth=bit_depth
+            )
+
+        np.testing.assert_array_equal(
+            cdl_convert.apply_cdl(
+                np.zeros((2, 3), dtype=np.uint32), self.cdl, bit_depth=16
+            ),
+            cdl_convert.apply_cdl(
+                np.zeros((2, 3), dtype=np.uint16), self.cdl
+            )
+        )
+
+    #==========================================================================
+
+    def testSigned(self):
+        """Tests that signed integers are refused"""
+        self.assertRaises(
+            TypeError,
+            cdl_convert.apply_cdl,
+            np.zeros((2, 3), dtype=np.int16),
+            self.cdl
+        )
+
+# ColorCorrection.compile() ===================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestColorCorrectionPlan(unittest.TestCase):
+    """Tests compiling a ColorCorrection into an evaluation plan"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cdl = cdl_convert.ColorCorrection('shot1', 'file')
+        self.pixels = np.random.RandomState(1357).uniform(
+            -0.1, 1.2, (6, 5, 3)
+        )
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+
+    def grade(self, slope, offset, power, sat):
+        """Sets all of the values of our correction"""
+        self.cdl.slope = slope
+        self.cdl.offset = offset
+        self.cdl.power = power
+        self.cdl.sat = sat
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testIdentity(self):
+        """Tests that an identity correction only clamps"""
+        plan = self.cdl.compile()
+
+        self.assertEqual(('clamp', ), plan.steps)
+        np.testing.assert_array_equal(
+            np.clip(self.pixels, 0.0, 1.0),
+            plan.apply(self.pixels)
+        )
+
+    #==========================================================================
+
+    def testSteps(self):
+        """Tests which operations are planned for different values"""
+        for values, steps in [
+            (
+                ([1.1, 0.9, 1.0], [0.1, 0.0, 0.0], [0.9, 1.1, 1.2], 0.8),
+                ('slope', 'offset', 'clamp', 'power[0]', 'power[1]',
+                 'power[2]', 'saturation', 'clamp'),
+            ),
+            (
+                ([1.0, 1.0, 1.0], [0.1, 0.1, 0.1], [1.3, 1.3, 1.3], 1.0),
+                ('offset', 'clamp', 'power'),
+            ),
+            (
+                ([2.0, 2.0, 2.0], [0.0, 0.0, 0.0], [2.0, 2.0, 2.0], 1.0),
+                ('slope', 'clamp', 'square'),
+            ),
+            (
+                ([1.0, 1.0, 1.0], [0.0, 0.0, 0.0], [0.5, 1.0, 2.0], 1.5),
+                ('clamp', 'sqrt[0]', 'square[2]', 'saturation', 'clamp'),
+            ),
+        ]:
+            self.grade(*values)
+            self.assertEqual(steps, self.cdl.compile().steps)
+
+    #==========================================================================
+
+    def testMatchesReference(self):
+        """Tests that every strategy matches the scalar formula"""
+        for values in [
+            ([1.1, 0.9, 1.0], [0.1, -0.05, 0.0], [0.9, 1.1, 1.2], 0.8),
+            ([1.2, 1.2, 1.2], [0.1, 0.1, 0.1], [1.3, 1.3, 1.3], 1.0),
+            ([2.0, 2.0, 2.0], [0.0, 0.0, 0.0], [2.0, 2.0, 2.0], 1.0),
+            ([1.0, 1.0, 1.0], [0.0, 0.0, 0.0], [0.5, 0.5, 0.5], 0.0),
+            ([1.0, 1.0, 1.0], [0.0, 0.0, 0.0], [0.5, 1.0, 2.0], 1.5),
+        ]:
+            self.grade(*values)
+            np.testing.assert_allclose(
+                reference_image(self.cdl, self.pixels),
+                cdl_convert.apply_cdl(self.pixels, self.cdl),
+                rtol=0,
+                atol=1e-12
+            )
+
+    #==========================================================================
+
+    def testPowerFastPaths(self):
+        """Tests that square and sqrt match np.power bit for bit"""
+        random = np.random.RandomState(1357)
+        for dtype in [np.float16, np.float32, np.float64]:
+            pixels = random.uniform(-2.0, 4.0, (64, 61, 3)).astype(dtype)
+            for power, func in [(2.0, np.square), (0.5, np.sqrt)]:
+                exponent = (dtype(power), )
+                for mirror in [False, True]:
+                    np.testing.assert_array_equal(
+                        cdl_convert._signed_power(
+                            pixels, np.power, exponent, mirror,
+                            np.empty_like(pixels)
+                        ),
+                        cdl_convert._signed_power(
+                            pixels, func, (), mirror, np.empty_like(pixels)
+                        )
+                    )
+
+                self.grade([1.0] * 3, [0.0] * 3, [power] * 3, 1.0)
+                np.testing.assert_array_equal(
+                    np.power(np.clip(pixels, 0.0, 1.0), *exponent),
+                    self.cdl.compile(dtype).apply(pixels)
+                )
+
+    #==========================================================================
+
+    def testCached(self):
+        """Tests that plans are cached until the values change"""
+        self.grade([1.1, 1.0, 1.0], [0.0, 0.0, 0.0], [1.0, 1.0, 1.0], 1.0)
+        plan = self.cdl.compile()
+
+        self.assertTrue(plan is self.cdl.compile())
+        self.assertTrue(plan is self.cdl.compile(np.float64))
+
+        plan32 = self.cdl.compile('float32')
+        self.assertEqual(np.float32, plan32.dtype)
+        self.assertFalse(plan32 is plan)
+
+        self.cdl.sat = 1.2
+        changed = self.cdl.compile()
+        self.assertFalse(changed is plan)
+        self.assertEqual('saturation', changed.steps[-2])
+
+    #==========================================================================
+
+    def testApplyOtherDtype(self):
+        """Tests applying a plan to pixels of another dtype"""
+        self.grade([1.1, 0.9, 1.0], [0.1, -0.05, 0.0], [0.9, 1.1, 1.2], 0.8)
+        pixels = self.pixels.astype(np.float32)
+
+        result = self.cdl.compile().apply(pixels)
+
+        self.assertEqual(np.float32, result.dtype)
+        np.testing.assert_array_equal(
+            cdl_convert.apply_cdl(pixels, self.cdl, dtype=np.float64),
+            result
+        )
+
+    #==========================================================================
+
+    def testBadDtype(self):
+        """Tests that plans need a floating point dtype"""
+        self.assertRaises(TypeError, self.cdl.compile, np.uint8)
+
+# Clamping policies ===========================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestApplyCdlClamp(unittest.TestCase):
+    """Tests evaluating corrections with each clamping policy"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cdl = cdl_convert.ColorCorrection('shot1', 'file')
+        self.pixels = np.random.RandomState(97531).uniform(
+            -0.5, 1.5, (6, 5, 3)
+        )
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+        cdl_convert._CHAIN_PLANS.clear()
+
+    #==========================================================================
+
+    def grade(self, slope, offset, power, sat):
+        """Sets all of the values of our correction"""
+        self.cdl.slope = slope
+        self.cdl.offset = offset
+        self.cdl.power = power
+        self.cdl.sat = sat
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testMatchesReference(self):
+        """Tests that every policy and strategy matches the scalar formula"""
+        for values in [
+            ([1.1, 0.9, 1.0], [0.1, -0.05, 0.0], [0.9, 1.1, 1.2], 0.8),
+            ([1.2, 1.2, 1.2], [-0.1, -0.1, -0.1], [1.3, 1.3, 1.3], 1.0),
+            ([1.0, 1.0, 1.0], [0.0, 0.0, 0.0], [2.0, 2.0, 2.0], 1.2),
+            ([1.0, 1.0, 1.0], [0.0, 0.0, 0.0], [0.5, 1.0, 2.0], 1.5),
+        ]:
+            self.grade(*values)
+            for clamp in cdl_convert.CLAMP_MODES:
+                np.testing.assert_allclose(
+                    reference_image(self.cdl, self.pixels, clamp),
+                    cdl_convert.apply_cdl(self.pixels, self.cdl, clamp=clamp),
+                    rtol=0,
+                    atol=1e-12
+                )
+
+    #==========================================================================
+
+    def testSteps(self):
+        """Tests that unclamped plans leave out both clamps"""
+        self.grade([1.1, 1.1, 1.1], [0.1, 0.1, 0.1], [0.9, 1.0, 2.0], 0.8)
+
+        for clamp in ['none', 'mirror']:
+            plan = self.cdl.compile(clamp=clamp)
+            self.assertEqual(clamp, plan.clamp)
+            self.assertEqual(
+                ('slope', 'offset', 'power[0]', 'square[2]', 'saturation'),
+                plan.steps
+            )
+
+    #==========================================================================
+
+    def testIdentity(self):
+        """Tests that unclamped identity leaves pixels untouched"""
+        out = np.zeros_like(self.pixels)
+
+        cdl_convert.apply_cdl(self.pixels, self.cdl, out=out, clamp='none')
+
+        self.assertEqual((), self.cdl.compile(clamp='none').steps)
+        np.testing.assert_array_equal(self.pixels, out)
+
+    #==========================================================================
+
+    def testDefault(self):
+        """Tests that CLAMP sets the default policy"""
+        self.grade([1.0, 1.0, 1.0], [0.0, 0.0, 0.0], [2.0, 2.0, 2.0], 1.0)
+        clamp = cdl_convert.CLAMP
+        cdl_convert.CLAMP = 'mirror'
+        try:
+            result = cdl_convert.apply_cdl(self.pixels, self.cdl)
+        finally:
+            cdl_convert.CLAMP = clamp
+
+        np.testing.assert_array_equal(
+            np.sign(self.pixels) * self.pixels ** 2, result
+        )
+
+    #==========================================================================
+
+    def testTiledAndChained(self):
+        """Tests that tiled, threaded and chained results match"""
+        self.grade([1.1, 0.9, 1.0], [0.1, -0.05, 0.0], [0.9, 1.1, 1.2], 0.8)
+        for clamp in cdl_convert.CLAMP_MODES:
+            expected = cdl_convert.apply_cdl(
+                self.pixels, self.cdl, clamp=clamp
+            )
+            for func in [cdl_convert.apply_cdl_tiled,
+                         cdl_convert.apply_cdl_threaded]:
+                np.testing.assert_array_equal(
+                    expected,
+                    func(self.pixels, self.cdl, memory=100, clamp=clamp)
+                )
+            np.testing.assert_array_equal(
+                expected,
+                cdl_convert.apply_cdl_chain(
+                    self.pixels, [self.cdl], clamp=clamp
+                )
+            )
+
+    #==========================================================================
+
+    def testCodes(self):
+        """Tests that unclamped integer codes stay inside the code range"""
+        self.grade([1.4, 1.0, 0.8], [-0.1, 0.0, 0.1], [0.9, 1.0, 1.2], 1.3)
+        codes = np.arange(0, 1024, dtype=np.uint16).reshape(32, 32, 1)
+        codes = np.repeat(codes, 3, axis=2)
+        codes[..., 1] = codes[..., 1][::-1]
+
+        for clamp in cdl_convert.CLAMP_MODES:
+            expected = reference_image(self.cdl, codes / 1023.0, clamp)
+            expected = np.clip(np.rint(expected * 1023), 0, 1023)
+            result = cdl_convert.apply_cdl(
+                codes, self.cdl, bit_depth=10, dtype=np.float64, clamp=clamp
+            )
+            np.testing.assert_array_equal(expected, result)
+
+    #==========================================================================
+
+    def testBadClamp(self):
+        """Tests that unknown clamping policies are refused"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.apply_cdl,
+            self.pixels,
+            self.cdl,
+            clamp='soft'
+        )
+        self.assertRaises(ValueError, self.cdl.compile, clamp='soft')
+
+    #==========================================================================
+
+    def testChainsShareClamp(self):
+        """Tests that plans with different policies can't be chained"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert._chain_plans,
+            [self.cdl.compile(clamp='asc'), self.cdl.compile(clamp='none')]
+        )
+
+# apply_cdl_chain() ===========================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestApplyCdlChain(unittest.TestCase):
+    """Tests evaluating a chain of corrections in one pass"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.shot = cdl_convert.ColorCorrection('shot1', 'file')
+        self.shot.slope = [1.2, 0.9, 1.1]
+        self.shot.offset = [0.02, -0.01, 0.05]
+        self.shot.power = [1.1, 0.9, 1.2]
+        self.shot.sat = 0.8
+
+        self.sequence = cdl_convert.ColorCorrection('seq1', 'file')
+        self.sequence.power = [2.0, 2.0, 2.0]
+        self.sequence.sat = 1.3
+
+        self.pixels = np.random.RandomState(2468).uniform(
+            -0.1, 1.2, (7, 6, 3)
+        )
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+        cdl_convert._CHAIN_PLANS.clear()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testMatchesSequential(self):
+        """Tests that a chain matches applying each correction in turn"""
+        expected = cdl_convert.apply_cdl(
+            cdl_convert.apply_cdl(self.pixels, self.shot), self.sequence
+        )
+
+        np.testing.assert_array_equal(
+            expected,
+            cdl_convert.apply_cdl_chain(
+                self.pixels, [self.shot, self.sequence], memory=100
+            )
+        )
+
+    #==========================================================================
+
+    def testInPlaceFloat16(self):
+        """Tests that float16 stays in float32 for the whole chain"""
+        pixels = self.pixels.astype(np.float16)
+        expected = cdl_convert.apply_cdl(
+            cdl_convert.apply_cdl(pixels.astype(np.float32), self.shot),
+            self.sequence
+        ).astype(np.float16)
+
+        result = cdl_convert.apply_cdl_chain(
+            pixels, [self.shot, self.sequence], out=pixels
+        )
+
+        self.assertTrue(result is pixels)
+        np.testing.assert_array_equal(expected, pixels)
+
+    #==========================================================================
+
+    def testSkipsRedundantStages(self):
+        """Tests that later corrections skip clamps and identity grades"""
+        identity = cdl_convert.ColorCorrection('identity', 'file')
+
+        plan = cdl_convert.compile_chain(
+            [self.shot, identity, self.sequence]
+        )
+
+        self.assertEqual(
+            self.shot.compile().steps
+            + ('square', 'saturation', 'clamp'),
+            plan.steps
+        )
+
+    #==========================================================================
+
+    def testSharedPlans(self):
+        """Tests that a shared sequence grade is only compiled once"""
+        chains = []
+        for i in range(20):
+            shot = cdl_convert.ColorCorrection('shot{0}'.format(i + 2), 'file')
+            shot.slope = [1.0 + i / 100.0, 1.0, 1.0]
+            chains.append(
+                cdl_convert.compile_chain([shot, self.sequence])
+            )
+
+        self.assertEqual(1, len(self.sequence._plans))
+        sequence_stages = self.sequence.compile()._tail
+        for chain in chains:
+            self.assertTrue(chain._head[-1] is sequence_stages[0])
+
+        self.assertTrue(
+            chains[0] is cdl_convert.compile_chain(
+                [cdl_convert.ColorCorrection.members['shot2'],
+                 self.sequence]
+            )
+        )
+
+    #==========================================================================
+
+    def testBadChains(self):
+        """Tests that empty chains and integer pixels are refused"""
+        self.assertRaises(
+            ValueError, cdl_convert.apply_cdl_chain, self.pixels, []
+        )
+        self.assertRaises(
+            TypeError,
+            cdl_convert.apply_cdl_chain,
+            np.zeros((2, 3), np.uint16),
+            [self.shot]
+        )
+
+# ColorCorrection.inverse() ===================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestColorCorrectionInverse(unittest.TestCase):
+    """Tests undoing a ColorCorrection on pixel arrays"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cdl = cdl_convert.ColorCorrection('shot1', 'file')
+        self.cdl.slope = [1.2, 0.9, 1.1]
+        self.cdl.offset = [0.02, -0.01, 0.05]
+        self.cdl.power = [1.1, 0.9, 1.2]
+        self.cdl.sat = 0.8
+        # Every channel stays inside of 0.0 - 1.0 through the forward
+        # transform, so nothing is clamped.
+        self.pixels = np.random.RandomState(1234).uniform(
+            0.1, 0.8, (6, 5, 3)
+        )
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testRoundTrip(self):
+        """Tests that the inverse undoes the correction"""
+        graded = self.cdl.apply(self.pixels)
+
+        result = self.cdl.inverse().apply(graded)
+
+        np.testing.assert_allclose(self.pixels, result, rtol=0, atol=1e-12)
+
+    #==========================================================================
+
+    def testRoundTripSaturate(self):
+        """Tests undoing a saturation increase"""
+        self.cdl.sat = 1.3
+        pixels = 0.45 + (self.pixels - 0.45) * 0.2
+        graded = self.cdl.apply(pixels)
+
+        result = self.cdl.inverse().apply(graded)
+
+        np.testing.assert_allclose(pixels, result, rtol=0, atol=1e-12)
+
+    #==========================================================================
+
+    def testFloat32InPlace(self):
+        """Tests inverting float32 pixels in place"""
+        pixels = self.pixels.astype(np.float32)
+        graded = self.cdl.apply(pixels)
+
+        result = self.cdl.inverse().apply(graded, out=graded)
+
+        self.assertTrue(result is graded)
+        self.assertEqual(np.float32, result.dtype)
+        np.testing.assert_allclose(pixels, result, rtol=0, atol=1e-5)
+
+    #==========================================================================
+
+    def testUndefined(self):
+        """Tests that channels no input could produce come out as NaN"""
+        self.cdl.sat = 0.5
+        pixels = np.array([[1.0, 0.0, 0.0], [0.5, 0.5, 0.5]])
+
+        result = self.cdl.inverse().apply(pixels)
+
+        self.assertTrue(np.isnan(result[0]).all())
+        self.assertFalse(np.isnan(result[1]).any())
+
+    #==========================================================================
+
+    def testClamped(self):
+        """Tests that clamped values invert to the input at the clamp"""
+        self.cdl.sat = 1.0
+        pixels = np.array([0.0, 1.0, 0.0])
+
+        result = self.cdl.inverse().apply(pixels)
+
+        np.testing.assert_allclose(
+            [-0.02 / 1.2, 1.01 / 0.9, -0.05 / 1.1],
+            result
+        )
+
+    #==========================================================================
+
+    def testUnclamped(self):
+        """Tests undoing corrections applied without clamping"""
+        pixels = np.random.RandomState(4321).uniform(-0.5, 1.5, (6, 5, 3))
+
+        for clamp in ['none', 'mirror']:
+            graded = self.cdl.apply(pixels, clamp=clamp)
+
+            result = self.cdl.inverse(clamp).apply(graded)
+
+            self.assertEqual(clamp, self.cdl.inverse(clamp).clamp)
+            np.testing.assert_allclose(pixels, result, rtol=0, atol=1e-12)
+
+        cdl_convert.CLAMP = 'mirror'
+        try:
+            inverse = self.cdl.inverse()
+        finally:
+            cdl_convert.CLAMP = 'asc'
+        self.assertEqual('mirror', inverse.clamp)
+        self.assertRaises(ValueError, self.cdl.inverse, 'loose')
+
+    #==========================================================================
+
+    def testSnapshot(self):
+        """Tests that the inverse keeps the values it was made with"""
+        inverse = self.cdl.inverse()
+        self.cdl.slope = [2.0, 2.0, 2.0]
+
+        self.assertEqual('shot1', inverse.id)
+        self.assertEqual((1.2, 0.9, 1.1), inverse.slope)
+        self.assertEqual((0.02, -0.01, 0.05), inverse.offset)
+        self.assertEqual((1.1, 0.9, 1.2), inverse.power)
+        self.assertEqual(0.8, inverse.sat)
+
+    #==========================================================================
+
+    def testNotInvertible(self):
+        """Tests that zero slope, power or sat can't be inverted"""
+        for attr, value in [('slope', [1.0, 0.0, 1.0]),
+                            ('power', [1.0, 1.0, 0.0]),
+                            ('sat', 0.0)]:
+            cdl = cdl_convert.ColorCorrection(attr, 'file')
+            setattr(cdl, attr, value)
+            self.assertRaises(ValueError, cdl.inverse)
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
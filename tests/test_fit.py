@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+"""
+Tests fitting corrections to samples with cdl_convert
+
+REQUIREMENTS:
+
+numpy
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+import os
+import sys
+import unittest
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert.cdl_convert as cdl_convert
+from helpers import build_cdl
+
+np = cdl_convert.np
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+NO_NUMPY = np is None
+NO_NUMPY_REASON = 'NumPy is not installed'
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+# fit_cdl() ===================================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestFitCdl(unittest.TestCase):
+    """Tests fitting a correction to source and target samples"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cdl = build_cdl('graded')
+        self.source = np.random.RandomState(2).uniform(0.0, 1.0, (2000, 3))
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def assertValuesAlmostEqual(self, expected, fitted, places=7):
+        """Asserts that every grade value of two corrections is close"""
+        expected = expected._values()
+        fitted = fitted._values()
+        for expected_values, fitted_values in zip(expected[:3], fitted[:3]):
+            for value, fitted_value in zip(expected_values, fitted_values):
+                self.assertAlmostEqual(value, fitted_value, places)
+        self.assertAlmostEqual(expected[3], fitted[3], places)
+
+    #==========================================================================
+
+    def testRecoversGrade(self):
+        """Tests that an exact grade is recovered for each clamping policy"""
+        for clamp in cdl_convert.CLAMP_MODES:
+            low = 0.0 if clamp == 'asc' else -0.2
+            source = np.random.RandomState(4).uniform(low, 1.0, (2000, 3))
+            target = self.cdl.apply(source, clamp=clamp)
+
+            fitted = cdl_convert.fit_cdl(source, target, clamp=clamp)
+
+            self.assertValuesAlmostEqual(self.cdl, fitted)
+
+    #==========================================================================
+
+    def testNoisySamples(self):
+        """Tests that noisy samples fit close to the grade"""
+        target = self.cdl.apply(self.source)
+        target += np.random.RandomState(7).normal(0.0, 0.005, target.shape)
+
+        fitted = cdl_convert.fit_cdl(self.source, target)
+
+        self.assertValuesAlmostEqual(self.cdl, fitted, places=2)
+
+    #==========================================================================
+
+    def testClampedTargets(self):
+        """Tests fitting a grade that pushes samples into the clamps"""
+        self.cdl.slope = [1.6, 0.7, 1.0]
+        self.cdl.offset = [-0.1, 0.05, 0.0]
+        target = self.cdl.apply(self.source)
+
+        fitted = cdl_convert.fit_cdl(self.source, target)
+
+        self.assertValuesAlmostEqual(self.cdl, fitted, places=6)
+
+    #==========================================================================
+
+    def testIdentity(self):
+        """Tests that samples graded by nothing fit the identity"""
+        fitted = cdl_convert.fit_cdl(self.source, self.source.copy())
+
+        np.testing.assert_allclose(
+            self.source, fitted.apply(self.source), rtol=0, atol=1e-9
+        )
+        self.assertAlmostEqual(1.0, fitted.sat)
+
+    #==========================================================================
+
+    def testLut(self):
+        """Tests fitting a baked LUT when no source is given"""
+        lut = cdl_convert.bake_lut(
+            self.cdl, size=9, in_range=(-0.25, 1.25), clamp='none'
+        )
+
+        fitted = cdl_convert.fit_cdl(
+            None, lut, in_range=(-0.25, 1.25), clamp='none'
+        )
+
+        self.assertValuesAlmostEqual(self.cdl, fitted)
+
+    #==========================================================================
+
+    def test1dLut(self):
+        """Tests fitting a 1D LUT"""
+        self.cdl.sat = 1.0
+        lut = cdl_convert.bake_lut(self.cdl, size=64)
+
+        fitted = cdl_convert.fit_cdl(None, lut)
+
+        self.assertValuesAlmostEqual(self.cdl, fitted, places=6)
+
+    #==========================================================================
+
+    def testNonNegative(self):
+        """Tests that slope, power and sat don't go negative"""
+        target = 1.0 - self.source
+
+        fitted = cdl_convert.fit_cdl(self.source, target)
+
+        for value in fitted.slope + fitted.power:
+            self.assertTrue(value >= 0.0)
+        self.assertTrue(fitted.sat >= 0.0)
+
+    #==========================================================================
+
+    def testIdAndFile(self):
+        """Tests the id and file of the returned correction"""
+        target = self.cdl.apply(self.source)
+
+        fitted = cdl_convert.fit_cdl(self.source, target)
+        named = cdl_convert.fit_cdl(
+            self.source, target, cc_id='patches', cdl_file='chart.cc'
+        )
+
+        self.assertEqual('fit001', fitted.id)
+        self.assertTrue(fitted.file_in.endswith('fit001.cc'))
+        self.assertEqual('patches', named.id)
+        self.assertTrue(named.file_in.endswith('chart.cc'))
+        self.assertTrue(
+            cdl_convert.ColorCorrection.members['patches'] is named
+        )
+
+    #==========================================================================
+
+    def testShapes(self):
+        """Tests that samples of any matching shape are accepted"""
+        target = self.cdl.apply(self.source)
+
+        fitted = cdl_convert.fit_cdl(
+            self.source.reshape(20, 100, 3).astype(np.float32),
+            target.reshape(20, 100, 3)
+        )
+
+        self.assertValuesAlmostEqual(self.cdl, fitted, places=5)
+
+    #==========================================================================
+
+    def testBadSamples(self):
+        """Tests that mismatched or bad samples raise"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.fit_cdl, self.source, self.source[:10]
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.fit_cdl, self.source[:, :2], self.source[:, :2]
+        )
+        self.assertRaises(
+            TypeError,
+            cdl_convert.fit_cdl, np.ones((4, 3), np.int32), np.ones((4, 3))
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.fit_cdl, None, np.ones((4, 4, 3))
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.fit_cdl, self.source, self.source, clamp='clip'
+        )
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
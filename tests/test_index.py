@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+"""
+Tests indexing corrections for nearest grade searches with cdl_convert
+
+REQUIREMENTS:
+
+numpy
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+import os
+import sys
+import unittest
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert.cdl_convert as cdl_convert
+
+np = cdl_convert.np
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+NO_NUMPY = np is None
+NO_NUMPY_REASON = 'NumPy is not installed'
+
+#==============================================================================
+# FUNCTIONS
+#==============================================================================
+
+
+def brute_force(values, weights, grade):
+    """Returns the weighted distance from every value to a grade"""
+    return np.sqrt((((values - grade) * weights) ** 2).sum(axis=1))
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+# GradeIndex ==================================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestGradeIndex(unittest.TestCase):
+    """Tests searching for the nearest grades"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        random = np.random.RandomState(11)
+        looks = np.abs(random.normal(1.0, 0.3, (40, 10)))
+        self.values = np.abs(
+            looks[random.randint(0, 40, 5000)] +
+            random.normal(0.0, 0.02, (5000, 10))
+        )
+        self.batch = cdl_convert.CorrectionBatch(
+            ['grade{0}'.format(i) for i in range(5000)], self.values
+        )
+        self.grades = np.abs(random.normal(1.0, 0.3, (20, 10)))
+        self.weights = np.ones(10)
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testNearest(self):
+        """Tests that the nearest grades match a search of every grade"""
+        for leaf_size in [1, 7, 128, 10000]:
+            index = cdl_convert.GradeIndex(self.batch, leaf_size=leaf_size)
+            for grade in self.grades:
+                expected = brute_force(self.values, self.weights, grade)
+
+                distances, indexes = index.nearest(grade, k=5)
+
+                np.testing.assert_allclose(
+                    np.sort(expected)[:5], distances, rtol=1e-12
+                )
+                np.testing.assert_allclose(
+                    expected[indexes], distances, rtol=1e-12
+                )
+
+    #==========================================================================
+
+    def testWithin(self):
+        """Tests that radius searches match a search of every grade"""
+        index = cdl_convert.GradeIndex(self.batch, leaf_size=16)
+        for grade in self.grades:
+            expected = brute_force(self.values, self.weights, grade)
+
+            distances, indexes = index.within(grade, 0.4)
+
+            self.assertEqual(
+                sorted(np.flatnonzero(expected <= 0.4)), sorted(indexes)
+            )
+            np.testing.assert_allclose(expected[indexes], distances)
+            self.assertTrue((np.diff(distances) >= 0.0).all())
+
+        distances, indexes = index.within(self.grades[0], 0.0)
+        self.assertEqual((0, ), distances.shape)
+        self.assertEqual((0, ), indexes.shape)
+
+    #==========================================================================
+
+    def testWeights(self):
+        """Tests that weights scale each dimension of the distance"""
+        weights = [1.0] * 6 + [0.5] * 3 + [0.0]
+        index = cdl_convert.GradeIndex(self.batch, weights=weights)
+        for grade in self.grades:
+            expected = brute_force(self.values, weights, grade)
+
+            distances, indexes = index.nearest(grade, k=3)
+
+            np.testing.assert_allclose(
+                np.sort(expected)[:3], distances, rtol=1e-12
+            )
+            np.testing.assert_allclose(expected[indexes], distances)
+
+    #==========================================================================
+
+    def testCorrections(self):
+        """Tests indexing and searching with corrections"""
+        cdls = self.batch.corrections()[:50]
+        index = cdl_convert.GradeIndex(cdls)
+
+        distances, indexes = index.nearest(cdls[7], k=2)
+
+        self.assertEqual(50, len(index))
+        self.assertEqual(0.0, distances[0])
+        self.assertEqual('grade7', index.ids[indexes[0]])
+        np.testing.assert_array_equal(self.values[:50], index.values)
+
+    #==========================================================================
+
+    def testFewGrades(self):
+        """Tests asking for more grades than are indexed"""
+        index = cdl_convert.GradeIndex(
+            cdl_convert.CorrectionBatch(['a', 'b'], self.values[:2])
+        )
+
+        distances, indexes = index.nearest(self.values[1], k=5)
+
+        self.assertEqual([1, 0], indexes.tolist())
+        self.assertEqual(0.0, distances[0])
+
+    #==========================================================================
+
+    def testRepeatedGrades(self):
+        """Tests indexing many copies of the same grade"""
+        batch = cdl_convert.CorrectionBatch(
+            [str(i) for i in range(500)], np.ones((500, 10))
+        )
+        index = cdl_convert.GradeIndex(batch, leaf_size=4)
+
+        distances, indexes = index.nearest(np.ones(10), k=3)
+
+        self.assertEqual([0.0] * 3, distances.tolist())
+        self.assertEqual(500, len(index.within(np.ones(10), 0.0)[1]))
+
+    #==========================================================================
+
+    def testBadIndexes(self):
+        """Tests that bad grades and arguments raise"""
+        index = cdl_convert.GradeIndex(self.batch)
+        self.assertRaises(ValueError, cdl_convert.GradeIndex, [])
+        self.assertRaises(
+            ValueError,
+            cdl_convert.GradeIndex, self.batch, weights=[1.0, -1.0] * 5
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.GradeIndex, self.batch, weights=[1.0] * 3
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.GradeIndex, self.batch, leaf_size=0
+        )
+        self.assertRaises(ValueError, index.nearest, [1.0] * 9)
+        self.assertRaises(ValueError, index.nearest, self.grades[0], k=0)
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,1037 @@
+#!/usr/bin/env python
+"""
+Tests the LUT baking and writing functions of cdl_convert
+
+REQUIREMENTS:
+
+mock
+numpy
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+import os
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+import sys
+import tempfile
+import unittest
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert.cdl_convert as cdl_convert
+from helpers import build_cdl
+
+np = cdl_convert.np
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+NO_NUMPY = np is None
+NO_NUMPY_REASON = 'NumPy is not installed'
+
+#==============================================================================
+# FUNCTIONS
+#==============================================================================
+
+
+def read_rows(lines):
+    """Converts lines of space separated numbers into an array"""
+    return np.array([[float(i) for i in line.split()] for line in lines])
+
+#==============================================================================
+
+
+def reference_tetrahedral(lut, rgb):
+    """Tetrahedrally interpolates one in range point the textbook way"""
+    size = lut.shape[0]
+    index = [min(int(i * (size - 1)), size - 2) for i in rgb]
+    r, g, b = [i * (size - 1) - j for i, j in zip(rgb, index)]
+
+    def corner(dr, dg, db):
+        """Returns the entry at an offset from the cell's black corner"""
+        return lut[index[0] + dr, index[1] + dg, index[2] + db]
+
+    c000, c111 = corner(0, 0, 0), corner(1, 1, 1)
+    if r >= g >= b:
+        return (
+            (1 - r) * c000 + (r - g) * corner(1, 0, 0) +
+            (g - b) * corner(1, 1, 0) + b * c111
+        )
+    elif r >= b >= g:
+        return (
+            (1 - r) * c000 + (r - b) * corner(1, 0, 0) +
+            (b - g) * corner(1, 0, 1) + g * c111
+        )
+    elif b >= r >= g:
+        return (
+            (1 - b) * c000 + (b - r) * corner(0, 0, 1) +
+            (r - g) * corner(1, 0, 1) + g * c111
+        )
+    elif g >= r >= b:
+        return (
+            (1 - g) * c000 + (g - r) * corner(0, 1, 0) +
+            (r - b) * corner(1, 1, 0) + b * c111
+        )
+    elif g >= b >= r:
+        return (
+            (1 - g) * c000 + (g - b) * corner(0, 1, 0) +
+            (b - r) * corner(0, 1, 1) + r * c111
+        )
+    return (
+        (1 - b) * c000 + (b - g) * corner(0, 0, 1) +
+        (g - r) * corner(0, 1, 1) + r * c111
+    )
+
+#==============================================================================
+
+
+def reference_trilinear(lut, rgb):
+    """Trilinearly interpolates one in range point the textbook way"""
+    size = lut.shape[0]
+    index = [min(int(i * (size - 1)), size - 2) for i in rgb]
+    fractions = [i * (size - 1) - j for i, j in zip(rgb, index)]
+
+    result = np.zeros(3)
+    for dr in (0, 1):
+        for dg in (0, 1):
+            for db in (0, 1):
+                weight = 1.0
+                for offset, fraction in zip((dr, dg, db), fractions):
+                    weight *= fraction if offset else 1 - fraction
+                result += weight * lut[
+                    index[0] + dr, index[1] + dg, index[2] + db
+                ]
+    return result
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+# bake_lut() ==================================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestBakeLut(unittest.TestCase):
+    """Tests evaluating a correction over a lattice"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.sop = build_cdl('sop', sat=1.0)
+        self.sat = build_cdl('sat', sat=1.3)
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testDimensionsChosen(self):
+        """Tests that 1D is baked without saturation and 3D with"""
+        self.assertEqual(
+            (cdl_convert.LUT_1D_SIZE, 3),
+            cdl_convert.bake_lut(self.sop).shape
+        )
+        size = cdl_convert.LUT_3D_SIZE
+        self.assertEqual(
+            (size, size, size, 3),
+            cdl_convert.bake_lut(self.sat).shape
+        )
+
+    #==========================================================================
+
+    def test1dValues(self):
+        """Tests that a 1D LUT holds the graded ramp"""
+        lut = cdl_convert.bake_lut(self.sop, size=11, in_range=(-0.5, 1.5))
+
+        ramp = np.linspace(-0.5, 1.5, 11)
+        expected = self.sop.apply(np.repeat(ramp[:, np.newaxis], 3, axis=1))
+
+        np.testing.assert_array_equal(expected, lut)
+
+    #==========================================================================
+
+    def test3dValues(self):
+        """Tests that lattice entry [r, g, b] holds the graded r, g, b"""
+        lut = cdl_convert.bake_lut(self.sat, size=5)
+
+        for r, g, b in [(0, 0, 0), (4, 1, 2), (1, 3, 4), (4, 4, 4)]:
+            rgb = np.array([r, g, b]) / 4.0
+            np.testing.assert_allclose(
+                self.sat.apply(rgb),
+                lut[r, g, b],
+                rtol=0,
+                atol=1e-12
+            )
+
+    #==========================================================================
+
+    def test3dWithoutSat(self):
+        """Tests that a 3D LUT can be asked for without saturation"""
+        self.assertEqual(
+            (3, 3, 3, 3),
+            cdl_convert.bake_lut(self.sop, size=3, dimensions=3).shape
+        )
+
+    #==========================================================================
+
+    def test1dWithSat(self):
+        """Tests that saturation can't be baked into a 1D LUT"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.bake_lut,
+            self.sat,
+            dimensions=1
+        )
+
+    #==========================================================================
+
+    def testChain(self):
+        """Tests baking a chain of corrections into one LUT"""
+        chain_1d = cdl_convert.bake_lut([self.sop, self.sop], size=9)
+        self.assertEqual((9, 3), chain_1d.shape)
+        ramp = np.repeat(np.linspace(0.0, 1.0, 9)[:, np.newaxis], 3, axis=1)
+        np.testing.assert_array_equal(
+            self.sop.apply(self.sop.apply(ramp)), chain_1d
+        )
+
+        chain_3d = cdl_convert.bake_lut([self.sop, self.sat], size=5)
+        self.assertEqual((5, 5, 5, 3), chain_3d.shape)
+        lattice = cdl_convert._identity_lattice(5, 3, (0.0, 1.0), np.float64)
+        np.testing.assert_array_equal(
+            self.sat.apply(self.sop.apply(lattice)), chain_3d
+        )
+
+        self.assertRaises(
+            ValueError,
+            cdl_convert.bake_lut,
+            [self.sop, self.sat],
+            dimensions=1
+        )
+        self.assertRaises(ValueError, cdl_convert.bake_lut, [])
+
+    #==========================================================================
+
+    def testClamp(self):
+        """Tests that unclamped LUTs keep values outside of 0 - 1"""
+        lut = cdl_convert.bake_lut(
+            self.sop, size=9, in_range=(-0.5, 1.5), clamp='mirror'
+        )
+
+        ramp = np.repeat(np.linspace(-0.5, 1.5, 9)[:, np.newaxis], 3, axis=1)
+        np.testing.assert_array_equal(
+            self.sop.apply(ramp, clamp='mirror'), lut
+        )
+        self.assertTrue(lut.min() < 0.0)
+        self.assertTrue(lut.max() > 1.0)
+
+    #==========================================================================
+
+    def testBadOptions(self):
+        """Tests that bad sizes, ranges and dimensions are rejected"""
+        self.assertRaises(
+            ValueError, cdl_convert.bake_lut, self.sop, size=1
+        )
+        self.assertRaises(
+            ValueError, cdl_convert.bake_lut, self.sop, in_range=(1.0, 0.0)
+        )
+        self.assertRaises(
+            ValueError, cdl_convert.bake_lut, self.sop, dimensions=2
+        )
+
+# write_cube(), write_spi1d(), write_spi3d() ==================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestWriteLuts(unittest.TestCase):
+    """Tests writing baked corrections to LUT files"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.sop = build_cdl('sop', sat=1.0)
+        self.sat = build_cdl('sat', sat=0.7)
+        self.directory = tempfile.mkdtemp()
+        self.lut_range = cdl_convert.LUT_RANGE
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+        cdl_convert.LUT_RANGE = self.lut_range
+        for filename in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, filename))
+        os.rmdir(self.directory)
+
+    #==========================================================================
+
+    def write(self, cdl, ext, **kwargs):
+        """Writes cdl with the writer for ext and returns the file lines"""
+        cdl._files['file_out'] = os.path.join(
+            self.directory, '{0}.{1}'.format(cdl.id, ext)
+        )
+        cdl_convert.OUTPUT_FORMATS[ext](cdl, **kwargs)
+        with open(cdl.file_out, 'r') as lut_file:
+            return lut_file.read().splitlines()
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testCube1d(self):
+        """Tests writing a correction without saturation to a 1D cube"""
+        lines = self.write(self.sop, 'cube', size=16, in_range=(0.0, 2.0))
+
+        self.assertEqual(
+            [
+                'TITLE "sop"',
+                'LUT_1D_SIZE 16',
+                'DOMAIN_MIN 0.0 0.0 0.0',
+                'DOMAIN_MAX 2.0 2.0 2.0',
+            ],
+            lines[:4]
+        )
+        np.testing.assert_allclose(
+            cdl_convert.bake_lut(self.sop, 16, (0.0, 2.0)),
+            read_rows(lines[4:]),
+            rtol=0,
+            atol=5e-7
+        )
+
+    #==========================================================================
+
+    def testCube3d(self):
+        """Tests that 3D cube entries are written red fastest"""
+        lines = self.write(self.sat, 'cube', size=4)
+
+        self.assertEqual('LUT_3D_SIZE 4', lines[1])
+
+        rows = read_rows(lines[4:])
+        lut = cdl_convert.bake_lut(self.sat, 4)
+
+        self.assertEqual(64, rows.shape[0])
+        # The second row is red index 1, the fifth is green index 1 and
+        # the seventeenth is blue index 1.
+        for row, index in [(1, (1, 0, 0)), (4, (0, 1, 0)), (16, (0, 0, 1)),
+                           (63, (3, 3, 3))]:
+            np.testing.assert_allclose(lut[index], rows[row], atol=5e-7)
+
+    #==========================================================================
+
+    def testCubeDefaultRange(self):
+        """Tests that the cube domain follows LUT_RANGE"""
+        cdl_convert.LUT_RANGE = (-0.25, 1.25)
+
+        lines = self.write(self.sop, 'cube', size=8)
+
+        self.assertEqual('DOMAIN_MIN -0.25 -0.25 -0.25', lines[2])
+        self.assertEqual('DOMAIN_MAX 1.25 1.25 1.25', lines[3])
+
+    #==========================================================================
+
+    def testSpi1d(self):
+        """Tests writing a spi1d"""
+        lines = self.write(self.sop, 'spi1d', size=10)
+
+        self.assertEqual(
+            ['Version 1', 'From 0.0 1.0', 'Length 10', 'Components 3', '{'],
+            lines[:5]
+        )
+        self.assertEqual('}', lines[-1])
+        np.testing.assert_allclose(
+            cdl_convert.bake_lut(self.sop, 10),
+            read_rows(lines[5:-1]),
+            rtol=0,
+            atol=5e-7
+        )
+
+    #==========================================================================
+
+    def testSpi1dWithSat(self):
+        """Tests that saturation can't be written to a spi1d"""
+        self.assertRaises(
+            ValueError,
+            self.write,
+            self.sat,
+            'spi1d'
+        )
+
+    #==========================================================================
+
+    def testSpi3d(self):
+        """Tests writing a spi3d with lattice indexes"""
+        lines = self.write(self.sat, 'spi3d', size=3)
+
+        self.assertEqual(['SPILUT 1.0', '3 3', '3 3 3'], lines[:3])
+
+        rows = read_rows(lines[3:])
+        lut = cdl_convert.bake_lut(self.sat, 3)
+
+        self.assertEqual(27, rows.shape[0])
+        for row in rows:
+            index = tuple(int(i) for i in row[:3])
+            np.testing.assert_allclose(lut[index], row[3:], atol=5e-7)
+
+        self.assertEqual([0, 0, 1], rows[1, :3].tolist())
+
+    #==========================================================================
+
+    def testSpi3dRange(self):
+        """Tests that spi3d can't be given an input range"""
+        self.assertRaises(
+            ValueError,
+            self.write,
+            self.sat,
+            'spi3d',
+            in_range=(0.0, 2.0)
+        )
+
+    #==========================================================================
+
+    def testLargeLutStreamed(self):
+        """Tests that LUTs bigger than one write block are complete"""
+        lines = self.write(self.sat, 'cube', size=17)
+
+        self.assertEqual(4 + 17 ** 3, len(lines))
+
+# bake_luts() =================================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestBakeLuts(unittest.TestCase):
+    """Tests baking many corrections with a process pool"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cdls = [
+            build_cdl('sop', sat=1.0),
+            build_cdl('sat', sat=1.4),
+            build_cdl('satCopy', sat=1.4),
+            build_cdl('sopCopy', sat=1.0),
+            build_cdl('other', sat=0.5),
+        ]
+        self.cdls[4].offset = [0.0, 0.1, 0.2]
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+        for filename in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, filename))
+        os.rmdir(self.directory)
+
+    #==========================================================================
+
+    def set_dest(self, cdls, ext, folder=''):
+        """Points the file_out of each cdl into our temp directory"""
+        for cdl in cdls:
+            cdl._files['file_out'] = os.path.join(
+                self.directory, '{0}{1}.{2}'.format(folder, cdl.id, ext)
+            )
+
+    #==========================================================================
+
+    def compare(self, ext, processes, **kwargs):
+        """Bakes all cdls and compares them to the single file writer"""
+        self.set_dest(self.cdls, ext, 'single_')
+        for cdl in self.cdls:
+            cdl_convert.OUTPUT_FORMATS[ext](cdl, **kwargs)
+        self.set_dest(self.cdls, ext)
+
+        baked = cdl_convert.bake_luts(
+            self.cdls, ext, processes=processes, **kwargs
+        )
+
+        for cdl in self.cdls:
+            with open(cdl.file_out, 'rb') as lut_file:
+                written = lut_file.read()
+            single = os.path.join(
+                self.directory, 'single_{0}.{1}'.format(cdl.id, ext)
+            )
+            with open(single, 'rb') as lut_file:
+                self.assertEqual(lut_file.read(), written)
+
+        return baked
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testCube(self):
+        """Tests baking mixed 1D and 3D cubes in this process"""
+        self.assertEqual(3, self.compare('cube', 1, size=5))
+
+    #==========================================================================
+
+    def testCubeProcesses(self):
+        """Tests baking cubes across worker processes"""
+        self.assertEqual(
+            3,
+            self.compare('cube', 2, size=9, in_range=(-0.5, 1.5))
+        )
+
+    #==========================================================================
+
+    def testSpi3dProcesses(self):
+        """Tests baking spi3ds across worker processes"""
+        self.assertEqual(3, self.compare('spi3d', 2, size=4))
+
+    #==========================================================================
+
+    def testSpi1d(self):
+        """Tests baking spi1ds"""
+        self.cdls = [self.cdls[0], self.cdls[3]]
+        self.assertEqual(1, self.compare('spi1d', 2, size=64))
+
+    #==========================================================================
+
+    def testFingerprint(self):
+        """Tests that grades are shared by fingerprint, not exact values"""
+        self.cdls[3].slope = [
+            value + 1e-9 for value in self.cdls[0].slope
+        ]
+        self.assertEqual(
+            self.cdls[0].fingerprint(), self.cdls[3].fingerprint()
+        )
+        self.set_dest(self.cdls, 'cube')
+
+        self.assertEqual(
+            3, cdl_convert.bake_luts(self.cdls, 'cube', size=5, processes=1)
+        )
+        with open(self.cdls[0].file_out, 'r') as lut_file:
+            first = lut_file.read().splitlines()[1:]
+        with open(self.cdls[3].file_out, 'r') as lut_file:
+            self.assertEqual(first, lut_file.read().splitlines()[1:])
+
+    #==========================================================================
+
+    def testFloat32(self):
+        """Tests baking in float32"""
+        self.set_dest(self.cdls, 'cube')
+
+        cdl_convert.bake_luts(
+            self.cdls, 'cube', size=5, processes=2, dtype=np.float32
+        )
+
+        for cdl in self.cdls:
+            with open(cdl.file_out, 'r') as lut_file:
+                rows = read_rows(lut_file.read().splitlines()[4:])
+            lut = cdl_convert.bake_lut(cdl, 5)
+            if lut.ndim == 4:
+                lut = lut.transpose(2, 1, 0, 3)
+            np.testing.assert_allclose(
+                lut.reshape(-1, 3), rows, rtol=0, atol=2e-6
+            )
+
+    #==========================================================================
+
+    def testSpi1dWithSat(self):
+        """Tests that nothing is written if a correction can't be baked"""
+        self.set_dest(self.cdls, 'spi1d')
+
+        self.assertRaises(
+            ValueError,
+            cdl_convert.bake_luts,
+            self.cdls,
+            'spi1d'
+        )
+        self.assertEqual([], os.listdir(self.directory))
+
+    #==========================================================================
+
+    def testNotLut(self):
+        """Tests that only LUT formats can be baked"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.bake_luts,
+            self.cdls,
+            'cc'
+        )
+
+    #==========================================================================
+
+    def testDefaultProcesses(self):
+        """Tests that PROCESSES sets the default process count"""
+        self.set_dest(self.cdls, 'cube')
+        processes = cdl_convert.PROCESSES
+        cdl_convert.PROCESSES = 1
+        try:
+            with mock.patch('cdl_convert.cdl_convert.Pool') as mockPool:
+                cdl_convert.bake_luts(self.cdls, 'cube', size=3)
+        finally:
+            cdl_convert.PROCESSES = processes
+
+        self.assertFalse(mockPool.called)
+        self.assertEqual(5, len(os.listdir(self.directory)))
+
+# sample_lut() ================================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestSampleLut(unittest.TestCase):
+    """Tests interpolating baked LUTs"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        random = np.random.RandomState(5)
+        self.lut = random.uniform(-0.2, 1.2, (5, 5, 5, 3))
+        self.points = random.uniform(0.0, 1.0, (200, 3))
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testTetrahedral(self):
+        """Tests tetrahedral lookups against a case by case version"""
+        expected = np.array(
+            [reference_tetrahedral(self.lut, rgb) for rgb in self.points]
+        )
+
+        np.testing.assert_allclose(
+            expected,
+            cdl_convert.sample_lut(self.lut, self.points),
+            rtol=0,
+            atol=1e-12
+        )
+
+    #==========================================================================
+
+    def testTrilinear(self):
+        """Tests trilinear lookups against a corner by corner version"""
+        expected = np.array(
+            [reference_trilinear(self.lut, rgb) for rgb in self.points]
+        )
+
+        np.testing.assert_allclose(
+            expected,
+            cdl_convert.sample_lut(
+                self.lut, self.points, interpolation='trilinear'
+            ),
+            rtol=0,
+            atol=1e-12
+        )
+
+    #==========================================================================
+
+    def testLatticePoints(self):
+        """Tests that points on the lattice return the entries exactly"""
+        points = cdl_convert._identity_lattice(5, 3, (-0.5, 1.5), np.float64)
+
+        for interpolation in ['trilinear', 'tetrahedral']:
+            np.testing.assert_allclose(
+                self.lut,
+                cdl_convert.sample_lut(
+                    self.lut, points, (-0.5, 1.5), interpolation
+                ),
+                rtol=0,
+                atol=1e-12
+            )
+
+    #==========================================================================
+
+    def testOutOfRangeClamped(self):
+        """Tests that points past the range take the edge entries"""
+        points = np.array([[-1.0, -1.0, -1.0], [2.0, 2.0, 2.0], [-1, 2, 0.5]])
+
+        sampled = cdl_convert.sample_lut(self.lut, points)
+
+        np.testing.assert_allclose(self.lut[0, 0, 0], sampled[0], atol=1e-12)
+        np.testing.assert_allclose(self.lut[4, 4, 4], sampled[1], atol=1e-12)
+        np.testing.assert_allclose(self.lut[0, 4, 2], sampled[2], atol=1e-12)
+
+    #==========================================================================
+
+    def test1d(self):
+        """Tests that 1D LUTs interpolate each channel on its own"""
+        lut = self.lut[:, 0, 0]
+        ramp = np.linspace(0.0, 1.0, 5)
+
+        sampled = cdl_convert.sample_lut(lut, self.points)
+
+        for channel in range(3):
+            np.testing.assert_allclose(
+                np.interp(self.points[:, channel], ramp, lut[:, channel]),
+                sampled[:, channel]
+            )
+
+    #==========================================================================
+
+    def testChunksAndShape(self):
+        """Tests that any shape of points and out arrays work across chunks"""
+        points = np.random.RandomState(1).uniform(0, 1, (3, 100, 3))
+        expected = cdl_convert.sample_lut(self.lut, points.reshape(-1, 3))
+        out = np.empty((3, 3, 100), np.float32).transpose(0, 2, 1)
+
+        with mock.patch.object(cdl_convert, '_SAMPLE_CHUNK', 64):
+            result = cdl_convert.sample_lut(
+                self.lut, points.astype(np.float32), out=out
+            )
+
+        self.assertTrue(result is out)
+        np.testing.assert_allclose(
+            expected.reshape(3, 100, 3), out, rtol=1e-6, atol=1e-6
+        )
+
+    #==========================================================================
+
+    def testBadOptions(self):
+        """Tests that bad LUTs, points and interpolations raise"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.sample_lut, self.lut[:, :4], self.points
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.sample_lut, self.lut, self.points[:, :2]
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.sample_lut, self.lut, self.points, (1.0, 0.0)
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.sample_lut, self.lut, self.points, None, 'linear'
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.sample_lut,
+            self.lut[:, 0, 0], self.points, None, 'tetrahedral'
+        )
+
+# verify_lut() ================================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestVerifyLut(unittest.TestCase):
+    """Tests measuring how closely LUTs match the math"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        # Green's power stays at or above 1.0, as it's clamped at 0.0
+        # first, so that the 1D LUT can follow the curve closely.
+        self.sop = build_cdl('sop', power=[0.9, 1.1, 1.0], sat=1.0)
+        self.sat = build_cdl('sat', sat=1.3)
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testErrors(self):
+        """Tests the max and rms errors against a direct calculation"""
+        lut = cdl_convert.bake_lut(self.sat, size=9)
+        points = np.random.RandomState(3).uniform(0.0, 1.0, (1000, 3))
+
+        errors = cdl_convert.verify_lut(self.sat, lut, samples=1000, seed=3)
+
+        self.assertEqual(['tetrahedral', 'trilinear'], sorted(errors))
+        for interpolation in errors:
+            difference = np.abs(
+                cdl_convert.sample_lut(lut, points, None, interpolation) -
+                self.sat.apply(points)
+            )
+            self.assertAlmostEqual(difference.max(), errors[interpolation][0])
+            self.assertAlmostEqual(
+                np.sqrt(np.mean(difference ** 2)), errors[interpolation][1]
+            )
+
+    #==========================================================================
+
+    def testBakesLut(self):
+        """Tests that a LUT is baked with the given options when not given"""
+        lut = cdl_convert.bake_lut(
+            self.sat, size=9, in_range=(-0.5, 1.5), clamp='none'
+        )
+
+        self.assertEqual(
+            cdl_convert.verify_lut(
+                self.sat, lut, in_range=(-0.5, 1.5), samples=5000,
+                clamp='none'
+            ),
+            cdl_convert.verify_lut(
+                self.sat, size=9, in_range=(-0.5, 1.5), samples=5000,
+                clamp='none'
+            )
+        )
+
+    #==========================================================================
+
+    def testErrorShrinksWithSize(self):
+        """Tests that larger LUTs measure closer to the math"""
+        small = cdl_convert.verify_lut(self.sat, size=9, samples=20000)
+        large = cdl_convert.verify_lut(self.sat, size=65, samples=20000)
+
+        for interpolation in small:
+            self.assertTrue(large[interpolation][0] < small[interpolation][0])
+            self.assertTrue(large[interpolation][1] < small[interpolation][1])
+
+    #==========================================================================
+
+    def test1dAndChain(self):
+        """Tests that 1D LUTs and chains are measured linearly"""
+        errors = cdl_convert.verify_lut(
+            [self.sop, self.sop], size=4096, samples=20000
+        )
+
+        self.assertEqual(['linear'], list(errors))
+        self.assertTrue(errors['linear'][0] < 1e-4)
+
+    #==========================================================================
+
+    def testChunksMatch(self):
+        """Tests that chunking doesn't change the errors"""
+        errors = cdl_convert.verify_lut(self.sat, size=9, samples=1000)
+
+        with mock.patch.object(cdl_convert, '_SAMPLE_CHUNK', 300):
+            chunked = cdl_convert.verify_lut(self.sat, size=9, samples=1000)
+
+        for interpolation in errors:
+            self.assertAlmostEqual(
+                errors[interpolation][0], chunked[interpolation][0]
+            )
+            self.assertAlmostEqual(
+                errors[interpolation][1], chunked[interpolation][1]
+            )
+
+    #==========================================================================
+
+    def testBadSamples(self):
+        """Tests that at least one sample is needed"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.verify_lut, self.sat, samples=0
+        )
+
+# parse_args() and main() =====================================================
+
+
+class TestLutArgs(unittest.TestCase):
+    """Tests the LUT command line options"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cdl = cdl_convert.ColorCorrection('uniqueId', 'file')
+        self.sysargv = sys.argv
+        self.stdout = sys.stdout
+        self.outputFormats = cdl_convert.OUTPUT_FORMATS
+        self.inputFormats = cdl_convert.INPUT_FORMATS
+        sys.stdout = StringIO()
+
+    #==========================================================================
+
+    def tearDown(self):
+        sys.argv = self.sysargv
+        sys.stdout = self.stdout
+        cdl_convert.OUTPUT_FORMATS = self.outputFormats
+        cdl_convert.INPUT_FORMATS = self.inputFormats
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testLutFormats(self):
+        """Tests that LUT formats are accepted outputs"""
+        sys.argv = ['scriptname', 'file.cc', '-o', 'cube,SPI1D,spi3d']
+
+        args = cdl_convert.parse_args()
+
+        self.assertEqual(['cube', 'spi1d', 'spi3d'], args.output)
+
+    #==========================================================================
+
+    def testLutOptions(self):
+        """Tests parsing the LUT size and range"""
+        sys.argv = [
+            'scriptname', 'file.cc', '-o', 'cube', '--lut-size', '65',
+            '--lut-range=-0.5,1.5'
+        ]
+
+        args = cdl_convert.parse_args()
+
+        self.assertEqual(65, args.lut_size)
+        self.assertEqual((-0.5, 1.5), args.lut_range)
+
+    #==========================================================================
+
+    def testBadLutRange(self):
+        """Tests that a LUT range must be two numbers"""
+        sys.argv = ['scriptname', 'file.cc', '--lut-range', '1.5']
+
+        self.assertRaises(
+            ValueError,
+            cdl_convert.parse_args
+        )
+
+    #==========================================================================
+
+    @mock.patch('cdl_convert.cdl_convert.bake_luts')
+    @mock.patch('cdl_convert.cdl_convert.write_cc')
+    @mock.patch('cdl_convert.cdl_convert.parse_cc')
+    def testMainPassesLutOptions(self, mockParse, mockWriteCC, mockBake):
+        """Tests that LUT options only go to LUT baking"""
+        mockParse.return_value = [self.cdl, ]
+        sys.argv = [
+            'scriptname', 'file.cc', '-o', 'cc,cube', '--lut-size', '17',
+            '--processes', '3', '--clamp', 'none'
+        ]
+
+        cdl_convert.INPUT_FORMATS = dict(self.inputFormats, cc=mockParse)
+        cdl_convert.OUTPUT_FORMATS = dict(self.outputFormats, cc=mockWriteCC)
+
+        cdl_convert.main()
+
+        mockWriteCC.assert_called_once_with(self.cdl)
+        mockBake.assert_called_once_with(
+            [self.cdl], 'cube', processes=3, size=17, clamp='none'
+        )
+        self.assertTrue(self.cdl.file_out.endswith('uniqueId.cube'))
+
+    #==========================================================================
+
+    @unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+    def testMainVerifies(self):
+        """Tests that --verify reads back each written LUT and prints errors"""
+        directory = tempfile.mkdtemp()
+        cdl = cdl_convert.ColorCorrection(
+            'graded', os.path.join(directory, 'file.cc')
+        )
+        cdl.slope = [1.2, 1.0, 0.8]
+        cdl.sat = 1.3
+        sys.argv = [
+            'scriptname', 'file.cc', '-o', 'spi3d,cube', '--lut-size', '17',
+            '--processes', '1', '--verify'
+        ]
+
+        cdl_convert.INPUT_FORMATS = dict(
+            self.inputFormats, cc=lambda path: [cdl]
+        )
+
+        try:
+            cdl_convert.main()
+            lut, in_range = cdl_convert._read_lut(
+                os.path.join(directory, 'graded.spi3d')
+            )
+        finally:
+            for filename in os.listdir(directory):
+                os.remove(os.path.join(directory, filename))
+            os.rmdir(directory)
+
+        self.assertEqual((0.0, 1.0), in_range)
+        np.testing.assert_allclose(
+            cdl_convert.bake_lut(cdl, 17, dimensions=3), lut,
+            rtol=0, atol=1e-6
+        )
+        # Written to 6 places, the files interpolate as the bake does.
+        expected = cdl_convert.verify_lut(cdl, size=17, dimensions=3)
+        lines = sys.stdout.getvalue().splitlines()
+        for ext in ['cube', 'spi3d']:
+            for interpolation in expected:
+                prefix = (
+                    'Verified cdl graded {ext} with {interpolation} '
+                    'interpolation: max error '.format(
+                        ext=ext, interpolation=interpolation
+                    )
+                )
+                matches = [line for line in lines if line.startswith(prefix)]
+                self.assertEqual(1, len(matches))
+                self.assertAlmostEqual(
+                    expected[interpolation][0],
+                    float(matches[0][len(prefix):].split(',')[0]),
+                    places=3
+                )
+
+    #==========================================================================
+
+    @unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+    @mock.patch('cdl_convert.cdl_convert.bake_luts')
+    def testMainVerifiesWrittenFile(self, mockBake):
+        """Tests that --verify checks the file, not a fresh bake"""
+        directory = tempfile.mkdtemp()
+        cdl = cdl_convert.ColorCorrection(
+            'graded', os.path.join(directory, 'file.cc')
+        )
+        cdl.slope = [2.0, 2.0, 2.0]
+
+        def bake(cdls, ext, **kwargs):
+            """Writes an identity LUT where the correction should be"""
+            identity = cdl_convert.ColorCorrection('identity', 'file')
+            lut = cdl_convert.bake_lut(identity, 16)
+            cdl_convert._write_lut_file(
+                cdls[0].file_out,
+                *cdl_convert._lut_layout(ext, lut, 'identity', (0.0, 1.0))
+            )
+
+        mockBake.side_effect = bake
+        sys.argv = ['scriptname', 'file.cc', '-o', 'spi1d', '--verify']
+
+        cdl_convert.INPUT_FORMATS = dict(
+            self.inputFormats, cc=lambda path: [cdl]
+        )
+
+        try:
+            cdl_convert.main()
+        finally:
+            for filename in os.listdir(directory):
+                os.remove(os.path.join(directory, filename))
+            os.rmdir(directory)
+
+        prefix = (
+            'Verified cdl graded spi1d with linear interpolation: max error '
+        )
+        lines = [
+            line for line in sys.stdout.getvalue().splitlines()
+            if line.startswith(prefix)
+        ]
+        self.assertEqual(1, len(lines))
+        self.assertTrue(float(lines[0][len(prefix):].split(',')[0]) > 0.4)
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
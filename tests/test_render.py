@@ -0,0 +1,747 @@
+#!/usr/bin/env python
+"""
+Tests the image reading, writing and sequence rendering of cdl_convert
+
+REQUIREMENTS:
+
+mock
+numpy
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+import os
+import shutil
+from io import BytesIO
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+import sys
+import tempfile
+import unittest
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert.cdl_convert as cdl_convert
+from helpers import build_cdl
+
+np = cdl_convert.np
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+NO_NUMPY = np is None
+NO_NUMPY_REASON = 'NumPy is not installed'
+
+#==============================================================================
+# FUNCTIONS
+#==============================================================================
+
+
+def random_frame(seed, dtype=np.float32 if np else None, shape=(5, 7)):
+    """Returns a random RGB frame of dtype"""
+    state = np.random.RandomState(seed)
+    if np.dtype(dtype).kind == 'u':
+        top = np.iinfo(dtype).max
+        return state.randint(0, top + 1, shape + (3, )).astype(dtype)
+    return state.uniform(0.0, 1.0, shape + (3, )).astype(dtype)
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+# read_image(), write_image() =================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestImages(unittest.TestCase):
+    """Tests reading and writing uncompressed images"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    #==========================================================================
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    #==========================================================================
+
+    def path(self, name):
+        """Returns the path of name in our directory"""
+        return os.path.join(self.directory, name)
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testRoundTrips(self):
+        """Tests that every format reads back what was written"""
+        for name, dtype in [('frame.pfm', np.float32),
+                            ('frame.ppm', np.uint8),
+                            ('frame.ppm', np.uint16),
+                            ('frame.raw', np.float32)]:
+            pixels = random_frame(1, dtype)
+            cdl_convert.write_image(self.path(name), pixels)
+
+            result = cdl_convert.read_image(self.path(name), (5, 7))
+
+            self.assertEqual(np.dtype(dtype), result.dtype)
+            np.testing.assert_array_equal(pixels, result)
+
+    #==========================================================================
+
+    def testPfmLayout(self):
+        """Tests that PFM rows are stored from the bottom up"""
+        pixels = random_frame(2)
+        cdl_convert.write_image(self.path('frame.pfm'), pixels)
+
+        with open(self.path('frame.pfm'), 'rb') as image_file:
+            self.assertEqual(b'PF\n7 5\n-1.0\n', image_file.read(12))
+            data = np.frombuffer(image_file.read(), dtype='<f4')
+
+        np.testing.assert_array_equal(pixels[-1].ravel(), data[:21])
+
+    #==========================================================================
+
+    def testPpmHeader(self):
+        """Tests reading a PPM with a comment in its header"""
+        pixels = random_frame(3, np.uint8, (2, 2))
+        with open(self.path('frame.ppm'), 'wb') as image_file:
+            image_file.write(b'P6\n# made by hand\n2 2\n255\n')
+            image_file.write(pixels.tobytes())
+
+        np.testing.assert_array_equal(
+            pixels, cdl_convert.read_image(self.path('frame.ppm'))
+        )
+
+    #==========================================================================
+
+    def testConversions(self):
+        """Tests writing pixels in a dtype the format doesn't store"""
+        codes = random_frame(4, np.uint16)
+        cdl_convert.write_image(self.path('frame.pfm'), codes)
+        np.testing.assert_allclose(
+            codes / 65535.0,
+            cdl_convert.read_image(self.path('frame.pfm')),
+            rtol=1e-6
+        )
+
+        floats = random_frame(5, np.float64) * 1.2 - 0.1
+        cdl_convert.write_image(self.path('frame.ppm'), floats)
+        np.testing.assert_array_equal(
+            np.rint(np.clip(floats, 0.0, 1.0) * 65535),
+            cdl_convert.read_image(self.path('frame.ppm'))
+        )
+
+    #==========================================================================
+
+    def testBadImages(self):
+        """Tests that unsupported and broken images are refused"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.write_image,
+            self.path('frame.exr'),
+            random_frame(6)
+        )
+
+        cdl_convert.write_image(self.path('frame.raw'), random_frame(6))
+        self.assertRaises(
+            ValueError, cdl_convert.read_image, self.path('frame.raw')
+        )
+        self.assertRaises(
+            ValueError, cdl_convert.read_image, self.path('frame.raw'), (4, 7)
+        )
+
+        with open(self.path('frame.ppm'), 'wb') as image_file:
+            image_file.write(b'P6\n2 2\n1023\n')
+        self.assertRaises(
+            ValueError, cdl_convert.read_image, self.path('frame.ppm')
+        )
+
+        with open(self.path('frame.pfm'), 'wb') as image_file:
+            image_file.write(b'PF\n2 2\n-1.0\n\x00\x00')
+        self.assertRaises(
+            ValueError, cdl_convert.read_image, self.path('frame.pfm')
+        )
+
+# MediaRef.frames =============================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestMediaRefFrames(unittest.TestCase):
+    """Tests finding the frames of a MediaRef on disk"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name in ['shot.0010.pfm', 'shot.0009.pfm', 'shot.0011.pfm',
+                     'other_01.ppm', 'notes.txt']:
+            open(os.path.join(self.directory, name), 'w').close()
+
+    #==========================================================================
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        cdl_convert.MediaRef.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testSequence(self):
+        """Tests that a sequence lists its frames in frame order"""
+        ref = cdl_convert.MediaRef(
+            os.path.join(self.directory, 'shot.0010.pfm')
+        )
+
+        self.assertEqual(
+            [os.path.join(self.directory, name) for name in
+             ['shot.0009.pfm', 'shot.0010.pfm', 'shot.0011.pfm']],
+            ref.frames
+        )
+
+    #==========================================================================
+
+    def testPercentPadding(self):
+        """Tests finding frames from a %d padded sequence"""
+        ref = cdl_convert.MediaRef(
+            os.path.join(self.directory, 'shot.%04d.pfm')
+        )
+
+        self.assertEqual(3, len(ref.frames))
+
+    #==========================================================================
+
+    def testDirectory(self):
+        """Tests that a directory lists the frames of every sequence"""
+        ref = cdl_convert.MediaRef(self.directory)
+
+        self.assertEqual(
+            ['other_01.ppm', 'shot.0009.pfm', 'shot.0010.pfm',
+             'shot.0011.pfm'],
+            sorted(os.path.basename(frame) for frame in ref.frames)
+        )
+
+    #==========================================================================
+
+    def testMissing(self):
+        """Tests that missing media has no frames"""
+        ref = cdl_convert.MediaRef(
+            os.path.join(self.directory, 'missing', 'shot.0001.pfm')
+        )
+
+        self.assertEqual([], ref.frames)
+
+# render_sequences() ==========================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestRenderSequences(unittest.TestCase):
+    """Tests grading every frame of a sequence"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cdl = build_cdl('shot', sat=1.2)
+        self.source = tempfile.mkdtemp()
+        self.dest = os.path.join(tempfile.mkdtemp(), 'graded')
+        self.frames = {}
+        for frame in range(1, 8):
+            name = 'shot.{0:04d}.pfm'.format(frame)
+            self.frames[name] = random_frame(frame)
+            cdl_convert.write_image(
+                os.path.join(self.source, name), self.frames[name]
+            )
+        self.ref = cdl_convert.MediaRef(
+            os.path.join(self.source, 'shot.0001.pfm')
+        )
+
+    #==========================================================================
+
+    def tearDown(self):
+        shutil.rmtree(self.source)
+        shutil.rmtree(os.path.dirname(self.dest))
+        cdl_convert.ColorCorrection.members = {}
+        cdl_convert.MediaRef.members = {}
+
+    #==========================================================================
+
+    def check(self, ext='pfm'):
+        """Checks that every frame was graded into dest"""
+        for name, pixels in self.frames.items():
+            name = os.path.splitext(name)[0] + '.' + ext
+            result = cdl_convert.read_image(os.path.join(self.dest, name))
+            expected = self.cdl.apply(pixels)
+            if ext == 'ppm':
+                expected = np.rint(expected * 65535)
+            np.testing.assert_array_equal(expected, result)
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testInProcess(self):
+        """Tests rendering frames in this process"""
+        count = cdl_convert.render_sequences(
+            [(self.cdl, self.ref)], self.dest, processes=1, queue_size=1
+        )
+
+        self.assertEqual(7, count)
+        self.check()
+
+    #==========================================================================
+
+    def testProcesses(self):
+        """Tests rendering frames across a pool of processes"""
+        count = cdl_convert.render_sequences(
+            [(self.cdl, self.ref)], self.dest, processes=2
+        )
+
+        self.assertEqual(7, count)
+        self.check()
+
+    #==========================================================================
+
+    def testFormat(self):
+        """Tests rendering frames to another format"""
+        cdl_convert.render_sequences(
+            [(self.cdl, self.ref)], self.dest, ext='PPM', processes=1
+        )
+
+        self.check('ppm')
+
+    #==========================================================================
+
+    def testCodeValues(self):
+        """Tests that PPM frames are graded as code values"""
+        pixels = random_frame(8, np.uint16)
+        cdl_convert.write_image(
+            os.path.join(self.source, 'codes_0001.ppm'), pixels
+        )
+        ref = cdl_convert.MediaRef(
+            os.path.join(self.source, 'codes_0001.ppm')
+        )
+
+        cdl_convert.render_sequences([(self.cdl, ref)], self.dest, processes=1)
+
+        np.testing.assert_array_equal(
+            self.cdl.apply(pixels),
+            cdl_convert.read_image(os.path.join(self.dest, 'codes_0001.ppm'))
+        )
+
+    #==========================================================================
+
+    def testErrors(self):
+        """Tests that bad renders are refused before any frame is read"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.render_sequences,
+            [(self.cdl, self.ref)],
+            self.source
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.render_sequences,
+            [(self.cdl, cdl_convert.MediaRef('/missing/shot.0001.pfm'))],
+            self.dest
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.render_sequences,
+            [(self.cdl, self.ref)],
+            self.dest,
+            ext='exr'
+        )
+        self.assertFalse(os.path.exists(self.dest))
+
+    #==========================================================================
+
+    def testFrameError(self):
+        """Tests that an error reading a frame is raised"""
+        with open(os.path.join(self.source, 'shot.0004.pfm'), 'wb') as bad:
+            bad.write(b'P6\n1 1\n255\n\x00\x00\x00')
+
+        self.assertRaises(
+            ValueError,
+            cdl_convert.render_sequences,
+            [(self.cdl, self.ref)],
+            self.dest,
+            processes=1,
+            queue_size=1
+        )
+
+# filter_frames() =============================================================
+
+
+class TrickleStream(object):
+    """Binary stream that hands over its data a few bytes at a time"""
+
+    def __init__(self, data, chunk):
+        self.data = data
+        self.chunk = chunk
+        self.position = 0
+
+    def readinto(self, buffer):
+        """Copies up to chunk bytes into buffer"""
+        piece = self.data[self.position:self.position + self.chunk]
+        piece = piece[:len(buffer)]
+        buffer[:len(piece)] = piece
+        self.position += len(piece)
+        return len(piece)
+
+#==============================================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestFilterFrames(unittest.TestCase):
+    """Tests grading a stream of raw frames"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cdl = build_cdl('shot', sat=1.2)
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+
+    def filter(self, frames, dtype, **kwargs):
+        """Filters frames through BytesIO streams and returns the output"""
+        stream_out = BytesIO()
+        count = cdl_convert.filter_frames(
+            self.cdl,
+            7,
+            5,
+            dtype=dtype,
+            stream_in=kwargs.pop(
+                'stream_in',
+                BytesIO(b''.join(frame.tobytes() for frame in frames))
+            ),
+            stream_out=stream_out,
+            **kwargs
+        )
+        self.assertEqual(len(frames), count)
+        return np.frombuffer(stream_out.getvalue(), dtype=dtype).reshape(
+            (-1, 5, 7, 3)
+        )
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testDtypes(self):
+        """Tests that every frame of every dtype is graded"""
+        for dtype in [np.float32, np.float16, np.uint8, np.uint16]:
+            frames = [random_frame(seed, dtype) for seed in range(5)]
+
+            result = self.filter(frames, dtype)
+
+            for frame, graded in zip(frames, result):
+                np.testing.assert_array_equal(self.cdl.apply(frame), graded)
+
+    #==========================================================================
+
+    def testBigEndian(self):
+        """Tests that big endian frames are swapped in and out"""
+        frames = [random_frame(seed, np.uint16) for seed in range(3)]
+        swapped = [frame.astype('>u2') for frame in frames]
+
+        result = self.filter(swapped, '>u2', bit_depth=16, clamp='none')
+
+        for frame, graded in zip(frames, result):
+            np.testing.assert_array_equal(
+                self.cdl.apply(frame, clamp='none'), graded
+            )
+
+    #==========================================================================
+
+    def testShortReads(self):
+        """Tests that frames arriving in pieces are put back together"""
+        frames = [random_frame(seed) for seed in range(3)]
+        stream_in = TrickleStream(
+            b''.join(frame.tobytes() for frame in frames), 33
+        )
+
+        result = self.filter(frames, np.float32, stream_in=stream_in)
+
+        np.testing.assert_array_equal(self.cdl.apply(frames[2]), result[2])
+
+    #==========================================================================
+
+    def testEmpty(self):
+        """Tests that an empty stream grades no frames"""
+        self.assertEqual(0, len(self.filter([], np.float32)))
+
+    #==========================================================================
+
+    def testTruncated(self):
+        """Tests that a stream ending partway through a frame is an error"""
+        data = random_frame(1).tobytes()
+
+        self.assertRaises(
+            ValueError,
+            cdl_convert.filter_frames,
+            self.cdl,
+            7,
+            5,
+            stream_in=BytesIO(data + data[:20]),
+            stream_out=BytesIO()
+        )
+
+    #==========================================================================
+
+    def testBadFrames(self):
+        """Tests that bad sizes and dtypes are refused"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.filter_frames,
+            self.cdl,
+            0,
+            5,
+            stream_in=BytesIO(),
+            stream_out=BytesIO()
+        )
+        self.assertRaises(
+            TypeError,
+            cdl_convert.filter_frames,
+            self.cdl,
+            7,
+            5,
+            dtype=np.int16,
+            stream_in=BytesIO(),
+            stream_out=BytesIO()
+        )
+
+# Render command line =========================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestRenderArgs(unittest.TestCase):
+    """Tests the render options of the command line"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.cdl = cdl_convert.ColorCorrection('uniqueId', 'file')
+        self.sysargv = sys.argv
+        self.stdin = sys.stdin
+        self.stdout = sys.stdout
+        self.stderr = sys.stderr
+        self.outputFormats = cdl_convert.OUTPUT_FORMATS
+        self.inputFormats = cdl_convert.INPUT_FORMATS
+        sys.stdout = StringIO()
+
+    #==========================================================================
+
+    def tearDown(self):
+        sys.argv = self.sysargv
+        sys.stdin = self.stdin
+        sys.stdout = self.stdout
+        sys.stderr = self.stderr
+        cdl_convert.OUTPUT_FORMATS = self.outputFormats
+        cdl_convert.INPUT_FORMATS = self.inputFormats
+        cdl_convert.ColorCorrection.members = {}
+        cdl_convert.MediaRef.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testRenderOptions(self):
+        """Tests parsing the render options"""
+        sys.argv = [
+            'scriptname', 'file.cc', '--render', 'plates/shot.####.raw',
+            '--render-dest', 'graded', '--render-format', 'PFM',
+            '--raw-size', '1920x1080'
+        ]
+
+        args = cdl_convert.parse_args()
+
+        self.assertEqual('plates/shot.####.raw', args.render)
+        self.assertEqual('graded', args.render_dest)
+        self.assertEqual('pfm', args.render_format)
+        self.assertEqual((1080, 1920), args.raw_size)
+
+    #==========================================================================
+
+    def testBadRenderOptions(self):
+        """Tests that bad render options are refused"""
+        for argv in [
+            ['--render', 'plates'],
+            ['--render', 'plates', '--render-dest', 'out',
+             '--render-format', 'exr'],
+            ['--raw-size', '1920'],
+        ]:
+            sys.argv = ['scriptname', 'file.cc'] + argv
+            self.assertRaises(ValueError, cdl_convert.parse_args)
+
+    #==========================================================================
+
+    @mock.patch('cdl_convert.cdl_convert.render_sequences')
+    @mock.patch('cdl_convert.cdl_convert.write_cc')
+    @mock.patch('cdl_convert.cdl_convert.parse_cc')
+    def testMainRenders(self, mockParse, mockWriteCC, mockRender):
+        """Tests that main renders the media with the correction"""
+        mockParse.return_value = [self.cdl, ]
+        sys.argv = [
+            'scriptname', 'file.cc', '--render', 'plates/shot.0001.pfm',
+            '--render-dest', 'graded', '--processes', '2'
+        ]
+
+        cdl_convert.INPUT_FORMATS = dict(self.inputFormats, cc=mockParse)
+        cdl_convert.OUTPUT_FORMATS = dict(self.outputFormats, cc=mockWriteCC)
+
+        cdl_convert.main()
+
+        ((decisions, dest), kwargs) = mockRender.call_args
+        self.assertEqual(self.cdl, decisions[0][0])
+        self.assertEqual('plates/shot.0001.pfm', decisions[0][1].ref)
+        self.assertEqual('graded', dest)
+        self.assertEqual(2, kwargs['processes'])
+        self.assertFalse(mockWriteCC.called)
+
+        sys.argv += ['-o', 'cc']
+
+        cdl_convert.main()
+
+        mockWriteCC.assert_called_once_with(self.cdl)
+
+    #==========================================================================
+
+    def testFilterOptions(self):
+        """Tests parsing the filter options"""
+        sys.argv = [
+            'scriptname', 'file.cc', '--filter', '--raw-size', '1920x1080',
+            '--raw-dtype', 'uint16', '--bit-depth', '10'
+        ]
+
+        args = cdl_convert.parse_args()
+
+        self.assertTrue(args.filter)
+        self.assertEqual('uint16', args.raw_dtype)
+        self.assertEqual(10, args.bit_depth)
+
+        sys.argv = ['scriptname', 'file.cc', '--filter']
+        self.assertRaises(ValueError, cdl_convert.parse_args)
+
+    #==========================================================================
+
+    @mock.patch('cdl_convert.cdl_convert.filter_frames')
+    @mock.patch('cdl_convert.cdl_convert.write_cc')
+    @mock.patch('cdl_convert.cdl_convert.parse_cc')
+    def testMainFilters(self, mockParse, mockWriteCC, mockFilter):
+        """Tests that main only filters frames when filtering"""
+        mockParse.return_value = [self.cdl, ]
+        sys.argv = [
+            'scriptname', 'file.cc', '--filter', '--raw-size', '1920x1080'
+        ]
+
+        cdl_convert.INPUT_FORMATS = dict(self.inputFormats, cc=mockParse)
+        cdl_convert.OUTPUT_FORMATS = dict(self.outputFormats, cc=mockWriteCC)
+
+        cdl_convert.main()
+
+        mockFilter.assert_called_once_with(
+            self.cdl,
+            1920,
+            1080,
+            dtype='float32',
+            bit_depth=None,
+            clamp=None
+        )
+        self.assertFalse(mockWriteCC.called)
+        self.assertEqual('', sys.stdout.getvalue())
+
+    #==========================================================================
+
+    @mock.patch('cdl_convert.cdl_convert.write_cc')
+    @mock.patch('cdl_convert.cdl_convert.parse_cc')
+    def testMainFilterErrors(self, mockParse, mockWriteCC):
+        """Tests that filter errors go to stderr, leaving whole frames"""
+        self.cdl.slope = [1.5, 1.0, 0.5]
+        mockParse.return_value = [self.cdl, ]
+        pixels = np.random.RandomState(4).uniform(0.0, 1.0, (2, 3, 4, 3))
+        pixels = pixels.astype(np.float32)
+        stream = pixels.tobytes()
+        # The second frame is cut short.
+        sys.stdin = BytesIO(stream[:len(stream) - 20])
+        sys.stdout = BytesIO()
+        sys.stderr = StringIO()
+        sys.argv = ['scriptname', 'file.cc', '--filter', '--raw-size', '4x3']
+
+        cdl_convert.INPUT_FORMATS = dict(self.inputFormats, cc=mockParse)
+        cdl_convert.OUTPUT_FORMATS = dict(self.outputFormats, cc=mockWriteCC)
+
+        with self.assertRaises(SystemExit) as raised:
+            cdl_convert.main()
+
+        self.assertEqual(1, raised.exception.code)
+        self.assertEqual(
+            cdl_convert.apply_cdl(pixels[0], self.cdl).tobytes(),
+            sys.stdout.getvalue()
+        )
+        self.assertTrue(
+            'Error filtering frames: The stream ended 20 bytes short'
+            in sys.stderr.getvalue()
+        )
+        self.assertFalse(mockWriteCC.called)
+
+    #==========================================================================
+
+    @mock.patch('cdl_convert.cdl_convert.write_cc')
+    @mock.patch('cdl_convert.cdl_convert.parse_cc')
+    def testMainRenderNeedsOneCorrection(self, mockParse, mockWriteCC):
+        """Tests that rendering needs a single correction"""
+        mockParse.return_value = [
+            self.cdl, cdl_convert.ColorCorrection('other', 'file')
+        ]
+        sys.argv = [
+            'scriptname', 'file.cc', '--render', 'plates/shot.0001.pfm',
+            '--render-dest', 'graded'
+        ]
+
+        cdl_convert.INPUT_FORMATS = dict(self.inputFormats, cc=mockParse)
+        cdl_convert.OUTPUT_FORMATS = dict(self.outputFormats, cc=mockWriteCC)
+
+        self.assertRaises(ValueError, cdl_convert.main)
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python
+"""
+Tests the grade statistics of cdl_convert
+
+REQUIREMENTS:
+
+mock
+numpy
+"""
+
+#==============================================================================
+# IMPORTS
+#==============================================================================
+
+# Standard Imports
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+import os
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Grab our test's path and append the cdL_convert root directory
+
+# There has to be a better method than:
+# 1) Getting our current directory
+# 2) Splitting into list
+# 3) Splicing out the last 3 entries (filepath, test dir, tools dir)
+# 4) Joining
+# 5) Appending to our Python path.
+
+sys.path.append('/'.join(os.path.realpath(__file__).split('/')[:-2]))
+
+import cdl_convert.cdl_convert as cdl_convert
+
+np = cdl_convert.np
+
+#==============================================================================
+# GLOBALS
+#==============================================================================
+
+NO_NUMPY = np is None
+NO_NUMPY_REASON = 'NumPy is not installed'
+
+
+#==============================================================================
+# TEST CLASSES
+#==============================================================================
+
+# grade_stats() ===============================================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestGradeStats(unittest.TestCase):
+    """Tests summarising groups of grades"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        random = np.random.RandomState(6)
+        self.ids = [
+            '{scene}_{take}_A{reel:03d}'.format(
+                scene=random.randint(10, 14), take=take,
+                reel=random.randint(1, 4)
+            )
+            for take in range(600)
+        ]
+        self.values = np.abs(random.normal(1.0, 0.2, (600, 10)))
+        self.batch = cdl_convert.CorrectionBatch(self.ids, self.values)
+
+    #==========================================================================
+
+    def tearDown(self):
+        cdl_convert.ColorCorrection.members = {}
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def assertGroupStats(self, stats, groups):
+        """Asserts that stats match NumPy's reductions of each group"""
+        self.assertEqual(sorted(set(groups)), stats['groups'])
+        groups = np.array(groups)
+        for number, group in enumerate(stats['groups']):
+            members = self.values[groups == group]
+            np.testing.assert_array_equal(
+                groups == group, stats['group_index'] == number
+            )
+            self.assertEqual(len(members), stats['count'][number])
+            np.testing.assert_allclose(
+                members.mean(axis=0), stats['mean'][number]
+            )
+            np.testing.assert_array_equal(
+                members.min(axis=0), stats['min'][number]
+            )
+            np.testing.assert_array_equal(
+                members.max(axis=0), stats['max'][number]
+            )
+            np.testing.assert_allclose(
+                np.percentile(
+                    members, cdl_convert.STATS_PERCENTILES, axis=0
+                ),
+                stats['percentiles'][number]
+            )
+
+    #==========================================================================
+
+    def testAll(self):
+        """Tests summarising every grade as one group"""
+        stats = cdl_convert.grade_stats(self.batch)
+
+        self.assertGroupStats(stats, ['all'] * 600)
+
+    #==========================================================================
+
+    def testGroups(self):
+        """Tests grouping by the fields of ids"""
+        for group, key in [
+                ('scene', lambda cc_id: cc_id.split('_')[0]),
+                ('reel', lambda cc_id: cc_id.split('_')[-1]),
+                ('prefix', lambda cc_id: cc_id.rsplit('_', 1)[0]),
+        ]:
+            stats = cdl_convert.grade_stats(self.batch, group=group)
+
+            self.assertGroupStats(stats, [key(i) for i in self.ids])
+
+        self.assertEqual(
+            ['A001', 'A002', 'A003'],
+            cdl_convert.grade_stats(self.batch, group='reel')['groups']
+        )
+
+    #==========================================================================
+
+    def testCustomGroups(self):
+        """Tests grouping with a function or a group for each grade"""
+        odd = ['odd' if i % 2 else 'even' for i in range(600)]
+
+        by_list = cdl_convert.grade_stats(self.batch, group=odd)
+        by_function = cdl_convert.grade_stats(
+            self.batch, group=lambda cc_id: cc_id[:2]
+        )
+
+        self.assertGroupStats(by_list, odd)
+        self.assertGroupStats(by_function, [i[:2] for i in self.ids])
+
+    #==========================================================================
+
+    def testArrayGroups(self):
+        """Tests grouping with an array of groups or a unicode name"""
+        shots = np.arange(600) // 100
+        names = np.array(['odd' if i % 2 else 'even' for i in range(600)])
+
+        by_numbers = cdl_convert.grade_stats(self.batch, group=shots)
+        by_names = cdl_convert.grade_stats(self.batch, group=names)
+        by_unicode = cdl_convert.grade_stats(self.batch, group=u'scene')
+
+        self.assertGroupStats(by_numbers, [str(i) for i in shots])
+        self.assertGroupStats(by_names, names.tolist())
+        self.assertGroupStats(
+            by_unicode, [i.split('_')[0] for i in self.ids]
+        )
+
+    #==========================================================================
+
+    def testPercentiles(self):
+        """Tests asking for percentiles of groups of a single grade"""
+        stats = cdl_convert.grade_stats(
+            self.batch,
+            group=[str(i) for i in range(600)],
+            percentiles=[0, 10, 100]
+        )
+
+        np.testing.assert_array_equal(
+            np.repeat(self.values[:, np.newaxis], 3, axis=1)[
+                np.argsort([str(i) for i in range(600)])
+            ],
+            stats['percentiles']
+        )
+        self.assertFalse(stats['outliers'].any())
+
+    #==========================================================================
+
+    def testOutliers(self):
+        """Tests that values beyond the fences of their group are flagged"""
+        self.values[5, 2] = 5.0
+        self.values[9, 9] = 0.0
+        batch = cdl_convert.CorrectionBatch(self.ids, self.values)
+
+        stats = cdl_convert.grade_stats(batch, fence=3.0)
+
+        quartiles = np.percentile(self.values, [25, 75], axis=0)
+        spread = 3.0 * (quartiles[1] - quartiles[0])
+        np.testing.assert_array_equal(
+            (self.values < quartiles[0] - spread) |
+            (self.values > quartiles[1] + spread),
+            stats['outliers']
+        )
+        self.assertTrue(stats['outliers'][5, 2])
+        self.assertTrue(stats['outliers'][9, 9])
+
+    #==========================================================================
+
+    def testCorrections(self):
+        """Tests summarising a list of corrections"""
+        stats = cdl_convert.grade_stats(self.batch.corrections()[:10])
+
+        np.testing.assert_allclose(
+            self.values[:10].mean(axis=0), stats['mean'][0]
+        )
+
+    #==========================================================================
+
+    def testBadStats(self):
+        """Tests that bad groups and percentiles raise"""
+        self.assertRaises(ValueError, cdl_convert.grade_stats, [])
+        self.assertRaises(
+            ValueError,
+            cdl_convert.grade_stats, self.batch, group='take'
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.grade_stats, self.batch, group=u'take'
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.grade_stats, self.batch, group=np.arange(599)
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.grade_stats, self.batch, group=['a', 'b']
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.grade_stats, self.batch, percentiles=[50, 101]
+        )
+
+# parse_stats_args() and main() ===============================================
+
+
+@unittest.skipIf(NO_NUMPY, NO_NUMPY_REASON)
+class TestMainStats(unittest.TestCase):
+    """Tests the stats subcommand"""
+
+    #==========================================================================
+    # SETUP & TEARDOWN
+    #==========================================================================
+
+    def setUp(self):
+        self.sysargv = sys.argv
+        self.stdout = sys.stdout
+        self.inputFormats = cdl_convert.INPUT_FORMATS
+        sys.stdout = StringIO()
+        # Anything written next to the inputs lands here.
+        self.directory = tempfile.mkdtemp()
+        source = os.path.join(self.directory, 'file')
+
+        self.first = cdl_convert.ColorCorrection('010_1_A001', source)
+        self.second = cdl_convert.ColorCorrection('010_2_A001', source)
+        self.second.slope = [1.2, 1.0, 1.0]
+        self.third = cdl_convert.ColorCorrection('020_1_A002', source)
+        self.third.sat = 0.5
+
+    #==========================================================================
+
+    def tearDown(self):
+        sys.argv = self.sysargv
+        sys.stdout = self.stdout
+        cdl_convert.INPUT_FORMATS = self.inputFormats
+        cdl_convert.ColorCorrection.members = {}
+        shutil.rmtree(self.directory)
+
+    #==========================================================================
+    # TESTS
+    #==========================================================================
+
+    def testArgs(self):
+        """Tests parsing the stats arguments"""
+        args = cdl_convert.parse_stats_args(
+            ['a.ale', 'b.flex', '--group', 'reel', '--percentiles', '10,90',
+             '--fence', '3', '-i', 'ALE']
+        )
+
+        self.assertEqual(['a.ale', 'b.flex'], args.input_files)
+        self.assertEqual('reel', args.group)
+        self.assertEqual([10.0, 90.0], args.percentiles)
+        self.assertEqual(3.0, args.fence)
+        self.assertEqual('ale', args.input)
+
+        args = cdl_convert.parse_stats_args(['a.ale'])
+        self.assertEqual(
+            list(cdl_convert.STATS_PERCENTILES), args.percentiles
+        )
+        self.assertEqual(None, args.group)
+
+    #==========================================================================
+
+    def testBadArgs(self):
+        """Tests that bad percentiles and input formats raise"""
+        self.assertRaises(
+            ValueError,
+            cdl_convert.parse_stats_args, ['a.ale', '--percentiles', 'low']
+        )
+        self.assertRaises(
+            ValueError,
+            cdl_convert.parse_stats_args, ['a.ale', '-i', 'mov']
+        )
+
+    #==========================================================================
+
+    def testMain(self):
+        """Tests that main reads every input and prints a report"""
+        parse_ale = mock.Mock(return_value=[self.first, self.second])
+        parse_cc = mock.Mock(return_value=[self.third])
+        cdl_convert.INPUT_FORMATS = dict(
+            self.inputFormats, ale=parse_ale, cc=parse_cc
+        )
+        sys.argv = [
+            'scriptname', 'stats', 'day1.ale', 'shot.cc', '--group', 'scene',
+            '--percentiles', '50'
+        ]
+
+        cdl_convert.main()
+
+        parse_ale.assert_called_once_with(os.path.abspath('day1.ale'))
+        parse_cc.assert_called_once_with(os.path.abspath('shot.cc'))
+        report = sys.stdout.getvalue()
+        self.assertTrue('Group 010: 2 grades, 0 outliers' in report)
+        self.assertTrue('Group 020: 1 grades, 0 outliers' in report)
+        self.assertTrue(
+            '     slope_r         1.1           1         1.2         1.1'
+            in report
+        )
+        self.assertTrue(
+            '         sat         0.5         0.5         0.5         0.5'
+            in report
+        )
+
+    #==========================================================================
+
+    def testMainStatsFile(self):
+        """Tests that a file named stats converts when given a path"""
+        parse_cc = mock.Mock(return_value=[self.first])
+        mockWrite = mock.Mock()
+        cdl_convert.INPUT_FORMATS = dict(self.inputFormats, cc=parse_cc)
+        sys.argv = ['scriptname', './stats', '-i', 'cc']
+
+        with mock.patch.dict(cdl_convert.OUTPUT_FORMATS, cc=mockWrite):
+            cdl_convert.main()
+
+        parse_cc.assert_called_once_with(os.path.abspath('stats'))
+        mockWrite.assert_called_once_with(self.first)
+
+#==============================================================================
+# RUNNER
+#==============================================================================
+if __name__ == '__main__':
+    unittest.main()